@@ -1,5 +1,7 @@
-import subprocess
 import datetime
+import json
+import os
+import subprocess
 from pathlib import Path
 
 __all__ = [
@@ -14,32 +16,74 @@ __all__ = [
     "VERSION",
 ]
 
-COMMIT_DATE, COMMIT_FULL_HASH, COMMIT_SMALL_HASH = subprocess.run(
-    'git show --quiet --format="format:%cI %H %h"',
-    shell=True,
-    stdout=subprocess.PIPE,
-    encoding="UTF-8",
-).stdout.split(" ")
-
-COMMIT_TAGGED_VERSION = subprocess.run(
-    'git describe --tags',
-    shell=True,
-    stdout=subprocess.PIPE,
-    encoding="UTF-8",
-).stdout.strip()
-
-BRANCH = subprocess.run(
-    'git branch --show-current',
-    shell=True,
-    stdout=subprocess.PIPE,
-    encoding="UTF-8",
-).stdout.strip()
+BASE_PATH = Path(__file__).parent.parent.parent
+
+VERSION_PATH = BASE_PATH / "VERSION"
+# Commit information stamped at deployment (python manage.py stamp_build_info). Without it, git is queried at startup.
+BUILD_INFO_PATH = Path(os.environ.get("FMS_BUILD_INFO_PATH", BASE_PATH / "BUILD_INFO.json"))
+
+def _run_git(command: str) -> str:
+    return subprocess.run(
+        command,
+        shell=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        encoding="UTF-8",
+        cwd=BASE_PATH,
+    ).stdout.strip()
+
+def read_git_info() -> dict:
+    """
+    Get the commit information from git.
+
+    Returns:
+        Dictionary with the commit date, full hash, small hash, tagged version and branch (empty if git fails).
+    """
+    commit = _run_git('git show --quiet --format="format:%cI %H %h"').split(" ")
+    commit_date, commit_full_hash, commit_small_hash = commit if len(commit) == 3 else ("", "", "")
+    return {
+        "commit_date": commit_date,
+        "commit_full_hash": commit_full_hash,
+        "commit_small_hash": commit_small_hash,
+        "commit_tagged_version": _run_git('git describe --tags'),
+        "branch": _run_git('git branch --show-current'),
+    }
+
+def stamp_build_info(path: Path = BUILD_INFO_PATH) -> dict:
+    """
+    Write the commit information from git to the build info file, read at startup instead of querying git.
+
+    Args:
+        `path`: Path of the build info file.
+
+    Returns:
+        Dictionary with the stamped commit information.
+    """
+    build_info = read_git_info()
+    tmp_path = Path(f"{path}.tmp")
+    with open(tmp_path, "w") as build_info_file:
+        json.dump(build_info, build_info_file, indent=4)
+    os.replace(tmp_path, path)
+    return build_info
+
+def load_build_info(path: Path = BUILD_INFO_PATH) -> dict:
+    try:
+        with open(path, "r") as build_info_file:
+            return json.load(build_info_file)
+    except (OSError, ValueError):
+        return read_git_info()
+
+_build_info = load_build_info()
+
+COMMIT_DATE = _build_info.get("commit_date", "")
+COMMIT_FULL_HASH = _build_info.get("commit_full_hash", "")
+COMMIT_SMALL_HASH = _build_info.get("commit_small_hash", "")
+COMMIT_TAGGED_VERSION = _build_info.get("commit_tagged_version", "")
+BRANCH = _build_info.get("branch", "")
 
 CONTACT_EMAIL = "info@computationalgenomics.ca"
 COPYRIGHT_YEARS = str(datetime.datetime.now().year)
 REPOSITORY = "https://github.com/c3g/freezeman"
 
-VERSION_PATH = Path(__file__).parent.parent.parent / "VERSION"
-
 with open(VERSION_PATH, "r") as vf:
     VERSION = vf.read().strip()
@@ -67,6 +67,7 @@ MIDDLEWARE = [
     'crequest.middleware.CrequestMiddleware',
     'reversion.middleware.RevisionMiddleware',
     'crum.CurrentRequestUserMiddleware',
+    'fms_core.db_router.ReplicaStickinessMiddleware',
 ]
 
 ROOT_URLCONF = 'fms.urls'
@@ -104,6 +105,26 @@ DATABASES = {
     }
 }
 
+# Optional read replica. Safe read-only requests (lists, exports, reports, labwork summaries) are served from it, see
+# fms_core.db_router. Tests use the default database in its place.
+REPLICA_DATABASE_ALIAS = "replica"
+REPLICA_MAX_LAG_SECONDS = float(os.environ.get("PG_REPLICA_MAX_LAG", "10"))
+REPLICA_LAG_CHECK_INTERVAL = float(os.environ.get("PG_REPLICA_LAG_CHECK_INTERVAL", "5"))
+REPLICA_STICKY_SECONDS = int(os.environ.get("PG_REPLICA_STICKY_SECONDS", "60"))
+
+if os.environ.get("PG_REPLICA_HOST", None) is not None:
+    DATABASES[REPLICA_DATABASE_ALIAS] = {
+        **DATABASES["default"],
+        "NAME": os.environ.get("PG_REPLICA_DATABASE", DATABASES["default"]["NAME"]),
+        "USER": os.environ.get("PG_REPLICA_USER", DATABASES["default"]["USER"]),
+        "PASSWORD": os.environ.get("PG_REPLICA_PASSWORD", DATABASES["default"]["PASSWORD"]),
+        "HOST": os.environ.get("PG_REPLICA_HOST"),
+        "PORT": os.environ.get("PG_REPLICA_PORT", DATABASES["default"]["PORT"]),
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_ROUTERS = ["fms_core.db_router.ReplicaRouter"]
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.0/ref/settings/#auth-password-validators
@@ -142,7 +163,7 @@ REST_FRAMEWORK = {
         'rest_framework_csv.renderers.CSVRenderer',
     ),
     'EXCEPTION_HANDLER': 'fms_core.exception_handler.fms_exception_handler',
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
+    'DEFAULT_PAGINATION_CLASS': 'fms_core.pagination.KeysetOptionalPagination',
     'PAGE_SIZE': 100,
 }
 
@@ -200,6 +221,8 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles/')
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media/')
 
 TEMPLATE_UPLOAD_PATH = os.path.join(MEDIA_ROOT, 'uploads/templates/')
+# Templates submitted for a background import and their output files are kept here
+IMPORT_JOB_PATH = os.environ.get("FMS_IMPORT_JOB_PATH", os.path.join(MEDIA_ROOT, 'uploads/import_jobs/'))
 
 # Directory where data release triggers are deposited
 TRIGGERS_OUTPUT_PARENT_PATH = os.path.join(BASE_DIR, 'triggers/')
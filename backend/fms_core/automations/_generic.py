@@ -1,4 +1,7 @@
 import abc
+from typing import List
+
+from fms_core.models import Sample
 
 class GenericAutomation(metaclass=abc.ABCMeta):
     work_folder = None
@@ -6,6 +9,20 @@ class GenericAutomation(metaclass=abc.ABCMeta):
     def __init__(self):
         pass
 
+    @classmethod
+    def load_samples(cls, sample_ids: List[int]) -> List[Sample]:
+        """
+        Loads the samples of the automation in a single query, with the related data the automation needs.
+        Automations that need other related data override it.
+
+        Args:
+        `sample_ids`: A list of the ids of the samples processed by the automation.
+
+        Returns:
+        The list of samples.
+        """
+        return list(Sample.objects.filter(id__in=sample_ids).select_related("container", "coordinate"))
+
     @abc.abstractmethod
-    def execute(self, **kwargs):
-        raise f"Automation called without being defined." # Overload
\ No newline at end of file
+    def execute(self, samples: List[Sample], additional_data: dict):
+        raise f"Automation called without being defined." # Overload
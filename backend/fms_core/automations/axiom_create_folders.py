@@ -3,15 +3,30 @@ from os import path, makedirs
 from fms.settings import FMS_AUTOMATIONS_WORK_PATH
 from typing import List
 from fms_core.models import Container, Sample
+from fms_core.models.tracked_model import get_tracking_user
+from fms_core.utils import str_cast_and_normalize
 from collections import defaultdict
-from pandas import DataFrame
+from concurrent.futures import ThreadPoolExecutor
+from django.utils import timezone
 import csv
+import reversion
 from fms_core.template_importer._constants import DESTINATION_CONTAINER_BARCODE_MARKER
 
 
 WORK_FOLDER = "axiom-arrays"
 FILE_SUFFIX = ".PROJECT"
 REMOVED_CONTAINER_SUFFIX = "_AFHD"
+MAX_WRITE_WORKERS = 8
+
+def _write_project_files(filepath: str, project: str, rows: List[list]):
+    # Create directory if it doesn't already exist
+    makedirs(filepath, exist_ok=True)
+    # Create file if it doesn't already exist
+    with open(path.join(filepath, project + FILE_SUFFIX), "w") as fp:
+        fp.write(project)
+    # Write csv file with sample info into directory
+    with open(path.join(filepath, project + ".csv"), "w", newline="") as fp:
+        csv.writer(fp, quoting=csv.QUOTE_NONNUMERIC, lineterminator="\n").writerows(rows)
 
 class AxiomCreateFolders(GenericAutomation):
     
@@ -21,13 +36,14 @@ class AxiomCreateFolders(GenericAutomation):
         super().__init__()
 
     @classmethod
-    def execute(self, sample_ids: List, additional_data: dict):
+    def execute(self, samples: List[Sample], additional_data: dict):
         """
         Execute the AxiomCreateFolders automation to create folders and files for the genotyping scanner outputs.
         The name used for the folder and file created inside are based on the container name and id of the samples listed.
+        The files of the containers are written in parallel and the container comments are updated together.
 
         Args:
-        `sample_ids`: A list of samples that are ready for the Axiom experiment run.
+        `samples`: A list of samples that are ready for the Axiom experiment run, loaded with their container and coordinate (see load_samples).
         `additional_data`: A dictionnary that maps a source container name to a destination array barcode.
 
         Returns:
@@ -36,25 +52,50 @@ class AxiomCreateFolders(GenericAutomation):
         """
         errors = defaultdict(list)
         warnings = defaultdict(list)
+        # group the samples by plate, in plate order
+        samples_by_container_id = defaultdict(list)
+        container_by_id = {}
+        for sample in sorted(samples, key=lambda sample: (sample.coordinate is None,
+                                                          sample.coordinate.row if sample.coordinate is not None else 0,
+                                                          sample.coordinate.column if sample.coordinate is not None else 0)):
+            samples_by_container_id[sample.container_id].append(sample)
+            container_by_id[sample.container_id] = sample.container
+
         # build list of folder from sample plate info
-        for container in Container.objects.filter(samples__id__in=sample_ids).all().distinct():
+        files = []
+        for container_id, container_samples in samples_by_container_id.items():
+            container = container_by_id[container_id]
+            array_barcode = additional_data.get(container.name, None)
+            if array_barcode is None:
+                errors["additional_data"].append(f"No array barcode provided for container {container.name}.")
+                continue
             project = container.name.replace(REMOVED_CONTAINER_SUFFIX, "") + "_" + str(container.id)
-            filepath = path.join(self.work_folder, project)
-            df = DataFrame(columns=["Coordinates", "Array Barcode", "Unique Sample ID", "Unique Sample ID Duplicate"])
-            for i, sample in enumerate(Sample.objects.filter(id__in=sample_ids).filter(container_id__exact=container.id).order_by("coordinate__row", "coordinate__column").all()):
+            rows = []
+            for sample in container_samples:
                 unique_sample_id = sample.name + "_" + str(sample.id)
-                df.loc[i] = [sample.coordinates, additional_data[container.name], unique_sample_id, unique_sample_id]
-            # Create directory if it doesn't already exist
-            try:
-                makedirs(filepath)
-            except FileExistsError:
-                pass
-            # Create file if it doesn't already exist
-            with open(path.join(filepath, project + FILE_SUFFIX), "w") as fp:
-                fp.write(project)
-            # Write csv file with sample info into directory
-            df.to_csv(path.join(filepath, project + ".csv"), header=False, index=False, quoting=csv.QUOTE_NONNUMERIC)
-            # Add a comment to the container to provide a reference for validation during experiment run.
-            container.comment = DESTINATION_CONTAINER_BARCODE_MARKER + additional_data[container.name] + " ." + container.comment
-            container.save()
+                rows.append([sample.coordinates, array_barcode, unique_sample_id, unique_sample_id])
+            files.append((path.join(self.work_folder, project), project, rows))
+        if errors:
+            return ({"success": False, "data": None}, errors, warnings)
+
+        with ThreadPoolExecutor(max_workers=MAX_WRITE_WORKERS) as executor:
+            futures = [executor.submit(_write_project_files, filepath, project, rows) for filepath, project, rows in files]
+        for (_, project, _), future in zip(files, futures):
+            if future.exception() is not None:
+                errors["files"].append(f"Files for {project} could not be written. {future.exception()}")
+        if errors:
+            return ({"success": False, "data": None}, errors, warnings)
+
+        # Add a comment to the containers to provide a reference for validation during experiment run.
+        user = get_tracking_user()
+        containers = list(container_by_id.values())
+        for container in containers:
+            container.comment = str_cast_and_normalize(DESTINATION_CONTAINER_BARCODE_MARKER + additional_data[container.name] + " ." + container.comment)
+            container.updated_by = user
+            container.updated_at = timezone.now()
+        Container.objects.bulk_update(containers, ["comment", "updated_by", "updated_at"])
+        # bulk_update bypasses save(), register the containers in the ongoing revision ourselves
+        if reversion.is_active():
+            for container in containers:
+                reversion.add_to_revision(container)
         return ({"success": True, "data": None}, errors, warnings)
@@ -1,5 +1,5 @@
 from typing import Dict, List, Tuple
-from .coordinates import CoordinateSpec, alphas, ints, validate_and_normalize_coordinates
+from .coordinates import CoordinateLattice, CoordinateSpec, alphas, ints, get_coordinate_lattice
 
 
 __all__ = [
@@ -80,6 +80,7 @@ class ContainerSpec:
                  children: Tuple["ContainerSpec", ...], is_run_container: bool):
         self._container_kind_id = container_kind_id
         self._coordinate_spec = coordinate_spec
+        self._coordinate_lattice = get_coordinate_lattice(coordinate_spec)
         self._coordinate_overlap_allowed = coordinate_overlap_allowed
         self._is_run_container = is_run_container
         self._children = children
@@ -108,6 +109,10 @@ class ContainerSpec:
     def coordinate_spec(self) -> CoordinateSpec:
         return self._coordinate_spec
 
+    @property
+    def coordinate_lattice(self) -> CoordinateLattice:
+        return self._coordinate_lattice
+
     @property
     def requires_coordinates(self) -> bool:
         return bool(self._coordinate_spec)
@@ -132,7 +137,7 @@ class ContainerSpec:
         return next((c for c in self._children if c.container_kind_id == kind_id), None) is not None
 
     def validate_and_normalize_coordinates(self, coordinates: str) -> str:
-        return validate_and_normalize_coordinates(coordinates, self._coordinate_spec)
+        return self._coordinate_lattice.validate_and_normalize(coordinates)
 
     def serialize(self) -> dict:
         return {
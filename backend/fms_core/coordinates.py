@@ -7,17 +7,21 @@ container, and can be customized to use different types of coordinate ranges.
 
 import re
 import unicodedata
-from typing import Tuple, Union
+from functools import lru_cache
+from itertools import product
+from typing import Dict, Optional, Tuple, Union
 
 
 __all__ = [
     "CoordinateAxis",
     "CoordinateSpec",
+    "CoordinateLattice",
 
     "CoordinateError",
 
     "alphas",
     "ints",
+    "get_coordinate_lattice",
 
     "validate_and_normalize_coordinates",
     "check_coordinate_overlap",
@@ -30,6 +34,8 @@ CoordinateSpec = Union[Tuple[()], Tuple[CoordinateAxis], Tuple[CoordinateAxis, C
 ROW = "row"
 COLUMN = "column"
 
+ALPHA_DIGIT_COORDINATE_REGEX = re.compile(r"^([A-Za-z]+)([0-9]+)$")
+
 
 class CoordinateError(Exception):
     pass
@@ -60,6 +66,125 @@ def ints(end: int, pad_to: int = 0) -> CoordinateAxis:
 
     return tuple(str(i).zfill(pad_to) for i in range(1, end + 1))
 
+class CoordinateLattice:
+    """
+    Precomputed coordinates of a coordinate spec. The lattice lists the coordinates in row-major order (the last axis
+    varies first, eg. A01, A02, ..., B01) and column-major order (the first axis varies first, eg. A01, B01, ..., A02),
+    and maps coordinates to their position on the axes. It replaces building and matching a regex and parsing strings
+    for each coordinate.
+    """
+
+    def __init__(self, spec: CoordinateSpec):
+        self._spec = spec
+        # Positions are tuples of axis indices, in row-major order
+        self._position_by_coordinate: Dict[str, Tuple[int, ...]] = {}
+        for position in product(*(range(len(axis)) for axis in spec)):
+            self._position_by_coordinate.setdefault("".join(axis[index] for axis, index in zip(spec, position)), position)
+        self._row_major = tuple(self._position_by_coordinate.keys()) if spec else ()
+        if len(spec) == 2:
+            self._column_major = tuple(sorted(self._row_major, key=lambda coordinate: self._position_by_coordinate[coordinate][::-1]))
+        else:
+            self._column_major = self._row_major
+        self._is_alpha_digit = is_alpha_digit_spec(spec)
+        if self._is_alpha_digit:
+            # Numerical values of the digit axis, to accept unpadded (or over-padded) digits
+            self._digit_index_by_value = {int(value): index for index, value in enumerate(spec[1])}
+
+    def __len__(self) -> int:
+        return len(self._row_major)
+
+    def __contains__(self, coordinate: str) -> bool:
+        return coordinate in self._position_by_coordinate
+
+    @property
+    def spec(self) -> CoordinateSpec:
+        return self._spec
+
+    @property
+    def is_alpha_digit(self) -> bool:
+        return self._is_alpha_digit
+
+    @property
+    def row_major(self) -> Tuple[str, ...]:
+        return self._row_major
+
+    @property
+    def column_major(self) -> Tuple[str, ...]:
+        return self._column_major
+
+    def ordered(self, axis: str = ROW) -> Tuple[str, ...]:
+        """
+        Lists the coordinates following the row (row-major) or the column (column-major) axis.
+        """
+        return self._column_major if axis == COLUMN else self._row_major
+
+    @property
+    def regex_str(self) -> str:
+        return "^" + "".join(f"({'|'.join(s)})" for s in self._spec) + "$"
+
+    def validate_and_normalize(self, coords: Optional[str]) -> Optional[str]:
+        """
+        Validates coordinates against the lattice and returns them normalized. Raises a CoordinateError if they are invalid.
+        """
+        if coords is None and self._spec == (): # empty tuple spec means no coordinates are required
+            return coords
+
+        if coords is None:
+            raise CoordinateError(f"Coordinates must be specified specified for coordinate system {self.regex_str}")
+        else:
+            c = unicodedata.normalize("NFC", coords.strip())
+
+            if c not in self._position_by_coordinate:
+                raise CoordinateError(f"Invalid coordinates {c} specified for coordinate system {self.regex_str}")
+
+            return c
+
+    def _position(self, coord: str) -> Optional[Tuple[int, ...]]:
+        position = self._position_by_coordinate.get(coord, None)
+        if position is None and self._is_alpha_digit:
+            match = ALPHA_DIGIT_COORDINATE_REGEX.match(coord)
+            if match is not None:
+                letters, digits = match.groups()
+                letter_index = self._spec[0].index(letters) if letters in self._spec[0] else None
+                digit_index = self._digit_index_by_value.get(int(digits), None)
+                if letter_index is not None and digit_index is not None:
+                    position = (letter_index, digit_index)
+        return position
+
+    def ordinal(self, coord: str, axis: str = ROW) -> int:
+        """
+        Converts a coordinate to its ordinal, starting at 1, following the row (row-major) or the column (column-major) axis.
+        Raises a CoordinateError if the coordinate is not in the lattice.
+        """
+        position = self._position(coord)
+        if position is None or not self._spec:
+            raise CoordinateError(f"Cannot convert coord {coord} to ordinal - does not match coordinate spec.")
+        if len(position) == 1:
+            return position[0] + 1
+        first_index, second_index = position
+        if axis == COLUMN:
+            return second_index * len(self._spec[0]) + first_index + 1
+        return first_index * len(self._spec[1]) + second_index + 1
+
+    def coordinate(self, ordinal: int, axis: str = ROW) -> str:
+        """
+        Converts an ordinal, starting at 1, to its coordinate following the row (row-major) or the column (column-major) axis.
+        Raises a CoordinateError if the ordinal is out of the lattice.
+        """
+        coordinates = self.ordered(axis)
+        if not 0 < ordinal <= len(coordinates):
+            raise CoordinateError(f"Ordinal {ordinal} is out of the coordinate system {self.regex_str}.")
+        return coordinates[ordinal - 1]
+
+
+@lru_cache(maxsize=None)
+def get_coordinate_lattice(spec: CoordinateSpec) -> CoordinateLattice:
+    """
+    Returns the coordinate lattice of a coordinate spec. Lattices are built once for each spec.
+    """
+    return CoordinateLattice(spec)
+
+
 def is_alpha_digit_spec(spec: CoordinateSpec) -> bool:
     '''Determines if a CoordinateSpec is for the alpha/digit style, eg "A01, B12, etc..."'''
     if len(spec) == 2:
@@ -88,56 +213,8 @@ def convert_alpha_digit_coord_to_ordinal(coord: str, spec: CoordinateSpec, axis:
     # Spec must be for "A01" style coordinates.
     if not is_alpha_digit_spec(spec):
         raise CoordinateError(f'Cannot convert coord {coord} to ordinal - CoordinateSpec does not support coordinate style.')
-    spec_letters = spec[0]
-    spec_digits = spec[1]
-    
-    # Collect the characters at the start of the coord.
-    letters = ''
-    digits = ''
-    for index in range(0, len(coord)):
-        if str(coord[index]).isalpha():
-            letters += coord[index]
-        else:
-            # Break on first digit and grab the remainder of the string
-            digits = coord[index:]
-            break
-
-    if len(letters) == 0:
-        raise CoordinateError(f'Cannot convert coord {coord} to ordinal - no letters were found.')
-
-    if (len(digits) == 0):
-        raise CoordinateError(f'Cannot convert coord {coord} to ordinal - no digits were found.')
-
-    alpha_offset = 0
-    digit_offset = 0
-    if axis == ROW:
-        try:
-            # Find the index of the letter (or letters) in the spec
-            letter_index = spec_letters.index(letters)
-            # Compute the offset of that letter (number of "rows" of length N)
-            alpha_offset = letter_index * len(spec_digits)
-        except:
-            raise CoordinateError(f'Cannot convert coord {coord} to ordinal - does not match coordinate spec.')
-
-        # Convert the digits to an int value
-        try:
-            digit_offset = int(digits)
-        except:
-            raise CoordinateError(f'Cannot convert coord {coord} to ordinal - does not match coordinate spec.')
-    else: # axis == COLUMN
-        try:
-            # Find the index of the letter (or letters) in the spec and starting the index at 1.
-            alpha_offset = spec_letters.index(letters) + 1 
-        except:
-            raise CoordinateError(f'Cannot convert coord {coord} to ordinal - does not match coordinate spec.')
-
-        # Convert the digits to an int value
-        try:
-            digit_offset = (int(digits) - 1) * len(spec_letters)
-        except:
-            raise CoordinateError(f'Cannot convert coord {coord} to ordinal - does not match coordinate spec.')
-
-    return alpha_offset + digit_offset
+
+    return get_coordinate_lattice(spec).ordinal(coord, axis)
 
 def convert_ordinal_to_alpha_digit_coord(lane: int, spec: CoordinateSpec) -> str:
     """
@@ -149,17 +226,12 @@ def convert_ordinal_to_alpha_digit_coord(lane: int, spec: CoordinateSpec) -> str
         raise CoordinateError(f"Invalid lane number {lane} cannot be converted to coordinates.")
     if spec is None:
         raise CoordinateError(f"Coordinate Spec is required to convert lane into coordinates.")
+    if not is_alpha_digit_spec(spec):
+        raise CoordinateError(f'Cannot convert lane {lane} to requested coordinate style.')
     try:
-        if not is_alpha_digit_spec(spec):
-            raise CoordinateError(f'Cannot convert lane {lane} to requested coordinate style.')
-        spec_letters = spec[0]
-        spec_digits = spec[1]
-        letter_index, digit_index = divmod(lane - 1, len(spec_digits))
-        letters = spec_letters[letter_index]
-        digits = spec_digits[digit_index]
-    except Exception as err:
+        return get_coordinate_lattice(spec).coordinate(lane)
+    except CoordinateError:
         raise CoordinateError(f"Failed to convert lane {lane} to alpha numerical coordinates for given container spec {spec}.")
-    return letters + digits
 
 def validate_and_normalize_coordinates(coords: str, spec: CoordinateSpec) -> str:
     """
@@ -169,21 +241,7 @@ def validate_and_normalize_coordinates(coords: str, spec: CoordinateSpec) -> str
 
     # TODO: Handle padded 0s?
 
-    if coords is None and spec == (): # empty tuple spec means no coordinates are required
-        return coords
-
-    coordinate_regex_str = "^" + "".join(f"({'|'.join(s)})" for s in spec) + "$"
-
-    if coords is None:
-        raise CoordinateError(f"Coordinates must be specified specified for coordinate system {coordinate_regex_str}")
-    else:
-        coordinate_regex = re.compile(coordinate_regex_str)
-        c = unicodedata.normalize("NFC", coords.strip())
-
-        if not coordinate_regex.match(c):
-            raise CoordinateError(f"Invalid coordinates {c} specified for coordinate system {coordinate_regex_str}")
-
-        return c
+    return get_coordinate_lattice(spec).validate_and_normalize(coords)
 
 
 def check_coordinate_overlap(queryset, obj, parent, obj_type: str = "container"):
@@ -0,0 +1,175 @@
+import datetime
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from django.conf import settings
+from django.db import connections, DEFAULT_DB_ALIAS
+from django.utils import timezone
+
+# Reads are routed to the replica database only inside a replica block (see use_replica and ReplicaReadMixin). Writes,
+# migrations and every read outside a replica block use the default database. The replica is skipped when it lags
+# behind the default database by more than REPLICA_MAX_LAG_SECONDS or cannot be reached, and for the users that wrote
+# to the default database during the last REPLICA_STICKY_SECONDS (they always read their own writes). The last write of
+# each user is kept in the default database (RecentWrite) so every web process and worker sees it.
+
+_read_alias = ContextVar("read_alias", default=None)
+
+_replica_status_lock = threading.Lock()
+_replica_status = {} # alias -> (checked_at, usable)
+
+def get_replica_alias() -> Optional[str]:
+    """
+    Returns:
+        Alias of the replica database, None if no replica is configured.
+    """
+    alias = getattr(settings, "REPLICA_DATABASE_ALIAS", None)
+    return alias if alias and alias != DEFAULT_DB_ALIAS and alias in settings.DATABASES else None
+
+def get_replica_lag(alias: str) -> float:
+    """
+    Measure how far behind the default database the replica is. A database that is not a standby (ie. a second database
+    used as a replica stand-in) and a standby that replayed everything it received have no lag.
+
+    Args:
+        `alias`: Alias of the replica database.
+
+    Returns:
+        The lag in seconds.
+
+    Raises:
+        Any database error raised while querying the replica.
+    """
+    with connections[alias].cursor() as cursor:
+        cursor.execute("SELECT CASE WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+                       "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END")
+        return float(cursor.fetchone()[0])
+
+def is_replica_usable(alias: str) -> bool:
+    """
+    Tells if the replica is reachable and within the allowed lag. The result is kept REPLICA_LAG_CHECK_INTERVAL seconds
+    so the replica is checked at most once per interval by each process.
+
+    Args:
+        `alias`: Alias of the replica database.
+
+    Returns:
+        True if reads can be sent to the replica.
+    """
+    now = time.monotonic()
+    with _replica_status_lock:
+        checked_at, usable = _replica_status.get(alias, (None, False))
+        if checked_at is not None and now - checked_at < settings.REPLICA_LAG_CHECK_INTERVAL:
+            return usable
+        try:
+            usable = get_replica_lag(alias) <= settings.REPLICA_MAX_LAG_SECONDS
+        except Exception:
+            usable = False
+        _replica_status[alias] = (now, usable)
+        return usable
+
+def mark_recent_write(user):
+    """
+    Send the reads of a user to the default database for the next REPLICA_STICKY_SECONDS, so the user reads its own writes
+    even if the replica did not replay them yet. Does nothing if no replica is configured.
+
+    Args:
+        `user`: User that wrote to the default database.
+    """
+    from fms_core.models import RecentWrite # Imported on use, the router module must not load the models
+    if get_replica_alias() is not None and user is not None and user.is_authenticated:
+        RecentWrite.objects.using(DEFAULT_DB_ALIAS).bulk_create([RecentWrite(user_id=user.id, written_at=timezone.now())],
+                                                                update_conflicts=True,
+                                                                unique_fields=["user"],
+                                                                update_fields=["written_at"])
+
+def has_recent_write(user) -> bool:
+    from fms_core.models import RecentWrite
+    if user is None or not user.is_authenticated:
+        return False
+    sticky_since = timezone.now() - datetime.timedelta(seconds=settings.REPLICA_STICKY_SECONDS)
+    return RecentWrite.objects.using(DEFAULT_DB_ALIAS).filter(user_id=user.id, written_at__gte=sticky_since).exists()
+
+def get_read_alias_for_user(user) -> Optional[str]:
+    """
+    Choose the database a user's read-only request can be served from.
+
+    Args:
+        `user`: User making the request.
+
+    Returns:
+        Alias of the replica database, None if the request must use the default database.
+    """
+    alias = get_replica_alias()
+    if alias is None or has_recent_write(user) or not is_replica_usable(alias):
+        return None
+    return alias
+
+def set_read_alias(alias: Optional[str]):
+    """
+    Route the following reads to the given database, until reset_read_alias is called with the returned token.
+
+    Args:
+        `alias`: Alias of the replica database (see get_read_alias_for_user) or None for the default routing.
+
+    Returns:
+        Token to give to reset_read_alias.
+    """
+    return _read_alias.set(alias)
+
+def reset_read_alias(token):
+    _read_alias.reset(token)
+
+@contextmanager
+def use_replica(alias: Optional[str]):
+    """
+    Route the reads made in the block to the given database. Blocks with a None alias use the default routing.
+
+    Args:
+        `alias`: Alias of the replica database (see get_read_alias_for_user) or None.
+    """
+    token = set_read_alias(alias)
+    try:
+        yield
+    finally:
+        reset_read_alias(token)
+
+
+class ReplicaRouter:
+    """
+    Database router sending the reads made in a replica block to the replica database. Everything else goes to the
+    default database.
+    """
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same data as the default database
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica schema follows the default database through replication
+        return False if db == get_replica_alias() else None
+
+
+class ReplicaStickinessMiddleware:
+    """
+    Records the users whose requests wrote to the default database (successful unsafe requests, except the read-only
+    posted actions flagged with replica_read_only), so their following reads are not sent to a replica that may not
+    have their changes yet.
+    """
+    SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if request.method not in self.SAFE_METHODS and response.status_code < 400 and not getattr(request, "replica_read_only", False):
+            mark_recent_write(getattr(request, "user", None))
+        return response
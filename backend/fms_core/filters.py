@@ -3,13 +3,14 @@ from django.db.models import Q, Max, Count, Exists, OuterRef, Case, When, Boolea
 from django.utils import timezone
 import datetime
 from .models._constants import ReleaseStatus, ValidationStatus
+from .models.typed_property_value import TEXT_KEY_LENGTH
 
 from .models import (Container,
                      DerivedBySample,
                      Index,
                      Individual,
                      Sample,
-                     PropertyValue,
+                     TypedPropertyValue,
                      Dataset,
                      Biosample,
                      ExperimentRun,
@@ -41,19 +42,20 @@ from .viewsets._utils import _prefix_keys
 class GenericFilter(django_filters.FilterSet):
     id__not__in = django_filters.CharFilter(method="id_not_in_filter")
 
+    # Batch filters match a list of values separated by spaces (ie. names pasted from a spreadsheet). The list is sent
+    # as a single array parameter (see fms_core.lookups.AnyLookup), the statement does not grow with the list.
     def batch_filter(self, queryset, name, value):
-        query = Q()
-        for v in value.split(" "):
-            query |= Q(('%s' % name, v))
-        query_set = queryset.filter(query)
-        return query_set
+        values = value.split()
+        if not values:
+            return queryset.none()
+        return queryset.filter(**{f"{name}__any": values})
 
     def insensitive_batch_filter(self, queryset, name, value):
-        query = Q()
-        for v in value.split(" "):
-            query |= Q((f"{name}__iexact", v))
-        query_set = queryset.filter(query)
-        return query_set
+        # Matched on lower(field), the fields filtered this way have a lower case index
+        values = [v.lower() for v in value.split()]
+        if not values:
+            return queryset.none()
+        return queryset.filter(**{f"{name}__lower__any": values})
 
     def id_not_in_filter(self, queryset, name, value):
         ids = value.split(',')
@@ -76,16 +78,17 @@ class SampleFilter(GenericFilter):
     container__barcode = django_filters.CharFilter(field_name="container__barcode", method="batch_filter")
     qPCR_status__in = django_filters.CharFilter(method="process_measurement_properties_filter")
     derived_by_samples__project__name = django_filters.CharFilter(method="insensitive_batch_filter")
+    first_project__name = django_filters.CharFilter(method="insensitive_batch_filter")
     qc_flag__in = django_filters.CharFilter(method="qc_flag_filter")
     is_pooled = django_filters.CharFilter(method="is_pooled_filter")
     metadata = django_filters.CharFilter(method="metadata_filter")
 
     def process_measurement_properties_filter(self, queryset, name, value):
-        property_values = PropertyValue.objects.filter(property_type__name='qPCR Status')
-        condition = Q()
-        for status in value.split(','):
-            condition |= Q(value__icontains=status)
-        process_measurements_ids = property_values.filter(condition).values('object_id')
+        # Statuses are matched (case insensitive) on the indexed text key of the typed property values
+        text_keys = [status.strip()[:TEXT_KEY_LENGTH].lower() for status in value.split(',') if status.strip()]
+        process_measurements_ids = TypedPropertyValue.objects.filter(property_type__name='qPCR Status',
+                                                                     process_measurement__isnull=False,
+                                                                     text_key__in=text_keys).values('process_measurement_id')
         return queryset.filter(process_measurement__in=process_measurements_ids)
 
     def qc_flag_filter(self, queryset, name, values):
@@ -120,16 +123,19 @@ class SampleFilter(GenericFilter):
                     # Metadata name is not in the dict, add first value
                     elif name_value[0] not in metadata_dict.keys():
                         metadata_dict[name_value[0]] = [name_value[1]]
-        # Build queryset
-        biosample_qs = Biosample.objects.all()
+        # Build a single condition on the indexed metadata projection (one containment test per value)
+        condition = Q()
         for metadata_name, metadata_values in metadata_dict.items():
             # Meaning value was left empty
             if not metadata_values:
-                biosample_qs = biosample_qs.filter(metadata__name=metadata_name)
+                condition &= Q(metadata_values__has_key=metadata_name)
             else:
-                biosample_qs = biosample_qs.filter(metadata__name=metadata_name, metadata__value__in=metadata_values)
+                value_condition = Q()
+                for metadata_value in metadata_values:
+                    value_condition |= Q(metadata_values__contains={metadata_name: metadata_value})
+                condition &= value_condition
         # Apply filter to sample queryset
-        biosample_ids = biosample_qs.values('id')
+        biosample_ids = Biosample.objects.filter(condition).values('id')
         return queryset.filter(derived_samples__biosample__in=biosample_ids)
 
     class Meta:
@@ -140,6 +146,7 @@ class LibraryFilter(GenericFilter):
     name = django_filters.CharFilter(field_name="name", method="batch_filter")
     container__barcode = django_filters.CharFilter(field_name="container__barcode", method="batch_filter")
     derived_by_samples__project__name = django_filters.CharFilter(method="insensitive_batch_filter")
+    first_project__name = django_filters.CharFilter(method="insensitive_batch_filter")
     qc_flag__in = django_filters.CharFilter(method="qc_flag_filter")
     quantity_ng__lte = django_filters.NumberFilter(method="quantity_ng_lte_filter")
     quantity_ng__gte = django_filters.NumberFilter(method="quantity_ng_gte_filter")
@@ -202,13 +209,6 @@ class LibraryFilter(GenericFilter):
         return queryset.filter(condition)
 
     def is_pooled_filter(self, queryset, name, values):
-        queryset = queryset.annotate(
-            is_pooled=Case(
-                When(Q(first_volume_ratio__lt=1), then=True),
-                default=False,
-                output_field=BooleanField()
-            )
-        )
         bool_value = (values == 'true')
         return queryset.filter(is_pooled=bool_value)
 
@@ -244,34 +244,22 @@ class DatasetFilter(GenericFilter):
         return queryset.filter(release_flag=value)
 
     def latest_release_update_filter(self, queryset, name, value):
-        return queryset.annotate(
-            latest_release_update=Max("readsets__release_status_timestamp")
-        ).filter(latest_release_update__gt=value)
+        return queryset.filter(latest_release_update__gt=value)
 
     def latest_release_update__gte_filter(self, queryset, name, value):
-        return queryset.annotate(
-            latest_release_update=Max("readsets__release_status_timestamp")
-        ).filter(latest_release_update__gte=value)
+        return queryset.filter(latest_release_update__gte=value)
 
     def latest_release_update__lt_filter(self, queryset, name, value):
-        return queryset.annotate(
-            latest_release_update=Max("readsets__release_status_timestamp")
-        ).filter(latest_release_update__lt=value)
+        return queryset.filter(latest_release_update__lt=value)
 
     def latest_validation_update_filter(self, queryset, name, value):
-        return queryset.annotate(
-            latest_validation_update=Max("readsets__validation_status_timestamp")
-        ).filter(latest_validation_update__gt=value)
+        return queryset.filter(latest_validation_update__gt=value)
 
     def latest_validation_update__gte_filter(self, queryset, name, value):
-        return queryset.annotate(
-            latest_validation_update=Max("readsets__validation_status_timestamp")
-        ).filter(latest_validation_update__gte=value)
+        return queryset.filter(latest_validation_update__gte=value)
 
     def latest_validation_update__lt_filter(self, queryset, name, value):
-        return queryset.annotate(
-            latest_validation_update=Max("readsets__validation_status_timestamp")
-        ).filter(latest_validation_update__lt=value)
+        return queryset.filter(latest_validation_update__lt=value)
 
     class Meta:
         model = Dataset
@@ -284,46 +272,25 @@ class ExperimentRunFilter(GenericFilter):
     run_processing_completion_time__gte = django_filters.CharFilter(method="run_processing_completion_time__gte_filter")
 
     def experiment_run_progress_stage_filter(self, queryset, name, value):
-        queryset = queryset.annotate(
-            has_readsets=Exists(Readset.objects.filter(dataset__experiment_run=OuterRef("pk")))
-        )
-        queryset = queryset.annotate(
-            unvalidated_count=Count("datasets__readsets", filter=Q(datasets__readsets__validation_status=ValidationStatus.AVAILABLE), distinct=True)
-        )
-        queryset = queryset.annotate(
-            unreleased_count=Count("datasets__readsets", filter=Q(datasets__readsets__release_status=ReleaseStatus.AVAILABLE), distinct=True)
-        )
-
         match value:
             case "processed":
-                filtered_queryset = queryset.filter(unvalidated_count__gt=0)
+                filtered_queryset = queryset.filter(unvalidated_readset_count__gt=0)
             case "validated":
-                filtered_queryset = queryset.filter(unvalidated_count=0, unreleased_count__gt=0)
+                filtered_queryset = queryset.filter(unvalidated_readset_count=0, unreleased_readset_count__gt=0)
             case "released":
-                filtered_queryset = queryset.filter(unvalidated_count=0, unreleased_count=0, has_readsets=True)
+                filtered_queryset = queryset.filter(unvalidated_readset_count=0, unreleased_readset_count=0, readset_count__gt=0)
 
         return filtered_queryset
 
     def is_processing_complete_filter(self, queryset, name, value):
-        filtered_in = []
-        for experiment_run in queryset:
-            if (experiment_run.run_processing_completion_time is not None) == value:
-                filtered_in.append(experiment_run.pk)
-
-        return queryset.filter(id__in=filtered_in)
+        return queryset.filter(run_processing_completion_time__isnull=not value)
 
     def needs_run_processing_filter(self, queryset, name, value):
         return queryset.filter(run_type__needs_run_processing=value)
 
     def run_processing_completion_time__gte_filter(self, queryset, name, value):
-        filtered_in = []
-        for experiment_run in queryset:
-            run_processing_completion_time = experiment_run.run_processing_completion_time
-            # the value is expected to follow the the format: 2026-03-02 20:58:37.910344+00:00
-            if run_processing_completion_time and str(run_processing_completion_time) >= value:
-                filtered_in.append(experiment_run.pk)
-
-        return queryset.filter(id__in=filtered_in)
+        # the value is expected to follow the the format: 2026-03-02 20:58:37.910344+00:00
+        return queryset.filter(run_processing_completion_time__gte=value)
 
     class Meta:
         model = ExperimentRun
@@ -401,6 +368,8 @@ class SampleNextStepByStudyFilter(GenericFilter):
         fields = _sample_next_step_by_study_filterset_fields
 
 class ReadsetFilter(GenericFilter):
+    name = django_filters.CharFilter(field_name="name", method="batch_filter")
+    sample_name = django_filters.CharFilter(field_name="sample_name", method="batch_filter")
     number_reads__lte = django_filters.NumberFilter(method="number_reads_lte_filter")
     number_reads__gte = django_filters.NumberFilter(method="number_reads_gte_filter")
 
@@ -0,0 +1,27 @@
+from django.db.models import CharField, Field, Lookup, TextField
+from django.db.models.functions import Lower
+
+# Lookups registered when the app is ready (see FmsCoreConfig.ready).
+
+class AnyLookup(Lookup):
+    """
+    Matches the field against a list of values sent as a single array parameter (field = ANY(%s)), instead of a list of
+    parameters (field IN (%s, %s, ...)) or a chain of OR conditions. The statement is the same whatever the length of
+    the list, and the field index can be used. Use with the lower transform (field__lower__any) for case insensitive
+    matching with a lower(field) index.
+    """
+    lookup_name = "any"
+    prepare_rhs = False
+
+    def get_prep_lookup(self):
+        return [self.lhs.output_field.get_prep_value(value) for value in self.rhs]
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        values = [self.lhs.output_field.get_db_prep_value(value, connection, prepared=True) for value in self.rhs]
+        return f"{lhs} = ANY(%s)", (*lhs_params, values)
+
+def register_lookups():
+    Field.register_lookup(AnyLookup)
+    CharField.register_lookup(Lower)
+    TextField.register_lookup(Lower)
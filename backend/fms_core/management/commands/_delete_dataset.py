@@ -1,4 +1,5 @@
 from django.apps import apps
+from fms_core.services.readset import update_dataset_status_counters
 
 # Parameters required for this curation
 ACTION = "action"                         # = delete_dataset
@@ -17,6 +18,7 @@ USER_ID = "requester_user_id"             # The user id of the person requesting
 
 # This curation deletes all datasets listed as well as all related objects and report data tied to them. If a dataset is not found, it is skipped and the curation continues.
 # Make sure that an update_field_value is not the best solution first.
+# The readset status counters of the datasets and of their experiment runs are recomputed once the readsets are deleted.
 
 def delete_dataset(params, objects_to_delete, log):
     log.info("Action [" + str(params[CURATION_INDEX]) + "] Delete DatasetFile started.")
@@ -36,6 +38,7 @@ def delete_dataset(params, objects_to_delete, log):
         productiondata_model = apps.get_model("fms_report", "ProductionData")
         productiontracking_model = apps.get_model("fms_report", "ProductionTracking")
         count_deleted = 0
+        deleted_dataset_ids = []
         for dataset_id in dataset_ids_array:
             try:
                 dataset = dataset_model.objects.get(id=dataset_id)
@@ -57,12 +60,19 @@ def delete_dataset(params, objects_to_delete, log):
                 dataset.deleted = True
                 dataset.save(requester_id=user_id) # save using the id of the requester (using the default admin user if None)
                 objects_to_delete.append(dataset)  # Delay deletion until after the revision block so the object get a version
+                deleted_dataset_ids.append(dataset.id)
                 count_deleted += 1
             except dataset_model.DoesNotExist:
                 log.error(f"No dataset found for id [{dataset_id}].")
             except dataset_model.MultipleObjectsReturned:
                 log.error(f"Multiple datasets found for id [{dataset_id}]. Check database integrity.")
                 error_found = True
+        if deleted_dataset_ids:
+            # Readsets are gone : the datasets counters drop to 0 and the experiment runs counters only sum the remaining datasets
+            _, errors, _ = update_dataset_status_counters(deleted_dataset_ids)
+            for error in errors:
+                log.error(error)
+                error_found = True
     except LookupError:
         log.error("Model [Dataset] does not exist.")
         error_found = True
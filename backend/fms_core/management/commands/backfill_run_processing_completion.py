@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from fms_core.models import ExperimentRun
+from fms_core.services.experiment_run import update_run_processing_completion_time
+
+# This command recomputes the run processing completion time of experiment runs from their run processing end time
+# and their datasets (for example after datasets were deleted). It can be called using manage.py :
+# > python manage.py backfill_run_processing_completion
+# Use --experiment-run-ids to limit the update to specific experiment runs.
+
+DEFAULT_BATCH_SIZE = 100
+
+class Command(BaseCommand):
+    help = "Recompute the run processing completion time of experiment runs"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Number of experiment runs updated per transaction.")
+        parser.add_argument("--experiment-run-ids", type=int, nargs="+", help="Limit the update to the given experiment run ids.")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        if batch_size <= 0:
+            raise CommandError("Batch size must be greater than 0.")
+
+        experiment_runs_queryset = ExperimentRun.objects.order_by("id")
+        if options["experiment_run_ids"]:
+            experiment_runs_queryset = experiment_runs_queryset.filter(id__in=options["experiment_run_ids"])
+
+        updated_count = 0
+        last_id = 0
+        while True:
+            experiment_runs = list(experiment_runs_queryset.filter(id__gt=last_id)[:batch_size])
+            if not experiment_runs:
+                break
+            with transaction.atomic():
+                for experiment_run in experiment_runs:
+                    _, errors, _ = update_run_processing_completion_time(experiment_run)
+                    if errors:
+                        raise CommandError(f"Run processing completion update failed for experiment run {experiment_run.id}. {errors}")
+            updated_count += len(experiment_runs)
+            last_id = experiment_runs[-1].id
+            self.stdout.write(f"Updated run processing completion for {updated_count} experiment runs.")
+
+        self.stdout.write(self.style.SUCCESS(f"Run processing completion backfill completed for {updated_count} experiment runs."))
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from fms_core.models import Sample
+from fms_core.services.sample import update_sample_summary
+
+# This command recomputes the sample summary fields (derived sample count, pooled and library indicators, first project
+# and first biosample) from the derived by sample entries. It can be called using manage.py :
+# > python manage.py backfill_sample_summary
+# Use --sample-ids to limit the update to specific samples.
+
+DEFAULT_BATCH_SIZE = 1000
+
+class Command(BaseCommand):
+    help = "Recompute the denormalized sample summary fields from the derived by sample entries"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Number of samples updated per transaction.")
+        parser.add_argument("--sample-ids", type=int, nargs="+", help="Limit the update to the given sample ids.")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        if batch_size <= 0:
+            raise CommandError("Batch size must be greater than 0.")
+
+        sample_ids_queryset = Sample.objects.order_by("id").values_list("id", flat=True)
+        if options["sample_ids"]:
+            sample_ids_queryset = sample_ids_queryset.filter(id__in=options["sample_ids"])
+
+        updated_count = 0
+        last_id = 0
+        while True:
+            batch_ids = list(sample_ids_queryset.filter(id__gt=last_id)[:batch_size])
+            if not batch_ids:
+                break
+            with transaction.atomic():
+                samples = list(Sample.objects.filter(id__in=batch_ids).only("id"))
+                samples, errors, _ = update_sample_summary(samples)
+                if errors:
+                    raise CommandError(f"Sample summary update failed for samples {batch_ids[0]} to {batch_ids[-1]}. {errors}")
+            updated_count += len(samples)
+            last_id = batch_ids[-1]
+            self.stdout.write(f"Updated summary for {updated_count} samples.")
+
+        self.stdout.write(self.style.SUCCESS(f"Sample summary backfill completed for {updated_count} samples."))
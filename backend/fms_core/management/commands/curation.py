@@ -19,6 +19,8 @@ from ._delete_sample import delete_sample
 from ._delete_datasetfile import delete_datasetfile
 from ._delete_dataset import delete_dataset
 from ._create_entity import create_entity
+from fms_core.models import SampleNextStepByStudy
+from fms_core.services.sample_next_step import reconcile_study_step_counters
 
 # This curation module can be called using manage.py :
 # > python manage.py curation -p NameOfConfigFileWithoutExtension
@@ -131,6 +133,14 @@ class Command(BaseCommand):
                                 for object in objects_to_delete:
                                     log.info(f"Completing deletion of object {object.__class__.__name__} id [{object.id}].")
                                     object.delete()
+                            # Deleted sample queues bypass the workflow services, recompute the step counters of their studies
+                            study_ids = {object.study_id for object in objects_to_delete if isinstance(object, SampleNextStepByStudy)}
+                            if study_ids:
+                                _, errors, _ = reconcile_study_step_counters(list(study_ids))
+                                if errors:
+                                    log.error(f"Failed to reconcile the step counters of studies {sorted(study_ids)}: {errors}")
+                                    self.stdout.write(self.style.ERROR("Action [" + str(curation["curation_index"]) + "] failed."))
+                                    raise IntegrityError
                     self.stdout.write(self.style.SUCCESS("Completed curation."))
             except IntegrityError:
                 log.info("Curation operation transaction rolled back.")
@@ -0,0 +1,74 @@
+import json
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# This command measures the startup time of a fresh interpreter loading the application the way a worker does, to track
+# regressions (heavy module level imports, subprocesses). It can be called using manage.py :
+# > python manage.py measure_startup --repeat 5
+# Use --max-seconds to fail when the median total time exceeds a budget.
+
+DEFAULT_REPEAT = 3
+# Modules expected to be loaded only on first use
+DEFERRED_MODULES = ["pandas", "openpyxl", "numpy"]
+
+STARTUP_SCRIPT = """
+import json, os, sys, time
+start = time.perf_counter()
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", {settings_module!r})
+import django
+django.setup()
+setup_time = time.perf_counter()
+from django.urls import get_resolver
+get_resolver().url_patterns
+urls_time = time.perf_counter()
+print(json.dumps({{
+    "setup": setup_time - start,
+    "urls": urls_time - setup_time,
+    "total": urls_time - start,
+    "loaded_deferred_modules": [module for module in {deferred_modules!r} if module in sys.modules],
+}}))
+"""
+
+class Command(BaseCommand):
+    help = "Measure the time taken by a fresh interpreter to set up the application and load its urls (and viewsets)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Number of measured startups.")
+        parser.add_argument("--max-seconds", type=float, default=None, help="Fail if the median total startup time is above this value.")
+        parser.add_argument("--json", action="store_true", help="Output the measures as json.")
+
+    def measure(self):
+        script = STARTUP_SCRIPT.format(settings_module=settings.SETTINGS_MODULE, deferred_modules=DEFERRED_MODULES)
+        process = subprocess.run([sys.executable, "-c", script], stdout=subprocess.PIPE, stderr=subprocess.PIPE, encoding="UTF-8", cwd=settings.BASE_DIR)
+        if process.returncode != 0:
+            raise CommandError(f"Application startup failed. {process.stderr}")
+        return json.loads(process.stdout.strip().splitlines()[-1])
+
+    def handle(self, *args, **options):
+        if options["repeat"] <= 0:
+            raise CommandError("Repeat must be greater than 0.")
+
+        measures = [self.measure() for _ in range(options["repeat"])]
+        summary = {
+            step: {
+                "median": statistics.median(measure[step] for measure in measures),
+                "min": min(measure[step] for measure in measures),
+                "max": max(measure[step] for measure in measures),
+            } for step in ["setup", "urls", "total"]
+        }
+        summary["loaded_deferred_modules"] = sorted(set(module for measure in measures for module in measure["loaded_deferred_modules"]))
+
+        if options["json"]:
+            self.stdout.write(json.dumps(summary, indent=4))
+        else:
+            for step in ["setup", "urls", "total"]:
+                self.stdout.write(f"{step:<6}: median {summary[step]['median']:.3f}s (min {summary[step]['min']:.3f}s, max {summary[step]['max']:.3f}s)")
+            if summary["loaded_deferred_modules"]:
+                self.stdout.write(self.style.WARNING(f"Modules loaded at startup that should be deferred : {', '.join(summary['loaded_deferred_modules'])}."))
+
+        if options["max_seconds"] is not None and summary["total"]["median"] > options["max_seconds"]:
+            raise CommandError(f"Median startup time {summary['total']['median']:.3f}s exceeds {options['max_seconds']}s.")
@@ -0,0 +1,64 @@
+from django.core.management.base import BaseCommand
+from os.path import expanduser
+import os
+import time
+import platform
+import datetime
+import logging
+
+from fms_core.services.import_job import process_import_job_queue, RUNNING_JOB_TIMEOUT
+
+# This background template import worker can be called using manage.py :
+# > python manage.py process_import_jobs
+# Without --loop, the queued import jobs are run and the command exits (suited for cron). With --loop, the command keeps
+# polling the queue.
+
+# constants
+HOME = expanduser("~")
+LOG_PATH = "/log/"
+LOG_NAME = "import_jobs"
+SERVER_PLATFORM = "Linux"  # Platform for the server
+SERVER_TZ = "America/Montreal"  # Local timezone
+DEFAULT_POLL_INTERVAL = 5 # seconds
+
+class Command(BaseCommand):
+    help = 'Run the template imports submitted to run in the background'
+
+    def add_arguments(self, parser):
+        parser.add_argument("--loop", action="store_true", help="Keep polling the queue instead of exiting once it is empty.")
+        parser.add_argument("--interval", type=int, default=DEFAULT_POLL_INTERVAL, help="Seconds to wait between polls when looping.")
+        parser.add_argument("--running-timeout", type=int, default=int(RUNNING_JOB_TIMEOUT.total_seconds() // 60),
+                            help="Minutes after which a running job left by a stopped worker is failed.")
+
+    def init_logging(self, log_name):
+        path = HOME + LOG_PATH
+        if not os.path.exists(path):
+            os.makedirs(path)
+        filename = path + log_name + ".log"
+        formatter = logging.Formatter("%(asctime)s || %(levelname)s || %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
+        handler = logging.FileHandler(filename, "a+")
+        handler.setFormatter(formatter)
+        log = logging.getLogger(log_name)
+        log.setLevel(logging.DEBUG)
+        log.addHandler(handler)
+        return log
+
+    def handle(self, *args, **options):
+        if platform.system() == SERVER_PLATFORM:
+            os.environ["TZ"] = SERVER_TZ
+            time.tzset()
+        log = self.init_logging(LOG_NAME)
+
+        while True:
+            try:
+                processed_count = process_import_job_queue(log, datetime.timedelta(minutes=options["running_timeout"]))
+                if processed_count:
+                    self.stdout.write(self.style.SUCCESS(f"Ran {processed_count} import jobs."))
+            except Exception as err:
+                self.stdout.write(self.style.ERROR(f"Import job processing interrupted. {err}"))
+                log.error(f"Import job processing interrupted. {err}")
+                if not options["loop"]:
+                    raise err
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
@@ -0,0 +1,67 @@
+from django.core.management.base import BaseCommand
+from os.path import expanduser
+import os
+import time
+import platform
+import logging
+
+from fms_core.services.trigger_file import process_trigger_file_queue, DEFAULT_TRIGGER_FILE_BATCH_SIZE, DEFAULT_TRIGGER_FILE_MAX_ATTEMPTS
+
+# This trigger file writer can be called using manage.py :
+# > python manage.py process_trigger_files
+# Without --loop, the pending trigger files are written and the command exits (suited for cron). With --loop, the command
+# keeps polling the outbox.
+
+# constants
+HOME = expanduser("~")
+LOG_PATH = "/log/"
+LOG_NAME = "trigger_files"
+SERVER_PLATFORM = "Linux"  # Platform for the server
+SERVER_TZ = "America/Montreal"  # Local timezone
+DEFAULT_POLL_INTERVAL = 5 # seconds
+
+class Command(BaseCommand):
+    help = 'Write the pending run info, validation info and release info trigger files'
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_TRIGGER_FILE_BATCH_SIZE, help="Number of trigger files locked per transaction.")
+        parser.add_argument("--max-attempts", type=int, default=DEFAULT_TRIGGER_FILE_MAX_ATTEMPTS, help="Number of failed attempts after which a trigger file is no longer retried.")
+        parser.add_argument("--loop", action="store_true", help="Keep polling the outbox instead of exiting once it is empty.")
+        parser.add_argument("--interval", type=int, default=DEFAULT_POLL_INTERVAL, help="Seconds to wait between polls when looping.")
+
+    def init_logging(self, log_name):
+        path = HOME + LOG_PATH
+        if not os.path.exists(path):
+            os.makedirs(path)
+        filename = path + log_name + ".log"
+        formatter = logging.Formatter("%(asctime)s || %(levelname)s || %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
+        handler = logging.FileHandler(filename, "a+")
+        handler.setFormatter(formatter)
+        log = logging.getLogger(log_name)
+        log.setLevel(logging.DEBUG)
+        log.addHandler(handler)
+        return log
+
+    def handle(self, *args, **options):
+        if platform.system() == SERVER_PLATFORM:
+            os.environ["TZ"] = SERVER_TZ
+            time.tzset()
+        log = self.init_logging(LOG_NAME)
+
+        while True:
+            try:
+                written_count, failed_count = process_trigger_file_queue(log, batch_size=options["batch_size"], max_attempts=options["max_attempts"])
+                if written_count:
+                    self.stdout.write(self.style.SUCCESS(f"Wrote {written_count} trigger files."))
+                    log.info(f"Wrote {written_count} trigger files.")
+                if failed_count:
+                    # Failed trigger files stay pending and are retried on the next poll, up to the maximum number of attempts.
+                    self.stdout.write(self.style.ERROR(f"Failed to write {failed_count} trigger files."))
+            except Exception as err:
+                self.stdout.write(self.style.ERROR(f"Trigger file processing interrupted. {err}"))
+                log.error(f"Trigger file processing interrupted. {err}")
+                if not options["loop"]:
+                    raise err
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from fms_core.models import Study
+from fms_core.services.sample_next_step import reconcile_study_step_counters
+
+# This command recomputes the study step counters (queued and completed samples by study step) from the samples queued
+# to the study workflows and the step histories. It can be called using manage.py :
+# > python manage.py reconcile_study_step_counters
+# Use --study-ids to limit the update to specific studies.
+
+DEFAULT_BATCH_SIZE = 100
+
+class Command(BaseCommand):
+    help = "Recompute the study step counters from the queued samples and the step histories"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Number of studies updated per transaction.")
+        parser.add_argument("--study-ids", type=int, nargs="+", help="Limit the update to the given study ids.")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        if batch_size <= 0:
+            raise CommandError("Batch size must be greater than 0.")
+
+        study_ids_queryset = Study.objects.order_by("id").values_list("id", flat=True)
+        if options["study_ids"]:
+            study_ids_queryset = study_ids_queryset.filter(id__in=options["study_ids"])
+
+        updated_count = 0
+        last_id = 0
+        while True:
+            batch_ids = list(study_ids_queryset.filter(id__gt=last_id)[:batch_size])
+            if not batch_ids:
+                break
+            with transaction.atomic():
+                _, errors, _ = reconcile_study_step_counters(batch_ids)
+                if errors:
+                    raise CommandError(f"Study step counters reconciliation failed for studies {batch_ids[0]} to {batch_ids[-1]}. {errors}")
+            updated_count += len(batch_ids)
+            last_id = batch_ids[-1]
+            self.stdout.write(f"Reconciled step counters for {updated_count} studies.")
+
+        self.stdout.write(self.style.SUCCESS(f"Study step counters reconciliation completed for {updated_count} studies."))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from fms.info import stamp_build_info, BUILD_INFO_PATH
+
+# This command writes the commit information to the build info file, so that workers do not query git when they start.
+# It is called at deployment, after checking out the release, using manage.py :
+# > python manage.py stamp_build_info
+
+class Command(BaseCommand):
+    help = "Stamp the commit information read by the application at startup"
+
+    def handle(self, *args, **options):
+        build_info = stamp_build_info()
+        if not build_info["commit_full_hash"]:
+            self.stdout.write(self.style.WARNING("Commit information could not be read from git."))
+        self.stdout.write(self.style.SUCCESS(f"Build info stamped in {BUILD_INFO_PATH} ({build_info['commit_tagged_version'] or build_info['commit_small_hash']})."))
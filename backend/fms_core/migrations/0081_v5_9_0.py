@@ -0,0 +1,65 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('fms_core', '0080_v5_8_0'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sample',
+            name='derived_sample_count',
+            field=models.PositiveIntegerField(default=0, help_text='Number of derived samples contained in the sample.'),
+        ),
+        migrations.AddField(
+            model_name='sample',
+            name='is_pooled',
+            field=models.BooleanField(default=False, help_text='Whether the sample is a pool (or a fraction of a pool).'),
+        ),
+        migrations.AddField(
+            model_name='sample',
+            name='has_library',
+            field=models.BooleanField(default=False, help_text='Whether the sample contains at least one library.'),
+        ),
+        migrations.AddField(
+            model_name='sample',
+            name='first_project',
+            field=models.ForeignKey(blank=True, help_text='Project of the first derived sample of the sample.', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='first_project_samples', to='fms_core.project'),
+        ),
+        migrations.AddField(
+            model_name='sample',
+            name='first_biosample',
+            field=models.ForeignKey(blank=True, help_text='Biosample of the first derived sample of the sample.', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='first_biosample_samples', to='fms_core.biosample'),
+        ),
+        migrations.AddIndex(
+            model_name='sample',
+            index=models.Index(fields=['is_pooled'], name='sample_ispooled_idx'),
+        ),
+        # Initialize the sample summary from the existing derived by sample entries in a single statement.
+        migrations.RunSQL(
+            """
+                WITH summary AS (
+                    SELECT dbs.sample_id,
+                           COUNT(*) AS derived_sample_count,
+                           BOOL_OR(ds.library_id IS NOT NULL) AS has_library,
+                           (ARRAY_AGG(dbs.volume_ratio ORDER BY dbs.id))[1] AS first_volume_ratio,
+                           (ARRAY_AGG(dbs.project_id ORDER BY dbs.id))[1] AS first_project_id,
+                           (ARRAY_AGG(ds.biosample_id ORDER BY dbs.id))[1] AS first_biosample_id
+                    FROM fms_core_derivedbysample AS dbs
+                    JOIN fms_core_derivedsample AS ds ON ds.id = dbs.derived_sample_id
+                    GROUP BY dbs.sample_id
+                )
+                UPDATE fms_core_sample AS sample
+                SET derived_sample_count = summary.derived_sample_count,
+                    is_pooled = (summary.derived_sample_count > 1 OR summary.first_volume_ratio < 1),
+                    has_library = summary.has_library,
+                    first_project_id = summary.first_project_id,
+                    first_biosample_id = summary.first_biosample_id
+                FROM summary
+                WHERE sample.id = summary.sample_id;
+            """,
+            migrations.RunSQL.noop
+        ),
+    ]
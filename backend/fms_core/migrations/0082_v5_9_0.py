@@ -0,0 +1,34 @@
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('fms_core', '0081_v5_9_0'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='biosample',
+            name='metadata_values',
+            field=models.JSONField(blank=True, default=dict, help_text='Metadata of the biosample as a name to value dictionary.'),
+        ),
+        migrations.AddIndex(
+            model_name='biosample',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['metadata_values'], name='biosample_metadatavalues_idx'),
+        ),
+        # Initialize the metadata projection from the existing sample metadata.
+        migrations.RunSQL(
+            """
+                UPDATE fms_core_biosample AS biosample
+                SET metadata_values = metadata.metadata_values
+                FROM (
+                    SELECT biosample_id, JSONB_OBJECT_AGG(name, value) AS metadata_values
+                    FROM fms_core_samplemetadata
+                    GROUP BY biosample_id
+                ) AS metadata
+                WHERE biosample.id = metadata.biosample_id;
+            """,
+            migrations.RunSQL.noop
+        ),
+    ]
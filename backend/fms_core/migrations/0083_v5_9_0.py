@@ -0,0 +1,47 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('fms_core', '0082_v5_9_0'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='experimentrun',
+            name='run_processing_completion_time',
+            field=models.DateTimeField(blank=True, null=True, help_text='Time at which the run processing is considered complete (run processing end time or creation of the dataset of the last lane). Null if the run processing is not complete.'),
+        ),
+        migrations.AddIndex(
+            model_name='experimentrun',
+            index=models.Index(fields=['run_processing_completion_time'], name='exprun_runproccompletion_idx'),
+        ),
+        # Initialize the run processing completion time from the run processing end time or the datasets of each run.
+        migrations.RunSQL(
+            """
+                WITH dataset_summary AS (
+                    SELECT dataset.experiment_run_id,
+                           COUNT(DISTINCT dataset.lane) AS lane_processed_count,
+                           (ARRAY_AGG(dataset.created_at ORDER BY dataset.id DESC))[1] AS last_dataset_created_at
+                    FROM fms_core_dataset AS dataset
+                    WHERE dataset.experiment_run_id IS NOT NULL
+                    GROUP BY dataset.experiment_run_id
+                ),
+                lane_summary AS (
+                    SELECT sample.container_id, COUNT(*) AS lane_count
+                    FROM fms_core_sample AS sample
+                    GROUP BY sample.container_id
+                )
+                UPDATE fms_core_experimentrun AS experimentrun
+                SET run_processing_completion_time = COALESCE(
+                    experimentrun.run_processing_end_time,
+                    (SELECT dataset_summary.last_dataset_created_at
+                     FROM dataset_summary
+                     LEFT JOIN lane_summary ON lane_summary.container_id = experimentrun.container_id
+                     WHERE dataset_summary.experiment_run_id = experimentrun.id
+                       AND dataset_summary.lane_processed_count = COALESCE(lane_summary.lane_count, 0))
+                );
+            """,
+            migrations.RunSQL.noop
+        ),
+    ]
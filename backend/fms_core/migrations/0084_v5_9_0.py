@@ -0,0 +1,50 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('fms_core', '0083_v5_9_0'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SampleAncestry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('depth', models.PositiveIntegerField(help_text='Number of lineages between the sample and its ancestor (1 for the parent).')),
+                ('sample', models.ForeignKey(help_text='Descendant sample.', on_delete=django.db.models.deletion.CASCADE, related_name='ancestries', to='fms_core.sample')),
+                ('derived_sample', models.ForeignKey(help_text='Derived sample followed from the sample to its ancestor.', on_delete=django.db.models.deletion.CASCADE, related_name='sample_ancestries', to='fms_core.derivedsample')),
+                ('ancestor', models.ForeignKey(help_text='Ancestor sample.', on_delete=django.db.models.deletion.CASCADE, related_name='descendant_ancestries', to='fms_core.sample')),
+                ('protocol', models.ForeignKey(blank=True, help_text='Protocol of the process applied to the ancestor on the path to the sample.', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='sample_ancestries', to='fms_core.protocol')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['ancestor'], name='sampleancestry_ancestor_idx')],
+                'constraints': [models.UniqueConstraint(fields=('sample_id', 'derived_sample_id', 'ancestor_id'), name='sampleancestry_sample_derivedsample_ancestor_key')],
+            },
+        ),
+        # Initialize the sample ancestry from the existing sample lineages in a single recursive statement.
+        migrations.RunSQL(
+            """
+                WITH RECURSIVE ancestry(sample_id, derived_sample_id, ancestor_id, depth, protocol_id) AS (
+                    SELECT lineage.child_id, dbs.derived_sample_id, lineage.parent_id, 1, process.protocol_id
+                    FROM fms_core_samplelineage AS lineage
+                    JOIN fms_core_derivedbysample AS dbs ON dbs.sample_id = lineage.parent_id
+                    JOIN fms_core_processmeasurement AS pm ON pm.id = lineage.process_measurement_id
+                    JOIN fms_core_process AS process ON process.id = pm.process_id
+                    UNION ALL
+                    SELECT ancestry.sample_id, ancestry.derived_sample_id, lineage.parent_id, ancestry.depth + 1, process.protocol_id
+                    FROM ancestry
+                    JOIN fms_core_samplelineage AS lineage ON lineage.child_id = ancestry.ancestor_id
+                    JOIN fms_core_derivedbysample AS dbs ON dbs.sample_id = lineage.parent_id AND dbs.derived_sample_id = ancestry.derived_sample_id
+                    JOIN fms_core_processmeasurement AS pm ON pm.id = lineage.process_measurement_id
+                    JOIN fms_core_process AS process ON process.id = pm.process_id
+                )
+                INSERT INTO fms_core_sampleancestry (sample_id, derived_sample_id, ancestor_id, depth, protocol_id)
+                SELECT sample_id, derived_sample_id, ancestor_id, MIN(depth), (ARRAY_AGG(protocol_id ORDER BY depth))[1]
+                FROM ancestry
+                GROUP BY sample_id, derived_sample_id, ancestor_id;
+            """,
+            migrations.RunSQL.noop
+        ),
+    ]
@@ -0,0 +1,115 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('fms_core', '0084_v5_9_0'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataset',
+            name='readset_count',
+            field=models.PositiveIntegerField(default=0, help_text='Number of readsets of the dataset.'),
+        ),
+        migrations.AddField(
+            model_name='dataset',
+            name='released_status_count',
+            field=models.PositiveIntegerField(default=0, help_text='Number of released readsets of the dataset.'),
+        ),
+        migrations.AddField(
+            model_name='dataset',
+            name='blocked_status_count',
+            field=models.PositiveIntegerField(default=0, help_text='Number of blocked readsets of the dataset.'),
+        ),
+        migrations.AddField(
+            model_name='dataset',
+            name='unreleased_count',
+            field=models.PositiveIntegerField(default=0, help_text='Number of readsets of the dataset without release status.'),
+        ),
+        migrations.AddField(
+            model_name='dataset',
+            name='unvalidated_count',
+            field=models.PositiveIntegerField(default=0, help_text='Number of readsets of the dataset without validation status.'),
+        ),
+        migrations.AddField(
+            model_name='dataset',
+            name='latest_release_update',
+            field=models.DateTimeField(blank=True, null=True, help_text='Latest release status change of the readsets of the dataset.'),
+        ),
+        migrations.AddField(
+            model_name='dataset',
+            name='latest_validation_update',
+            field=models.DateTimeField(blank=True, null=True, help_text='Latest validation status change of the readsets of the dataset.'),
+        ),
+        migrations.AddIndex(
+            model_name='dataset',
+            index=models.Index(fields=['latest_release_update'], name='dataset_latestrelupdate_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dataset',
+            index=models.Index(fields=['latest_validation_update'], name='dataset_latestvalidupdate_idx'),
+        ),
+        migrations.AddField(
+            model_name='experimentrun',
+            name='readset_count',
+            field=models.PositiveIntegerField(default=0, help_text='Number of readsets of the experiment run.'),
+        ),
+        migrations.AddField(
+            model_name='experimentrun',
+            name='unreleased_readset_count',
+            field=models.PositiveIntegerField(default=0, help_text='Number of readsets of the experiment run without release status.'),
+        ),
+        migrations.AddField(
+            model_name='experimentrun',
+            name='unvalidated_readset_count',
+            field=models.PositiveIntegerField(default=0, help_text='Number of readsets of the experiment run without validation status.'),
+        ),
+        migrations.AddIndex(
+            model_name='experimentrun',
+            index=models.Index(fields=['unvalidated_readset_count', 'unreleased_readset_count'], name='exprun_readsetstatus_idx'),
+        ),
+        # Initialize the dataset and experiment run readset status counters from the existing readsets.
+        migrations.RunSQL(
+            """
+                WITH counters AS (
+                    SELECT readset.dataset_id,
+                           COUNT(*) AS readset_count,
+                           COUNT(*) FILTER (WHERE readset.release_status = 1) AS released_status_count,
+                           COUNT(*) FILTER (WHERE readset.release_status = 2) AS blocked_status_count,
+                           COUNT(*) FILTER (WHERE readset.release_status = 0) AS unreleased_count,
+                           COUNT(*) FILTER (WHERE readset.validation_status = 0) AS unvalidated_count,
+                           MAX(readset.release_status_timestamp) AS latest_release_update,
+                           MAX(readset.validation_status_timestamp) AS latest_validation_update
+                    FROM fms_core_readset AS readset
+                    GROUP BY readset.dataset_id
+                )
+                UPDATE fms_core_dataset AS dataset
+                SET readset_count = counters.readset_count,
+                    released_status_count = counters.released_status_count,
+                    blocked_status_count = counters.blocked_status_count,
+                    unreleased_count = counters.unreleased_count,
+                    unvalidated_count = counters.unvalidated_count,
+                    latest_release_update = counters.latest_release_update,
+                    latest_validation_update = counters.latest_validation_update
+                FROM counters
+                WHERE dataset.id = counters.dataset_id;
+
+                WITH counters AS (
+                    SELECT dataset.experiment_run_id,
+                           SUM(dataset.readset_count) AS readset_count,
+                           SUM(dataset.unreleased_count) AS unreleased_readset_count,
+                           SUM(dataset.unvalidated_count) AS unvalidated_readset_count
+                    FROM fms_core_dataset AS dataset
+                    GROUP BY dataset.experiment_run_id
+                )
+                UPDATE fms_core_experimentrun AS experimentrun
+                SET readset_count = counters.readset_count,
+                    unreleased_readset_count = counters.unreleased_readset_count,
+                    unvalidated_readset_count = counters.unvalidated_readset_count
+                FROM counters
+                WHERE experimentrun.id = counters.experiment_run_id;
+            """,
+            migrations.RunSQL.noop
+        ),
+    ]
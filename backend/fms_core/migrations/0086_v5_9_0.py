@@ -0,0 +1,26 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('fms_core', '0085_v5_9_0'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TriggerFile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('type', models.CharField(choices=[('RUN_INFO', 'Run info'), ('VALIDATION_INFO', 'Validation info'), ('RELEASE_INFO', 'Release info')], help_text='Type of trigger file.', max_length=20)),
+                ('file_path', models.CharField(help_text='Destination path of the trigger file.', max_length=4096)),
+                ('content', models.JSONField(help_text='Content of the trigger file.')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='Timestamp the trigger file was queued.')),
+                ('written_at', models.DateTimeField(blank=True, help_text='Timestamp the trigger file was written. Empty while pending.', null=True)),
+                ('attempt_count', models.PositiveIntegerField(default=0, help_text='Number of failed attempts to write the trigger file.')),
+                ('last_error', models.TextField(blank=True, help_text='Error of the last failed attempt to write the trigger file.')),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('written_at__isnull', True)), fields=['id'], name='triggerfile_pending_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('fms_core', '0086_v5_9_0'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('importer', models.CharField(help_text='Dotted path of the importer class used for the submission.', max_length=200)),
+                ('file_name', models.CharField(help_text='Name of the submitted template file.', max_length=500)),
+                ('file_path', models.CharField(help_text='Path of the submitted template file kept for the job.', max_length=4096)),
+                ('status', models.CharField(choices=[('QUEUED', 'Queued'), ('RUNNING', 'Running'), ('SUCCEEDED', 'Succeeded'), ('FAILED', 'Failed')], default='QUEUED', help_text='Status of the job.', max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='Timestamp the job was queued.')),
+                ('started_at', models.DateTimeField(blank=True, help_text='Timestamp the job started.', null=True)),
+                ('completed_at', models.DateTimeField(blank=True, help_text='Timestamp the job completed.', null=True)),
+                ('row_count', models.PositiveIntegerField(default=0, help_text='Number of template rows to handle.')),
+                ('processed_row_count', models.PositiveIntegerField(default=0, help_text='Number of template rows handled.')),
+                ('result', models.JSONField(blank=True, help_text='Result of the template import.', null=True)),
+                ('output_file_path', models.CharField(blank=True, help_text='Path of the output file produced by the import.', max_length=4096)),
+                ('error', models.TextField(blank=True, help_text='Error that interrupted the job.')),
+                ('created_by', models.ForeignKey(help_text='User that submitted the template.', on_delete=django.db.models.deletion.PROTECT, related_name='import_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('status', 'QUEUED')), fields=['id'], name='importjob_queued_idx'),
+                            models.Index(fields=['created_by', 'created_at'], name='importjob_createdby_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,91 @@
+import datetime
+import math
+import re
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+BATCH_SIZE = 5000
+TEXT_KEY_LENGTH = 200
+NUMERIC_REGEX = re.compile(r"^[+-]?(\d+(\.\d*)?|\.\d+)([eE][+-]?\d+)?$")
+DATE_REGEX = re.compile(r"^\d{4}-\d{2}-\d{2}")
+
+def typed_fields(value):
+    text = value.strip() if isinstance(value, str) else ("" if value is None else str(value))
+    numeric_value = None
+    if not isinstance(value, bool) and NUMERIC_REGEX.match(text):
+        numeric_value = float(text)
+        if not math.isfinite(numeric_value):
+            numeric_value = None
+    date_value = None
+    if DATE_REGEX.match(text):
+        try:
+            date_value = datetime.datetime.fromisoformat(text).date()
+        except ValueError:
+            pass
+    return dict(numeric_value=numeric_value, date_value=date_value, text_value=text, text_key=text[:TEXT_KEY_LENGTH].lower())
+
+def initialize_typed_property_values(apps, schema_editor):
+    ContentType = apps.get_model("contenttypes", "ContentType")
+    PropertyValue = apps.get_model("fms_core", "PropertyValue")
+    TypedPropertyValue = apps.get_model("fms_core", "TypedPropertyValue")
+    Process = apps.get_model("fms_core", "Process")
+    ProcessMeasurement = apps.get_model("fms_core", "ProcessMeasurement")
+
+    content_type_ids = dict(ContentType.objects.filter(app_label="fms_core", model__in=["process", "processmeasurement"]).values_list("model", "id"))
+    last_id = 0
+    while True:
+        property_values = list(PropertyValue.objects.filter(id__gt=last_id).order_by("id").values("id", "property_type_id", "content_type_id", "object_id", "value")[:BATCH_SIZE])
+        if not property_values:
+            break
+        object_ids = [property_value["object_id"] for property_value in property_values]
+        # Property values of deleted objects are not projected
+        process_ids = set(Process.objects.filter(id__in=object_ids).values_list("id", flat=True))
+        process_measurement_ids = set(ProcessMeasurement.objects.filter(id__in=object_ids).values_list("id", flat=True))
+        typed_property_values = []
+        for property_value in property_values:
+            is_process = property_value["content_type_id"] == content_type_ids.get("process") and property_value["object_id"] in process_ids
+            is_process_measurement = (property_value["content_type_id"] == content_type_ids.get("processmeasurement")
+                                      and property_value["object_id"] in process_measurement_ids)
+            if is_process or is_process_measurement:
+                typed_property_values.append(TypedPropertyValue(property_value_id=property_value["id"],
+                                                                property_type_id=property_value["property_type_id"],
+                                                                process_id=property_value["object_id"] if is_process else None,
+                                                                process_measurement_id=property_value["object_id"] if is_process_measurement else None,
+                                                                **typed_fields(property_value["value"])))
+        TypedPropertyValue.objects.bulk_create(typed_property_values)
+        last_id = property_values[-1]["id"]
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('fms_core', '0087_v5_9_0'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TypedPropertyValue',
+            fields=[
+                ('property_value', models.OneToOneField(help_text='Property value projected.', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='typed_value', serialize=False, to='fms_core.propertyvalue')),
+                ('numeric_value', models.FloatField(blank=True, help_text='Value as a number, if it is numeric.', null=True)),
+                ('date_value', models.DateField(blank=True, help_text='Value as a date, if it is an ISO date.', null=True)),
+                ('text_value', models.TextField(blank=True, help_text='Value as text.')),
+                ('text_key', models.CharField(blank=True, help_text='Lowercase start of the text value, for indexed lookups.', max_length=200)),
+                ('process', models.ForeignKey(blank=True, help_text='Process described by the property value.', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='typed_property_values', to='fms_core.process')),
+                ('process_measurement', models.ForeignKey(blank=True, help_text='Process measurement described by the property value.', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='typed_property_values', to='fms_core.processmeasurement')),
+                ('property_type', models.ForeignKey(help_text='Property type.', on_delete=django.db.models.deletion.CASCADE, related_name='typed_values', to='fms_core.propertytype')),
+            ],
+            options={
+                'indexes': [
+                    models.Index(fields=['property_type', 'process_measurement'], name='typedpv_measurement_idx'),
+                    models.Index(fields=['property_type', 'process'], name='typedpv_process_idx'),
+                    models.Index(fields=['property_type', 'numeric_value'], name='typedpv_numeric_idx'),
+                    models.Index(fields=['property_type', 'date_value'], name='typedpv_date_idx'),
+                    models.Index(fields=['property_type', 'text_key'], name='typedpv_text_idx'),
+                ],
+            },
+        ),
+        # Initialize the projection from the existing property values.
+        migrations.RunPython(initialize_typed_property_values, reverse_code=migrations.RunPython.noop),
+    ]
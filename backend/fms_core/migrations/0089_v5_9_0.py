@@ -0,0 +1,23 @@
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('fms_core', '0088_v5_9_0'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(django.db.models.functions.text.Lower('name'), name='project_name_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='readset',
+            index=models.Index(fields=['name'], name='readset_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='readset',
+            index=models.Index(fields=['sample_name'], name='readset_samplename_idx'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('fms_core', '0089_v5_9_0'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudyStepCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('queued_count', models.IntegerField(default=0, help_text='Number of samples currently queued to the step of the study.')),
+                ('completed_count', models.IntegerField(default=0, help_text='Number of step history entries recorded for the step of the study.')),
+                ('study', models.ForeignKey(help_text='Study of the counted step.', on_delete=django.db.models.deletion.CASCADE, related_name='step_counters', to='fms_core.study')),
+                ('step_order', models.ForeignKey(help_text='Step order of the study workflow.', on_delete=django.db.models.deletion.CASCADE, related_name='study_step_counters', to='fms_core.steporder')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('study', 'step_order'), name='studystepcounter_study_steporder_key')],
+            },
+        ),
+        # Initialize the counters from the existing queues and step histories.
+        migrations.RunSQL(
+            """
+                INSERT INTO fms_core_studystepcounter (study_id, step_order_id, queued_count, completed_count)
+                SELECT study_id, step_order_id, SUM(queued_count), SUM(completed_count)
+                FROM (
+                    SELECT study_id, step_order_id, COUNT(*) AS queued_count, 0 AS completed_count
+                    FROM fms_core_samplenextstepbystudy
+                    GROUP BY study_id, step_order_id
+                    UNION ALL
+                    SELECT study_id, step_order_id, 0 AS queued_count, COUNT(*) AS completed_count
+                    FROM fms_core_stephistory
+                    GROUP BY study_id, step_order_id
+                ) AS counts
+                GROUP BY study_id, step_order_id;
+            """,
+            migrations.RunSQL.noop
+        ),
+    ]
@@ -0,0 +1,18 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('fms_core', '0090_v5_9_0'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='sampleidentitymatch',
+            index=models.Index(fields=['tested', 'matching_site_ratio'], name='identitymatch_tested_ratio_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sampleidentitymatch',
+            index=models.Index(fields=['matched', 'matching_site_ratio'], name='identitymatch_match_ratio_idx'),
+        ),
+    ]
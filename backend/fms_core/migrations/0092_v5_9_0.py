@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('fms_core', '0091_v5_9_0'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecentWrite',
+            fields=[
+                ('user', models.OneToOneField(help_text='User that wrote to the database.', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='recent_write', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('written_at', models.DateTimeField(help_text='Timestamp of the last write of the user.')),
+            ],
+        ),
+    ]
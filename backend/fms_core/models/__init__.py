@@ -8,6 +8,10 @@ from .individual import Individual
 from .sample import Sample
 from .sample_kind import SampleKind
 from .sample_lineage import SampleLineage
+from .sample_ancestry import SampleAncestry
+from .trigger_file import TriggerFile
+from .import_job import ImportJob
+from .recent_write import RecentWrite
 from .protocol import Protocol
 from .process import Process
 from .process_measurement import ProcessMeasurement
@@ -18,6 +22,7 @@ from .run_type import RunType
 from .experiment_run import ExperimentRun
 from .property_type import PropertyType
 from .property_value import PropertyValue
+from .typed_property_value import TypedPropertyValue
 from .project import Project
 from .index import Index
 from .index_set import IndexSet
@@ -42,6 +47,7 @@ from .study import Study
 from .sample_next_step import SampleNextStep
 from .step_history import StepHistory
 from .sample_next_step_by_study import SampleNextStepByStudy
+from .study_step_counter import StudyStepCounter
 from .coordinate import Coordinate
 from .metric import Metric
 from .readset import Readset
@@ -64,6 +70,10 @@ __all__ = [
     "Sample",
     "SampleKind",
     "SampleLineage",
+    "SampleAncestry",
+    "TriggerFile",
+    "ImportJob",
+    "RecentWrite",
     "SampleMetadata",
     "Protocol",
     "Process",
@@ -75,6 +85,7 @@ __all__ = [
     "ExperimentRun",
     "PropertyType",
     "PropertyValue",
+    "TypedPropertyValue",
     "Project",
     "Index",
     "IndexSet",
@@ -98,6 +109,7 @@ __all__ = [
     "SampleNextStep",
     "StepHistory",
     "SampleNextStepByStudy",
+    "StudyStepCounter",
     "Coordinate",
     "Metric",
     "Readset",
@@ -37,6 +37,17 @@ class ValidationStatus(models.IntegerChoices):
     PASSED = 1
     FAILED = 2
 
+class ImportJobStatus(models.TextChoices):
+    QUEUED = "QUEUED", "Queued"
+    RUNNING = "RUNNING", "Running"
+    SUCCEEDED = "SUCCEEDED", "Succeeded"
+    FAILED = "FAILED", "Failed"
+
+class TriggerFileType(models.TextChoices):
+    RUN_INFO = "RUN_INFO", "Run info"
+    VALIDATION_INFO = "VALIDATION_INFO", "Validation info"
+    RELEASE_INFO = "RELEASE_INFO", "Release info"
+
 class SampleType(models.TextChoices):
     ANY = "ANY", "Any"
     UNEXTRACTED_SAMPLE = "UNEXTRACTED_SAMPLE", "Unextracted sample"
@@ -1,5 +1,6 @@
 import reversion
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex
 from django.core.exceptions import ValidationError
 from typing import Optional
 
@@ -19,6 +20,13 @@ class Biosample(TrackedModel):
     individual = models.ForeignKey("Individual", blank=True, null=True, on_delete=models.PROTECT,
                                    related_name="biosamples", help_text="Individual associated with the biosample.")
     collection_site = models.CharField(null=True, blank=True, max_length=200, help_text="The facility designated for the collection of samples.")
+    # Projection of the SampleMetadata entries of the biosample, maintained by the sample metadata services.
+    metadata_values = models.JSONField(default=dict, blank=True, help_text="Metadata of the biosample as a name to value dictionary.")
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['metadata_values'], name='biosample_metadatavalues_idx'),
+        ]
 
     # Computed properties for individuals
 
@@ -17,11 +17,23 @@ class Dataset(TrackedModel):
     lane = models.PositiveIntegerField(help_text="Coordinates of the lane in a container")
     metric_report_url = models.CharField(null=True, blank=True, max_length=STANDARD_FILE_PATH_LENGTH, help_text="URL to the run processing metrics report.")
     archived_comments = GenericRelation(ArchivedComment)
+    # Readset status counters, maintained by the readset services (see update_dataset_status_counters)
+    readset_count = models.PositiveIntegerField(default=0, help_text="Number of readsets of the dataset.")
+    released_status_count = models.PositiveIntegerField(default=0, help_text="Number of released readsets of the dataset.")
+    blocked_status_count = models.PositiveIntegerField(default=0, help_text="Number of blocked readsets of the dataset.")
+    unreleased_count = models.PositiveIntegerField(default=0, help_text="Number of readsets of the dataset without release status.")
+    unvalidated_count = models.PositiveIntegerField(default=0, help_text="Number of readsets of the dataset without validation status.")
+    latest_release_update = models.DateTimeField(null=True, blank=True, help_text="Latest release status change of the readsets of the dataset.")
+    latest_validation_update = models.DateTimeField(null=True, blank=True, help_text="Latest validation status change of the readsets of the dataset.")
 
     class Meta:
         constraints = [
             models.UniqueConstraint(fields=["project", "experiment_run", "lane"], name="dataset_project_experimentrun_lane_key")
         ]
+        indexes = [
+            models.Index(fields=['latest_release_update'], name='dataset_latestrelupdate_idx'),
+            models.Index(fields=['latest_validation_update'], name='dataset_latestvalidupdate_idx'),
+        ]
 
     @property
     def validation_status(self) -> Optional[ValidationStatus]:
@@ -47,17 +47,43 @@ class ExperimentRun(TrackedModel):
     run_processing_launch_time = models.DateTimeField(null=True, blank=True, help_text="Last time the run processing was launched, if it has been launched for the experiment run.")
     run_processing_start_time = models.DateTimeField(null=True, blank=True, help_text="Last time the run processing actually started for the experiment run.")
     run_processing_end_time = models.DateTimeField(null=True, blank=True, help_text="Last time the run processing completed for the experiment run.")
+    run_processing_completion_time = models.DateTimeField(null=True, blank=True,
+                                                          help_text="Time at which the run processing is considered complete (run processing end time or "
+                                                                    "creation of the dataset of the last lane). Null if the run processing is not complete.")
+    # Readset status counters of the datasets of the run, maintained by the readset services (see update_dataset_status_counters)
+    readset_count = models.PositiveIntegerField(default=0, help_text="Number of readsets of the experiment run.")
+    unreleased_readset_count = models.PositiveIntegerField(default=0, help_text="Number of readsets of the experiment run without release status.")
+    unvalidated_readset_count = models.PositiveIntegerField(default=0, help_text="Number of readsets of the experiment run without validation status.")
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['run_processing_completion_time'], name='exprun_runproccompletion_idx'),
+            models.Index(fields=['unvalidated_readset_count', 'unreleased_readset_count'], name='exprun_readsetstatus_idx'),
+        ]
 
     @property
-    def run_processing_completion_time(self):
+    def is_run_processing_complete(self) -> bool:
+        return self.run_processing_completion_time is not None
+
+    def compute_run_processing_completion_time(self):
+        """
+        Compute the run processing completion time from the run processing end time or the datasets of the run.
+        The result is persisted in run_processing_completion_time by the services that modify either of them.
+
+        Returns:
+            The completion time, None if the run processing is not complete.
+        """
         if self.run_processing_end_time:
             return self.run_processing_end_time
+        if self.pk is None:
+            return None
 
         lane_count = self.container.samples.count()
         datasets = self.datasets.all()
         lane_processed_count = datasets.distinct('lane').count()
+        last_dataset = datasets.order_by('id').last()
 
-        return datasets.order_by('id').last().created_at if lane_count == lane_processed_count else None
+        return last_dataset.created_at if last_dataset is not None and lane_count == lane_processed_count else None
 
     def clean(self):
         super().clean()
@@ -0,0 +1,34 @@
+from django.contrib.auth.models import User
+from django.db import models
+from django.db.models import Q
+
+from ._constants import STANDARD_FILE_PATH_LENGTH, ImportJobStatus
+
+__all__ = ["ImportJob"]
+
+
+class ImportJob(models.Model):
+    """
+    Template submission executed in the background by the process_import_jobs command. The submitted file is kept on
+    disk until the job runs, the progress is updated while the rows are handled and the result has the same content
+    as the one returned by a synchronous submission. It is not versioned.
+    """
+    importer = models.CharField(max_length=200, help_text="Dotted path of the importer class used for the submission.")
+    file_name = models.CharField(max_length=500, help_text="Name of the submitted template file.")
+    file_path = models.CharField(max_length=STANDARD_FILE_PATH_LENGTH, help_text="Path of the submitted template file kept for the job.")
+    status = models.CharField(max_length=20, choices=ImportJobStatus.choices, default=ImportJobStatus.QUEUED, help_text="Status of the job.")
+    created_by = models.ForeignKey(User, on_delete=models.PROTECT, related_name="import_jobs", help_text="User that submitted the template.")
+    created_at = models.DateTimeField(auto_now_add=True, help_text="Timestamp the job was queued.")
+    started_at = models.DateTimeField(null=True, blank=True, help_text="Timestamp the job started.")
+    completed_at = models.DateTimeField(null=True, blank=True, help_text="Timestamp the job completed.")
+    row_count = models.PositiveIntegerField(default=0, help_text="Number of template rows to handle.")
+    processed_row_count = models.PositiveIntegerField(default=0, help_text="Number of template rows handled.")
+    result = models.JSONField(null=True, blank=True, help_text="Result of the template import.")
+    output_file_path = models.CharField(max_length=STANDARD_FILE_PATH_LENGTH, blank=True, help_text="Path of the output file produced by the import.")
+    error = models.TextField(blank=True, help_text="Error that interrupted the job.")
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["id"], condition=Q(status=ImportJobStatus.QUEUED), name="importjob_queued_idx"),
+            models.Index(fields=["created_by", "created_at"], name="importjob_createdby_idx"),
+        ]
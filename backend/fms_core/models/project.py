@@ -2,6 +2,7 @@ import reversion
 
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models.functions import Lower
 
 from .tracked_model import TrackedModel
 from django.contrib.auth.models import User
@@ -32,6 +33,7 @@ class Project(TrackedModel):
     class Meta:
         indexes = [
             models.Index(fields=['name'], name='project_name_idx'),
+            models.Index(Lower('name'), name='project_name_lower_idx'), # Case insensitive batch filters
         ]
     def clean(self):
         super().clean()
@@ -23,6 +23,12 @@ class Readset(TrackedModel):
     validation_status_timestamp = models.DateTimeField(null=True, blank=True, help_text='The last time the run validation status of the file was changed.')
     validated_by = models.ForeignKey(null=True, blank=True, help_text='User that validated the readset data.', on_delete=models.PROTECT, related_name='validated_readsets', to='auth.user')
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['name'], name='readset_name_idx'),
+            models.Index(fields=['sample_name'], name='readset_samplename_idx'),
+        ]
+
     def __str__(self):
         return self.name
 
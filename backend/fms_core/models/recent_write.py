@@ -0,0 +1,14 @@
+from django.contrib.auth.models import User
+from django.db import models
+
+__all__ = ["RecentWrite"]
+
+
+class RecentWrite(models.Model):
+    """
+    Last time a user wrote to the default database. It is shared by the web processes and the background workers so
+    that the reads of a user are not sent to a replica that may not have the user's changes yet (see fms_core.db_router).
+    It is always read from and written to the default database and is not versioned.
+    """
+    user = models.OneToOneField(User, primary_key=True, on_delete=models.CASCADE, related_name="recent_write", help_text="User that wrote to the database.")
+    written_at = models.DateTimeField(help_text="Timestamp of the last write of the user.")
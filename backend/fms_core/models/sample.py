@@ -59,10 +59,20 @@ class Sample(TrackedModel):
 
     derived_samples = models.ManyToManyField("DerivedSample", blank=True, through="DerivedBySample", symmetrical=False, related_name="samples")
 
+    # Summary of the derived by sample entries, maintained by the services that create or modify them (see update_sample_summary).
+    derived_sample_count = models.PositiveIntegerField(default=0, help_text="Number of derived samples contained in the sample.")
+    is_pooled = models.BooleanField(default=False, help_text="Whether the sample is a pool (or a fraction of a pool).")
+    has_library = models.BooleanField(default=False, help_text="Whether the sample contains at least one library.")
+    first_project = models.ForeignKey(Project, null=True, blank=True, on_delete=models.PROTECT, related_name="first_project_samples",
+                                      help_text="Project of the first derived sample of the sample.")
+    first_biosample = models.ForeignKey(Biosample, null=True, blank=True, on_delete=models.PROTECT, related_name="first_biosample_samples",
+                                        help_text="Biosample of the first derived sample of the sample.")
+
     class Meta:
         indexes = [
             models.Index(fields=['name'], name='sample_name_idx'),
-            models.Index(fields=['creation_date'], name='sample_creationdate_idx')
+            models.Index(fields=['creation_date'], name='sample_creationdate_idx'),
+            models.Index(fields=['is_pooled'], name='sample_ispooled_idx'),
         ]
         constraints = [
             models.UniqueConstraint(fields=["container", "coordinate"], name="sample_container_coordinate_key")
@@ -82,7 +92,9 @@ class Sample(TrackedModel):
 
     @property
     def is_pool(self) -> bool:
-        return DerivedBySample.objects.filter(sample=self.pk).count() > 1 # More than 1 DerivedBySample implies more than 1 DerivedSample
+        # Counted live (prefetched derived_by_samples are used when available). derived_sample_count is only a summary
+        # for the lists, filters and sorting, it is not maintained where DerivedBySample rows are created directly.
+        return self.derived_by_samples.count() > 1 # More than 1 DerivedBySample implies more than 1 DerivedSample
 
     @property
     def is_library(self) -> bool:
@@ -0,0 +1,30 @@
+from django.db import models
+
+from .sample import Sample
+from .derived_sample import DerivedSample
+from .protocol import Protocol
+
+__all__ = ["SampleAncestry"]
+
+
+class SampleAncestry(models.Model):
+    """
+    Materialized ancestry of the samples, derived from the sample lineages. Each entry links a sample to one of its
+    ancestors following a derived sample (the ancestor contains the derived sample). It is maintained when sample
+    lineages are created and is not versioned.
+    """
+    sample = models.ForeignKey(Sample, on_delete=models.CASCADE, related_name="ancestries", help_text="Descendant sample.")
+    derived_sample = models.ForeignKey(DerivedSample, on_delete=models.CASCADE, related_name="sample_ancestries",
+                                       help_text="Derived sample followed from the sample to its ancestor.")
+    ancestor = models.ForeignKey(Sample, on_delete=models.CASCADE, related_name="descendant_ancestries", help_text="Ancestor sample.")
+    depth = models.PositiveIntegerField(help_text="Number of lineages between the sample and its ancestor (1 for the parent).")
+    protocol = models.ForeignKey(Protocol, null=True, blank=True, on_delete=models.SET_NULL, related_name="sample_ancestries",
+                                 help_text="Protocol of the process applied to the ancestor on the path to the sample.")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["sample_id", "derived_sample_id", "ancestor_id"], name="sampleancestry_sample_derivedsample_ancestor_key")
+        ]
+        indexes = [
+            models.Index(fields=["ancestor"], name="sampleancestry_ancestor_idx"),
+        ]
@@ -20,6 +20,10 @@ class SampleIdentityMatch(TrackedModel):
         constraints = [
             models.UniqueConstraint(fields=["tested_id", "matched_id", "readset_id"], name="sampleidentitymatch_testedid_matchedid_readsetid_key")
         ]
+        indexes = [
+            models.Index(fields=["tested", "matching_site_ratio"], name="identitymatch_tested_ratio_idx"),
+            models.Index(fields=["matched", "matching_site_ratio"], name="identitymatch_match_ratio_idx"),
+        ]
 
     def clean(self):
         super().clean()
@@ -2,6 +2,8 @@ import reversion
 
 from django.core.exceptions import MultipleObjectsReturned, ValidationError
 from django.db import models
+from django.db.models.signals import post_save
+from django.dispatch import receiver
 from django.apps import apps
 
 from .tracked_model import TrackedModel
@@ -58,4 +60,13 @@ class SampleLineage(TrackedModel):
 
     def save(self, *args, **kwargs):
         self.full_clean()
-        super().save(*args, **kwargs)  # Save the object
\ No newline at end of file
+        super().save(*args, **kwargs)  # Save the object
+
+@receiver(post_save, sender=SampleLineage)
+def _extend_sample_ancestry(sender, instance, created, raw, **kwargs):
+    # The materialized ancestry is maintained here so that every new lineage extends it, whatever created the lineage.
+    if created and not raw:
+        from fms_core.services.sample_lineage import create_sample_ancestry
+        _, errors, _ = create_sample_ancestry(instance)
+        if errors:
+            raise ValidationError(errors)
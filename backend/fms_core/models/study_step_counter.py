@@ -0,0 +1,23 @@
+from django.db import models
+
+from .study import Study
+from .step_order import StepOrder
+
+__all__ = ["StudyStepCounter"]
+
+
+class StudyStepCounter(models.Model):
+    """
+    Counters of the samples queued to and completed at each step of a study workflow. They are maintained by the workflow
+    services as samples are queued, moved and dequeued, can be reconciled with the reconcile_study_step_counters command
+    and are not versioned.
+    """
+    study = models.ForeignKey(Study, on_delete=models.CASCADE, related_name="step_counters", help_text="Study of the counted step.")
+    step_order = models.ForeignKey(StepOrder, on_delete=models.CASCADE, related_name="study_step_counters", help_text="Step order of the study workflow.")
+    queued_count = models.IntegerField(default=0, help_text="Number of samples currently queued to the step of the study.")
+    completed_count = models.IntegerField(default=0, help_text="Number of step history entries recorded for the step of the study.")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["study", "step_order"], name="studystepcounter_study_steporder_key")
+        ]
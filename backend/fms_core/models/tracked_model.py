@@ -8,6 +8,21 @@ from crum import get_current_user
 ADMIN_USERNAME='biobankadmin'
 
 
+def get_tracking_user(requester_id=None):
+    """
+    Resolve the user recorded in created_by and updated_by. Uses the requester if provided, the user of
+    the current request otherwise and falls back on the admin user. Bulk operations that bypass save()
+    (bulk_create, bulk_update) use it to stamp the instances themselves.
+    """
+    if requester_id:
+        user = User.objects.get(pk=requester_id)
+    else:
+        user = get_current_user()
+    if not user or (user and not user.pk):
+        user = User.objects.get(username=ADMIN_USERNAME)
+    return user
+
+
 class TrackedModel(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, help_text="Date the instance was created.")
     created_by = models.ForeignKey(User, null=False, blank=True, related_name="%(app_label)s_%(class)s_creation", on_delete=models.PROTECT)
@@ -19,13 +34,7 @@ class TrackedModel(models.Model):
         abstract = True
 
     def save(self, *args, **kwargs):
-        requester = kwargs.get("requester_id")
-        if requester:
-            user = User.objects.get(pk=requester)
-        else:
-            user = get_current_user()
-        if not user or (user and not user.pk):
-            user = User.objects.get(username=ADMIN_USERNAME)
+        user = get_tracking_user(kwargs.get("requester_id"))
         # if the instance has not been saved to the DB yet
         if not self.id:
             # initialize the user that create the object.
@@ -0,0 +1,26 @@
+from django.db import models
+from django.db.models import Q
+
+from ._constants import STANDARD_FILE_PATH_LENGTH, TriggerFileType
+
+__all__ = ["TriggerFile"]
+
+
+class TriggerFile(models.Model):
+    """
+    Outbox of the trigger files (run info, validation info and release info) dropped in the spool directories watched by
+    the data processing. Entries are created in the same transaction as the change they announce and the files are
+    written by the process_trigger_files command once committed. It is not versioned.
+    """
+    type = models.CharField(max_length=20, choices=TriggerFileType.choices, help_text="Type of trigger file.")
+    file_path = models.CharField(max_length=STANDARD_FILE_PATH_LENGTH, help_text="Destination path of the trigger file.")
+    content = models.JSONField(help_text="Content of the trigger file.")
+    created_at = models.DateTimeField(auto_now_add=True, help_text="Timestamp the trigger file was queued.")
+    written_at = models.DateTimeField(null=True, blank=True, help_text="Timestamp the trigger file was written. Empty while pending.")
+    attempt_count = models.PositiveIntegerField(default=0, help_text="Number of failed attempts to write the trigger file.")
+    last_error = models.TextField(blank=True, help_text="Error of the last failed attempt to write the trigger file.")
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["id"], condition=Q(written_at__isnull=True), name="triggerfile_pending_idx"),
+        ]
@@ -0,0 +1,36 @@
+from django.db import models
+
+from .property_type import PropertyType
+from .property_value import PropertyValue
+
+__all__ = ["TypedPropertyValue"]
+
+TEXT_KEY_LENGTH = 200
+
+
+class TypedPropertyValue(models.Model):
+    """
+    Typed projection of a property value, with the process or process measurement it describes and its value converted
+    to a number or a date when possible. It is maintained by the property value services (see update_typed_property_values)
+    and is used by the filters and exports instead of the generic property values. It is not versioned.
+    """
+    property_value = models.OneToOneField(PropertyValue, primary_key=True, on_delete=models.CASCADE, related_name="typed_value",
+                                          help_text="Property value projected.")
+    property_type = models.ForeignKey(PropertyType, on_delete=models.CASCADE, related_name="typed_values", help_text="Property type.")
+    process = models.ForeignKey("Process", null=True, blank=True, on_delete=models.CASCADE, related_name="typed_property_values",
+                                help_text="Process described by the property value.")
+    process_measurement = models.ForeignKey("ProcessMeasurement", null=True, blank=True, on_delete=models.CASCADE, related_name="typed_property_values",
+                                            help_text="Process measurement described by the property value.")
+    numeric_value = models.FloatField(null=True, blank=True, help_text="Value as a number, if it is numeric.")
+    date_value = models.DateField(null=True, blank=True, help_text="Value as a date, if it is an ISO date.")
+    text_value = models.TextField(blank=True, help_text="Value as text.")
+    text_key = models.CharField(max_length=TEXT_KEY_LENGTH, blank=True, help_text="Lowercase start of the text value, for indexed lookups.")
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["property_type", "process_measurement"], name="typedpv_measurement_idx"),
+            models.Index(fields=["property_type", "process"], name="typedpv_process_idx"),
+            models.Index(fields=["property_type", "numeric_value"], name="typedpv_numeric_idx"),
+            models.Index(fields=["property_type", "date_value"], name="typedpv_date_idx"),
+            models.Index(fields=["property_type", "text_key"], name="typedpv_text_idx"),
+        ]
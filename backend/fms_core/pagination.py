@@ -0,0 +1,230 @@
+import base64
+import hashlib
+import json
+from typing import Any, List, Optional, Tuple
+
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.response import Response
+
+# Limit/offset remains the default pagination. Adding the cursor parameter to a list request (empty for the first page)
+# switches to keyset pagination : the page is selected using the ordering values of the last row of the previous page
+# instead of an offset, so the cost of a page does not grow with its depth. The count parameter selects how the total
+# count is obtained (exact, cached, estimate or none) in both modes.
+
+CURSOR_QUERY_PARAM = "cursor"
+COUNT_QUERY_PARAM = "count"
+
+COUNT_EXACT = "exact"
+COUNT_CACHED = "cached"
+COUNT_ESTIMATE = "estimate"
+COUNT_NONE = "none"
+COUNT_MODES = [COUNT_EXACT, COUNT_CACHED, COUNT_ESTIMATE, COUNT_NONE]
+
+COUNT_CACHE_TIMEOUT = 300 # seconds
+KEYSET_TIEBREAKER = "id"
+
+def is_cursor_request(request) -> bool:
+    return request is not None and CURSOR_QUERY_PARAM in request.query_params
+
+def get_count_mode(request) -> str:
+    count_mode = request.query_params.get(COUNT_QUERY_PARAM, COUNT_EXACT) if request is not None else COUNT_EXACT
+    if count_mode not in COUNT_MODES:
+        raise ValidationError({COUNT_QUERY_PARAM: f"Count mode must be one of {', '.join(COUNT_MODES)}."})
+    return count_mode
+
+def estimate_count(queryset: QuerySet) -> int:
+    """
+    Estimate the number of rows returned by a queryset using the query planner statistics.
+
+    Args:
+        `queryset`: Queryset to count.
+
+    Returns:
+        The number of rows estimated by the planner.
+    """
+    try:
+        sql, params = queryset.query.sql_with_params()
+    except EmptyResultSet:
+        return 0
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+def get_count(queryset: QuerySet, count_mode: str = COUNT_EXACT) -> Optional[int]:
+    """
+    Count the rows of a queryset using the given count mode.
+
+    Args:
+        `queryset`: Queryset to count.
+        `count_mode`: One of COUNT_MODES. Cached counts are kept COUNT_CACHE_TIMEOUT seconds for a given query.
+
+    Returns:
+        The count of rows, None if count_mode is COUNT_NONE.
+    """
+    if count_mode == COUNT_NONE:
+        return None
+    elif count_mode == COUNT_ESTIMATE:
+        return estimate_count(queryset)
+    elif count_mode == COUNT_CACHED:
+        try:
+            sql, params = queryset.query.sql_with_params()
+        except EmptyResultSet:
+            return 0
+        cache_key = "fms_count_" + hashlib.sha256(f"{sql}{params}".encode()).hexdigest()
+        count = cache.get(cache_key)
+        if count is None:
+            count = queryset.count()
+            cache.set(cache_key, count, COUNT_CACHE_TIMEOUT)
+        return count
+    else:
+        return queryset.count()
+
+def get_keyset_ordering(queryset: QuerySet, default_ordering=None) -> List[str]:
+    """
+    Build a total ordering for keyset pagination from the queryset ordering (or the default ordering).
+    The id is appended as a tiebreaker so that rows sharing the same ordering values have a stable order.
+
+    Args:
+        `queryset`: Queryset to paginate.
+        `default_ordering`: Ordering used if the queryset is not ordered.
+
+    Returns:
+        List of ordering field names (prefixed with - for descending order).
+    """
+    ordering = list(queryset.query.order_by) or ([default_ordering] if isinstance(default_ordering, str) else list(default_ordering or []))
+    if any(not isinstance(order, str) or order == "?" for order in ordering):
+        raise ValidationError({CURSOR_QUERY_PARAM: "Cursor pagination is not supported for this ordering."})
+    ordering = [KEYSET_TIEBREAKER if order == "pk" else f"-{KEYSET_TIEBREAKER}" if order == "-pk" else order for order in ordering]
+    if KEYSET_TIEBREAKER not in ordering and f"-{KEYSET_TIEBREAKER}" not in ordering:
+        ordering.append(KEYSET_TIEBREAKER)
+    return ordering
+
+def encode_cursor(ordering: List[str], values: List[Any]) -> str:
+    payload = json.dumps({"o": ordering, "v": values}, cls=DjangoJSONEncoder, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+def decode_cursor(cursor: str, ordering: List[str]) -> List[Any]:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except (TypeError, ValueError):
+        raise NotFound("Invalid cursor.")
+    # A cursor is only valid for the ordering it was created with
+    if not isinstance(payload, dict) or payload.get("o") != ordering or len(payload.get("v") or []) != len(ordering):
+        raise NotFound("Invalid cursor.")
+    return payload["v"]
+
+def keyset_condition(ordering: List[str], values: List[Any]) -> Q:
+    """
+    Build the condition selecting the rows that come after the given ordering values.
+
+    Args:
+        `ordering`: List of ordering field names (prefixed with - for descending order).
+        `values`: Ordering values of the last row of the previous page.
+
+    Returns:
+        Q object selecting the rows after the given values.
+    """
+    condition = Q()
+    equal_condition = Q()
+    for order, value in zip(ordering, values):
+        descending = order.startswith("-")
+        field = order.lstrip("-")
+        # PostgreSQL sorts null values last in ascending order and first in descending order
+        if value is None:
+            after_condition = Q(**{f"{field}__isnull": False}) if descending else None
+            value_condition = Q(**{f"{field}__isnull": True})
+        else:
+            after_condition = Q(**{f"{field}__lt": value}) if descending else Q(**{f"{field}__gt": value}) | Q(**{f"{field}__isnull": True})
+            value_condition = Q(**{field: value})
+        if after_condition is not None:
+            condition |= equal_condition & after_condition
+        equal_condition &= value_condition
+    return condition
+
+def keyset_paginate(queryset: QuerySet, cursor: Optional[str], limit: int, default_ordering=None) -> Tuple[List, Optional[str]]:
+    """
+    Get a page of the queryset using keyset pagination.
+
+    Args:
+        `queryset`: Queryset to paginate. Its ordering is used (completed by a tiebreaker).
+        `cursor`: Cursor returned with the previous page. Empty or None for the first page.
+        `limit`: Maximum number of rows in the page.
+        `default_ordering`: Ordering used if the queryset is not ordered.
+
+    Returns:
+        Tuple with the list of rows of the page and the cursor of the next page (None if it is the last page).
+    """
+    ordering = get_keyset_ordering(queryset, default_ordering)
+    queryset = queryset.order_by(*ordering)
+    if cursor:
+        queryset = queryset.filter(keyset_condition(ordering, decode_cursor(cursor, ordering)))
+
+    rows = list(queryset[:limit + 1])
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_row = rows[-1]
+        last_id = last_row[KEYSET_TIEBREAKER] if isinstance(last_row, dict) else last_row.pk
+        # Ordering values may be related fields or annotations, fetch them for the last row only
+        last_values = queryset.order_by().filter(**{KEYSET_TIEBREAKER: last_id}).values_list(*[order.lstrip("-") for order in ordering]).first()
+        next_cursor = encode_cursor(ordering, list(last_values))
+    return (rows, next_cursor)
+
+
+class KeysetOptionalPagination(LimitOffsetPagination):
+    """
+    Limit/offset pagination that switches to keyset pagination when the request contains the cursor parameter.
+    In keyset mode, the response contains the cursor of the next page in the next field.
+    """
+    cursor_mode = False
+    next_cursor = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_mode = is_cursor_request(request)
+        if not self.cursor_mode:
+            count_mode = get_count_mode(request)
+            if count_mode == COUNT_EXACT:
+                return super().paginate_queryset(queryset, request, view)
+            # Same as the limit/offset pagination, using the requested count mode
+            self.request = request
+            self.limit = self.get_limit(request)
+            if self.limit is None:
+                return None
+            self.count = get_count(queryset, count_mode)
+            self.offset = self.get_offset(request)
+            return list(queryset[self.offset:self.offset + self.limit])
+
+        self.request = request
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+        self.count = get_count(queryset, get_count_mode(request))
+        page, self.next_cursor = keyset_paginate(queryset,
+                                                 request.query_params.get(CURSOR_QUERY_PARAM),
+                                                 self.limit,
+                                                 getattr(view, "ordering", None))
+        return page
+
+    def get_next_link(self):
+        if self.count is None:
+            # Without count, the next link cannot be determined
+            return None
+        return super().get_next_link()
+
+    def get_paginated_response(self, data):
+        if not self.cursor_mode:
+            return super().get_paginated_response(data)
+        return Response({
+            "count": self.count,
+            "next": self.next_cursor,
+            "results": data,
+        })
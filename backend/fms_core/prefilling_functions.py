@@ -1,7 +1,6 @@
 import re
 from fms_core.template_importer._constants import DESTINATION_CONTAINER_BARCODE_MARKER
 from fms_core.services.sample import get_sample_from_container, get_biosample_name
-from fms_core.services.samplesheet import fit_sheet_columns_width_to_content
 
 def get_axiom_experiment_barcode_from_comment(comment: str):
     re_comment = rf"{DESTINATION_CONTAINER_BARCODE_MARKER}(\S+)[ ]\."
@@ -9,6 +8,8 @@ def get_axiom_experiment_barcode_from_comment(comment: str):
     return m.group(1) # first group holds the experiment container barcode
 
 def custom_prefill_8x12_container_biosample_names(workbook_sheet, sheet_info, header_offset, rows_dicts):
+    # Imported here since the templates referencing this function are loaded with every viewset (openpyxl is heavy)
+    from fms_core.services.samplesheet import fit_sheet_columns_width_to_content
     SOURCE_BARCODE_FIELD = "Sample Container Barcode"
     SOURCE_COORDINATE_FIELD = "Sample Container Coord"
     DEST_COORDINATE_FIELD = "QC Container Coord"
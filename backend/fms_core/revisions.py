@@ -0,0 +1,88 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import reversion
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from reversion.models import Version
+
+# By default, django-reversion serializes a registered object each time it is saved in a revision, even if the object
+# is saved multiple times. In deferred capture, saves only record which objects were touched. The objects are fetched
+# once per model when the capture ends and each one is serialized once, with its final state, in the same revision.
+
+DEFERRED_CAPTURE_BATCH_SIZE = 1000
+# Fields updated by every save of a tracked model. They are not considered when looking for an unchanged object.
+TRACKING_FIELDS = ["created_at", "created_by", "updated_at", "updated_by"]
+
+_captured_objects = ContextVar("captured_objects", default=None)
+
+@receiver(post_save)
+def _capture_saved_object(sender, instance, using, **kwargs):
+    captured_objects = _captured_objects.get()
+    if captured_objects is not None and reversion.is_registered(sender):
+        captured_objects.setdefault((sender, using), {})[instance.pk] = None
+
+def _get_unchanged_object_ids(model, using, objects):
+    """
+    Find the objects identical to their latest version, tracking fields excluded.
+
+    Args:
+        `model`: Registered model of the objects.
+        `using`: Database of the objects.
+        `objects`: Objects about to be added to the revision.
+
+    Returns:
+        Set of the pk (as string, like Version.object_id) of the unchanged objects.
+    """
+    object_by_id = {str(obj.pk): obj for obj in objects}
+    latest_versions = (Version.objects.using(using)
+                                      .get_for_model(model, model_db=using)
+                                      .filter(object_id__in=object_by_id.keys())
+                                      .order_by("object_id", "-pk")
+                                      .distinct("object_id"))
+    unchanged_object_ids = set()
+    for version in latest_versions:
+        obj = object_by_id[version.object_id]
+        try:
+            version_fields = version.field_dict
+        except Exception:
+            continue # Versions of an older model definition are considered changed
+        if all(getattr(obj, field.attname) == version_fields.get(field.attname, version_fields.get(field.name))
+               for field in model._meta.concrete_fields if field.name not in TRACKING_FIELDS):
+            unchanged_object_ids.add(version.object_id)
+    return unchanged_object_ids
+
+@contextmanager
+def deferred_revision_capture(skip_unchanged: bool = False):
+    """
+    Defer the capture of the objects saved in the current revision until the end of the block. Multiple saves of the same
+    object produce a single version. Does nothing if no revision is active, if the revision is managed manually (ie. dry
+    runs) or if a deferred capture is already in progress.
+
+    Args:
+        `skip_unchanged`: Do not add a version for the objects identical to their latest version (tracking fields
+                          excluded). Versions always contain the complete object so they can still be reverted.
+    """
+    if not reversion.is_active() or reversion.is_manage_manually() or _captured_objects.get() is not None:
+        yield
+        return
+
+    captured_objects = {}
+    token = _captured_objects.set(captured_objects)
+    try:
+        # Saves are not captured by reversion in a manually managed block, only recorded by _capture_saved_object
+        with reversion.create_revision(manage_manually=True):
+            yield
+            _captured_objects.reset(token)
+            token = None
+            for (model, using), object_ids in captured_objects.items():
+                object_ids = list(object_ids)
+                for i in range(0, len(object_ids), DEFERRED_CAPTURE_BATCH_SIZE):
+                    objects = list(model._base_manager.using(using).filter(pk__in=object_ids[i:i + DEFERRED_CAPTURE_BATCH_SIZE]))
+                    unchanged_object_ids = _get_unchanged_object_ids(model, using, objects) if skip_unchanged else set()
+                    for obj in objects:
+                        if str(obj.pk) not in unchanged_object_ids:
+                            reversion.add_to_revision(obj, model_db=using)
+    finally:
+        if token is not None:
+            _captured_objects.reset(token)
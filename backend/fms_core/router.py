@@ -30,6 +30,7 @@ from .viewsets import (
     TaxonViewSet,
     SampleLineageViewSet,
     ImportedFileViewSet,
+    ImportJobViewSet,
     DatasetViewSet,
     DatasetFileViewSet,
     ReadsetViewSet,
@@ -49,6 +50,7 @@ from .viewsets import (
     SampleIdentityMatchViewSet,
     ProfileViewSet,
     DerivedSampleViewSet,
+    PlanningViewSet,
 )
 
 __all__ = ["router"]
@@ -85,6 +87,7 @@ router.register(r"users", UserViewSet)
 router.register(r"groups", GroupViewSet)
 router.register(r"sample-lineage", SampleLineageViewSet, basename="sample-lineage")
 router.register(r"imported-files", ImportedFileViewSet, basename="imported-files")
+router.register(r"import-jobs", ImportJobViewSet, basename="import-jobs")
 router.register(r"datasets", DatasetViewSet, basename="datasets")
 router.register(r"readsets", ReadsetViewSet, basename="readsets")
 router.register(r"dataset-files", DatasetFileViewSet, basename="dataset-files")
@@ -102,3 +105,4 @@ router.register(r"reports", ReportViewSet, basename="reports")
 router.register(r"sample-identities", SampleIdentityViewSet)
 router.register(r"sample-identity-matches", SampleIdentityMatchViewSet)
 router.register(r"profiles", ProfileViewSet, basename="profiles")
+router.register(r"planning", PlanningViewSet, basename="planning")
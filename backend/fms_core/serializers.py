@@ -30,6 +30,7 @@ from .models import (
     LibraryType,
     Platform,
     PropertyValue,
+    TypedPropertyValue,
     PropertyType,
     Protocol,
     Process,
@@ -41,6 +42,7 @@ from .models import (
     Sequence,
     Taxon,
     ImportedFile,
+    ImportJob,
     Workflow,
     Step,
     ReferenceGenome,
@@ -106,6 +108,7 @@ __all__ = [
     "SequenceSerializer",
     "TaxonSerializer",
     "ImportedFileSerializer",
+    "ImportJobSerializer",
     "PooledSampleSerializer",
     "PooledSampleExportSerializer",
     "WorkflowSerializer",
@@ -403,12 +406,13 @@ class ProcessMeasurementWithPropertiesExportListSerializer(serializers.ListSeria
             content_type=protocol_content_type
         ).values("id", "name", "object_id").all()
 
-        property_values = PropertyValue.objects.filter(
+        # The typed projection separates the values of the processes from the values of the process measurements
+        property_values = TypedPropertyValue.objects.filter(
             property_type__in=Subquery(property_types.values("id")),
         ).filter(
-            Q(object_id__in=Subquery(process_measurements.values("process__id"))) |
-            Q(object_id__in=Subquery(process_measurements.values("id")))
-        ).values("property_type_id", "value", "object_id").all()
+            Q(process__in=Subquery(process_measurements.values("process__id"))) |
+            Q(process_measurement__in=Subquery(process_measurements.values("id")))
+        ).values("property_type_id", "property_value__value", "process_id", "process_measurement_id").all()
 
         property_types_by_protocol = defaultdict(list[tuple[int, str]])
         for property_type in property_types:
@@ -416,11 +420,14 @@ class ProcessMeasurementWithPropertiesExportListSerializer(serializers.ListSeria
             property_types_by_protocol[protocol_id].append((property_type['id'], property_type['name']))
 
         property_value_by_pm_and_pt = defaultdict[int, dict[int, Any]](dict)
+        property_value_by_process_and_pt = defaultdict[int, dict[int, Any]](dict)
         for property_value in property_values:
             property_type_id = property_value['property_type_id']
-            value = property_value['value']
-            process_maybe_measurement_id = property_value['object_id']
-            property_value_by_pm_and_pt[process_maybe_measurement_id][property_type_id] = value
+            value = property_value['property_value__value']
+            if property_value['process_measurement_id'] is not None:
+                property_value_by_pm_and_pt[property_value['process_measurement_id']][property_type_id] = value
+            else:
+                property_value_by_process_and_pt[property_value['process_id']][property_type_id] = value
 
         data = []
         for process_measurement in process_measurements:
@@ -432,7 +439,7 @@ class ProcessMeasurementWithPropertiesExportListSerializer(serializers.ListSeria
                 property_value = (
                     property_value_by_pm_and_pt.get(process_measurement.id, {})
                     or
-                    property_value_by_pm_and_pt.get(process_measurement.process.id, {})
+                    property_value_by_process_and_pt.get(process_measurement.process.id, {})
                 ).get(property_type_id, None)
                 if property_value is not None:
                     datum[property_type_name] = property_value
@@ -499,7 +506,7 @@ class SampleMetadataSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 class SampleSerializer(serializers.Serializer):
-    derived_samples_counts = serializers.IntegerField(read_only=True, source="count_derived_samples")
+    derived_samples_counts = serializers.IntegerField(read_only=True, source="derived_sample_count")
 
     class Meta:
         fields = ('id', 'biosample_id', 'name', 'alias', 'volume', 'depleted', 'concentration', 'child_of',
@@ -510,7 +517,7 @@ class SampleSerializer(serializers.Serializer):
 
 class SampleExportSerializer(serializers.Serializer):
     coordinates = serializers.CharField(read_only=True, source="coordinate.name")
-    derived_samples_count = serializers.IntegerField(read_only=True, source="count_derived_samples")
+    derived_samples_count = serializers.IntegerField(read_only=True, source="derived_sample_count")
 
     class Meta:
         fields = ('sample_id', 'sample_name', 'biosample_id', 'alias', 'individual_alias', 'sample_kind', 'tissue_source',
@@ -523,7 +530,7 @@ class SampleExportSerializer(serializers.Serializer):
 
 class LibrarySerializer(serializers.Serializer):
     library_size = serializers.DecimalField(max_digits=20, decimal_places=0, read_only=True, source="fragment_size")
-    derived_samples_count = serializers.IntegerField(read_only=True, source="count_derived_samples")
+    derived_samples_count = serializers.IntegerField(read_only=True, source="derived_sample_count")
 
     class Meta:
         fields = ('id', 'name', 'biosample_id', 'container', 'coordinate', 'volume', 'is_pool', 'derived_samples_count',
@@ -534,7 +541,7 @@ class LibrarySerializer(serializers.Serializer):
 class LibraryExportSerializer(serializers.Serializer):
     coordinates = serializers.CharField(read_only=True, source="coordinate.name")
     library_size = serializers.DecimalField(max_digits=20, decimal_places=0, read_only=True, source="fragment_size")
-    derived_samples_count = serializers.IntegerField(read_only=True, source="count_derived_samples")
+    derived_samples_count = serializers.IntegerField(read_only=True, source="derived_sample_count")
 
     class Meta:
         fields = ('id', 'name', 'biosample_id', 'container', 'coordinates', 'volume', 'is_pool', 'derived_samples_count',
@@ -671,6 +678,11 @@ class ImportedFileSerializer(serializers.ModelSerializer):
         model = ImportedFile
         fields = "__all__"
 
+class ImportJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ImportJob
+        exclude = ("file_path", "output_file_path")
+
 class ArchivedCommentSerializer(serializers.ModelSerializer):
     class Meta:
         model = ArchivedComment
@@ -678,14 +690,9 @@ class ArchivedCommentSerializer(serializers.ModelSerializer):
 
 class DatasetSerializer(serializers.ModelSerializer):
     files = serializers.SerializerMethodField()
-    released_status_count = serializers.SerializerMethodField()
-    blocked_status_count = serializers.SerializerMethodField()
-    readset_count = serializers.SerializerMethodField()
     archived_comments = ArchivedCommentSerializer("archived_comments", many=True)
-    latest_release_update = serializers.SerializerMethodField()
     released_by = serializers.SerializerMethodField()
     validation_status = serializers.SerializerMethodField()
-    latest_validation_update = serializers.SerializerMethodField()
     validated_by = serializers.SerializerMethodField()
     external_project_id = serializers.CharField(read_only=True, source="project.external_id")
     project_name = serializers.CharField(read_only=True, source="project.name")
@@ -694,28 +701,14 @@ class DatasetSerializer(serializers.ModelSerializer):
     class Meta:
         model = Dataset
         fields = ("id", "external_project_id", "released_by", "validated_by", "latest_validation_update", "run_name", "experiment_run_id", "lane", "files", "released_status_count", "blocked_status_count", "latest_release_update", "validation_status", "project_id", "project_name", "metric_report_url", "readset_count", "archived_comments")
+        read_only_fields = ("released_status_count", "blocked_status_count", "latest_release_update", "latest_validation_update", "readset_count")
 
     def get_files(self, obj):
         return DatasetFile.objects.filter(readset__dataset=obj.id).values_list("id", flat=True)
 
-    def get_released_status_count(self, obj):
-        return Readset.objects.filter(dataset=obj.id, release_status=ReleaseStatus.RELEASED).count()
-
-    def get_blocked_status_count(self, obj):
-        return Readset.objects.filter(dataset=obj.id, release_status=ReleaseStatus.BLOCKED).count()
-
-    def get_latest_release_update(self, obj):
-        return Readset.objects.filter(dataset=obj.id).aggregate(Max("release_status_timestamp"))["release_status_timestamp__max"]
-
-    def get_readset_count(self, obj):
-        return Readset.objects.filter(dataset=obj.id).count()
-
     def get_validation_status(self, obj):
         return obj.validation_status
 
-    def get_latest_validation_update(self, obj):
-        return Readset.objects.filter(dataset=obj.id).aggregate(Max("validation_status_timestamp"))["validation_status_timestamp__max"]
-
     def get_validated_by(self, obj):
         return obj.validated_by
 
@@ -735,6 +728,9 @@ class ReadsetSerializer(serializers.ModelSerializer):
         return DatasetFile.objects.filter(readset=obj.pk).aggregate(total_size=Sum("size"))["total_size"]
 
     def get_sample_source(self, obj: Readset):
+        sample_source_by_readset = self.context.get("sample_source_by_readset", None)
+        if sample_source_by_readset is not None and obj.id in sample_source_by_readset:
+            return sample_source_by_readset[obj.id]
         experiment_container = obj.dataset.experiment_run.container if obj.dataset.experiment_run else None
         if experiment_container is None:
             return None
@@ -763,6 +759,9 @@ class ReadsetWithMetricsSerializer(serializers.ModelSerializer):
         return DatasetFile.objects.filter(readset=obj.pk).aggregate(total_size=Sum("size"))["total_size"]
 
     def get_sample_source(self, obj: Readset):
+        sample_source_by_readset = self.context.get("sample_source_by_readset", None)
+        if sample_source_by_readset is not None and obj.id in sample_source_by_readset:
+            return sample_source_by_readset[obj.id]
         experiment_container = obj.dataset.experiment_run.container if obj.dataset.experiment_run else None
         if experiment_container is None:
             return None
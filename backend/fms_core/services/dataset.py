@@ -1,6 +1,6 @@
-import json
-from os import path, rename
+from os import path
 from decimal import Decimal
+import reversion
 
 from django.core.exceptions import ValidationError
 from django.utils import timezone
@@ -13,19 +13,22 @@ from fms_core.models.project import Project
 from fms_core.models.dataset_file import DatasetFile
 from fms_core.models.dataset import Dataset
 from fms_core.models.readset import Readset
-from fms_core.models._constants import ReleaseStatus, ValidationStatus
+from fms_core.models._constants import ReleaseStatus, ValidationStatus, TriggerFileType
 from fms_core.models.sample_identity import SampleIdentity
 
 from fms_report.models.production_data import ProductionData
 from fms_report.models.production_tracking import ProductionTracking
+from fms_report.services.report_data_preparation import queue_readsets_for_report_preparation
 
 from fms_core.schema_validators import RUN_PROCESSING_VALIDATOR
 from fms.settings import VALIDATED_FILES_OUTPUT_PATH, RELEASED_FILES_OUTPUT_PATH
 from fms_core.utils import make_timestamped_filename
 
-from fms_core.services.readset import create_readset
+from fms_core.services.readset import create_readset, update_dataset_status_counters
+from fms_core.services.trigger_file import queue_trigger_file
+from fms_core.services.experiment_run import update_run_processing_completion_time
 from fms_core.services.metric import create_metrics_from_run_validation_data
-from fms_core.services.sample_identity import create_sample_identity_matches
+from fms_core.services.sample_identity import bulk_create_sample_identity_matches
 from fms_core.services.archived_comment import (create_archived_comment_for_model,
                                                 AUTOMATED_COMMENT_DATASET_VALIDATED,
                                                 AUTOMATED_COMMENT_DATASET_NEW_DATA,
@@ -81,6 +84,10 @@ def create_dataset(project_id: int,
                           f"experiment_run_id {kwargs['experiment_run_id']} and lane {kwargs['lane']}.")
         else:
             create_archived_comment_for_model(Dataset, dataset.id, AUTOMATED_COMMENT_DATASET_NEW_DATA()) # Set comment now for incomming data
+            # A new lane dataset may complete the run processing of the experiment run
+            _, errors_completion, warnings_completion = update_run_processing_completion_time(dataset.experiment_run)
+            errors.extend(errors_completion)
+            warnings.extend(warnings_completion)
     except ValidationError as e:
         # the validation error messages should be readable
         errors.extend(e.messages)
@@ -115,6 +122,9 @@ def reset_dataset_content(dataset: Dataset):
             for identity_match in readset.readset_identity_match.all():
                 identity_match.delete()
             readset.delete()
+        _, errors_counters, warnings_counters = update_dataset_status_counters([dataset.id])
+        errors.extend(errors_counters)
+        warnings.extend(warnings_counters)
         create_archived_comment_for_model(Dataset, dataset.id, AUTOMATED_COMMENT_DATASET_RESET())
     except Exception as err:
         errors.append(str(err))
@@ -224,6 +234,7 @@ def set_dataset_validation_status(dataset_obj: Dataset, validation_status: Valid
         errors.append(f"Cannot set validation status for Lane {dataset_obj.lane} of Experiment Run {dataset_obj.experiment_run.name} because project {dataset_obj.project.name} is missing an external project id.")
         return count_status, errors, warnings
 
+    readset_ids = []
     for readset in Readset.objects.filter(dataset=dataset_obj).all():
         previous_status = readset.validation_status
         readset.validation_status = validation_status
@@ -234,7 +245,15 @@ def set_dataset_validation_status(dataset_obj: Dataset, validation_status: Valid
             readset.validation_status_timestamp = timestamp
             readset.validated_by = validated_by
         readset.save()
+        readset_ids.append(readset.id)
         count_status += 1
+    _, errors_counters, warnings_counters = update_dataset_status_counters([dataset_obj.id])
+    errors.extend(errors_counters)
+    warnings.extend(warnings_counters)
+    # Report data of these readsets is prepared again by the report queue worker (process_report_queue)
+    _, errors_queue, warnings_queue = queue_readsets_for_report_preparation(readset_ids)
+    errors.extend(errors_queue)
+    warnings.extend(warnings_queue)
     create_archived_comment_for_model(Dataset, dataset_obj.id, AUTOMATED_COMMENT_DATASET_VALIDATED(ValidationStatus.labels[validation_status]))
     is_status_revocation = validation_status != ValidationStatus.PASSED and previous_status == ValidationStatus.PASSED # identifies dataset that get a passed status invalidation
     if validation_status == ValidationStatus.PASSED or is_status_revocation:
@@ -315,6 +334,7 @@ def set_dataset_release_status(dataset_id: int, readsets_release_status: dict[st
 
         try:
             release_status_timestamp = timezone.now()
+            readsets = list(readsets)
             for readset in readsets:
                 release_status = readsets_release_status[str(readset.id)]
                 previous_status = readset.release_status
@@ -326,7 +346,8 @@ def set_dataset_release_status(dataset_id: int, readsets_release_status: dict[st
                 else:
                     readset.release_status_timestamp = release_status_timestamp
                     readset.released_by = released_by
-                readset.save()
+                readset.updated_by = released_by
+                readset.updated_at = release_status_timestamp
                 is_status_revocation = release_status != ReleaseStatus.RELEASED and previous_status == ReleaseStatus.RELEASED
                 if release_status == ReleaseStatus.RELEASED:
                     readsets_released.append(readset)
@@ -334,14 +355,23 @@ def set_dataset_release_status(dataset_id: int, readsets_release_status: dict[st
                 elif is_status_revocation:
                     readsets_recalled.append(readset)
                 count_status += 1
+            # Only the release fields change and the statuses are validated above, a single update replaces the readset saves
+            Readset.objects.bulk_update(readsets, ["release_status", "release_status_timestamp", "released_by", "updated_by", "updated_at"])
+            if reversion.is_active():
+                for readset in readsets:
+                    reversion.add_to_revision(readset)
         except Exception as e:
             errors.append(f"Error updating release status: {e}")
             return None, errors, warnings
 
+        updated_datasets, errors_counters, warnings_counters = update_dataset_status_counters([dataset_obj.id])
+        if errors_counters:
+            errors.extend(errors_counters)
+            return None, errors, warnings
+
         # Validate that all release status are set (released or blocked) at once.
-        readsets = list(Readset.objects.filter(dataset=dataset_id).all())
-        readset_count = len(readsets)
-        unset_count = len([readset.id for readset in readsets if readset.release_status==ReleaseStatus.AVAILABLE])
+        readset_count = updated_datasets[0].readset_count
+        unset_count = updated_datasets[0].unreleased_count
         if unset_count > 0 and unset_count < readset_count:
             errors.append(f"Cannot set only a subset of a dataset readsets status.")
             return None, errors, warnings
@@ -366,7 +396,7 @@ def set_dataset_release_status(dataset_id: int, readsets_release_status: dict[st
 
 def create_validation_info_file(dataset_obj: Dataset, is_validation_revocation: bool = False):
     """
-    Once a dataset gets validated, creates a file that lists the deliverables to be transfered to the data delivery location.
+    Once a dataset gets validated, queues a file that lists the deliverables to be transfered to the data delivery location.
     
     Args:
         `dataset_obj`: Dataset that has passed validation.
@@ -409,24 +439,20 @@ def create_validation_info_file(dataset_obj: Dataset, is_validation_revocation:
     dataset_files = DatasetFile.objects.filter(readset__dataset=dataset_obj)
 
     for dataset_file in dataset_files:
-        file_definition = {"readset_id": dataset_file.readset.id, "filepath": dataset_file.file_path}
+        file_definition = {"readset_id": dataset_file.readset_id, "filepath": dataset_file.file_path}
         validated_data["files"][dataset_file.id] = file_definition
-    try:
-        # Create file with .tmp extension if it doesn't already exist
-        tmp_file_path = f"{file_path}.tmp"
-        with open(tmp_file_path, "x") as fp:
-            fp.write(json.dumps(validated_data, indent=4))    
-        # move file to final destination
-        rename(src=tmp_file_path, dst=file_path)
-    except Exception as err:
+    # The file is written by the trigger file worker once the transaction is committed
+    _, errors_queue, warnings_queue = queue_trigger_file(TriggerFileType.VALIDATION_INFO, file_path, validated_data)
+    if errors_queue:
         file_path = None
-        errors.append(f"Failed to create validation file trigger for Dataset {dataset_obj.id}. Error : {str(err)}.")
+        errors.append(f"Failed to create validation file trigger for Dataset {dataset_obj.id}. Error : {' '.join(errors_queue)}")
+    warnings.extend(warnings_queue)
 
     return file_path, errors, warnings
 
 def create_release_info_file(dataset_obj: Dataset, readsets_obj: List[Readset], is_release_revocation: bool = False):
     """
-    Once readsets in a dataset gets released, creates a file that lists the deliverables to be made available to the client.
+    Once readsets in a dataset gets released, queues a file that lists the deliverables to be made available to the client.
     
     Args:
         `dataset_obj`: Dataset that has data being released.
@@ -473,18 +499,14 @@ def create_release_info_file(dataset_obj: Dataset, readsets_obj: List[Readset],
     dataset_files = DatasetFile.objects.filter(readset__in=readsets_obj)
 
     for dataset_file in dataset_files:
-        file_definition = {"readset_id": dataset_file.readset.id, "filepath": dataset_file.file_path}
+        file_definition = {"readset_id": dataset_file.readset_id, "filepath": dataset_file.file_path}
         released_data["files"][dataset_file.id] = file_definition
-    try:
-        # Create file with .tmp extension if it doesn't already exist
-        tmp_file_path = f"{file_path}.tmp"
-        with open(tmp_file_path, "x") as fp:
-            fp.write(json.dumps(released_data, indent=4))
-        # move file to final destination
-        rename(src=tmp_file_path, dst=file_path)
-    except Exception as err:
+    # The file is written by the trigger file worker once the transaction is committed
+    _, errors_queue, warnings_queue = queue_trigger_file(TriggerFileType.RELEASE_INFO, file_path, released_data)
+    if errors_queue:
         file_path = None
-        errors.append(f"Failed to create release file trigger for Dataset {dataset_obj.id}. Error : {str(err)}.")
+        errors.append(f"Failed to create release file trigger for Dataset {dataset_obj.id}. Error : {' '.join(errors_queue)}")
+    warnings.extend(warnings_queue)
 
     return file_path, errors, warnings    
     
@@ -584,6 +606,7 @@ def ingest_run_validation_report(report_json):
                         errors.append(f"Dataset file for readset [{readset_name}] cannot be created : missing {'final_path' if file.get('final_path') is None else 'size'}.")
                         return (datasets, dataset_files, errors, warnings)
 
+        identity_match_entries = []
         for run_validation in report_json["run_validation"]:
             readset_obj = readset_by_name[run_validation["sample"]]
             _, newerrors, newwarnings = create_metrics_from_run_validation_data(readset=readset_obj,
@@ -615,12 +638,13 @@ def ingest_run_validation_report(report_json):
                         other_matching_site_ratio = other_match_values["percent_match"]
                         other_compared_sites = other_match_values["n_sites"]
                         matches_by_biosample_id[other_biosample_id] = {"matching_site_ratio": (Decimal(str(other_matching_site_ratio))/100).quantize(Decimal("0.00001")), "compared_sites": other_compared_sites}
-                        
-                errors_matches, warnings_matches = create_sample_identity_matches(tested_identity=tested_identity,
-                                                                                  matches_by_biosample_id=matches_by_biosample_id,
-                                                                                  readset_obj=readset_obj)
-                errors.extend(errors_matches)
-                warnings.extend(warnings_matches)
+
+                identity_match_entries.extend((tested_identity, matched_biosample_id, match_info, readset_obj)
+                                              for matched_biosample_id, match_info in matches_by_biosample_id.items())
+        # Identity matches of all the readsets are inserted together
+        errors_matches, warnings_matches = bulk_create_sample_identity_matches(identity_match_entries)
+        errors.extend(errors_matches)
+        warnings.extend(warnings_matches)
 
     else:
         errors.append("Experiment run ID missing.")
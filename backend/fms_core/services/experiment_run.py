@@ -1,17 +1,19 @@
 from datetime import datetime
 import os
-import json
 from django.utils import timezone
 from django.core.exceptions import ValidationError
 from django.conf import settings
+from django.db import transaction
 
 from fms_core.utils import make_timestamped_filename
 from fms_core.services.experiment_run_info import generate_run_info
 from ..models import ExperimentRun, ProcessMeasurement
+from ..models._constants import TriggerFileType
 
 from .process import create_process
 from .property_value import create_process_properties, create_process_measurement_properties
 from .sample import transfer_sample
+from .trigger_file import queue_trigger_file
 
 class LAUNCH_MODES():
     DEFAULT="DEFAULT"
@@ -162,6 +164,33 @@ def set_experiment_run_end_time(experiment_run_id: int = None):
     return experiment_run, errors, warnings
 
 
+def update_run_processing_completion_time(experiment_run: ExperimentRun):
+    """
+    Recompute and persist the run processing completion time of the experiment run. Must be called when the datasets
+    of the experiment run are created (the completion time of a run without run processing end time is the creation
+    of the dataset of its last lane).
+
+    Args:
+        `experiment_run`: Experiment run instance. It is updated in place.
+
+    Returns:
+        Returns the updated experiment run object, errors and warnings.
+    """
+    errors = []
+    warnings = []
+    if experiment_run is not None:
+        try:
+            experiment_run.run_processing_completion_time = experiment_run.compute_run_processing_completion_time()
+            # Derived data : do not create a new version of the experiment run
+            ExperimentRun.objects.filter(id=experiment_run.id).update(run_processing_completion_time=experiment_run.run_processing_completion_time)
+        except Exception as err:
+            errors.append(f"Failed to update the run processing completion time of experiment run {experiment_run.id}. {err}")
+    else:
+        errors.append(f"The experiment run is required.")
+
+    return experiment_run, errors, warnings
+
+
 def set_run_processing_start_time(experiment_run_id: int = None):
     """
     Sets the timers using current time on the experiment run instance matching the id given.
@@ -188,6 +217,7 @@ def set_run_processing_start_time(experiment_run_id: int = None):
             experiment_run.end_time = timestamp
         experiment_run.run_processing_start_time = timestamp
         experiment_run.run_processing_end_time = None # Make sure the run_processing_end_time is reset in case this is a run processing restart.
+        experiment_run.run_processing_completion_time = experiment_run.compute_run_processing_completion_time()
         experiment_run.save()
     else:
         errors.append(f"The experiment run ID is required.")
@@ -216,6 +246,7 @@ def set_run_processing_end_time(experiment_run_id: int = None):
         except ExperimentRun.DoesNotExist as e:
             errors.append(f"No experiment run with id {experiment_run_id} could be found.")
         experiment_run.run_processing_end_time = timestamp
+        experiment_run.run_processing_completion_time = experiment_run.compute_run_processing_completion_time()
         experiment_run.save()
     else:
         errors.append(f"The experiment run id is required.")
@@ -225,8 +256,9 @@ def set_run_processing_end_time(experiment_run_id: int = None):
 
 def start_experiment_run_processing(experiment_run_id, mode=LAUNCH_MODES.DEFAULT):
     '''
-    Generates a run info file for an experiment and drops it in a spool directory
-    watched by Tech Dev, which triggers run processing to be scheduled.
+    Generates a run info file for an experiment and queues it to be dropped in a spool directory
+    watched by Tech Dev, which triggers run processing to be scheduled. The file is written by
+    the trigger file worker (process_trigger_files) once the launch is committed.
 
     If the run info file is generated without error then the run_processing_launch_time
     timestamp is updated with the current date and time.
@@ -238,7 +270,7 @@ def start_experiment_run_processing(experiment_run_id, mode=LAUNCH_MODES.DEFAULT
               RELAUNCH = Allows only for a relaunch (run_processing_launch_time must not be None).
 
     Returns:
-        The path to the run info file that was created, and a list of errors and warnings.
+        The path to the run info file that was queued, and a list of errors and warnings.
     '''
     run_info = None
     errors = []
@@ -269,14 +301,19 @@ def start_experiment_run_processing(experiment_run_id, mode=LAUNCH_MODES.DEFAULT
 
             run_info_file_path = os.path.join(settings.RUN_INFO_OUTPUT_PATH, file_name)
 
-            with open(run_info_file_path, "w", encoding="utf-8") as file:
-                json.dump(run_info, file, indent=4)
-
-            experiment_run.run_processing_launch_time = timezone.now()
-            experiment_run.run_processing_start_time = None
-            experiment_run.run_processing_end_time = None
-            experiment_run.save()
+            # The run info file is written by the trigger file worker once the launch is committed
+            with transaction.atomic():
+                _, errors_queue, _ = queue_trigger_file(TriggerFileType.RUN_INFO, run_info_file_path, run_info)
+                if errors_queue:
+                    raise Exception(" ".join(errors_queue))
+
+                experiment_run.run_processing_launch_time = timezone.now()
+                experiment_run.run_processing_start_time = None
+                experiment_run.run_processing_end_time = None
+                experiment_run.run_processing_completion_time = experiment_run.compute_run_processing_completion_time()
+                experiment_run.save()
         except Exception as e:
+            run_info_file_path = None
             errors.append(f'Failed to write run info file. {str(e)}')
                
     return (run_info_file_path, errors, warnings)
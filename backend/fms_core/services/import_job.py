@@ -0,0 +1,204 @@
+import datetime
+import json
+import os
+import time
+import reversion
+
+from crum import impersonate
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.files import File
+from django.db import connections, transaction, DEFAULT_DB_ALIAS
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from rest_framework.utils.encoders import JSONEncoder
+
+from fms_core.db_router import mark_recent_write
+from fms_core.models import ImportJob
+from fms_core.models._constants import ImportJobStatus
+from fms_core.utils import make_timestamped_filename
+
+PROGRESS_UPDATE_INTERVAL = 2 # seconds
+RUNNING_JOB_TIMEOUT = datetime.timedelta(hours=6) # Jobs running longer were left behind by a worker that stopped
+
+def queue_import_job(importer_class, file, user: User):
+    """
+    Keeps the submitted template on disk and queues a job to import it in the background.
+
+    Args:
+        `importer_class`: Importer class (GenericImporter subclass) used for the submission.
+        `file`: Submitted template file.
+        `user`: User that submitted the template.
+
+    Returns:
+        Tuple with the queued import job (None on error), errors and warnings.
+    """
+    import_job = None
+    errors = []
+    warnings = []
+
+    if user is None:
+        errors.append("Missing user for the template submission.")
+    if file is None:
+        errors.append("Missing template file.")
+
+    if not errors:
+        file_name = os.path.basename(file.name)
+        job_file_name, _ = make_timestamped_filename(f"{user.username}_{file_name}")
+        file_path = os.path.join(settings.IMPORT_JOB_PATH, job_file_name)
+        try:
+            os.makedirs(settings.IMPORT_JOB_PATH, exist_ok=True)
+            with open(file_path, "xb") as output:
+                for chunk in file.chunks():
+                    output.write(chunk)
+            import_job = ImportJob.objects.create(importer=f"{importer_class.__module__}.{importer_class.__qualname__}",
+                                                  file_name=file_name,
+                                                  file_path=file_path,
+                                                  created_by=user)
+        except Exception as err:
+            errors.append(f"Failed to queue the template submission. Error : {str(err)}.")
+
+    return import_job, errors, warnings
+
+def _make_progress_reporter(import_job: ImportJob):
+    """
+    Creates a callback that updates the progress of an import job. The import runs in a transaction, so the progress is
+    written through a separate connection to be visible while the job is running. Updates are throttled.
+
+    Returns:
+        Tuple with the callback and the connection used (to be closed once the job is done).
+    """
+    progress_connection = connections.create_connection(DEFAULT_DB_ALIAS)
+    last_update = None
+
+    def report_progress(processed_row_count, row_count):
+        nonlocal last_update
+        now = time.monotonic()
+        if last_update is not None and now - last_update < PROGRESS_UPDATE_INTERVAL:
+            return
+        last_update = now
+        with progress_connection.cursor() as cursor:
+            cursor.execute(f"UPDATE {ImportJob._meta.db_table} SET processed_row_count = %s, row_count = %s WHERE id = %s",
+                           [processed_row_count, row_count, import_job.id])
+
+    return report_progress, progress_connection
+
+def _remove_job_file(import_job_id: int, file_path: str, log):
+    # Files of a job are only kept until the job reaches a final status (except the output file of a completed job)
+    try:
+        os.remove(file_path)
+    except FileNotFoundError:
+        pass
+    except OSError as err:
+        log.error(f"Could not remove file {file_path} of import job {import_job_id}. {err}")
+
+def run_import_job(import_job: ImportJob, log):
+    """
+    Imports the template of a job and records the result. The result has the same content as the one returned by
+    import_template, except the output file that is kept on disk (its name stays in the result).
+
+    Args:
+        `import_job`: Import job to run (status RUNNING).
+        `log`: active logger to keep informed on the import
+
+    Returns:
+        The import job once completed.
+    """
+    importer = import_string(import_job.importer)()
+    report_progress, progress_connection = _make_progress_reporter(import_job)
+    importer.progress_callback = report_progress
+    try:
+        # Same context as a submission request : objects are tracked and versioned under the submitter and
+        # an invalid submission is rolled back.
+        with open(import_job.file_path, "rb") as template_file, impersonate(import_job.created_by), reversion.create_revision():
+            reversion.set_user(import_job.created_by)
+            result = importer.import_template(file=File(template_file, name=import_job.file_name), dry_run=False, user=import_job.created_by)
+            if not result["valid"]:
+                transaction.set_rollback(True)
+        output_file = result.get("output_file")
+        if output_file:
+            output_file_path = os.path.join(settings.IMPORT_JOB_PATH, f"{import_job.id}_{output_file['name']}")
+            with open(output_file_path, "xb") as output:
+                output.write(output_file["content"])
+            import_job.output_file_path = output_file_path
+            result["output_file"] = {"name": output_file["name"]}
+        # Keep the result as the api would serialize it
+        import_job.result = json.loads(json.dumps(result, cls=JSONEncoder))
+        import_job.status = ImportJobStatus.SUCCEEDED if result["valid"] else ImportJobStatus.FAILED
+    except Exception as err:
+        log.error(f"Import job {import_job.id} interrupted. Transaction rolled back. {err}")
+        import_job.error = str(err)
+        import_job.status = ImportJobStatus.FAILED
+    finally:
+        progress_connection.close()
+
+    row_count = sum(len(sheet.rows) for sheet in importer.sheets.values())
+    import_job.row_count = row_count
+    import_job.processed_row_count = min(importer.handled_row_count, row_count)
+    import_job.completed_at = timezone.now()
+    # A job running past the timeout may have been failed by another worker (fail_stale_import_jobs), keep that status
+    completed_fields = ["status", "result", "error", "output_file_path", "row_count", "processed_row_count", "completed_at"]
+    recorded = ImportJob.objects.filter(id=import_job.id, status=ImportJobStatus.RUNNING) \
+                                .update(**{field: getattr(import_job, field) for field in completed_fields})
+    if not recorded:
+        log.error(f"Import job {import_job.id} completed after being failed as interrupted. Its result is not recorded.")
+        if import_job.output_file_path:
+            _remove_job_file(import_job.id, import_job.output_file_path, log)
+        import_job.refresh_from_db()
+    _remove_job_file(import_job.id, import_job.file_path, log)
+    # The submitter reads the imported objects from the default database until the replica catches up
+    mark_recent_write(import_job.created_by)
+    return import_job
+
+def fail_stale_import_jobs(log, timeout: datetime.timedelta = RUNNING_JOB_TIMEOUT):
+    """
+    Fails the import jobs that are still running after the timeout. Their worker stopped before recording the result
+    (the import transaction was rolled back with it). The jobs are not queued again since they could stop the next
+    worker the same way.
+
+    Args:
+        `log`: active logger to keep informed on the imports
+        `timeout`: Time after which a running job is considered abandoned. Defaults to RUNNING_JOB_TIMEOUT.
+
+    Returns:
+        Number of import jobs failed.
+    """
+    now = timezone.now()
+    stale_jobs = list(ImportJob.objects.filter(status=ImportJobStatus.RUNNING, started_at__lt=now - timeout).values_list("id", "file_path"))
+    failed_count = ImportJob.objects.filter(id__in=[job_id for job_id, _ in stale_jobs], status=ImportJobStatus.RUNNING) \
+                                    .update(status=ImportJobStatus.FAILED,
+                                            error=f"The import job was interrupted. It did not complete within {timeout}.",
+                                            completed_at=now)
+    if failed_count:
+        log.error(f"Failed {failed_count} import jobs running for more than {timeout}.")
+        for job_id, file_path in stale_jobs:
+            _remove_job_file(job_id, file_path, log)
+    return failed_count
+
+def process_import_job_queue(log, running_timeout: datetime.timedelta = RUNNING_JOB_TIMEOUT):
+    """
+    Runs the queued import jobs in submission order until the queue is empty. Each job is claimed in its own
+    transaction, jobs claimed by another worker are skipped. Jobs left running by a stopped worker are failed first.
+
+    Args:
+        `log`: active logger to keep informed on the imports
+        `running_timeout`: Time after which a running job is considered abandoned. Defaults to RUNNING_JOB_TIMEOUT.
+
+    Returns:
+        Number of import jobs run.
+    """
+    fail_stale_import_jobs(log, running_timeout)
+    processed_count = 0
+    while True:
+        with transaction.atomic():
+            import_job = ImportJob.objects.select_for_update(skip_locked=True).filter(status=ImportJobStatus.QUEUED).order_by("id").first()
+            if import_job is None:
+                break
+            import_job.status = ImportJobStatus.RUNNING
+            import_job.started_at = timezone.now()
+            import_job.save()
+        log.info(f"Running import job {import_job.id} ({import_job.file_name}).")
+        run_import_job(import_job, log)
+        log.info(f"Import job {import_job.id} completed with status {import_job.status}.")
+        processed_count += 1
+    return processed_count
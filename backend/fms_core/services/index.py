@@ -1,6 +1,14 @@
+from collections import defaultdict
+from itertools import combinations
+
+import reversion
+
 from fms_core.models import Index, IndexBySet, IndexSet, IndexStructure, Sequence, SequenceByIndex3Prime, SequenceByIndex5Prime
 from fms_core.models._constants import INDEX_READ_FORWARD, INDEX_READ_REVERSE, STANDARD_SEQUENCE_FIELD_LENGTH
+from fms_core.models.tracked_model import get_tracking_user
+from fms_core.utils import unique
 from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
 
 
 def get_index(name):
@@ -140,6 +148,99 @@ def get_or_create_index(index_name: str, index_structure: str, index_set: IndexS
     return index, created_entity, errors, warnings
 
 
+def bulk_create_indices(indices_data):
+    """
+    Create indices, their index sets, sequences and links using a fixed number of queries. Sequences are deduplicated
+    in memory and existing Sequence, Index and IndexSet rows are resolved with a single query each before the missing
+    rows and the link tables are bulk inserted.
+    Mirrors get_or_create_index: an index that already exists is only linked to the index set and its sequences are
+    left untouched. The data is expected to be validated beforehand (see IndexCreationHandler).
+
+    Args:
+        `indices_data`: List of dict with the keys `set_name`, `name`, `external_name`, `index_structure` (name),
+                        `index_3prime` and `index_5prime` (lists of sequence values).
+
+    Returns:
+        Tuple including a dict of the index instances by name, the list of created index names as well as a list of errors and warnings.
+    """
+    indices_by_name = {}
+    created_index_names = []
+    errors = []
+    warnings = []
+
+    user = get_tracking_user()
+    tracking = dict(created_by=user, updated_by=user)
+
+    set_names = unique(index_data["set_name"] for index_data in indices_data if index_data["set_name"])
+    index_names = unique(index_data["name"] for index_data in indices_data)
+    structure_names = unique(index_data["index_structure"] for index_data in indices_data)
+
+    index_structures_by_name = {structure.name: structure for structure in IndexStructure.objects.filter(name__in=structure_names)}
+    index_sets_by_name = {index_set.name: index_set for index_set in IndexSet.objects.filter(name__in=set_names)}
+    indices_by_name = {index.name: index for index in Index.objects.filter(name__in=index_names)}
+
+    new_indices = []
+    for index_data in indices_data:
+        if index_data["name"] not in indices_by_name:
+            index_structure = index_structures_by_name.get(index_data["index_structure"], None)
+            if index_structure is None:
+                errors.append(f"Invalid index structure {index_data['index_structure']} for index {index_data['name']}.")
+                continue
+            index = Index(name=index_data["name"],
+                          index_structure=index_structure,
+                          # Optional attributes
+                          **(dict(external_name=index_data["external_name"]) if index_data["external_name"] is not None else dict()),
+                          **tracking)
+            indices_by_name[index.name] = index
+            new_indices.append((index, index_data))
+
+    if errors:
+        return indices_by_name, created_index_names, errors, warnings
+
+    created_objects = []
+    try:
+        with transaction.atomic():
+            new_index_sets = [IndexSet(name=set_name, **tracking) for set_name in set_names if set_name not in index_sets_by_name]
+            created_objects.extend(IndexSet.objects.bulk_create(new_index_sets))
+            index_sets_by_name.update({index_set.name: index_set for index_set in new_index_sets})
+
+            created_objects.extend(Index.objects.bulk_create([index for index, _ in new_indices]))
+            created_index_names = [index.name for index, _ in new_indices]
+
+            # Sequences are shared between indices (and flankers), only insert the values that are not already known
+            sequence_values = unique(value for _, index_data in new_indices for value in [*index_data["index_3prime"], *index_data["index_5prime"]])
+            sequences_by_value = {sequence.value: sequence for sequence in Sequence.objects.filter(value__in=sequence_values)}
+            new_sequences = [Sequence(value=value, **tracking) for value in sequence_values if value not in sequences_by_value]
+            created_objects.extend(Sequence.objects.bulk_create(new_sequences))
+            sequences_by_value.update({sequence.value: sequence for sequence in new_sequences})
+
+            set_links = unique((indices_by_name[index_data["name"]], index_sets_by_name[index_data["set_name"]])
+                               for index_data in indices_data if index_data["set_name"])
+            existing_set_links = set(IndexBySet.objects.filter(index__in=[index for index, _ in set_links],
+                                                               index_set__in=[index_set for _, index_set in set_links])
+                                                       .values_list("index_id", "index_set_id"))
+            new_set_links = [IndexBySet(index=index, index_set=index_set, **tracking)
+                             for index, index_set in set_links if (index.id, index_set.id) not in existing_set_links]
+            created_objects.extend(IndexBySet.objects.bulk_create(new_set_links))
+
+            new_3prime_links = [SequenceByIndex3Prime(index=index, sequence=sequences_by_value[value], **tracking)
+                                for index, index_data in new_indices for value in unique(index_data["index_3prime"])]
+            created_objects.extend(SequenceByIndex3Prime.objects.bulk_create(new_3prime_links))
+            new_5prime_links = [SequenceByIndex5Prime(index=index, sequence=sequences_by_value[value], **tracking)
+                                for index, index_data in new_indices for value in unique(index_data["index_5prime"])]
+            created_objects.extend(SequenceByIndex5Prime.objects.bulk_create(new_5prime_links))
+    except IntegrityError as err:
+        created_index_names = []
+        errors.append(f"Indices could not be created. {err}")
+
+    # bulk_create bypasses save(), register the created instances in the ongoing revision ourselves
+    if not errors and reversion.is_active():
+        for created_object in created_objects:
+            reversion.add_to_revision(created_object)
+
+    return indices_by_name, created_index_names, errors, warnings
+
+
 def create_indices_3prime_by_sequence(index, index_3prime):
     indices_3prime_by_sequence = []
     errors = []
@@ -198,6 +299,142 @@ def _reverse_complement(sequence):
         return reversed_sequence.translate(reversed_sequence.maketrans("ATGCU", "TACGA"))
 
 
+def _prepare_indices_for_validation(indices, index_read_direction_5_prime, index_read_direction_3_prime, length_5_prime, length_3_prime):
+    """
+    Build the sequences (index + flanker in the read direction) compared for each index and determine the validation
+    length used for each index part. Shared by validate_indices and find_index_collisions.
+
+    Args:
+        `indices`: List of index object to be tested. Must not be empty.
+        `index_read_direction_5_prime`: Direction the 5 prime index is read in the sequencer.
+        `index_read_direction_3_prime`: Direction the 3 prime index is read in the sequencer.
+        `length_5_prime`: Requested 5 prime validation length. 0 to calculate it.
+        `length_3_prime`: Requested 3 prime validation length. 0 to calculate it.
+
+    Returns:
+        Tuple with the indices dict (keyed by index id), the 5 prime validation length, the 3 prime validation length,
+        a flag indicating if the lengths were calculated and the warnings.
+    """
+    warnings = []
+    validation_length_is_calculated = not any([length_5_prime, length_3_prime])
+    indices_dict = {}
+    for index in indices:
+        indices_dict[index.id] = {"obj": index}
+
+    # Calculate the length of the default indices.
+    # first get the length of each partial index and flanker in a tuple list
+    for index in indices:
+        index_dict = indices_dict[index.id]
+        # get flanker sequences
+        if index_read_direction_5_prime == INDEX_READ_FORWARD:
+            flanker_5_prime = index_dict["obj"].index_structure.flanker_5prime_forward.value
+        else:
+            flanker_5_prime = index_dict["obj"].index_structure.flanker_5prime_reverse.value
+        if index_read_direction_3_prime == INDEX_READ_FORWARD:
+            flanker_3_prime = index_dict["obj"].index_structure.flanker_3prime_forward.value
+        else:
+            flanker_3_prime = index_dict["obj"].index_structure.flanker_3prime_reverse.value
+
+        min_5prime_index_length = 0
+        max_5prime_index_length = STANDARD_SEQUENCE_FIELD_LENGTH * 2 # Assuming max size index and flanker
+        index_dict["actual_5prime_sequences"] = []
+        for sequence_5prime in (index_dict["obj"].list_5prime_sequences or [""]):
+            if index_read_direction_5_prime == INDEX_READ_FORWARD:
+                actual_5prime_sequence = sequence_5prime + flanker_5_prime
+            else:
+                actual_5prime_sequence = _reverse_complement(flanker_5_prime + sequence_5prime)
+            index_dict["actual_5prime_sequences"].append(actual_5prime_sequence)
+            min_5prime_index_length = max(min_5prime_index_length, len(sequence_5prime))
+            max_5prime_index_length = min(max_5prime_index_length, len(actual_5prime_sequence))
+        index_dict["min_index_5prime_length"] = min_5prime_index_length
+        index_dict["max_index_5prime_length"] = max_5prime_index_length
+
+        min_3prime_index_length = 0
+        max_3prime_index_length = STANDARD_SEQUENCE_FIELD_LENGTH * 2 # Assuming max size index and flanker
+        index_dict["actual_3prime_sequences"] = []
+        for sequence_3prime in (index_dict["obj"].list_3prime_sequences or [""]):
+            if index_read_direction_3_prime == INDEX_READ_FORWARD:
+                actual_3prime_sequence = sequence_3prime + flanker_3_prime
+            else:
+                actual_3prime_sequence = _reverse_complement(flanker_3_prime + sequence_3prime)
+            index_dict["actual_3prime_sequences"].append(actual_3prime_sequence)
+            min_3prime_index_length = max(min_3prime_index_length, len(sequence_3prime))
+            max_3prime_index_length = min(max_3prime_index_length, len(actual_3prime_sequence))
+        index_dict["min_index_3prime_length"] = min_3prime_index_length
+        index_dict["max_index_3prime_length"] = max_3prime_index_length
+        
+    # Min index length is used as comparison length
+    # Max index length is used to validate some errors (include length of index + flanker in the read direction)
+    # Parameter length supercede the calculated ones but a warning is sent if they do not match.
+
+    # get target min and max length
+    min_5prime_lengths = []
+    max_5prime_lengths = []
+    min_3prime_lengths = []
+    max_3prime_lengths = []
+    for index in indices:
+        index_dict = indices_dict[index.id]
+        min_5prime_lengths.append(index_dict["min_index_5prime_length"])
+        max_5prime_lengths.append(index_dict["max_index_5prime_length"])
+        min_3prime_lengths.append(index_dict["min_index_3prime_length"])
+        max_3prime_lengths.append(index_dict["max_index_3prime_length"])
+    target_min_5prime_length = max(min_5prime_lengths)
+    target_max_5prime_length = min(max_5prime_lengths)
+    target_min_3prime_length = max(min_3prime_lengths)
+    target_max_3prime_length = min(max_3prime_lengths)
+
+    # Check if both length are default value (0). This means we have to supply the length. Otherwise, validate the length given.
+    if not validation_length_is_calculated and (length_5_prime != target_min_5prime_length or length_3_prime != target_min_3prime_length):
+        warnings.append(("Calculated validation lengths (5 prime : {0}, 3 prime : {1}) are different than requested ones (5 prime : {2}, 3 prime : {3}).", [target_min_5prime_length, target_min_3prime_length, length_5_prime, length_3_prime]))
+        target_min_5prime_length = length_5_prime
+        target_min_3prime_length = length_3_prime
+
+    # Warning if the minimal required index length for some indices is larger than the maximal permitted length for other indices
+    # some indices do not support 5 prime index of this size (or at all).
+    if target_min_5prime_length > target_max_5prime_length:
+        # identify and list the problematic indices
+        indices_in_warning = list(filter(lambda x: x[1] < target_min_5prime_length, zip(indices, max_5prime_lengths)))
+        warnings.append(f"Indices in this list {[i.id for i, _ in indices_in_warning]} do not support 5 primes index of the required length ({target_min_5prime_length}).")
+    # some indices do not support 3 prime index of this size (or at all).
+    if target_min_3prime_length > target_max_3prime_length:
+        # identify and list the problematic indices
+        indices_in_warning = list(filter(lambda x: x[1] < target_min_3prime_length, zip(indices, max_3prime_lengths)))
+        warnings.append(f"Indices in this list {[i.id for i, _ in indices_in_warning]} do not support 3 primes index of the required length ({target_min_3prime_length}).")
+
+    # warning if the minimal required index length for some indices is larger than the requested index length : sub-optimal validation
+    indices_in_warning = list(filter(lambda x: x[1] > target_min_5prime_length, zip(indices, min_5prime_lengths)))
+    if indices_in_warning: # 5 prime
+        warnings.append(("Sub-optimal. Indices in this list {0} validate using a length ({1}) that is smaller than their sequence length ({2}).", [[i.id for i, _ in indices_in_warning], target_min_5prime_length, [length for _, length in indices_in_warning]]))
+    indices_in_warning = list(filter(lambda x: x[1] > target_min_3prime_length, zip(indices, min_3prime_lengths)))
+    if indices_in_warning: # 3 prime
+        warnings.append(("Sub-optimal. Indices in this list {0} validate using a length ({1}) that is smaller than their sequence length ({2}).", [[i.id for i, _ in indices_in_warning], target_min_3prime_length, [length for _, length in indices_in_warning]]))
+
+    # warning if the minimal required index length for some indices is larger than the minimal required index length for other indices
+    indices_in_warning = list(filter(lambda x: x[1] < target_min_5prime_length, zip(indices, min_5prime_lengths)))
+    if indices_in_warning: # 5 prime
+        warnings.append(("Indices in this list {0} have smaller 5 prime index length than the length used for validation ({1}).", [[i.id for i, _ in indices_in_warning], target_min_5prime_length]))
+    indices_in_warning = list(filter(lambda x: x[1] < target_min_3prime_length, zip(indices, min_3prime_lengths)))
+    if indices_in_warning: # 3 prime
+        warnings.append(("Indices in this list {0} have smaller 3 prime index length than the length used for validation ({1}).", [[i.id for i, _ in indices_in_warning], target_min_3prime_length]))
+
+    return indices_dict, target_min_5prime_length, target_min_3prime_length, validation_length_is_calculated, warnings
+
+
+def _min_hamming_distance(reference_sequences, validation_sequences, length):
+    """
+    Smallest hamming distance between any pair of sequences of 2 indices, using only the first `length` bases.
+    A length of 0 skips the comparison and returns a distance of 0.
+    """
+    min_distance = 0
+    if length: # if length 0 skip
+        min_distance = length # Best case scenario
+        for reference_sequence in reference_sequences:
+            for validation_sequence in validation_sequences:
+                distance = sum(base_reference != base_validation for base_reference, base_validation in zip(reference_sequence[:length], validation_sequence[:length]))
+                min_distance = min(min_distance, distance)
+    return min_distance
+
+
 # Test each listed index against each other, given the instrument type reading sense and the length provided for each index part.
 # If not provided (both 0) the length will be automatically calculated.
 def validate_indices(indices, index_read_direction_5_prime=INDEX_READ_FORWARD, index_read_direction_3_prime=INDEX_READ_FORWARD, length_5_prime=0, length_3_prime=0, threshold=None):
@@ -229,111 +466,14 @@ def validate_indices(indices, index_read_direction_5_prime=INDEX_READ_FORWARD, i
     errors = []
     warnings = []
     is_valid = True
-    # Preload indices and make sure they all exist
     validation_length_is_calculated = not any([length_5_prime, length_3_prime])
-    indices_dict = {}
-    # Make sure all indices exist and build a dict with the instances
-    for index in indices:
-        indices_dict[index.id] = {"obj": index}
 
     if len(indices) == 0:
         warnings.append(("No indices were provided for validation.", []))
     else:
-        # Calculate the length of the default indices.
-        # first get the length of each partial index and flanker in a tuple list
-        for index in indices:
-            index_dict = indices_dict[index.id]
-            # get flanker sequences
-            if index_read_direction_5_prime == INDEX_READ_FORWARD:
-                flanker_5_prime = index_dict["obj"].index_structure.flanker_5prime_forward.value
-            else:
-                flanker_5_prime = index_dict["obj"].index_structure.flanker_5prime_reverse.value
-            if index_read_direction_3_prime == INDEX_READ_FORWARD:
-                flanker_3_prime = index_dict["obj"].index_structure.flanker_3prime_forward.value
-            else:
-                flanker_3_prime = index_dict["obj"].index_structure.flanker_3prime_reverse.value
-
-            min_5prime_index_length = 0
-            max_5prime_index_length = STANDARD_SEQUENCE_FIELD_LENGTH * 2 # Assuming max size index and flanker
-            index_dict["actual_5prime_sequences"] = []
-            for sequence_5prime in (index_dict["obj"].list_5prime_sequences or [""]):
-                if index_read_direction_5_prime == INDEX_READ_FORWARD:
-                    actual_5prime_sequence = sequence_5prime + flanker_5_prime
-                else:
-                    actual_5prime_sequence = _reverse_complement(flanker_5_prime + sequence_5prime)
-                index_dict["actual_5prime_sequences"].append(actual_5prime_sequence)
-                min_5prime_index_length = max(min_5prime_index_length, len(sequence_5prime))
-                max_5prime_index_length = min(max_5prime_index_length, len(actual_5prime_sequence))
-            index_dict["min_index_5prime_length"] = min_5prime_index_length
-            index_dict["max_index_5prime_length"] = max_5prime_index_length
-
-            min_3prime_index_length = 0
-            max_3prime_index_length = STANDARD_SEQUENCE_FIELD_LENGTH * 2 # Assuming max size index and flanker
-            index_dict["actual_3prime_sequences"] = []
-            for sequence_3prime in (index_dict["obj"].list_3prime_sequences or [""]):
-                if index_read_direction_3_prime == INDEX_READ_FORWARD:
-                    actual_3prime_sequence = sequence_3prime + flanker_3_prime
-                else:
-                    actual_3prime_sequence = _reverse_complement(flanker_3_prime + sequence_3prime)
-                index_dict["actual_3prime_sequences"].append(actual_3prime_sequence)
-                min_3prime_index_length = max(min_3prime_index_length, len(sequence_3prime))
-                max_3prime_index_length = min(max_3prime_index_length, len(actual_3prime_sequence))
-            index_dict["min_index_3prime_length"] = min_3prime_index_length
-            index_dict["max_index_3prime_length"] = max_3prime_index_length
-            
-        # Min index length is used as comparison length
-        # Max index length is used to validate some errors (include length of index + flanker in the read direction)
-        # Parameter length supercede the calculated ones but a warning is sent if they do not match.
-
-        # get target min and max length
-        min_5prime_lengths = []
-        max_5prime_lengths = []
-        min_3prime_lengths = []
-        max_3prime_lengths = []
-        for index in indices:
-            index_dict = indices_dict[index.id]
-            min_5prime_lengths.append(index_dict["min_index_5prime_length"])
-            max_5prime_lengths.append(index_dict["max_index_5prime_length"])
-            min_3prime_lengths.append(index_dict["min_index_3prime_length"])
-            max_3prime_lengths.append(index_dict["max_index_3prime_length"])
-        target_min_5prime_length = max(min_5prime_lengths)
-        target_max_5prime_length = min(max_5prime_lengths)
-        target_min_3prime_length = max(min_3prime_lengths)
-        target_max_3prime_length = min(max_3prime_lengths)
-
-        # Check if both length are default value (0). This means we have to supply the length. Otherwise, validate the length given.
-        if not validation_length_is_calculated and (length_5_prime != target_min_5prime_length or length_3_prime != target_min_3prime_length):
-            warnings.append(("Calculated validation lengths (5 prime : {0}, 3 prime : {1}) are different than requested ones (5 prime : {2}, 3 prime : {3}).", [target_min_5prime_length, target_min_3prime_length, length_5_prime, length_3_prime]))
-            target_min_5prime_length = length_5_prime
-            target_min_3prime_length = length_3_prime
-
-        # Warning if the minimal required index length for some indices is larger than the maximal permitted length for other indices
-        # some indices do not support 5 prime index of this size (or at all).
-        if target_min_5prime_length > target_max_5prime_length:
-            # identify and list the problematic indices
-            indices_in_warning = list(filter(lambda x: x[1] < target_min_5prime_length, zip(indices, max_5prime_lengths)))
-            warnings.append(f"Indices in this list {[i.id for i, _ in indices_in_warning]} do not support 5 primes index of the required length ({target_min_5prime_length}).")
-        # some indices do not support 3 prime index of this size (or at all).
-        if target_min_3prime_length > target_max_3prime_length:
-            # identify and list the problematic indices
-            indices_in_warning = list(filter(lambda x: x[1] < target_min_3prime_length, zip(indices, max_3prime_lengths)))
-            warnings.append(f"Indices in this list {[i.id for i, _ in indices_in_warning]} do not support 3 primes index of the required length ({target_min_3prime_length}).")
-
-        # warning if the minimal required index length for some indices is larger than the requested index length : sub-optimal validation
-        indices_in_warning = list(filter(lambda x: x[1] > target_min_5prime_length, zip(indices, min_5prime_lengths)))
-        if indices_in_warning: # 5 prime
-            warnings.append(("Sub-optimal. Indices in this list {0} validate using a length ({1}) that is smaller than their sequence length ({2}).", [[i.id for i, _ in indices_in_warning], target_min_5prime_length, [length for _, length in indices_in_warning]]))
-        indices_in_warning = list(filter(lambda x: x[1] > target_min_3prime_length, zip(indices, min_3prime_lengths)))
-        if indices_in_warning: # 3 prime
-            warnings.append(("Sub-optimal. Indices in this list {0} validate using a length ({1}) that is smaller than their sequence length ({2}).", [[i.id for i, _ in indices_in_warning], target_min_3prime_length, [length for _, length in indices_in_warning]]))
-
-        # warning if the minimal required index length for some indices is larger than the minimal required index length for other indices
-        indices_in_warning = list(filter(lambda x: x[1] < target_min_5prime_length, zip(indices, min_5prime_lengths)))
-        if indices_in_warning: # 5 prime
-            warnings.append(("Indices in this list {0} have smaller 5 prime index length than the length used for validation ({1}).", [[i.id for i, _ in indices_in_warning], target_min_5prime_length]))
-        indices_in_warning = list(filter(lambda x: x[1] < target_min_3prime_length, zip(indices, min_3prime_lengths)))
-        if indices_in_warning: # 3 prime
-            warnings.append(("Indices in this list {0} have smaller 3 prime index length than the length used for validation ({1}).", [[i.id for i, _ in indices_in_warning], target_min_3prime_length]))
+        indices_dict, target_min_5prime_length, target_min_3prime_length, validation_length_is_calculated, preparation_warnings = \
+            _prepare_indices_for_validation(indices, index_read_direction_5_prime, index_read_direction_3_prime, length_5_prime, length_3_prime)
+        warnings.extend(preparation_warnings)
 
         # At this point we have the validation data loaded, validation length calculated and validated.
         # We will now proceed to calculate the hamming distance of the index.
@@ -353,22 +493,12 @@ def validate_indices(indices, index_read_direction_5_prime=INDEX_READ_FORWARD, i
                 index_dict_reference = indices_dict[index_reference.id]
                 for validation_count, index_validation in enumerate(indices[reference_count + 1:], reference_count + 1): # skip redundant calculations
                     index_dict_validation = indices_dict[index_validation.id]
-                    # 5 prime hamming
-                    min_distance_5prime = 0
-                    if validation_length_5prime: # if length 0 skip
-                        min_distance_5prime = validation_length_5prime # Best case scenario
-                        for index_5prime_reference in index_dict_reference["actual_5prime_sequences"]:
-                            for index_5prime_validation in index_dict_validation["actual_5prime_sequences"]:
-                                distance_5prime = sum(base_reference != base_validation for base_reference, base_validation in zip(index_5prime_reference[:validation_length_5prime], index_5prime_validation[:validation_length_5prime]))
-                                min_distance_5prime = min(min_distance_5prime, distance_5prime)
-                    # 3 prime hamming
-                    min_distance_3prime = 0
-                    if validation_length_3prime: # if length 0 skip
-                        min_distance_3prime = validation_length_3prime # Best case scenario
-                        for index_3prime_reference in index_dict_reference["actual_3prime_sequences"]:
-                            for index_3prime_validation in index_dict_validation["actual_3prime_sequences"]:
-                                distance_3prime = sum(base_reference != base_validation for base_reference, base_validation in zip(index_3prime_reference[:validation_length_3prime], index_3prime_validation[:validation_length_3prime]))
-                                min_distance_3prime = min(min_distance_3prime, distance_3prime)
+                    min_distance_5prime = _min_hamming_distance(index_dict_reference["actual_5prime_sequences"],
+                                                                index_dict_validation["actual_5prime_sequences"],
+                                                                validation_length_5prime)
+                    min_distance_3prime = _min_hamming_distance(index_dict_reference["actual_3prime_sequences"],
+                                                                index_dict_validation["actual_3prime_sequences"],
+                                                                validation_length_3prime)
                     if threshold is not None:
                         is_valid = is_valid and (min_distance_3prime > threshold or min_distance_5prime > threshold)
                     results["distances"][validation_count][reference_count] = tuple([min_distance_3prime, min_distance_5prime])
@@ -401,3 +531,88 @@ def validate_distance_matrix(distance_matrix, threshold: int):
                     list_collisions.append((i, j))
                 is_valid = is_valid and valid_distance
     return is_valid, list_collisions
+
+def _collision_block_keys(sequences, length, threshold):
+    """
+    Keys used to bucket candidate collisions for one index part. If 2 sequences of `length` bases differ by at most
+    `threshold` bases, at least one of `threshold` + 1 blocks of bases is identical (pigeonhole principle).
+    A length shorter or equal to the threshold cannot tell the sequences apart: every pair is a candidate.
+    """
+    if length <= threshold:
+        return {None}
+    block_count = threshold + 1
+    return {(block, sequence[length * block // block_count:length * (block + 1) // block_count])
+            for sequence in sequences for block in range(block_count)}
+
+
+def find_index_collisions(indices, index_read_direction_5_prime=INDEX_READ_FORWARD, index_read_direction_3_prime=INDEX_READ_FORWARD, length_5_prime=0, length_3_prime=0, threshold=0):
+    """
+    Find the pairs of indices that collide, using the same rules and validation lengths as validate_indices. Instead of
+    filling the full distance matrix, indices are bucketed by blocks of their sequences so that only pairs that can be
+    within the threshold are compared. Suited for large sets (vendor index kits, pools) where collisions are rare.
+
+    Args:
+        `indices`: List of index object to be tested. Prefetch sequences_3prime, sequences_5prime and the index structure
+                   flankers to avoid querying each index.
+        `index_read_direction_5_prime`: Direction the 5 prime index is read in the sequencer. Default to INDEX_READ_FORWARD.
+        `index_read_direction_3_prime`: Direction the 3 prime index is read in the sequencer. Default to INDEX_READ_FORWARD.
+        `length_5_prime`: Length the algorithm tests each 5 prime index. Default to the calculated value for given indices.
+        `length_3_prime`: Length the algorithm tests each 3 prime index. Default to the calculated value for given indices.
+        `threshold`: Number of differences (distance) allowed before calling a collision. Default to 0 (identical indices).
+
+    Returns:
+        Tuple with validation results, the errors and the warnings.
+        results : `validation_length_5prime`: Length used for validation 5 prime indices.
+                  `validation_length_3prime`: Length used for validation 3 prime indices.
+                  `threshold`: Distance used to declare validity.
+                  `collisions`: List of tuple (position of first index, position of second index, (distance 3 prime, distance 5 prime))
+                                where positions refer to the `indices` list and the first position is the smallest.
+                  `is_valid`: Boolean declaring validity (no collision).
+    """
+    results = {}
+    errors = []
+    warnings = []
+
+    if len(indices) == 0:
+        warnings.append(("No indices were provided for validation.", []))
+        results["collisions"] = []
+        results["is_valid"] = True
+        return (results, errors, warnings)
+
+    indices_dict, validation_length_5prime, validation_length_3prime, validation_length_is_calculated, preparation_warnings = \
+        _prepare_indices_for_validation(indices, index_read_direction_5_prime, index_read_direction_3_prime, length_5_prime, length_3_prime)
+    warnings.extend(preparation_warnings)
+
+    sequences_3prime = [indices_dict[index.id]["actual_3prime_sequences"] for index in indices]
+    sequences_5prime = [indices_dict[index.id]["actual_5prime_sequences"] for index in indices]
+
+    buckets = defaultdict(list)
+    unbounded = [] # Sequences shorter than the validation length are not compared on missing bases, they are tested against every index
+    for position in range(len(indices)):
+        if any(len(sequence) < validation_length_3prime for sequence in sequences_3prime[position]) or \
+           any(len(sequence) < validation_length_5prime for sequence in sequences_5prime[position]):
+            unbounded.append(position)
+            continue
+        for key_3prime in _collision_block_keys(sequences_3prime[position], validation_length_3prime, threshold):
+            for key_5prime in _collision_block_keys(sequences_5prime[position], validation_length_5prime, threshold):
+                buckets[(key_3prime, key_5prime)].append(position)
+
+    candidates = set()
+    for positions in buckets.values():
+        candidates.update(combinations(positions, 2))
+    for position in unbounded:
+        candidates.update((min(position, other), max(position, other)) for other in range(len(indices)) if other != position)
+
+    collisions = []
+    for position_reference, position_validation in sorted(candidates):
+        distance_3prime = _min_hamming_distance(sequences_3prime[position_reference], sequences_3prime[position_validation], validation_length_3prime)
+        distance_5prime = _min_hamming_distance(sequences_5prime[position_reference], sequences_5prime[position_validation], validation_length_5prime)
+        if distance_3prime <= threshold and distance_5prime <= threshold:
+            collisions.append((position_reference, position_validation, (distance_3prime, distance_5prime)))
+
+    results["validation_length_5prime"] = validation_length_5prime
+    results["validation_length_3prime"] = validation_length_3prime
+    results["threshold"] = threshold
+    results["collisions"] = collisions
+    results["is_valid"] = not collisions
+    return (results, errors, warnings)
@@ -0,0 +1,327 @@
+from decimal import Decimal
+from typing import Optional, Sequence
+
+from fms_core.models import Sample
+from fms_core.services.library import convert_library_concentration_from_nm_to_ngbyul, convert_library_concentration_from_ngbyul_to_nm
+from fms_core.utils import decimal_rounded_to_precision, float_to_decimal
+
+# Volume calculations of the normalization and pooling planning. The calculations are made for a whole plate at once,
+# each argument being a column of values (one value by row). The planning row handlers use them with single row columns
+# so the templates, the robot files and the planning API all share the same rules and rounding.
+
+NORMALIZATION_VALID = "valid"
+NORMALIZATION_INSUFFICIENT_CONCENTRATION = "insufficient_concentration"
+NORMALIZATION_INSUFFICIENT_INPUT = "insufficient_input"
+
+DEFAULT_NORMALIZATION_TOLERANCE = Decimal("0.1") # Same default tolerance as validate_normalization
+
+def _validate_columns(**columns):
+    errors = []
+    lengths = {name: len(column) for name, column in columns.items() if column is not None}
+    if len(set(lengths.values())) > 1:
+        errors.append(f"All the columns must have the same number of rows ({', '.join(f'{name}: {length}' for name, length in lengths.items())}).")
+    for name, column in columns.items():
+        if column is not None and name not in ("manual_diluent_volumes", "requested_inputs") and any(value is None for value in column):
+            errors.append(f"Column {name} has missing values.")
+    return errors
+
+def _validate_positive(name, column):
+    return [f"Column {name} must only have values greater than 0."] if any(value is not None and value <= 0 for value in column) else []
+
+def compute_normalization(initial_volumes: Sequence[Decimal],
+                          initial_concentrations: Sequence[Decimal],
+                          final_volumes: Sequence[Decimal],
+                          requested_concentrations: Sequence[Decimal],
+                          requested_inputs: Optional[Sequence[Optional[Decimal]]] = None,
+                          manual_diluent_volumes: Optional[Sequence[Optional[Decimal]]] = None,
+                          tolerance: Decimal = DEFAULT_NORMALIZATION_TOLERANCE):
+    """
+    Computes the normalization of a list of samples. The requested input (requested concentration times final volume)
+    is compared to the available input (sample concentration times volume). If the requested concentration is higher
+    than the sample concentration, or if there is not enough material, as much sample volume as possible is used and
+    the concentration is adjusted. The manual diluent volume is removed from the diluent added by the robot, reducing
+    the sample volume used (and the concentration) if needed.
+
+    Args:
+        `initial_volumes`: Volume of each source sample (uL).
+        `initial_concentrations`: Concentration of each source sample (ng/uL).
+        `final_volumes`: Final volume of each normalized sample (uL).
+        `requested_concentrations`: Requested concentration of each normalized sample (ng/uL).
+        `requested_inputs`: Optional requested quantity (ng) of each normalized sample, when it was given instead of a
+                            concentration. Defaults to the requested concentration times the final volume.
+        `manual_diluent_volumes`: Optional volume of diluent added manually to each normalized sample (uL).
+        `tolerance`: Difference allowed between the requested concentration and the computed concentration (see
+                     validate_normalization).
+
+    Returns:
+        Tuple with the results, the errors and the warnings. The results are columns (lists, one value by row):
+        `volume_used`: Volume of source sample used (uL, rounded to precision).
+        `volume_diluent`: Volume of diluent to be added by the robot (uL, rounded to precision, 0 or more).
+        `final_volume`: Final volume (uL, rounded to precision).
+        `concentration`: Concentration of the normalized sample (ng/uL, not rounded).
+        `status`: NORMALIZATION_VALID, NORMALIZATION_INSUFFICIENT_CONCENTRATION or NORMALIZATION_INSUFFICIENT_INPUT.
+        `diluent_adjusted`: True if the sample volume used was reduced to make room for the manual diluent.
+        `is_valid`: True if the computed concentration is within tolerance of the requested concentration.
+    """
+    results = {}
+    warnings = []
+
+    errors = _validate_columns(initial_volumes=initial_volumes,
+                               initial_concentrations=initial_concentrations,
+                               final_volumes=final_volumes,
+                               requested_concentrations=requested_concentrations,
+                               requested_inputs=requested_inputs,
+                               manual_diluent_volumes=manual_diluent_volumes)
+    if not errors:
+        errors.extend(_validate_positive("final_volumes", final_volumes))
+    if errors:
+        return (results, errors, warnings)
+
+    row_count = len(initial_volumes)
+    requested_inputs = requested_inputs if requested_inputs is not None else [None] * row_count
+    manual_diluent_volumes = manual_diluent_volumes if manual_diluent_volumes is not None else [None] * row_count
+    for column in ["volume_used", "volume_diluent", "final_volume", "concentration", "status", "diluent_adjusted", "is_valid"]:
+        results[column] = []
+
+    for (initial_volume, initial_concentration, final_volume, requested_concentration,
+         requested_input, manual_diluent_volume) in zip(initial_volumes, initial_concentrations, final_volumes,
+                                                        requested_concentrations, requested_inputs, manual_diluent_volumes):
+        if requested_input is None:
+            requested_input = final_volume * requested_concentration
+        available_input = initial_volume * initial_concentration
+
+        # Requested concentration cannot be reached by dilution
+        if requested_concentration > initial_concentration:
+            volume_used = min(initial_volume, final_volume)
+            concentration = (volume_used / final_volume) * initial_concentration
+            status = NORMALIZATION_INSUFFICIENT_CONCENTRATION
+        # Not enough material
+        elif requested_input > available_input:
+            volume_used = initial_volume
+            concentration = (volume_used / final_volume) * initial_concentration
+            status = NORMALIZATION_INSUFFICIENT_INPUT
+        else:
+            volume_used = requested_input / initial_concentration
+            concentration = requested_concentration
+            status = NORMALIZATION_VALID
+
+        diluent_adjusted = False
+        if manual_diluent_volume:
+            volume_diluent = (final_volume - volume_used) - manual_diluent_volume
+            if volume_diluent < 0:
+                volume_used = volume_used + volume_diluent
+                concentration = (volume_used / final_volume) * initial_concentration
+                diluent_adjusted = True
+        else:
+            volume_diluent = final_volume - volume_used
+
+        volume_used = decimal_rounded_to_precision(volume_used)
+        computed_concentration = (initial_concentration * volume_used) / final_volume
+        results["volume_used"].append(volume_used)
+        results["volume_diluent"].append(max(decimal_rounded_to_precision(volume_diluent), Decimal("0.000")))
+        results["final_volume"].append(decimal_rounded_to_precision(final_volume))
+        results["concentration"].append(concentration)
+        results["status"].append(status)
+        results["diluent_adjusted"].append(diluent_adjusted)
+        results["is_valid"].append(abs(computed_concentration - requested_concentration) <= tolerance)
+
+    return (results, errors, warnings)
+
+def compute_pooling(initial_volumes: Sequence[Decimal],
+                    initial_concentrations: Sequence[Decimal],
+                    requested_quantities: Sequence[Decimal]):
+    """
+    Computes the volume of each sample to pool to reach the requested quantity of material. Samples that do not have
+    enough material are used completely.
+
+    Args:
+        `initial_volumes`: Volume of each source sample (uL).
+        `initial_concentrations`: Concentration of each source sample (ng/uL).
+        `requested_quantities`: Quantity of material requested from each source sample (ng).
+
+    Returns:
+        Tuple with the results, the errors and the warnings. The results are columns (lists, one value by row):
+        `volume_used`: Volume of source sample used (uL, rounded to precision when enough material is available).
+        `available_quantity`: Quantity of material of the source sample (ng).
+        `is_sufficient`: True if the source sample has enough material.
+    """
+    results = {}
+    warnings = []
+
+    errors = _validate_columns(initial_volumes=initial_volumes,
+                               initial_concentrations=initial_concentrations,
+                               requested_quantities=requested_quantities)
+    if not errors:
+        errors.extend(_validate_positive("initial_concentrations", initial_concentrations))
+    if errors:
+        return (results, errors, warnings)
+
+    for column in ["volume_used", "available_quantity", "is_sufficient"]:
+        results[column] = []
+
+    for initial_volume, initial_concentration, requested_quantity in zip(initial_volumes, initial_concentrations, requested_quantities):
+        available_quantity = initial_volume * initial_concentration
+        is_sufficient = available_quantity >= requested_quantity
+        results["volume_used"].append(decimal_rounded_to_precision(requested_quantity / initial_concentration) if is_sufficient else initial_volume)
+        results["available_quantity"].append(available_quantity)
+        results["is_sufficient"].append(is_sufficient)
+
+    return (results, errors, warnings)
+
+def _planning_decimal(row, key):
+    value = row.get(key, None)
+    return float_to_decimal(value) if value is not None and value != "" else None
+
+def _planning_sample_id(row):
+    # Ids are posted as numbers or as strings of digits. Anything else cannot name a sample.
+    value = row.get("sample_id", None)
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.strip().isdigit():
+        return int(value)
+    return None
+
+def plan_normalization(rows: Sequence[dict]):
+    """
+    Computes the normalization of a list of samples before any template is generated (what-if planning). Each row names
+    a sample and a single normalization option, as in the normalization planning template.
+
+    Args:
+        `rows`: List of dict with the keys sample_id, final_volume (uL), one of concentration_ngul, concentration_nm or
+                na_quantity (ng) and optionally manual_diluent_volume (uL).
+
+    Returns:
+        Tuple with the planned rows (the sample id with the computed values of compute_normalization, the concentration
+        being rounded and also given in nM when requested in nM), the errors and the warnings.
+    """
+    planned_rows = []
+    errors = []
+    warnings = []
+
+    sample_ids = [_planning_sample_id(row) for row in rows]
+    samples_by_id = Sample.objects.in_bulk([sample_id for sample_id in sample_ids if sample_id is not None])
+    columns = {"initial_volumes": [], "initial_concentrations": [], "final_volumes": [],
+               "requested_concentrations": [], "requested_inputs": [], "manual_diluent_volumes": []}
+    for i, (row, sample_id) in enumerate(zip(rows, sample_ids), start=1):
+        try:
+            final_volume = _planning_decimal(row, "final_volume")
+            options = {key: _planning_decimal(row, key) for key in ["concentration_ngul", "concentration_nm", "na_quantity"]}
+            manual_diluent_volume = _planning_decimal(row, "manual_diluent_volume")
+        except (TypeError, ValueError):
+            errors.append(f"Row {i}: Volumes, concentrations and quantities must be numbers.")
+            continue
+        if sample_id is None:
+            errors.append(f"Row {i}: A sample id is required and must be an integer.")
+            continue
+        sample = samples_by_id.get(sample_id, None)
+        if sample is None:
+            errors.append(f"Row {i}: Sample {sample_id} not found.")
+            continue
+        if sample.concentration is None:
+            errors.append(f"Row {i}: Sample {sample.name} needs a known concentration to be normalized.")
+            continue
+        if final_volume is None:
+            errors.append(f"Row {i}: A final volume is required.")
+            continue
+        if final_volume <= 0:
+            errors.append(f"Row {i}: Final volume must be greater than 0.")
+            continue
+        if sum(value is not None for value in options.values()) != 1:
+            errors.append(f"Row {i}: Only one option must be specified out of the following: NA quantity, conc. ng/uL or conc. nM.")
+            continue
+        if any(value is not None and value < 0 for value in [*options.values(), manual_diluent_volume]):
+            errors.append(f"Row {i}: Concentrations, quantities and manual diluent volume cannot be negative.")
+            continue
+
+        requested_input = None
+        if options["concentration_ngul"] is not None:
+            requested_concentration = options["concentration_ngul"]
+        elif options["concentration_nm"] is not None:
+            requested_concentration, conversion_errors, _ = convert_library_concentration_from_nm_to_ngbyul(sample, options["concentration_nm"])
+            if conversion_errors or requested_concentration is None:
+                errors.extend(f"Row {i}: {error}" for error in conversion_errors or ["Concentration could not be converted from nM to ng/uL."])
+                continue
+            requested_concentration = Decimal(requested_concentration)
+        else:
+            requested_input = options["na_quantity"]
+            requested_concentration = requested_input / final_volume
+
+        planned_rows.append({"sample_id": sample.id, "concentration_nm": options["concentration_nm"], "sample": sample})
+        columns["initial_volumes"].append(sample.volume)
+        columns["initial_concentrations"].append(sample.concentration)
+        columns["final_volumes"].append(final_volume)
+        columns["requested_concentrations"].append(requested_concentration)
+        columns["requested_inputs"].append(requested_input)
+        columns["manual_diluent_volumes"].append(manual_diluent_volume)
+
+    if errors:
+        return ([], errors, warnings)
+
+    results, errors, warnings = compute_normalization(**columns)
+    if errors:
+        return ([], errors, warnings)
+
+    for i, planned_row in enumerate(planned_rows):
+        sample = planned_row.pop("sample")
+        concentration = results["concentration"][i]
+        if planned_row["concentration_nm"] is not None:
+            concentration_nm, conversion_errors, _ = convert_library_concentration_from_ngbyul_to_nm(sample, concentration)
+            planned_row["concentration_nm"] = decimal_rounded_to_precision(concentration_nm) if not conversion_errors else None
+        planned_row.update({key: results[key][i] for key in ["volume_used", "volume_diluent", "final_volume", "status", "diluent_adjusted", "is_valid"]})
+        planned_row["concentration"] = decimal_rounded_to_precision(concentration)
+    return (planned_rows, errors, warnings)
+
+def plan_pooling(rows: Sequence[dict]):
+    """
+    Computes the volume of each sample to pool before any template is generated (what-if planning).
+
+    Args:
+        `rows`: List of dict with the keys sample_id and na_quantity (ng requested from the sample).
+
+    Returns:
+        Tuple with the planned rows (the sample id with the computed values of compute_pooling), the errors and the warnings.
+    """
+    planned_rows = []
+    errors = []
+    warnings = []
+
+    sample_ids = [_planning_sample_id(row) for row in rows]
+    samples_by_id = Sample.objects.in_bulk([sample_id for sample_id in sample_ids if sample_id is not None])
+    columns = {"initial_volumes": [], "initial_concentrations": [], "requested_quantities": []}
+    for i, (row, sample_id) in enumerate(zip(rows, sample_ids), start=1):
+        try:
+            requested_quantity = _planning_decimal(row, "na_quantity")
+        except (TypeError, ValueError):
+            errors.append(f"Row {i}: Quantities must be numbers.")
+            continue
+        if sample_id is None:
+            errors.append(f"Row {i}: A sample id is required and must be an integer.")
+            continue
+        sample = samples_by_id.get(sample_id, None)
+        if sample is None:
+            errors.append(f"Row {i}: Sample {sample_id} not found.")
+            continue
+        if sample.concentration is None:
+            errors.append(f"Row {i}: Sample {sample.name} needs a known concentration to be pooled.")
+            continue
+        if requested_quantity is None:
+            errors.append(f"Row {i}: A nucleic acid quantity is required to pool sample.")
+            continue
+        if requested_quantity < 0:
+            errors.append(f"Row {i}: Quantities cannot be negative.")
+            continue
+        planned_rows.append({"sample_id": sample.id})
+        columns["initial_volumes"].append(sample.volume)
+        columns["initial_concentrations"].append(sample.concentration)
+        columns["requested_quantities"].append(requested_quantity)
+
+    if errors:
+        return ([], errors, warnings)
+
+    results, errors, warnings = compute_pooling(**columns)
+    if errors:
+        return ([], errors, warnings)
+
+    for i, planned_row in enumerate(planned_rows):
+        planned_row.update({key: results[key][i] for key in ["volume_used", "available_quantity", "is_sufficient"]})
+    return (planned_rows, errors, warnings)
@@ -0,0 +1,109 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set
+
+from fms_core.models import Container, Sample
+
+from ..containers import CONTAINER_KIND_SPECS
+from ..coordinates import ROW
+
+def get_occupied_coordinates(containers: Iterable[Container]) -> Dict[int, Set[str]]:
+    """
+    Lists the coordinates used by the samples and the child containers of a set of containers.
+    Occupancy is read with a single query for the samples and a single query for the child containers.
+
+    Args:
+        `containers`: Containers for which the occupied coordinates are listed.
+
+    Returns:
+        A dict of the occupied coordinate names by container id. Every container is a key of the dict.
+    """
+    container_ids = [container.id for container in containers]
+    occupied_coordinates_by_container_id = {container_id: set() for container_id in container_ids}
+
+    samples = Sample.objects.filter(container_id__in=container_ids, coordinate__isnull=False).values_list("container_id", "coordinate__name")
+    children = Container.objects.filter(location_id__in=container_ids, coordinate__isnull=False).values_list("location_id", "coordinate__name")
+    for container_id, coordinate_name in [*samples, *children]:
+        occupied_coordinates_by_container_id[container_id].add(coordinate_name)
+
+    return occupied_coordinates_by_container_id
+
+def get_free_coordinates(containers: Iterable[Container], occupied_coordinates_by_container_id: Optional[Dict[int, Iterable[str]]] = None, axis: str = ROW):
+    """
+    Lists the free coordinates of a set of destination containers, using the precomputed coordinate lattice of the container specs.
+
+    Args:
+        `containers`: Destination containers. Each container must have a coordinate system.
+        `occupied_coordinates_by_container_id`: Optional coordinates by container id that are considered occupied in addition
+                                                to the ones used in the database (eg. coordinates planned for other transfers).
+        `axis`: Order in which the free coordinates are listed. ROW (A01, A02, ...) or COLUMN (A01, B01, ...). Defaults to ROW.
+
+    Returns:
+        Tuple with a dict of the ordered list of free coordinate names by container id, the errors and the warnings.
+    """
+    free_coordinates_by_container_id = {}
+    errors = []
+    warnings = []
+
+    containers = list(containers)
+    for container in containers:
+        if not CONTAINER_KIND_SPECS[container.kind].requires_coordinates:
+            errors.append(f"Container {container.barcode} of kind {container.kind} has no coordinates to place samples into.")
+    if errors:
+        return (free_coordinates_by_container_id, errors, warnings)
+
+    occupied_by_container_id = defaultdict(set, get_occupied_coordinates(containers))
+    for container_id, coordinates in (occupied_coordinates_by_container_id or {}).items():
+        occupied_by_container_id[container_id].update(coordinates)
+
+    for container in containers:
+        lattice = CONTAINER_KIND_SPECS[container.kind].coordinate_lattice
+        occupied = occupied_by_container_id[container.id]
+        free_coordinates_by_container_id[container.id] = [coordinate for coordinate in lattice.ordered(axis) if coordinate not in occupied]
+
+    return (free_coordinates_by_container_id, errors, warnings)
+
+def plan_placement(containers: Iterable[Container], sample_count: int, occupied_coordinates_by_container_id: Optional[Dict[int, Iterable[str]]] = None, axis: str = ROW):
+    """
+    Plans the placement of a number of samples into a set of destination containers. Containers are filled in the given order
+    and the free coordinates of each container are used following the requested axis.
+
+    Args:
+        `containers`: Ordered destination containers. Each container must have a coordinate system.
+        `sample_count`: Number of samples to place.
+        `occupied_coordinates_by_container_id`: Optional coordinates by container id that are considered occupied in addition
+                                                to the ones used in the database.
+        `axis`: Order in which the coordinates of a container are filled. ROW (A01, A02, ...) or COLUMN (A01, B01, ...). Defaults to ROW.
+
+    Returns:
+        Tuple with the list of placements (dict with the container and the ordered list of coordinate names assigned to it, only
+        for the containers that receive samples), the errors and the warnings.
+    """
+    placements: List[dict] = []
+    errors = []
+    warnings = []
+
+    if sample_count < 0:
+        errors.append(f"Cannot place a negative number of samples ({sample_count}).")
+        return (placements, errors, warnings)
+
+    containers = list(containers)
+    free_coordinates_by_container_id, errors, warnings = get_free_coordinates(containers, occupied_coordinates_by_container_id, axis)
+    if errors:
+        return (placements, errors, warnings)
+
+    remaining = sample_count
+    for container in containers:
+        if remaining == 0:
+            break
+        coordinates = free_coordinates_by_container_id[container.id][:remaining]
+        if coordinates:
+            placements.append({"container": container, "coordinates": coordinates})
+            remaining -= len(coordinates)
+
+    if remaining > 0:
+        available = sample_count - remaining
+        errors.append(f"Not enough free coordinates in the destination containers to place {sample_count} samples "
+                      f"({available} available).")
+        placements = []
+
+    return (placements, errors, warnings)
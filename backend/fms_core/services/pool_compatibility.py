@@ -0,0 +1,161 @@
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from fms_core.models import DerivedBySample
+from fms_core.models._constants import INDEX_READ_FORWARD
+from fms_core.services.index import find_index_collisions
+
+# Index compatibility of the pools of a template. The libraries of all the pools are loaded at once and each pool is
+# checked with find_index_collisions, that only compares the pairs of indices that can be within the threshold.
+
+LIBRARY_INDEX_RELATED_FIELDS = ["derived_sample__library__index__index_structure__flanker_3prime_forward",
+                                "derived_sample__library__index__index_structure__flanker_3prime_reverse",
+                                "derived_sample__library__index__index_structure__flanker_5prime_forward",
+                                "derived_sample__library__index__index_structure__flanker_5prime_reverse"]
+
+def load_pool_libraries(sample_ids_by_pool: Dict[str, List[int]]):
+    """
+    Load the index and the sample name of each library of the samples to pool, in a fixed number of queries.
+
+    Args:
+        `sample_ids_by_pool`: List of the ids of the samples to pool, by pool name.
+
+    Returns:
+        Tuple with the list of indices and the matching list of sample names, by pool name. Samples that are not
+        libraries are skipped.
+    """
+    sample_ids = {sample_id for sample_ids in sample_ids_by_pool.values() for sample_id in sample_ids}
+    derived_by_samples = (DerivedBySample.objects.filter(sample_id__in=sample_ids, derived_sample__library__isnull=False)
+                                                 .select_related("sample", *LIBRARY_INDEX_RELATED_FIELDS)
+                                                 .prefetch_related("derived_sample__library__index__sequences_3prime",
+                                                                   "derived_sample__library__index__sequences_5prime")
+                                                 .order_by("sample_id", "derived_sample_id"))
+    libraries_by_sample = defaultdict(list)
+    for derived_by_sample in derived_by_samples:
+        libraries_by_sample[derived_by_sample.sample_id].append((derived_by_sample.derived_sample.library.index, derived_by_sample.sample.name))
+
+    indices_by_pool = {}
+    samples_name_by_pool = {}
+    for pool_name, pool_sample_ids in sample_ids_by_pool.items():
+        libraries = [library for sample_id in pool_sample_ids for library in libraries_by_sample[sample_id]]
+        indices_by_pool[pool_name] = [index for index, _ in libraries]
+        samples_name_by_pool[pool_name] = [sample_name for _, sample_name in libraries]
+    return indices_by_pool, samples_name_by_pool
+
+def check_pool_compatibility(sample_ids_by_pool: Dict[str, List[int]],
+                             index_read_direction_5_prime=INDEX_READ_FORWARD,
+                             index_read_direction_3_prime=INDEX_READ_FORWARD,
+                             threshold: int = 0,
+                             warning_threshold: Optional[int] = None):
+    """
+    Find the indices that collide in each pool.
+
+    Args:
+        `sample_ids_by_pool`: List of the ids of the samples to pool, by pool name.
+        `index_read_direction_5_prime`: Direction the 5 prime index is read in the sequencer. Default to INDEX_READ_FORWARD.
+        `index_read_direction_3_prime`: Direction the 3 prime index is read in the sequencer. Default to INDEX_READ_FORWARD.
+        `threshold`: Number of differences (distance) allowed before calling a collision.
+        `warning_threshold`: Optional larger distance under which indices are reported as too close (not a collision).
+
+    Returns:
+        Tuple with the results by pool name, the errors and the warnings.
+        results : `is_valid`: Boolean declaring the pool free of collision.
+                  `validation_length_5prime`: Length used for validation 5 prime indices.
+                  `validation_length_3prime`: Length used for validation 3 prime indices.
+                  `collisions`: List of colliding pairs, as dict with index_reference, sample_reference, index_validation,
+                                sample_validation (index and sample name) and distance (distance 3 prime, distance 5 prime).
+                  `close_pairs`: Same as collisions for the pairs within the warning threshold that do not collide.
+                  `indices` and `samples_name`: Indices of the pool and the matching sample names.
+    """
+    results = {}
+    errors = []
+    warnings = []
+
+    indices_by_pool, samples_name_by_pool = load_pool_libraries(sample_ids_by_pool)
+    search_threshold = max(threshold, warning_threshold) if warning_threshold is not None else threshold
+    for pool_name, indices in indices_by_pool.items():
+        samples_name = samples_name_by_pool[pool_name]
+        pool_results, pool_errors, _ = find_index_collisions(indices=indices,
+                                                             index_read_direction_5_prime=index_read_direction_5_prime,
+                                                             index_read_direction_3_prime=index_read_direction_3_prime,
+                                                             threshold=search_threshold)
+        errors.extend(pool_errors)
+        collisions = []
+        close_pairs = []
+        # Pairs are listed with the last index first, like the lower half of the validate_indices distance matrix
+        for position_first, position_last, distance in sorted(pool_results["collisions"], key=lambda collision: (collision[1], collision[0])):
+            pair = {"index_reference": indices[position_last], "sample_reference": samples_name[position_last],
+                    "index_validation": indices[position_first], "sample_validation": samples_name[position_first],
+                    "distance": distance}
+            if all(part_distance <= threshold for part_distance in distance):
+                collisions.append(pair)
+            else:
+                close_pairs.append(pair)
+        results[pool_name] = {"is_valid": not collisions,
+                              "validation_length_5prime": pool_results.get("validation_length_5prime", None),
+                              "validation_length_3prime": pool_results.get("validation_length_3prime", None),
+                              "collisions": collisions,
+                              "close_pairs": close_pairs,
+                              "indices": indices,
+                              "samples_name": samples_name}
+    return (results, errors, warnings)
+
+def suggest_pool_moves(pool_results,
+                       index_read_direction_5_prime=INDEX_READ_FORWARD,
+                       index_read_direction_3_prime=INDEX_READ_FORWARD,
+                       threshold: int = 0):
+    """
+    Suggest samples to move between the pools to resolve their collisions. For each pool with collisions, the sample
+    involved in the most collisions is moved first, to the first pool where none of its indices collide, until the
+    pool is free of collisions. Suggestions are applied to the pools as they are made, so later suggestions account
+    for them.
+
+    Args:
+        `pool_results`: Results returned by check_pool_compatibility.
+        `index_read_direction_5_prime`: Direction the 5 prime index is read in the sequencer. Default to INDEX_READ_FORWARD.
+        `index_read_direction_3_prime`: Direction the 3 prime index is read in the sequencer. Default to INDEX_READ_FORWARD.
+        `threshold`: Number of differences (distance) allowed before calling a collision.
+
+    Returns:
+        List of suggested moves, as dict with sample (name), from_pool and to_pool (None if no existing pool can receive
+        the sample, meaning a new pool is needed).
+    """
+    libraries_by_pool = {pool_name: list(zip(results["indices"], results["samples_name"])) for pool_name, results in pool_results.items()}
+
+    def get_collisions(libraries):
+        indices = [index for index, _ in libraries]
+        collisions_results, _, _ = find_index_collisions(indices=indices,
+                                                         index_read_direction_5_prime=index_read_direction_5_prime,
+                                                         index_read_direction_3_prime=index_read_direction_3_prime,
+                                                         threshold=threshold)
+        return [(libraries[position_reference][1], libraries[position_validation][1])
+                for position_reference, position_validation, _ in collisions_results["collisions"]]
+
+    moves = []
+    for pool_name, results in pool_results.items():
+        if results["is_valid"]:
+            continue
+        collisions = get_collisions(libraries_by_pool[pool_name])
+        while collisions:
+            collision_count = defaultdict(int)
+            for sample_reference, sample_validation in collisions:
+                if sample_reference != sample_validation: # Libraries of the same sample cannot be separated
+                    collision_count[sample_reference] += 1
+                    collision_count[sample_validation] += 1
+            if not collision_count:
+                break
+            sample_name = max(collision_count, key=collision_count.get)
+            sample_libraries = [library for library in libraries_by_pool[pool_name] if library[1] == sample_name]
+            destination_pool = None
+            for other_pool_name, other_libraries in libraries_by_pool.items():
+                if other_pool_name == pool_name:
+                    continue
+                if not any(sample_name in collision for collision in get_collisions(other_libraries + sample_libraries)):
+                    destination_pool = other_pool_name
+                    break
+            libraries_by_pool[pool_name] = [library for library in libraries_by_pool[pool_name] if library[1] != sample_name]
+            if destination_pool is not None:
+                libraries_by_pool[destination_pool].extend(sample_libraries)
+            moves.append({"sample": sample_name, "from_pool": pool_name, "to_pool": destination_pool})
+            collisions = get_collisions(libraries_by_pool[pool_name])
+    return moves
@@ -1,6 +1,7 @@
 from django.core.exceptions import ValidationError
 from fms_core.models import Sample, Project
 from fms_core.services.sample_next_step import dequeue_sample_from_all_steps_study_workflow
+from fms_core.services.sample import update_sample_summary
 
 def create_link(sample=None, project=None):
     created_link = False
@@ -38,6 +39,11 @@ def create_link(sample=None, project=None):
             except ValidationError as e:
                 errors.append(str(e))
 
+    if created_link:
+        _, errors_summary, warnings_summary = update_sample_summary([sample])
+        errors.extend(errors_summary)
+        warnings.extend(warnings_summary)
+
     return (created_link, errors, warnings)
 
 def remove_link(sample=None, project=None):
@@ -69,4 +75,9 @@ def remove_link(sample=None, project=None):
             except ValidationError as e:
                 errors.append(str(e))
 
+    if link_removed:
+        _, errors_summary, warnings_summary = update_sample_summary([sample])
+        errors.extend(errors_summary)
+        warnings.extend(warnings_summary)
+
     return (link_removed, errors, warnings)
\ No newline at end of file
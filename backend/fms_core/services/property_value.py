@@ -1,5 +1,131 @@
+import datetime
+import math
+import re
+import reversion
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List
+
+from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
-from fms_core.models import PropertyValue
+
+from fms_core.models import PropertyValue, TypedPropertyValue, ProcessMeasurement
+from fms_core.models.tracked_model import get_tracking_user
+from fms_core.models.typed_property_value import TEXT_KEY_LENGTH
+
+# Property values are validated when they are built but are inserted with bulk_create : right away by the create
+# functions, or at the end of a bulk_property_value_creation block (used by the template imports) for all the property
+# values of the block. Each inserted property value gets its typed projection (TypedPropertyValue).
+
+PROPERTY_VALUE_BATCH_SIZE = 1000
+NUMERIC_REGEX = re.compile(r"^[+-]?(\d+(\.\d*)?|\.\d+)([eE][+-]?\d+)?$")
+DATE_REGEX = re.compile(r"^\d{4}-\d{2}-\d{2}")
+
+_pending_property_values = ContextVar("pending_property_values", default=None)
+
+def get_typed_value_fields(value) -> dict:
+    """
+    Convert a property value to its typed projection fields.
+
+    Args:
+        `value`: Value of a PropertyValue (usually text).
+
+    Returns:
+        Dictionary with the numeric_value and date_value (None if the value is not a number or an ISO date), text_value
+        and text_key of the value.
+    """
+    text = value.strip() if isinstance(value, str) else ("" if value is None else str(value))
+    numeric_value = None
+    if not isinstance(value, bool) and NUMERIC_REGEX.match(text):
+        numeric_value = float(text)
+        if not math.isfinite(numeric_value):
+            numeric_value = None
+    date_value = None
+    if DATE_REGEX.match(text):
+        try:
+            date_value = datetime.datetime.fromisoformat(text).date()
+        except ValueError:
+            pass
+    return dict(numeric_value=numeric_value, date_value=date_value, text_value=text, text_key=text[:TEXT_KEY_LENGTH].lower())
+
+def update_typed_property_values(property_values: List[PropertyValue]):
+    """
+    Rebuild the typed projection of the given property values. Must be called by any code that creates or modifies
+    property values without the functions of this module.
+
+    Args:
+        `property_values`: List of saved PropertyValue instances.
+    """
+    property_values = [property_value for property_value in property_values if property_value.pk is not None]
+    if not property_values:
+        return
+    process_measurement_content_type = ContentType.objects.get_for_model(ProcessMeasurement)
+    TypedPropertyValue.objects.filter(property_value__in=property_values).delete()
+    TypedPropertyValue.objects.bulk_create(
+        [TypedPropertyValue(property_value_id=property_value.pk,
+                            property_type_id=property_value.property_type_id,
+                            process_id=None if property_value.content_type_id == process_measurement_content_type.id else property_value.object_id,
+                            process_measurement_id=property_value.object_id if property_value.content_type_id == process_measurement_content_type.id else None,
+                            **get_typed_value_fields(property_value.value))
+         for property_value in property_values],
+        batch_size=PROPERTY_VALUE_BATCH_SIZE
+    )
+
+def bulk_create_property_values(property_values: List[PropertyValue]) -> List[PropertyValue]:
+    """
+    Insert validated property values, with their typed projection. The property values are added to the active revision.
+
+    Args:
+        `property_values`: List of unsaved PropertyValue instances, already validated.
+
+    Returns:
+        The list of inserted property values.
+    """
+    if not property_values:
+        return property_values
+    # bulk_create bypasses TrackedModel.save
+    user = get_tracking_user()
+    for property_value in property_values:
+        property_value.created_by = user
+        property_value.updated_by = user
+    property_values = PropertyValue.objects.bulk_create(property_values, batch_size=PROPERTY_VALUE_BATCH_SIZE)
+    if reversion.is_active():
+        for property_value in property_values:
+            reversion.add_to_revision(property_value)
+    update_typed_property_values(property_values)
+    return property_values
+
+@contextmanager
+def bulk_property_value_creation():
+    """
+    Defer the insertion of the property values created in the block to the end of the block, where they are inserted
+    together. Property values returned by the create functions are not saved until then. Nested blocks are part of the
+    outermost block.
+    """
+    if _pending_property_values.get() is not None:
+        yield
+        return
+    pending_property_values = []
+    token = _pending_property_values.set(pending_property_values)
+    try:
+        yield
+    finally:
+        _pending_property_values.reset(token)
+    bulk_create_property_values(pending_property_values)
+
+def _build_property_value(value, property_type, content_object) -> PropertyValue:
+    property_value = PropertyValue(value=value, property_type=property_type, content_object=content_object)
+    # The property type and the content object are provided as instances, skip their existence queries.
+    property_value.full_clean(exclude=["property_type", "content_type", "created_by", "updated_by"])
+    return property_value
+
+def _insert_property_values(property_values: List[PropertyValue]) -> List[PropertyValue]:
+    pending_property_values = _pending_property_values.get()
+    if pending_property_values is not None:
+        pending_property_values.extend(property_values)
+        return property_values
+    return bulk_create_property_values(property_values)
 
 def create_process_properties(properties, processes_by_protocol_id):
     property_values = []
@@ -25,11 +151,13 @@ def create_process_properties(properties, processes_by_protocol_id):
             value = str(value) if value is not None else ' '
 
         try:
-            pv = PropertyValue.objects.create(value=value, property_type=property_type, content_object=process)
-            property_values.append(pv)
+            property_values.append(_build_property_value(value, property_type, process))
         except ValidationError as e:
             errors.append(';'.join(e.messages))
 
+    if not errors:
+        property_values = _insert_property_values(property_values)
+
     return (property_values, errors, warnings)
 
 def create_process_measurement_properties(properties, process_measurement):
@@ -60,11 +188,13 @@ def create_process_measurement_properties(properties, process_measurement):
 
         if value is not None:
             try:
-                pv = PropertyValue.objects.create(value=value, property_type=property_type, content_object=process_measurement)
-                property_values.append(pv)
+                property_values.append(_build_property_value(value, property_type, process_measurement))
             except ValidationError as e:
                 errors.append(';'.join(e.messages))
 
+    if not errors:
+        property_values = _insert_property_values(property_values)
+
     return (property_values, errors, warnings)
 
 def validate_non_optional_properties(properties):
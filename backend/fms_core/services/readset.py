@@ -1,11 +1,17 @@
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from django.core.exceptions import ValidationError
+from django.db.models import Count, Max, Q, Sum
 from django.utils import timezone
 from django.contrib.auth.models import User
 
 from fms_core.models import Dataset
+from fms_core.models import ExperimentRun
 from fms_core.models import Readset
+from fms_core.models import Sample
+from fms_core.containers import CONTAINER_KIND_SPECS
+from fms_core.coordinates import convert_ordinal_to_alpha_digit_coord
+from fms_core.services.sample_lineage import get_sample_sources_from_derived_samples
 from fms_core.models.tracked_model import ADMIN_USERNAME
 from fms_core.models._constants import ReleaseStatus, ValidationStatus
 
@@ -54,4 +60,128 @@ def create_readset(dataset: Dataset, name: str, sample_name: str, derived_sample
     except ValidationError as e:
         errors.append(';'.join(e.messages))
 
-    return readset, errors, warnings
\ No newline at end of file
+    if readset is not None:
+        _, errors_counters, warnings_counters = update_dataset_status_counters([dataset.id])
+        errors.extend(errors_counters)
+        warnings.extend(warnings_counters)
+
+    return readset, errors, warnings
+
+
+DATASET_STATUS_COUNTER_FIELDS = ["readset_count",
+                                 "released_status_count",
+                                 "blocked_status_count",
+                                 "unreleased_count",
+                                 "unvalidated_count",
+                                 "latest_release_update",
+                                 "latest_validation_update"]
+EXPERIMENT_RUN_STATUS_COUNTER_FIELDS = ["readset_count", "unreleased_readset_count", "unvalidated_readset_count"]
+
+def update_dataset_status_counters(dataset_ids: List[int]) -> Tuple[List[Dataset], List[str], List[str]]:
+    """
+    Recomputes the readset status counters and latest status updates of the given datasets and of their experiment
+    runs. Must be called, in the same transaction, whenever readsets are created, deleted or have their release or
+    validation status changed.
+
+    Args:
+        `dataset_ids`: List of ids of the datasets to update.
+
+    Returns:
+        Tuple with the list of updated datasets, errors and warnings.
+    """
+    datasets = []
+    errors = []
+    warnings = []
+
+    try:
+        counters_by_dataset = {
+            counters["dataset_id"]: counters for counters in
+            Readset.objects.filter(dataset_id__in=dataset_ids)
+                           .order_by()
+                           .values("dataset_id")
+                           .annotate(readset_count=Count("id"),
+                                     released_status_count=Count("id", filter=Q(release_status=ReleaseStatus.RELEASED)),
+                                     blocked_status_count=Count("id", filter=Q(release_status=ReleaseStatus.BLOCKED)),
+                                     unreleased_count=Count("id", filter=Q(release_status=ReleaseStatus.AVAILABLE)),
+                                     unvalidated_count=Count("id", filter=Q(validation_status=ValidationStatus.AVAILABLE)),
+                                     latest_release_update=Max("release_status_timestamp"),
+                                     latest_validation_update=Max("validation_status_timestamp"))
+        }
+        datasets = list(Dataset.objects.filter(id__in=dataset_ids).only("id", "experiment_run_id", *DATASET_STATUS_COUNTER_FIELDS))
+        for dataset in datasets:
+            counters = counters_by_dataset.get(dataset.id, {})
+            for field in DATASET_STATUS_COUNTER_FIELDS:
+                setattr(dataset, field, counters.get(field, 0 if field.endswith("count") else None))
+        # Derived data : do not create a new version of the datasets
+        Dataset.objects.bulk_update(datasets, DATASET_STATUS_COUNTER_FIELDS)
+
+        experiment_run_ids = {dataset.experiment_run_id for dataset in datasets}
+        counters_by_experiment_run = {
+            counters["experiment_run_id"]: counters for counters in
+            Dataset.objects.filter(experiment_run_id__in=experiment_run_ids)
+                           .order_by()
+                           .values("experiment_run_id")
+                           .annotate(readset_count=Sum("readset_count"),
+                                     unreleased_readset_count=Sum("unreleased_count"),
+                                     unvalidated_readset_count=Sum("unvalidated_count"))
+        }
+        experiment_runs = list(ExperimentRun.objects.filter(id__in=experiment_run_ids).only("id", *EXPERIMENT_RUN_STATUS_COUNTER_FIELDS))
+        for experiment_run in experiment_runs:
+            counters = counters_by_experiment_run.get(experiment_run.id, {})
+            for field in EXPERIMENT_RUN_STATUS_COUNTER_FIELDS:
+                setattr(experiment_run, field, counters.get(field, 0))
+        ExperimentRun.objects.bulk_update(experiment_runs, EXPERIMENT_RUN_STATUS_COUNTER_FIELDS)
+    except Exception as err:
+        errors.append(f"Failed to update the readset status counters of the datasets. {err}")
+
+    return (datasets, errors, warnings)
+
+
+def get_readsets_sample_source(readset_ids: List[int]) -> Tuple[Dict[int, Optional[int]], List[str], List[str]]:
+    """
+    Traces the readsets back to the last aliquot of their sample before pooling. The experiment samples and the sample
+    sources of all the readsets are resolved at once.
+
+    Args:
+        `readset_ids`: List of readset ids.
+
+    Returns:
+        Tuple with a dictionary of the sample source id (None if it cannot be traced) by readset id, errors and warnings.
+    """
+    sample_source_by_readset = {}
+    errors = []
+    warnings = []
+
+    readsets = list(Readset.objects.filter(id__in=readset_ids).values("id",
+                                                                       "derived_sample_id",
+                                                                       "dataset__lane",
+                                                                       "dataset__experiment_run__container_id",
+                                                                       "dataset__experiment_run__container__kind"))
+    coordinates_by_readset = {}
+    for readset in readsets:
+        sample_source_by_readset[readset["id"]] = None
+        container_kind = readset["dataset__experiment_run__container__kind"]
+        if readset["dataset__experiment_run__container_id"] is not None and readset["derived_sample_id"] is not None:
+            container_spec = CONTAINER_KIND_SPECS.get(container_kind, None)
+            try:
+                coordinates_by_readset[readset["id"]] = convert_ordinal_to_alpha_digit_coord(readset["dataset__lane"], container_spec.coordinate_spec if container_spec is not None else None)
+            except Exception as err:
+                warnings.append(f"Cannot trace readset {readset['id']} to its experiment sample. {err}")
+
+    experiment_samples = Sample.objects.filter(container_id__in={readset["dataset__experiment_run__container_id"] for readset in readsets}).values_list("container_id", "coordinate__name", "id")
+    sample_id_by_container_coordinates = {(container_id, coordinates): sample_id for container_id, coordinates, sample_id in experiment_samples}
+
+    pair_by_readset = {}
+    for readset in readsets:
+        coordinates = coordinates_by_readset.get(readset["id"], None)
+        sample_id = sample_id_by_container_coordinates.get((readset["dataset__experiment_run__container_id"], coordinates), None)
+        if sample_id is not None:
+            pair_by_readset[readset["id"]] = (sample_id, readset["derived_sample_id"])
+
+    sample_source_by_pair, errors_source, warnings_source = get_sample_sources_from_derived_samples(list(pair_by_readset.values()))
+    errors.extend(errors_source)
+    warnings.extend(warnings_source)
+    for readset_id, pair in pair_by_readset.items():
+        sample_source_by_readset[readset_id] = sample_source_by_pair.get(pair, None)
+
+    return (sample_source_by_readset, errors, warnings)
@@ -4,15 +4,11 @@ from collections import defaultdict
 
 from typing import TypedDict, Union
 
-import pandas as pd
 from django.apps import apps
 from django.db.models import F, Count,  Sum, Max, Min, TextChoices, functions, QuerySet
 
 from io import BytesIO
-from openpyxl import Workbook
-from openpyxl.styles import PatternFill
 
-from fms_core.services.samplesheet import fit_sheet_columns_width_to_content
 from fms_report.models import Report, MetricField
 from fms_report.models._constants import AggregationType, FieldDataType
 
@@ -69,6 +65,8 @@ def get_date_range_with_window(start_date: str, end_date: str, time_window: Time
     Returns:
         Tuple with one ordered date list and one matching time window list.
     """
+    import pandas as pd # pandas is only loaded when a report is produced
+
     time_series = pd.date_range(start=start_date, end=end_date).to_series()
     match time_window:
         case TimeWindow.ANNUALLY:
@@ -120,6 +118,11 @@ def get_report_as_excel(report_data: ReportData) -> bytes:
     Returns:
         Bytes stream of an excel workbook.
     """
+    # openpyxl is only loaded when a report is exported
+    from openpyxl import Workbook
+    from openpyxl.styles import PatternFill
+    from fms_core.services.samplesheet import fit_sheet_columns_width_to_content
+
     out_stream = BytesIO()
     workbook = Workbook()
 
@@ -1,4 +1,5 @@
 from decimal import Decimal
+from collections import defaultdict
 from typing import NotRequired, Tuple, List, TypedDict, cast
 from datetime import datetime, date
 from django.db import Error
@@ -84,6 +85,10 @@ def create_full_sample(name, volume, creation_date, container, sample_kind,
                                            sample_id=sample.id,
                                            volume_ratio=1,
                                            **(dict(project=project) if project is not None else dict()))
+
+            _, errors_summary, warnings_summary = update_sample_summary([sample])
+            errors.extend(errors_summary)
+            warnings.extend(warnings_summary)
         except Coordinate.DoesNotExist as err:
             errors.append(f"Provided coordinates {coordinates} are not valid (Coordinates format example: A01).")
         except ValidationError as e:
@@ -163,6 +168,56 @@ def update_sample(sample_to_update, volume=None, concentration=None, depleted=No
     return (sample_to_update, errors, warnings)
 
 
+SAMPLE_SUMMARY_FIELDS = ["derived_sample_count", "is_pooled", "has_library", "first_project", "first_biosample"]
+
+def update_sample_summary(samples: List[Sample]) -> Tuple[List[Sample], List[str], List[str]]:
+    """
+    Recompute the summary fields of the given samples (derived sample count, pooled and library indicators,
+    first project and first biosample) from their derived by sample entries. Must be called by any service
+    that creates or modifies derived by sample entries. The sample instances received are updated in place
+    so that a later save does not overwrite the summary with stale values.
+
+    Args:
+        `samples`: List of Sample instances to update.
+
+    Returns:
+        Tuple with the list of updated samples, errors and warnings
+    """
+    errors = []
+    warnings = []
+
+    samples = [sample for sample in samples if sample is not None and sample.id is not None]
+    if not samples:
+        return (samples, errors, warnings)
+
+    derived_by_samples_by_sample = defaultdict(list)
+    derived_by_samples = (DerivedBySample.objects
+                                         .filter(sample_id__in=[sample.id for sample in samples])
+                                         .order_by("id")
+                                         .values("sample_id", "volume_ratio", "project_id",
+                                                 "derived_sample__biosample_id", "derived_sample__library_id"))
+    for derived_by_sample in derived_by_samples:
+        derived_by_samples_by_sample[derived_by_sample["sample_id"]].append(derived_by_sample)
+
+    for sample in samples:
+        sample_derived_by_samples = derived_by_samples_by_sample[sample.id]
+        first_derived_by_sample = sample_derived_by_samples[0] if sample_derived_by_samples else {}
+        first_volume_ratio = first_derived_by_sample.get("volume_ratio", None)
+        sample.derived_sample_count = len(sample_derived_by_samples)
+        sample.is_pooled = sample.derived_sample_count > 1 or (first_volume_ratio is not None and first_volume_ratio < 1)
+        sample.has_library = any(dbs["derived_sample__library_id"] is not None for dbs in sample_derived_by_samples)
+        sample.first_project_id = first_derived_by_sample.get("project_id", None)
+        sample.first_biosample_id = first_derived_by_sample.get("derived_sample__biosample_id", None)
+
+    try:
+        # Summary fields are derived data : skip the model validation and do not touch the tracking fields.
+        Sample.objects.bulk_update(samples, SAMPLE_SUMMARY_FIELDS)
+    except Error as e:
+        errors.append(str(e))
+
+    return (samples, errors, warnings)
+
+
 def inherit_sample(sample_source, new_sample_data, derived_samples_destination, volume_ratios, projects):
     """
     Copy an original sample and replace attributes with values provided by new_sample_data.
@@ -194,6 +249,10 @@ def inherit_sample(sample_source, new_sample_data, derived_samples_destination,
                                            volume_ratio=volume_ratios[derived_sample_destination.id],
                                            project=projects[derived_sample_destination.id])
 
+        _, errors_summary, warnings_summary = update_sample_summary([new_sample])
+        errors.extend(errors_summary)
+        warnings.extend(warnings_summary)
+
     except Error as e:
             errors.append(';'.join(e.messages))
 
@@ -517,6 +576,10 @@ def pool_samples(process: Process,
                         except Exception as e:
                             errors.append(e)
 
+            _, errors_summary, warnings_summary = update_sample_summary([sample_destination])
+            errors.extend(errors_summary)
+            warnings.extend(warnings_summary)
+
             for sample in samples_info:
                 source_sample = sample["Source Sample"]
                 volume_used = sample["Volume Used"]
@@ -668,6 +731,9 @@ def pool_submitted_samples(samples_info,
                     errors.extend(errors_study)
                     warnings.extend(warnings_study)
 
+            _, errors_summary, warnings_summary = update_sample_summary([pool_sample_obj])
+            errors.extend(errors_summary)
+            warnings.extend(warnings_summary)
 
     return pool_sample_obj, errors, warnings
 
@@ -911,6 +977,42 @@ def remove_qc_flags(sample):
     return sample, errors, warnings
 
 
+def update_biosample_metadata_values(biosamples: List[Biosample]) -> Tuple[List[Biosample], List[str], List[str]]:
+    """
+    Rebuild the metadata projection (name to value dictionary) of the given biosamples from their SampleMetadata entries.
+    Must be called by any service that creates, modifies or removes sample metadata. The biosample instances received
+    are updated in place.
+
+    Args:
+        `biosamples`: List of Biosample instances to update.
+
+    Returns:
+        Tuple with the list of updated biosamples, errors and warnings
+    """
+    errors = []
+    warnings = []
+
+    biosamples = [biosample for biosample in biosamples if biosample is not None and biosample.id is not None]
+    if not biosamples:
+        return (biosamples, errors, warnings)
+
+    metadata_values_by_biosample = defaultdict(dict)
+    metadata_values = SampleMetadata.objects.filter(biosample__in=biosamples).values_list("biosample_id", "name", "value")
+    for biosample_id, name, value in metadata_values:
+        metadata_values_by_biosample[biosample_id][name] = value
+
+    for biosample in biosamples:
+        biosample.metadata_values = metadata_values_by_biosample[biosample.id]
+
+    try:
+        # The projection is derived data : skip the model validation and do not touch the tracking fields.
+        Biosample.objects.bulk_update(biosamples, ["metadata_values"])
+    except Error as e:
+        errors.append(str(e))
+
+    return (biosamples, errors, warnings)
+
+
 def add_sample_metadata(sample, metadata):
     errors = []
     warnings = []
@@ -925,6 +1027,9 @@ def add_sample_metadata(sample, metadata):
                     errors.append(f'Sample [{sample.name}] already has property [{name}] with value [{value}].')
                 else:
                     SampleMetadata.objects.create(name=name, value=value, biosample=biosample_obj)
+            _, errors_projection, warnings_projection = update_biosample_metadata_values([biosample_obj])
+            errors.extend(errors_projection)
+            warnings.extend(warnings_projection)
         except ValidationError as e:
             errors.append(e)
     else:
@@ -952,6 +1057,9 @@ def update_sample_metadata(sample, metadata):
                     metadata_obj.save()
                 else:
                     errors.append(f'Sample [{sample.name}] does not have metadata with name [{name}].')
+            _, errors_projection, warnings_projection = update_biosample_metadata_values([biosample_obj])
+            errors.extend(errors_projection)
+            warnings.extend(warnings_projection)
         except ValidationError as e:
             errors.append(e)
     else:
@@ -979,6 +1087,10 @@ def remove_sample_metadata(sample, metadata):
                     deleted = True
         except SampleMetadata.DoesNotExist:
             errors.append(f'Metadata with name [{name}] is not tied to sample [{sample.name}]')
+        if deleted:
+            _, errors_projection, warnings_projection = update_biosample_metadata_values([biosample_obj])
+            errors.extend(errors_projection)
+            warnings.extend(warnings_projection)
     else:
         errors.append('Sample and metadata are required')
 
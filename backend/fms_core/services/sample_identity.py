@@ -1,14 +1,56 @@
+import reversion
+
 from fms_core.schema_validators import SAMPLE_IDENTITY_REPORT_VALIDATOR
 from django.core.exceptions import ValidationError
-from fms_core.models import  SampleIdentity, SampleIdentityMatch, Readset
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from fms_core.models import  Biosample, SampleIdentity, SampleIdentityMatch, Readset
 from fms_core.models._constants import SEX_UNKNOWN, SEX_MALE, SEX_FEMALE
+from fms_core.models.tracked_model import get_tracking_user
 from typing import TypedDict, Optional
 from decimal import Decimal
 
+SAMPLE_IDENTITY_MATCH_BATCH_SIZE = 1000
+
+class Identity_info(TypedDict):
+    conclusive: bool
+    predicted_sex: str
+
 class Identity_match_info(TypedDict):
     matching_site_ratio: Decimal
     compared_sites: int
 
+def _update_existing_identity(sample_identity: SampleIdentity, conclusive: bool, predicted_sex: str, replace: bool):
+    """
+    Applies the submitted information to an existing sample identity, when it can be replaced (not conclusive or replace requested).
+    The identity is not saved.
+
+    Returns:
+        Tuple with a boolean indicating the identity was updated, a boolean indicating the existing identity was kept, errors and warnings.
+    """
+    updated = False
+    kept_existing_identity = False
+    errors = []
+    warnings = []
+    biosample_id = sample_identity.biosample_id
+    if replace or (not replace and not sample_identity.conclusive):
+        if not sample_identity.predicted_sex == predicted_sex:
+            warnings.append(f"Identity change for biosample ID {biosample_id}. Predicted sex changed from {sample_identity.predicted_sex} to {predicted_sex}.")
+            sample_identity.predicted_sex = predicted_sex
+        if not sample_identity.conclusive == conclusive:
+            warnings.append(f"Identity change for biosample ID {biosample_id}. Conclusive identity changed from {sample_identity.conclusive} to {conclusive}.")
+            sample_identity.conclusive = conclusive
+        updated = True
+    else: # not replace and sample_identity.conclusive
+        kept_existing_identity = True
+        warnings.append(f"Submitting new Identity for existing conclusive identity for biosample ID {biosample_id}.")
+        if not sample_identity.predicted_sex == predicted_sex:
+            errors.append(f"Identity difference for biosample ID {biosample_id}. Predicted sex changed from {sample_identity.predicted_sex} to {predicted_sex}.")
+        if not sample_identity.conclusive == conclusive:
+            errors.append(f"Identity difference for biosample ID {biosample_id}. Predicted sex changed from {sample_identity.conclusive} to {conclusive}.")
+    return updated, kept_existing_identity, errors, warnings
+
 def create_sample_identity(biosample_id: int, conclusive: bool, predicted_sex: str, replace: bool = False):
     """
     Create a sample identity with the provided information. If there is currently an existing sample identity, an error is returned unless
@@ -38,25 +80,91 @@ def create_sample_identity(biosample_id: int, conclusive: bool, predicted_sex: s
         errors.append(';'.join(e.messages))
 
     if sample_identity and not created:
-        if replace or (not replace and not sample_identity.conclusive):
-            if not sample_identity.predicted_sex == predicted_sex:
-                warnings.append(f"Identity change for biosample ID {biosample_id}. Predicted sex changed from {sample_identity.predicted_sex} to {predicted_sex}.")
-                sample_identity.predicted_sex = predicted_sex
-            if not sample_identity.conclusive == conclusive:
-                warnings.append(f"Identity change for biosample ID {biosample_id}. Conclusive identity changed from {sample_identity.conclusive} to {conclusive}.")
-                sample_identity.conclusive = conclusive
+        updated, kept_existing_identity, errors_update, warnings_update = _update_existing_identity(sample_identity, conclusive, predicted_sex, replace)
+        errors.extend(errors_update)
+        warnings.extend(warnings_update)
+        if updated:
             sample_identity.identity_matches.clear()
             sample_identity.save()
-        else: # not replace and sample_identity.conclusive
-            kept_existing_identity = True
-            warnings.append(f"Submitting new Identity for existing conclusive identity for biosample ID {biosample_id}.")
-            if not sample_identity.predicted_sex == predicted_sex:
-                errors.append(f"Identity difference for biosample ID {biosample_id}. Predicted sex changed from {sample_identity.predicted_sex} to {predicted_sex}.")
-            if not sample_identity.conclusive == conclusive:
-                errors.append(f"Identity difference for biosample ID {biosample_id}. Predicted sex changed from {sample_identity.conclusive} to {conclusive}.")
     
     return sample_identity, kept_existing_identity, errors, warnings
 
+def create_sample_identities(identity_info_by_biosample_id: dict[int, Identity_info], replace: bool = False):
+    """
+    Set-based version of create_sample_identity for the identities of many biosamples. Existing identities are fetched in a single query,
+    new identities are bulk inserted and replaced identities are bulk updated (and their matches removed).
+
+    Args:
+        `identity_info_by_biosample_id`: Dictionary of the identity information (conclusive and predicted_sex) by biosample ID.
+        `replace`: Boolean that indicate if the current information is to replace an already conclusive identity. Defaults to false.
+
+    Returns:
+        Tuple with the following content:
+        `identity_by_biosample_id`: Sample identity objects by biosample ID.
+        `kept_existing_by_biosample_id`: Booleans indicating an existing identity was kept by biosample ID.
+        `errors`: Errors generated during the processing.
+        `warnings`: Warnings generated during the processing.
+    """
+    identity_by_biosample_id = {}
+    kept_existing_by_biosample_id = {}
+    errors = []
+    warnings = []
+
+    biosample_ids = list(identity_info_by_biosample_id.keys())
+    existing_identity_by_biosample_id = {identity.biosample_id: identity for identity in SampleIdentity.objects.filter(biosample_id__in=biosample_ids)}
+    known_biosample_ids = set(Biosample.objects.filter(id__in=biosample_ids).values_list("id", flat=True))
+
+    user = get_tracking_user()
+    new_identities = []
+    updated_identities = []
+    for biosample_id, identity_info in identity_info_by_biosample_id.items():
+        sample_identity = existing_identity_by_biosample_id.get(biosample_id, None)
+        if sample_identity is None:
+            if biosample_id not in known_biosample_ids:
+                errors.append(f"Biosample ID {biosample_id} does not exist.")
+                continue
+            sample_identity = SampleIdentity(biosample_id=biosample_id,
+                                             conclusive=identity_info["conclusive"],
+                                             predicted_sex=identity_info["predicted_sex"],
+                                             created_by=user,
+                                             updated_by=user)
+            new_identities.append(sample_identity)
+            kept_existing_identity = False
+        else:
+            updated, kept_existing_identity, errors_update, warnings_update = _update_existing_identity(sample_identity,
+                                                                                                        identity_info["conclusive"],
+                                                                                                        identity_info["predicted_sex"],
+                                                                                                        replace)
+            errors.extend(errors_update)
+            warnings.extend(warnings_update)
+            if updated:
+                sample_identity.updated_by = user
+                sample_identity.updated_at = timezone.now()
+                updated_identities.append(sample_identity)
+        identity_by_biosample_id[biosample_id] = sample_identity
+        kept_existing_by_biosample_id[biosample_id] = kept_existing_identity
+
+    if errors:
+        return identity_by_biosample_id, kept_existing_by_biosample_id, errors, warnings
+
+    try:
+        with transaction.atomic():
+            SampleIdentity.objects.bulk_create(new_identities)
+            SampleIdentity.objects.bulk_update(updated_identities, ["conclusive", "predicted_sex", "updated_by", "updated_at"])
+            # Replaced identities lose their matches (both directions, like identity_matches.clear())
+            SampleIdentityMatch.objects.filter(Q(tested__in=updated_identities) | Q(matched__in=updated_identities)).delete()
+    except IntegrityError as err:
+        identity_by_biosample_id = {}
+        kept_existing_by_biosample_id = {}
+        errors.append(f"Sample identities could not be created. {err}")
+
+    # bulk_create and bulk_update bypass save(), register the instances in the ongoing revision ourselves
+    if not errors and reversion.is_active():
+        for sample_identity in [*new_identities, *updated_identities]:
+            reversion.add_to_revision(sample_identity)
+
+    return identity_by_biosample_id, kept_existing_by_biosample_id, errors, warnings
+
 def create_sample_identity_matches(tested_identity: SampleIdentity, matches_by_biosample_id: dict[int, Identity_match_info], readset_obj: Optional[Readset] = None):
     """
     Create sample identity matches with the provided information.
@@ -66,6 +174,23 @@ def create_sample_identity_matches(tested_identity: SampleIdentity, matches_by_b
         `matches_by_biosample_id`: Dictionary of identity match information to other biosamples.
         `readset_obj`: (optional) Readset object to specify the readset sequencing data being matched. This parameter does not apply to identity QC.
 
+    Returns:
+        Tuple with the following content:
+        `errors`: Errors generated during the processing.
+        `warnings`: Warnings generated during the processing.
+    """
+    return bulk_create_sample_identity_matches([(tested_identity, matched_biosample_id, match_info, readset_obj)
+                                                for matched_biosample_id, match_info in matches_by_biosample_id.items()])
+
+def bulk_create_sample_identity_matches(match_entries: list[tuple[SampleIdentity, int, Identity_match_info, Optional[Readset]]]):
+    """
+    Create the sample identity matches of many tested identities. Matched identities and existing matches are fetched in a single query each
+    and the new matches are bulk inserted. Matches that already exist (in the database or earlier in the entries) are not inserted again.
+
+    Args:
+        `match_entries`: List of tuples (tested identity, matched biosample ID, identity match information, readset or None). The reverse match
+                         is also created for entries without readset.
+
     Returns:
         Tuple with the following content:
         `errors`: Errors generated during the processing.
@@ -73,29 +198,99 @@ def create_sample_identity_matches(tested_identity: SampleIdentity, matches_by_b
     """
     errors = []
     warnings = []
-    for matched_biosample_id, match_info in matches_by_biosample_id.items():
-        try:
-            matched_identity = SampleIdentity.objects.get(biosample_id=matched_biosample_id)
-            # Create the tested relation
-            _, tested_created = SampleIdentityMatch.objects.get_or_create(tested=tested_identity,
-                                                                          matched=matched_identity,
-                                                                          readset=readset_obj,
-                                                                          matching_site_ratio=match_info["matching_site_ratio"],
-                                                                          compared_sites=match_info["compared_sites"])
-            # Create the reverse relation if the match is not with itself
-            if readset_obj is None:
-                _, matched_created = SampleIdentityMatch.objects.get_or_create(tested=matched_identity,
-                                                                               matched=tested_identity,
-                                                                               readset=readset_obj,
-                                                                               matching_site_ratio=match_info["matching_site_ratio"],
-                                                                               compared_sites=match_info["compared_sites"])
-                if any([not tested_created, not matched_created]):
-                    warnings.append(f"Identity matches between identity {tested_identity.id} and {matched_identity.id} already exist.")
-        except Exception as err:
-            errors.append(err)
-    
+
+    match_entries = [match_entry for match_entry in match_entries if match_entry[0] is not None]
+    matched_biosample_ids = {matched_biosample_id for _, matched_biosample_id, _, _ in match_entries}
+    identity_by_biosample_id = {identity.biosample_id: identity for identity in SampleIdentity.objects.filter(biosample_id__in=matched_biosample_ids)}
+
+    identity_ids = {tested_identity.id for tested_identity, _, _, _ in match_entries} | {identity.id for identity in identity_by_biosample_id.values()}
+    result_by_key = {(tested_id, matched_id, readset_id): (matching_site_ratio, compared_sites)
+                     for tested_id, matched_id, readset_id, matching_site_ratio, compared_sites
+                     in SampleIdentityMatch.objects.filter(tested_id__in=identity_ids, matched_id__in=identity_ids)
+                                                   .values_list("tested_id", "matched_id", "readset_id", "matching_site_ratio", "compared_sites")}
+
+    user = get_tracking_user()
+    new_matches = []
+    for tested_identity, matched_biosample_id, match_info, readset_obj in match_entries:
+        matched_identity = identity_by_biosample_id.get(matched_biosample_id, None)
+        if matched_identity is None:
+            errors.append(f"Sample identity for biosample {matched_biosample_id} does not exist.")
+            continue
+        result = (match_info["matching_site_ratio"], match_info["compared_sites"])
+        readset_id = readset_obj.id if readset_obj is not None else None
+        # Create the tested relation and the reverse relation if the match is not with a readset
+        relations = [(tested_identity, matched_identity)]
+        if readset_obj is None:
+            relations.append((matched_identity, tested_identity))
+        existing_results = [result_by_key[(tested.id, matched.id, readset_id)] for tested, matched in relations if (tested.id, matched.id, readset_id) in result_by_key]
+        if any(existing_result != result for existing_result in existing_results):
+            warnings.append(f"Identity matches between identity {tested_identity.id} and {matched_identity.id} already exist with a different result. Existing matches are kept.")
+        elif existing_results and readset_obj is None:
+            warnings.append(f"Identity matches between identity {tested_identity.id} and {matched_identity.id} already exist.")
+        for tested, matched in relations:
+            if (tested.id, matched.id, readset_id) not in result_by_key:
+                result_by_key[(tested.id, matched.id, readset_id)] = result
+                new_matches.append(SampleIdentityMatch(tested=tested,
+                                                       matched=matched,
+                                                       readset=readset_obj,
+                                                       matching_site_ratio=match_info["matching_site_ratio"],
+                                                       compared_sites=match_info["compared_sites"],
+                                                       created_by=user,
+                                                       updated_by=user))
+
+    if errors:
+        return errors, warnings
+
+    try:
+        with transaction.atomic():
+            new_matches = SampleIdentityMatch.objects.bulk_create(new_matches, batch_size=SAMPLE_IDENTITY_MATCH_BATCH_SIZE)
+    except IntegrityError as err:
+        errors.append(f"Identity matches could not be created. {err}")
+
+    # bulk_create bypasses save(), register the created instances in the ongoing revision ourselves
+    if not errors and reversion.is_active():
+        for match in new_matches:
+            reversion.add_to_revision(match)
+
     return errors, warnings
 
+def get_identity_concordance(biosample_ids: list[int], min_matching_site_ratio: Optional[Decimal] = None, min_compared_sites: Optional[int] = None):
+    """
+    List the identity matches of biosamples, from the most to the least concordant. Matches found while testing other biosamples readsets
+    are included.
+
+    Args:
+        `biosample_ids`: List of the biosample IDs to review.
+        `min_matching_site_ratio`: (optional) Only keep the matches with at least this ratio of matching sites.
+        `min_compared_sites`: (optional) Only keep the matches with at least this number of compared sites.
+
+    Returns:
+        Tuple with the following content:
+        `matches`: List of matches (biosample_id, matched_biosample_id, readset_id, matching_site_ratio and compared_sites).
+        `errors`: Errors generated during the processing.
+        `warnings`: Warnings generated during the processing.
+    """
+    matches = []
+    errors = []
+    warnings = []
+
+    thresholds = Q()
+    if min_matching_site_ratio is not None:
+        thresholds &= Q(matching_site_ratio__gte=min_matching_site_ratio)
+    if min_compared_sites is not None:
+        thresholds &= Q(compared_sites__gte=min_compared_sites)
+
+    match_fields = ["readset_id", "matching_site_ratio", "compared_sites"]
+    tested_matches = (SampleIdentityMatch.objects.filter(thresholds, tested__biosample_id__in=biosample_ids)
+                                                 .values(*match_fields, biosample_id=F("tested__biosample_id"), matched_biosample_id=F("matched__biosample_id")))
+    # Identity QC matches are stored in both directions, readset matches only from the readset identity
+    readset_matches = (SampleIdentityMatch.objects.filter(thresholds, matched__biosample_id__in=biosample_ids, readset__isnull=False)
+                                                  .values(*match_fields, biosample_id=F("matched__biosample_id"), matched_biosample_id=F("tested__biosample_id")))
+    matches = sorted([*tested_matches, *readset_matches],
+                     key=lambda match: (match["biosample_id"], -match["matching_site_ratio"], match["matched_biosample_id"]))
+
+    return matches, errors, warnings
+
 
 def ingest_identity_testing_report(report_json, replace):
     """
@@ -127,31 +322,32 @@ def ingest_identity_testing_report(report_json, replace):
         return (identity_by_biosample_id, errors, warnings)
 
     # Create identities
+    identity_info_by_biosample_id = {}
     for sample_report in report_json["samples"].values():
-        biosample_id = int(sample_report["biosample_id"])
-        conclusive = sample_report["passed"]
-        predicted_sex = DICT_FMS_SEX[sample_report.get("fluidigm_predicted_sex", None)]
-        sample_identity, identity_kept, errors_creation, warnings_creation = create_sample_identity(biosample_id=biosample_id,
-                                                                                                    conclusive=conclusive,
-                                                                                                    predicted_sex=predicted_sex,
-                                                                                                    replace=replace)
-        errors.extend(errors_creation)
-        warnings.extend(warnings_creation)
-        if sample_identity and not errors_creation:
-            identity_by_biosample_id[biosample_id] = sample_identity
-            identity_kept_by_biosample_id[biosample_id] = identity_kept
+        identity_info_by_biosample_id[int(sample_report["biosample_id"])] = {
+            "conclusive": sample_report["passed"],
+            "predicted_sex": DICT_FMS_SEX[sample_report.get("fluidigm_predicted_sex", None)],
+        }
+    identity_by_biosample_id, identity_kept_by_biosample_id, errors_creation, warnings_creation = create_sample_identities(identity_info_by_biosample_id, replace)
+    errors.extend(errors_creation)
+    warnings.extend(warnings_creation)
+    if errors:
+        return (identity_by_biosample_id, errors, warnings)
     
     # add identity matches
+    match_entries = []
     for sample_report in report_json["samples"].values():
         biosample_id = int(sample_report["biosample_id"])
         tested_identity = identity_by_biosample_id.get(biosample_id, None)
         identity_kept = identity_kept_by_biosample_id.get(biosample_id, False)
-        matches_by_biosample_id = {}
         if tested_identity is not None and not identity_kept:
             matches = sample_report.get("genotype_matches", None)
             if matches is not None:
-                matches_by_biosample_id = {int(match["biosample_id"]): {"matching_site_ratio": (Decimal(str(match["percent_match"]))/100).quantize(Decimal("0.00001")), "compared_sites": match["n_sites"]} for match in matches.values()}
-                errors_matches, warnings_matches = create_sample_identity_matches(tested_identity=tested_identity, matches_by_biosample_id=matches_by_biosample_id)
-                errors.extend(errors_matches)
-                warnings.extend(warnings_matches)
+                match_entries.extend((tested_identity,
+                                      int(match["biosample_id"]),
+                                      {"matching_site_ratio": (Decimal(str(match["percent_match"]))/100).quantize(Decimal("0.00001")), "compared_sites": match["n_sites"]},
+                                      None) for match in matches.values())
+    errors_matches, warnings_matches = bulk_create_sample_identity_matches(match_entries)
+    errors.extend(errors_matches)
+    warnings.extend(warnings_matches)
     return (identity_by_biosample_id, errors, warnings)
\ No newline at end of file
@@ -1,7 +1,18 @@
 from typing import Any, Dict, List, Tuple, Optional
-from django.db.models import F
+from collections import defaultdict
+from django.db import connection
+from django.db.models import F, Count
 from django.core.exceptions import ValidationError
-from fms_core.models import SampleLineage, Sample, DerivedBySample, ProcessMeasurement
+from fms_core.models import SampleLineage, Sample, DerivedBySample, ProcessMeasurement, SampleAncestry
+
+LINEAGE_DIRECTION_ANCESTORS = "ancestors"
+LINEAGE_DIRECTION_DESCENDANTS = "descendants"
+LINEAGE_DIRECTIONS = [LINEAGE_DIRECTION_ANCESTORS, LINEAGE_DIRECTION_DESCENDANTS]
+LINEAGE_MAX_DEPTH = 50
+LINEAGE_MAX_NODES = 5000
+
+LINEAGE_NODE_FIELDS = ["id", "name", "quality_flag", "quantity_flag", "identity_flag", "depth"]
+LINEAGE_EDGE_FIELDS = ["id", "source_sample", "child_sample", "protocol_name"]
 
 
 def create_sample_lineage(parent_sample, child_sample, process_measurement):
@@ -73,10 +84,150 @@ def create_sample_lineage_graph(sampleId: int) -> Tuple[List[Dict[str, Any]], Li
     
     return (nodes, edges, errors)
 
-def get_sample_source_from_derived_sample(child_sample_id: int, child_derived_sample_id: int) -> List[int]:
+def create_sample_ancestry(sample_lineage: SampleLineage) -> Tuple[List[SampleAncestry], List[str], List[str]]:
+    """
+    Extends the materialized sample ancestry with a new sample lineage. The child inherits the ancestry of the parent
+    for each derived sample of the parent, and the parent becomes its ancestor at depth 1.
+    Called when a sample lineage is saved for the first time (see the post_save receiver of SampleLineage).
+    Must be called after the derived samples of the parent are set and before any lineage of the child's descendants is created.
+
+    Args:
+        `sample_lineage`: The sample lineage that was created.
+
+    Returns:
+        Tuple with the list of created sample ancestries, errors and warnings.
+    """
+    sample_ancestries = []
+    errors = []
+    warnings = []
+
+    try:
+        child_id = sample_lineage.child_id
+        parent_id = sample_lineage.parent_id
+        protocol_id = sample_lineage.process_measurement.process.protocol_id
+        for derived_sample_id in DerivedBySample.objects.filter(sample_id=parent_id).values_list("derived_sample_id", flat=True):
+            sample_ancestries.append(SampleAncestry(sample_id=child_id,
+                                                    derived_sample_id=derived_sample_id,
+                                                    ancestor_id=parent_id,
+                                                    depth=1,
+                                                    protocol_id=protocol_id))
+        parent_ancestries = SampleAncestry.objects.filter(sample_id=parent_id).values("derived_sample_id", "ancestor_id", "depth", "protocol_id")
+        for parent_ancestry in parent_ancestries:
+            sample_ancestries.append(SampleAncestry(sample_id=child_id,
+                                                    derived_sample_id=parent_ancestry["derived_sample_id"],
+                                                    ancestor_id=parent_ancestry["ancestor_id"],
+                                                    depth=parent_ancestry["depth"] + 1,
+                                                    protocol_id=parent_ancestry["protocol_id"]))
+        # Derived data : bulk insert without validation. A sample may reach an ancestor through more than one path.
+        sample_ancestries = SampleAncestry.objects.bulk_create(sample_ancestries, ignore_conflicts=True)
+    except Exception as err:
+        errors.append(f"Failed to create the sample ancestry of sample {sample_lineage.child_id}. {err}")
+
+    return (sample_ancestries, errors, warnings)
+
+def get_derived_sample_ancestors(sample_derived_samples: List[Tuple[int, int]]) -> Tuple[Dict[Tuple[int, int], List[Tuple[int, int, Optional[int]]]], List[str], List[str]]:
+    """
+    Lists the ancestors of many (sample, derived sample) pairs using a single recursive query on the sample lineages.
+    The lineages are followed toward the parent samples as long as the parent contains the derived sample.
+
+    Args:
+        `sample_derived_samples`: List of (sample id, derived sample id) pairs.
+
+    Returns:
+        Tuple with a dictionary of the list of ancestors (ancestor id, depth, protocol id) for each pair, errors and warnings.
+    """
+    ancestors_by_pair = defaultdict(list)
+    errors = []
+    warnings = []
+
+    if any(sample_id is None or derived_sample_id is None for sample_id, derived_sample_id in sample_derived_samples):
+        errors.append(f"Sample and derived sample are required to get the sample ancestors.")
+
+    if not errors and sample_derived_samples:
+        sample_ids = [sample_id for sample_id, _ in sample_derived_samples]
+        derived_sample_ids = [derived_sample_id for _, derived_sample_id in sample_derived_samples]
+        with connection.cursor() as cursor:
+            cursor.execute('''WITH RECURSIVE ancestry(sample_id, derived_sample_id, ancestor_id, depth, protocol_id) AS (
+                              SELECT seed.sample_id, seed.derived_sample_id, lineage.parent_id, 1, process.protocol_id
+                              FROM UNNEST(%s::bigint[], %s::bigint[]) AS seed(sample_id, derived_sample_id)
+                              JOIN fms_core_samplelineage AS lineage ON lineage.child_id = seed.sample_id
+                              JOIN fms_core_derivedbysample AS dbs ON dbs.sample_id = lineage.parent_id AND dbs.derived_sample_id = seed.derived_sample_id
+                              JOIN fms_core_processmeasurement AS pm ON pm.id = lineage.process_measurement_id
+                              JOIN fms_core_process AS process ON process.id = pm.process_id
+                              UNION ALL
+                              SELECT ancestry.sample_id, ancestry.derived_sample_id, lineage.parent_id, ancestry.depth + 1, process.protocol_id
+                              FROM ancestry
+                              JOIN fms_core_samplelineage AS lineage ON lineage.child_id = ancestry.ancestor_id
+                              JOIN fms_core_derivedbysample AS dbs ON dbs.sample_id = lineage.parent_id AND dbs.derived_sample_id = ancestry.derived_sample_id
+                              JOIN fms_core_processmeasurement AS pm ON pm.id = lineage.process_measurement_id
+                              JOIN fms_core_process AS process ON process.id = pm.process_id
+                              )
+                              SELECT sample_id, derived_sample_id, ancestor_id, MIN(depth), (ARRAY_AGG(protocol_id ORDER BY depth))[1]
+                              FROM ancestry
+                              GROUP BY sample_id, derived_sample_id, ancestor_id''', [sample_ids, derived_sample_ids])
+            for sample_id, derived_sample_id, ancestor_id, depth, protocol_id in cursor.fetchall():
+                ancestors_by_pair[(sample_id, derived_sample_id)].append((ancestor_id, depth, protocol_id))
+
+    return (ancestors_by_pair, errors, warnings)
+
+def get_sample_sources_from_derived_samples(sample_derived_samples: List[Tuple[int, int]], materialized: bool = True) -> Tuple[Dict[Tuple[int, int], Optional[int]], List[str], List[str]]:
+    """
+    Provides, for many (sample, derived sample) pairs at once, the sample id of the last aliquot before pooling.
+    Typically used to trace the samples of an experiment run back to their pre-pool aliquots.
+
+    Args:
+        `sample_derived_samples`: List of (sample id, derived sample id) pairs. The derived sample disambiguates pools.
+        `materialized`: Use the materialized sample ancestry (single lookup) instead of the recursive lineage query. Defaults to True.
+
+    Returns:
+        Tuple with a dictionary of the sample source id (None if the sample has no ancestor) for each pair, errors and warnings.
+    """
+    sample_source_by_pair = {}
+    errors = []
+    warnings = []
+
+    if any(sample_id is None or derived_sample_id is None for sample_id, derived_sample_id in sample_derived_samples):
+        errors.append(f"Sample and derived sample are required to get the sample source.")
+
+    if not errors:
+        pairs = set(sample_derived_samples)
+        ancestor_ids_by_pair = defaultdict(list)
+        if materialized:
+            ancestries = (SampleAncestry.objects.filter(sample_id__in={sample_id for sample_id, _ in pairs},
+                                                        derived_sample_id__in={derived_sample_id for _, derived_sample_id in pairs})
+                                                .values_list("sample_id", "derived_sample_id", "ancestor_id"))
+            for sample_id, derived_sample_id, ancestor_id in ancestries:
+                if (sample_id, derived_sample_id) in pairs:
+                    ancestor_ids_by_pair[(sample_id, derived_sample_id)].append(ancestor_id)
+        else:
+            ancestors_by_pair, errors_ancestors, warnings_ancestors = get_derived_sample_ancestors(list(pairs))
+            errors.extend(errors_ancestors)
+            warnings.extend(warnings_ancestors)
+            for pair, ancestors in ancestors_by_pair.items():
+                ancestor_ids_by_pair[pair] = [ancestor_id for ancestor_id, _, _ in ancestors]
+
+        ancestor_ids = {ancestor_id for ancestor_ids in ancestor_ids_by_pair.values() for ancestor_id in ancestor_ids}
+        derived_sample_count_by_sample = dict(DerivedBySample.objects.filter(sample_id__in=ancestor_ids)
+                                                                     .order_by()
+                                                                     .values("sample_id")
+                                                                     .annotate(count=Count("id"))
+                                                                     .values_list("sample_id", "count"))
+        for pair in pairs:
+            candidate_sample_id = None
+            # The most recent ancestor that is not a pool, the oldest ancestor if they are all pools
+            for ancestor_id in sorted(ancestor_ids_by_pair[pair], reverse=True):
+                candidate_sample_id = ancestor_id
+                if derived_sample_count_by_sample.get(ancestor_id, 0) <= 1:
+                    break
+            sample_source_by_pair[pair] = candidate_sample_id
+
+    return (sample_source_by_pair, errors, warnings)
+
+def get_sample_source_from_derived_sample(child_sample_id: int, child_derived_sample_id: int) -> Tuple[Optional[int], List[str], List[str]]:
     """
     Provides the sample id of the last aliquot of a sample that completed an experiment run before pooling 
     using the derived sample and experiment sample id to trace it back.
+    Use get_sample_sources_from_derived_samples to trace many samples at once.
 
     Args:
         `child_sample_id`: ID of the child sample of the lineage
@@ -95,45 +246,100 @@ def get_sample_source_from_derived_sample(child_sample_id: int, child_derived_sa
         errors.append(f"Experiment sample derived sample is required.")
 
     if not errors:
-        child_sample_param = tuple([child_sample_id])
-        child_derived_sample_param = tuple([child_derived_sample_id])
-
-        """
-        This query does a recursive search on the sample_lineage table.
-        
-        It starts from an input of sample id with a paired derived_sample id (to uniquely identify a sample in a pool).
-       
-        The query lists all lineages (id, child_id and parent_id) encountered moving up the lineage (toward parent samples)
-        that matches the given derived_sample_id.
-
-        Returns a queryset with distinct fields id, child_id, parent_id. 
-        """
-        samples = SampleLineage.objects.raw('''WITH RECURSIVE parent(id, child_id, parent_id, derived_sample_id) AS (
-                                            select DISTINCT fcsl1.id, fcsl1.child_id, fcsl1.parent_id, fcd1.derived_sample_id
-                                            FROM fms_core_samplelineage fcsl1
-                                            join fms_core_sample fcs1 on fcsl1.parent_id = fcs1.id
-                                            join fms_core_derivedbysample fcd1 on fcs1.id = fcd1.sample_id
-                                            WHERE fcsl1.child_id IN %s
-                                            and fcd1.derived_sample_id IN %s
-                                            UNION ALL
-                                            SELECT child.id, child.child_id, child.parent_id, child.derived_sample_id
-                                            FROM (
-                                            select fcsl2.id, fcsl2.child_id, fcsl2.parent_id, fcd2.derived_sample_id
-                                            from fms_core_samplelineage fcsl2
-                                            join fms_core_sample fcs2 on fcsl2.parent_id = fcs2.id
-                                            join fms_core_derivedbysample fcd2 on fcs2.id = fcd2.sample_id
-                                            ) child, parent
-                                            WHERE child.child_id = parent.parent_id
-                                            and child.derived_sample_id = parent.derived_sample_id
-                                            )
-                                            SELECT distinct id, child_id, parent_id FROM parent''', params=[child_sample_param, child_derived_sample_param])
-
-        sample_ids = tuple(sample.parent_id for sample in samples)
-        sample_extract = Sample.objects.filter(id__in=sample_ids).order_by("-id")
-
-        for sample in sample_extract:
-            candidate_sample_id = sample.id
-            if not sample.is_pool:
-                break
+        sample_source_by_pair, errors, warnings = get_sample_sources_from_derived_samples([(child_sample_id, child_derived_sample_id)])
+        candidate_sample_id = sample_source_by_pair.get((child_sample_id, child_derived_sample_id), None)
             
-    return (candidate_sample_id, errors, warnings)
\ No newline at end of file
+    return (candidate_sample_id, errors, warnings)
+
+def traverse_sample_lineage(sample_id: int,
+                            direction: str = LINEAGE_DIRECTION_DESCENDANTS,
+                            max_depth: int = 10,
+                            node_limit: int = 500,
+                            after: Optional[Tuple[int, int]] = None) -> Tuple[List[List[Any]], List[List[Any]], Optional[Tuple[int, int]], List[str], List[str]]:
+    """
+    Traverses the sample lineages from a sample toward its ancestors or its descendants, up to a maximum depth, using a
+    single recursive query. Nodes are returned by increasing depth then sample id, a page of at most node_limit nodes
+    at a time. Each edge is returned with the node it leads to (the parent for ancestors, the child for descendants),
+    so every edge of the traversal is returned exactly once across the pages.
+
+    Args:
+        `sample_id`: ID of an existing sample, the root of the traversal (depth 0).
+        `direction`: One of LINEAGE_DIRECTIONS. Defaults to descendants.
+        `max_depth`: Maximum number of lineages between the root and a node (at most LINEAGE_MAX_DEPTH).
+        `node_limit`: Maximum number of nodes returned (at most LINEAGE_MAX_NODES).
+        `after`: (depth, sample id) of the last node of the previous page. None for the first page.
+
+    Returns:
+        Tuple with the nodes (lists of values ordered as LINEAGE_NODE_FIELDS), the edges (lists of values ordered as
+        LINEAGE_EDGE_FIELDS), the (depth, sample id) to continue from (None if it is the last page), errors and warnings.
+    """
+    nodes = []
+    edges = []
+    next_after = None
+    errors = []
+    warnings = []
+
+    if direction not in LINEAGE_DIRECTIONS:
+        errors.append(f"Direction must be one of {', '.join(LINEAGE_DIRECTIONS)}.")
+    if max_depth is None or not 0 <= max_depth <= LINEAGE_MAX_DEPTH:
+        errors.append(f"Maximum depth must be between 0 and {LINEAGE_MAX_DEPTH}.")
+    if node_limit is None or not 0 < node_limit <= LINEAGE_MAX_NODES:
+        errors.append(f"Node limit must be between 1 and {LINEAGE_MAX_NODES}.")
+    if not Sample.objects.filter(pk=sample_id).exists():
+        errors.append(f"Sample with id {sample_id} does not exist.")
+
+    if not errors:
+        # from_id is the sample the traversal comes from, to_id the sample it reaches
+        from_column, to_column = ("child_id", "parent_id") if direction == LINEAGE_DIRECTION_ANCESTORS else ("parent_id", "child_id")
+        after_depth, after_sample_id = after if after is not None else (-1, 0)
+        with connection.cursor() as cursor:
+            cursor.execute(f'''WITH RECURSIVE traversal(lineage_id, from_id, to_id, depth) AS (
+                               SELECT lineage.id, lineage.{from_column}, lineage.{to_column}, 1
+                               FROM fms_core_samplelineage AS lineage
+                               WHERE lineage.{from_column} = %(sample_id)s AND %(max_depth)s > 0
+                               UNION
+                               SELECT lineage.id, lineage.{from_column}, lineage.{to_column}, traversal.depth + 1
+                               FROM traversal
+                               JOIN fms_core_samplelineage AS lineage ON lineage.{from_column} = traversal.to_id
+                               WHERE traversal.depth < %(max_depth)s
+                               ),
+                               node AS (
+                               SELECT %(sample_id)s::bigint AS sample_id, 0 AS depth
+                               UNION ALL
+                               SELECT to_id, MIN(depth) FROM traversal GROUP BY to_id
+                               ),
+                               page AS (
+                               SELECT sample_id, depth FROM node
+                               WHERE (depth, sample_id) > (%(after_depth)s, %(after_sample_id)s)
+                               ORDER BY depth, sample_id
+                               LIMIT %(limit)s
+                               )
+                               SELECT page.sample_id, page.depth, ARRAY_REMOVE(ARRAY_AGG(DISTINCT traversal.lineage_id), NULL)
+                               FROM page
+                               LEFT JOIN traversal ON traversal.to_id = page.sample_id
+                               GROUP BY page.sample_id, page.depth
+                               ORDER BY page.depth, page.sample_id''',
+                           {"sample_id": sample_id,
+                            "max_depth": max_depth,
+                            "after_depth": after_depth,
+                            "after_sample_id": after_sample_id,
+                            "limit": node_limit + 1})
+            page = cursor.fetchall()
+
+        if len(page) > node_limit:
+            page = page[:node_limit]
+            next_after = (page[-1][1], page[-1][0])
+
+        samples_by_id = {sample["id"]: sample for sample in Sample.objects.filter(id__in=[node_id for node_id, _, _ in page])
+                                                                           .values("id", "name", "quality_flag", "quantity_flag", "identity_flag")}
+        for node_id, depth, _ in page:
+            sample = samples_by_id[node_id]
+            nodes.append([node_id, sample["name"], sample["quality_flag"], sample["quantity_flag"], sample["identity_flag"], depth])
+
+        lineage_ids = [lineage_id for _, _, node_lineage_ids in page for lineage_id in node_lineage_ids]
+        lineages = (SampleLineage.objects.filter(id__in=lineage_ids)
+                                         .order_by("id")
+                                         .values_list("process_measurement_id", "parent_id", "child_id", "process_measurement__process__protocol__name"))
+        edges = [list(lineage) for lineage in lineages]
+
+    return (nodes, edges, next_after, errors, warnings)
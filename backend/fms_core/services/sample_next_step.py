@@ -1,10 +1,67 @@
+from collections import defaultdict
 from django.core.exceptions import ValidationError
-from django.db.models import Case, When, Q, F, BooleanField
-from fms_core.models import SampleNextStep, SampleNextStepByStudy, StepOrder, Sample, Study, Step, ProcessMeasurement, StepHistory
+from django.db.models import Case, When, Q, F, BooleanField, Count
+from fms_core.models import SampleNextStep, SampleNextStepByStudy, StepOrder, Sample, Study, Step, ProcessMeasurement, StepHistory, StudyStepCounter
 from fms_core._constants import WorkflowAction
 from typing import  List, Tuple, Union
 from fms_core.models._constants import SampleType
 
+def _update_study_step_counter(study_id: int, step_order_id: int, queued: int=0, completed: int=0):
+    """
+    Applies a variation to the queued and completed counters of a study step, creating the counter if needed.
+    Called by the workflow services in the transaction that queues, dequeues or records the step history of the sample.
+
+    Args:
+        `study_id`: Id of the study of the counter.
+        `step_order_id`: Id of the step order of the counter.
+        `queued`: Variation of the number of samples queued to the step. Defaults to 0.
+        `completed`: Variation of the number of step history entries of the step. Defaults to 0.
+    """
+    counter_query = StudyStepCounter.objects.filter(study_id=study_id, step_order_id=step_order_id)
+    increments = dict(queued_count=F("queued_count") + queued, completed_count=F("completed_count") + completed)
+    if not counter_query.update(**increments):
+        _, created = StudyStepCounter.objects.get_or_create(study_id=study_id,
+                                                            step_order_id=step_order_id,
+                                                            defaults=dict(queued_count=queued, completed_count=completed))
+        if not created: # Created concurrently since the update
+            counter_query.update(**increments)
+
+def reconcile_study_step_counters(study_ids: List[int]=None) -> Tuple[List[StudyStepCounter], List[str], List[str]]:
+    """
+    Recomputes the study step counters from the queued samples and the step histories. Should be called in a transaction.
+
+    Args:
+        `study_ids`: List of the ids of the studies to reconcile. Optional: defaults to all the studies.
+
+    Returns:
+        Tuple containing the list of the recomputed StudyStepCounter instances, the error messages and the warning messages.
+    """
+    counters = []
+    errors = []
+    warnings = []
+
+    queues = SampleNextStepByStudy.objects.all()
+    histories = StepHistory.objects.all()
+    existing_counters = StudyStepCounter.objects.all()
+    if study_ids is not None:
+        queues = queues.filter(study_id__in=study_ids)
+        histories = histories.filter(study_id__in=study_ids)
+        existing_counters = existing_counters.filter(study_id__in=study_ids)
+
+    try:
+        counts = defaultdict(lambda: dict(queued_count=0, completed_count=0))
+        for group in queues.order_by().values("study_id", "step_order_id").annotate(count=Count("id")):
+            counts[(group["study_id"], group["step_order_id"])]["queued_count"] = group["count"]
+        for group in histories.order_by().values("study_id", "step_order_id").annotate(count=Count("id")):
+            counts[(group["study_id"], group["step_order_id"])]["completed_count"] = group["count"]
+        existing_counters.delete()
+        counters = StudyStepCounter.objects.bulk_create([StudyStepCounter(study_id=study_id, step_order_id=step_order_id, **count)
+                                                         for (study_id, step_order_id), count in counts.items()])
+    except Exception as err:
+        errors.append(err)
+
+    return counters, errors, warnings
+
 def queue_sample_to_study_workflow(sample_obj: Sample, study_obj: Study, order: int=None) -> Tuple[Union[SampleNextStep, None], List[str], List[str]]:
     """
     Create a SampleNextStepByStudy instance to indicate the position of a sample in a study workflow. Also creates a SampleNextStep instance if none exists.
@@ -55,6 +112,7 @@ def queue_sample_to_study_workflow(sample_obj: Sample, study_obj: Study, order:
                 if sample_next_step is not None:
                     if not SampleNextStepByStudy.objects.filter(sample_next_step=sample_next_step, step_order=step_order, study=study_obj).exists():
                         SampleNextStepByStudy.objects.create(sample_next_step=sample_next_step, step_order=step_order, study=study_obj)
+                        _update_study_step_counter(study_obj.id, step_order.id, queued=1)
                     else:
                         warnings.append(("Sample {0} already queued to this study's workflow.", [sample_obj.name]))
             except Exception as err:
@@ -112,6 +170,7 @@ def dequeue_sample_from_specific_step_study_workflow(sample_obj: Sample, study_o
                 if sample_next_step_by_study_instance:
                     is_last_queue = SampleNextStepByStudy.objects.filter(sample_next_step=sample_next_step_instance).count() < 2
                     sample_next_step_by_study_instance.delete()
+                    _update_study_step_counter(study_obj.id, step_order.id, queued=-1)
                     if is_last_queue:
                         sample_next_step_instance.delete()
                     dequeued = True
@@ -179,6 +238,7 @@ def dequeue_sample_from_all_steps_study_workflow(sample_obj: Sample, study_obj:
                 for sample_next_step_by_study_instance in sample_next_step_by_study_instances.all():
                     is_last_queue = SampleNextStepByStudy.objects.filter(sample_next_step=sample_next_step).count() < 2
                     sample_next_step_by_study_instance.delete()
+                    _update_study_step_counter(study_obj.id, sample_next_step_by_study_instance.step_order_id, queued=-1)
                     if is_last_queue:
                         sample_next_step.delete()
                     num_deleted += 1
@@ -323,6 +383,7 @@ def move_sample_to_next_step(current_step: Step, current_sample: Sample, process
                             next_sample_next_step = SampleNextStep.objects.get(step=next_step_order.step, sample=new_sample)
                             if not SampleNextStepByStudy.objects.filter(sample_next_step=next_sample_next_step, study=study, step_order=next_step_order).exists():
                                 SampleNextStepByStudy.objects.create(sample_next_step=next_sample_next_step, study=study, step_order=next_step_order)
+                                _update_study_step_counter(study.id, next_step_order.id, queued=1)
                             elif new_sample.is_pool:
                                 warnings.append(("Sample {0} is already queued for step {1} "
                                                 "of study {2} of project {3}.", [new_sample.name, next_step_order.order if next_step_order is not None else '', study.letter, study.project.name]))
@@ -334,6 +395,7 @@ def move_sample_to_next_step(current_step: Step, current_sample: Sample, process
                                                                                   sample=new_sample)
                             if next_sample_next_step is not None:
                                 SampleNextStepByStudy.objects.create(sample_next_step=next_sample_next_step, study=study, step_order=next_step_order)
+                                _update_study_step_counter(study.id, next_step_order.id, queued=1)
                                 new_sample_next_steps.append(next_sample_next_step)
                     except Exception as err:
                         errors.append(f"Failed to create new sample next step instance.")
@@ -344,6 +406,7 @@ def move_sample_to_next_step(current_step: Step, current_sample: Sample, process
                                                process_measurement=process_measurement,
                                                sample=current_sample,
                                                workflow_action=workflow_action)
+                    _update_study_step_counter(study.id, current_step_order.id, completed=1)
                 except Exception as err:
                     errors.append(f"Failed to create StepHistory.")
             try:
@@ -351,6 +414,7 @@ def move_sample_to_next_step(current_step: Step, current_sample: Sample, process
                 if not keep_current:
                     for sample_next_step_by_study in SampleNextStepByStudy.objects.filter(sample_next_step=current_sample_next_step).all():
                         sample_next_step_by_study.delete()
+                        _update_study_step_counter(sample_next_step_by_study.study_id, sample_next_step_by_study.step_order_id, queued=-1)
                     current_sample_next_step.delete()
             except Exception as err:
                 errors.append(f"Failed to remove old sample next step.")
@@ -389,6 +453,7 @@ def dequeue_sample_from_all_study_workflows_matching_step(sample: Sample, step:
         for sample_next_step_by_study in SampleNextStepByStudy.objects.filter(sample_next_step=queued_sample_next_step).all():
             try:
                 sample_next_step_by_study.delete()
+                _update_study_step_counter(sample_next_step_by_study.study_id, sample_next_step_by_study.step_order_id, queued=-1)
                 removed_count += 1
             except Exception as err:
                 errors.append(err)
@@ -449,6 +514,7 @@ def remove_sample_from_workflow(current_step: Step, current_sample: Sample, proc
                                                process_measurement=process_measurement,
                                                sample=current_sample,
                                                workflow_action=workflow_action)
+                    _update_study_step_counter(study.id, current_step_order.id, completed=1)
                 except Exception as err:
                     errors.append(f"Failed to create StepHistory.")
 
@@ -505,6 +571,7 @@ def record_step_history(current_step: Step, current_sample: Sample, process_meas
                                                               process_measurement=process_measurement,
                                                               sample=current_sample,
                                                               workflow_action=workflow_action)
+                    _update_study_step_counter(study.id, current_step_order.id, completed=1)
                     new_step_histories.append(step_history)
                 except Exception as err:
                     errors.append(f"Failed to create StepHistory.")
@@ -0,0 +1,100 @@
+import json
+from os import rename
+
+from django.db import transaction
+from django.utils import timezone
+
+from fms_core.models import TriggerFile
+from fms_core.models._constants import TriggerFileType
+
+DEFAULT_TRIGGER_FILE_BATCH_SIZE = 100
+DEFAULT_TRIGGER_FILE_MAX_ATTEMPTS = 10
+
+def queue_trigger_file(trigger_file_type: TriggerFileType, file_path: str, content: dict):
+    """
+    Queues a trigger file to be written by the trigger file worker. The entry is part of the current transaction, so the
+    file is only written once the change it announces is committed.
+
+    Args:
+        `trigger_file_type`: Type of trigger file (TriggerFileType).
+        `file_path`: Destination path of the trigger file.
+        `content`: Json serializable content of the trigger file.
+
+    Returns:
+        Tuple with the queued trigger file (None on error), errors and warnings.
+    """
+    trigger_file = None
+    errors = []
+    warnings = []
+
+    if trigger_file_type not in TriggerFileType.values:
+        errors.append(f"Trigger file type can only be {' or '.join(TriggerFileType.values)}.")
+    if not file_path:
+        errors.append("Missing trigger file path.")
+
+    if not errors:
+        try:
+            trigger_file = TriggerFile.objects.create(type=trigger_file_type, file_path=file_path, content=content)
+        except Exception as err:
+            errors.append(f"Failed to queue trigger file {file_path}. Error : {str(err)}.")
+
+    return trigger_file, errors, warnings
+
+def write_trigger_file(trigger_file: TriggerFile):
+    """
+    Writes a trigger file to its destination. The content is written to a temporary file that is renamed once complete,
+    so the watcher never picks up a partial file.
+
+    Args:
+        `trigger_file`: Queued trigger file.
+
+    Raises:
+        Any error raised while writing or renaming the file.
+    """
+    tmp_file_path = f"{trigger_file.file_path}.tmp"
+    with open(tmp_file_path, "w", encoding="utf-8") as fp:
+        fp.write(json.dumps(trigger_file.content, indent=4))
+    # move file to final destination
+    rename(src=tmp_file_path, dst=trigger_file.file_path)
+
+def process_trigger_file_queue(log, batch_size=DEFAULT_TRIGGER_FILE_BATCH_SIZE, max_attempts=DEFAULT_TRIGGER_FILE_MAX_ATTEMPTS):
+    """
+    Writes the pending trigger files, one batch at a time, in queue order. Each file is attempted once per call : a file
+    that fails to be written keeps its pending state with the error and is retried by the next call, until it reaches
+    `max_attempts` failed attempts. It is then left failed (pending with attempt_count at the maximum) and is no longer
+    retried until its attempt_count is reset. Entries locked by another worker are skipped.
+
+    Args:
+        `log`: active logger to keep informed on the writing
+        `batch_size`: maximum number of trigger files locked in a single transaction
+        `max_attempts`: number of failed attempts after which a trigger file is no longer retried
+
+    Returns:
+        Tuple with the number of trigger files written and the number of failed attempts.
+    """
+    written_count = 0
+    failed_count = 0
+    last_id = 0
+    while True:
+        with transaction.atomic():
+            trigger_files = list(TriggerFile.objects.select_for_update(skip_locked=True)
+                                                    .filter(written_at__isnull=True, attempt_count__lt=max_attempts, id__gt=last_id)
+                                                    .order_by("id")[:batch_size])
+            if not trigger_files:
+                break
+            for trigger_file in trigger_files:
+                try:
+                    write_trigger_file(trigger_file)
+                    trigger_file.written_at = timezone.now()
+                    trigger_file.last_error = ""
+                    written_count += 1
+                except Exception as err:
+                    trigger_file.attempt_count += 1
+                    trigger_file.last_error = str(err)
+                    failed_count += 1
+                    log.error(f"Failed to write trigger file {trigger_file.file_path}. Error : {str(err)}.")
+                    if trigger_file.attempt_count >= max_attempts:
+                        log.error(f"Trigger file {trigger_file.file_path} failed {trigger_file.attempt_count} times and will not be retried.")
+            TriggerFile.objects.bulk_update(trigger_files, ["written_at", "attempt_count", "last_error"])
+            last_id = trigger_files[-1].id
+    return written_count, failed_count
@@ -71,6 +71,19 @@ def zip_files(output_zip_name, file_list):
 
     return zip_buffer
 
+def robot_file_content(header: list, lines: list) -> bytes:
+    """
+    Builds the content of a robot worklist csv file.
+
+    Args:
+        `header`: List of the column names.
+        `lines`: List of lines, each a list of values (converted with str).
+
+    Returns:
+        The csv content as bytes.
+    """
+    return "".join(",".join(str(value) for value in line) + "\n" for line in [header, *lines]).encode()
+
 def zero_pad_number(number: str | int, width: int) -> str:
     number = str(number)
     return number.rjust(width, '0')
\ No newline at end of file
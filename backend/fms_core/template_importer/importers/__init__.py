@@ -1,58 +1,45 @@
-from .container_creation import ContainerCreationImporter
-from .container_rename import ContainerRenameImporter
-from .container_move import ContainerMoveImporter
-from .experiment_run import ExperimentRunImporter
-from .index_creation import IndexCreationImporter
-from .sample_metadata import SampleMetadataImporter
-from .sample_submission import SampleSubmissionImporter
-from .sample_update import SampleUpdateImporter
-from .sample_qc import SampleQCImporter
-from .sample_selection_qpcr import SampleSelectionQPCRImporter
-from .extraction import ExtractionImporter
-from .transfer import TransferImporter
-from .project_study_link_sample import ProjectStudyLinkSamples
-from .library_preparation import LibraryPreparationImporter
-from .library_preparation_with_selection import LibraryPreparationWithSelectionImporter
-from .library_conversion import LibraryConversionImporter
-from .library_capture import LibraryCaptureImporter
-from .library_qc import LibraryQCImporter
-from .normalization import NormalizationImporter
-from .normalization_planning import NormalizationPlanningImporter
-from .sample_pooling import SamplePoolingImporter
-from .sample_pooling_planning import SamplePoolingPlanningImporter
-from .axiom_preparation import AxiomPreparationImporter
-from .qc_integration_spark import QCIntegrationSparkImporter
-from .sample_identity_qc import SampleIdentityQCImporter
-from .index_update import IndexUpdateImporter
-from .sample_rename import SampleRenameImporter
+from importlib import import_module
 
+# Importers (and the pandas and openpyxl modules they use) are loaded on first access : importing this package is cheap
+# and a worker only pays for the importers of the templates it actually handles.
+IMPORTER_MODULES = {
+    "ContainerCreationImporter": "container_creation",
+    "ContainerRenameImporter": "container_rename",
+    "ContainerMoveImporter": "container_move",
+    "ExperimentRunImporter": "experiment_run",
+    "IndexCreationImporter": "index_creation",
+    "SampleMetadataImporter": "sample_metadata",
+    "SampleSubmissionImporter": "sample_submission",
+    "SampleUpdateImporter": "sample_update",
+    "SampleQCImporter": "sample_qc",
+    "SampleSelectionQPCRImporter": "sample_selection_qpcr",
+    "ExtractionImporter": "extraction",
+    "TransferImporter": "transfer",
+    "ProjectStudyLinkSamples": "project_study_link_sample",
+    "LibraryPreparationImporter": "library_preparation",
+    "LibraryPreparationWithSelectionImporter": "library_preparation_with_selection",
+    "LibraryConversionImporter": "library_conversion",
+    "LibraryCaptureImporter": "library_capture",
+    "LibraryQCImporter": "library_qc",
+    "NormalizationImporter": "normalization",
+    "NormalizationPlanningImporter": "normalization_planning",
+    "SamplePoolingImporter": "sample_pooling",
+    "SamplePoolingPlanningImporter": "sample_pooling_planning",
+    "AxiomPreparationImporter": "axiom_preparation",
+    "QCIntegrationSparkImporter": "qc_integration_spark",
+    "SampleIdentityQCImporter": "sample_identity_qc",
+    "IndexUpdateImporter": "index_update",
+    "SampleRenameImporter": "sample_rename",
+}
 
-__all__ = [
-    "ContainerCreationImporter",
-    "ExperimentRunImporter",
-    "IndexCreationImporter",
-    "SampleMetadataImporter",
-    "SampleSubmissionImporter",
-    "SampleUpdateImporter",
-    "SampleQCImporter",
-    "SampleSelectionQPCRImporter",
-    "ExtractionImporter",
-    "TransferImporter",
-    'ProjectStudyLinkSamples',
-    "ContainerRenameImporter",
-    "ContainerMoveImporter",
-    "LibraryPreparationImporter",
-    "LibraryPreparationWithSelectionImporter",
-    "LibraryConversionImporter",
-    "LibraryCaptureImporter",
-    "LibraryQCImporter",
-    "NormalizationImporter",
-    "NormalizationPlanningImporter",
-    "SamplePoolingImporter",
-    "SamplePoolingPlanningImporter",
-    "AxiomPreparationImporter",
-    "QCIntegrationSparkImporter",
-    "SampleIdentityQCImporter",
-    "IndexUpdateImporter",
-    "SampleRenameImporter",
-]
+__all__ = list(IMPORTER_MODULES)
+
+def __getattr__(name):
+    if name in IMPORTER_MODULES:
+        importer_class = getattr(import_module(f".{IMPORTER_MODULES[name]}", __name__), name)
+        globals()[name] = importer_class
+        return importer_class
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted([*globals(), *__all__])
@@ -14,15 +14,21 @@ import json
 from ..sheet_data import SheetData
 from .._utils import blank_and_nan_to_none
 from fms_core.utils import str_normalize
+from fms_core.revisions import deferred_revision_capture
+from fms_core.services.property_value import bulk_property_value_creation
 from fms_core.models import ImportedFile
 from fms_core.templates import SheetInfo
 
 class GenericImporter():
     ERRORS_CUTOFF = 20
+    # Do not add a version for objects saved by the import without any change
+    REVISION_SKIP_UNCHANGED = False
     logger = logging.getLogger(__name__)
 
     def __init__(self):
         self.base_errors = []
+        # Messages that concern the whole template without invalidating it
+        self.base_warnings = []
         self.errors_count = 0
 
         self.preloaded_data = {}
@@ -33,6 +39,9 @@ class GenericImporter():
         self.previews_info = []
         self.dry_run = None
         self.output_file = None
+        # Optional callable receiving the number of handled rows and the total number of rows (used by background imports)
+        self.progress_callback = None
+        self.handled_row_count = 0
 
         # self.SHEETS_INFO is expected to be defined in child classes
         self.SHEETS_INFO: list[SheetInfo] = self.SHEETS_INFO
@@ -64,7 +73,8 @@ class GenericImporter():
                     if dry_run:
                         # This ensures that only one reversion is created, and is rollbacked in a dry_run
                         with reversion.create_revision(manage_manually=True):
-                            self.import_template_inner()
+                            with bulk_property_value_creation():
+                                self.import_template_inner()
                             reversion.set_comment("Template import - dry run")
                         transaction.set_rollback(True)
                     else:
@@ -78,7 +88,10 @@ class GenericImporter():
                                 self.imported_file = ImportedFile.objects.create(filename=new_file_name, location=file_path, created_by_id=user.id)
                             except Exception as err:
                                 self.base_errors.append(err)
-                        self.import_template_inner()                            
+                        # Objects saved multiple times during the import get a single version, captured at the end.
+                        # Property values of all the rows are inserted together at the end.
+                        with deferred_revision_capture(skip_unchanged=self.REVISION_SKIP_UNCHANGED), bulk_property_value_creation():
+                            self.import_template_inner()
                         reversion.set_comment("Template import")
                 except:
                     self.logger.error("Error during template import. Transaction rolled back.", exc_info=True)
@@ -104,7 +117,7 @@ class GenericImporter():
                 except Exception as Err: # Either same file name already exists (unlikely) or lack of disk space (more likely)
                     self.base_errors.append(f"Could not save the template on server. Operation aborted. Contact support.")
 
-        has_warnings = False
+        has_warnings = bool(self.base_warnings)
         for sheet_preview in self.previews_info:
             if any([r['warnings'] for r in sheet_preview['rows']]):
                 has_warnings = True
@@ -115,6 +128,9 @@ class GenericImporter():
                          'base_errors': [{
                              "error": str(e),
                              } for e in self.base_errors],
+                         'base_warnings': [{
+                             "warning": str(w),
+                             } for w in self.base_warnings],
                          'result_previews': self.previews_info,
                          'output_file': self.output_file
                          }
@@ -172,8 +188,15 @@ class GenericImporter():
 
         sheet.rows_results[row_i].update(**result)
         row_obj = row_handler_obj.row_object
+        self.report_progress()
         return (result, row_obj)
 
+    def report_progress(self):
+        self.handled_row_count += 1
+        if self.progress_callback is not None:
+            row_count = sum(len(sheet.rows) for sheet in self.sheets.values())
+            self.progress_callback(min(self.handled_row_count, row_count), row_count)
+
     @property
     def is_valid(self):
         if any(s.is_valid is None for s in list(self.sheets.values())):
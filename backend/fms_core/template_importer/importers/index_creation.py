@@ -1,8 +1,15 @@
+from django.db.models.functions import Lower
+
 from ._generic import GenericImporter
 from fms_core.template_importer.row_handlers.index_creation import IndexCreationHandler
 from fms_core.templates import INDEX_CREATION_TEMPLATE
+from fms_core.template_importer._constants import INDEX_COLLISION_THRESHOLD
+
+from fms_core.models import Index, IndexBySet, IndexSet, IndexStructure
+from fms_core.models._constants import INDEX_READ_FORWARD
+from fms_core.services.index import bulk_create_indices, find_index_collisions
 
-from fms_core.utils import comma_separated_string_to_array, str_cast_and_normalize
+from fms_core.utils import comma_separated_string_to_array, str_cast_and_normalize, unique
 
 class IndexCreationImporter(GenericImporter):
     SHEETS_INFO = INDEX_CREATION_TEMPLATE["sheets info"]
@@ -10,9 +17,25 @@ class IndexCreationImporter(GenericImporter):
     def __init__(self):
         super().__init__()
 
+    def initialize_data_for_template(self, set_names, index_names, index_structure_names):
+        """
+        Resolve the existing index sets, indices and index structures named in the template using one query each.
+        Names are keyed in lower case to detect names that differ only by letter case.
+        """
+        self.preloaded_data = {'index_sets': {}, 'indices': {}, 'index_structures': {}}
+
+        self.preloaded_data['index_structures'] = {structure.name: structure
+                                                   for structure in IndexStructure.objects.filter(name__in=index_structure_names)}
+        index_sets = IndexSet.objects.annotate(lower_name=Lower('name')).filter(lower_name__in=[name.lower() for name in set_names])
+        self.preloaded_data['index_sets'] = {index_set.lower_name: index_set.name for index_set in index_sets}
+        indices = Index.objects.annotate(lower_name=Lower('name')).filter(lower_name__in=[name.lower() for name in index_names]).values('lower_name', 'name', 'index_structure__name')
+        self.preloaded_data['indices'] = {index['lower_name']: {'name': index['name'], 'index_structure': index['index_structure__name']}
+                                          for index in indices}
+
     def import_template_inner(self):
         index_creation_sheet = self.sheets['Indices']
 
+        rows_kwargs = []
         for row_id, row_data in enumerate(index_creation_sheet.rows):
             index = {
                 'name': str_cast_and_normalize(row_data['Index Name']),
@@ -26,10 +49,61 @@ class IndexCreationImporter(GenericImporter):
                 set_name=str_cast_and_normalize(row_data['Set Name']),
                 index=index,
             )
+            rows_kwargs.append(index_creation_kwargs)
+
+        self.initialize_data_for_template(set_names=unique(kwargs['set_name'] for kwargs in rows_kwargs if kwargs['set_name']),
+                                          index_names=unique(kwargs['index']['name'] for kwargs in rows_kwargs if kwargs['index']['name']),
+                                          index_structure_names=unique(kwargs['index']['index_structure'] for kwargs in rows_kwargs if kwargs['index']['index_structure']))
 
-            (result, _) = self.handle_row(
+        indices_data = []
+        for row_id, index_creation_kwargs in enumerate(rows_kwargs):
+            (result, index_data) = self.handle_row(
                 row_handler_class=IndexCreationHandler,
                 sheet=index_creation_sheet,
                 row_i=row_id,
+                preloaded_data=self.preloaded_data,
                 **index_creation_kwargs,
-            )
\ No newline at end of file
+            )
+            if index_data is not None:
+                indices_data.append(index_data)
+                # Following rows see the set and index of this row as existing
+                if index_data['set_name']:
+                    self.preloaded_data['index_sets'].setdefault(index_data['set_name'].lower(), index_data['set_name'])
+                self.preloaded_data['indices'].setdefault(index_data['name'].lower(), {'name': index_data['name'],
+                                                                                      'index_structure': index_data['index_structure']})
+
+        if self.errors_count == 0 and indices_data:
+            indices_by_name, created_index_names, errors, _ = bulk_create_indices(indices_data)
+            self.base_errors.extend(errors)
+            if not errors:
+                self.validate_index_sets(set_names=unique(index_data['set_name'] for index_data in indices_data if index_data['set_name']),
+                                         created_index_names=created_index_names)
+
+    def validate_index_sets(self, set_names, created_index_names):
+        """
+        Run each index set of the template through collision validation against itself before the import is committed.
+        Collisions between indices that existed before the import are not reported.
+        """
+        set_index_ids = {}
+        for set_name, index_id in IndexBySet.objects.filter(index_set__name__in=set_names).values_list('index_set__name', 'index_id'):
+            set_index_ids.setdefault(set_name, []).append(index_id)
+        indices_by_id = Index.objects.select_related('index_structure__flanker_3prime_forward',
+                                                     'index_structure__flanker_5prime_forward') \
+                                     .prefetch_related('sequences_3prime', 'sequences_5prime') \
+                                     .in_bulk(unique(index_id for index_ids in set_index_ids.values() for index_id in index_ids))
+        created_index_names = set(created_index_names)
+
+        for set_name in set_names:
+            indices = [indices_by_id[index_id] for index_id in set_index_ids.get(set_name, [])]
+            results, errors, _ = find_index_collisions(indices=indices,
+                                                       index_read_direction_5_prime=INDEX_READ_FORWARD,
+                                                       index_read_direction_3_prime=INDEX_READ_FORWARD,
+                                                       threshold=INDEX_COLLISION_THRESHOLD)
+            self.base_errors.extend(errors)
+            for position_reference, position_validation, _ in results['collisions']:
+                index_reference = indices[position_reference]
+                index_validation = indices[position_validation]
+                if index_reference.name in created_index_names or index_validation.name in created_index_names:
+                    self.base_errors.append(f"Index set {set_name}: Index {index_reference.name} and Index {index_validation.name} are not different "
+                                            f"for index validation length ({results['validation_length_3prime']}, "
+                                            f"{results['validation_length_5prime']}).")
@@ -7,13 +7,13 @@ from fms_core.templates import NORMALIZATION_PLANNING_TEMPLATE, NORMALIZATION_TE
 
 from fms_core.models import Container
 from ...containers import CONTAINER_KIND_SPECS
+from ...coordinates import COLUMN, get_coordinate_lattice
 from fms_core.services.id_generator import get_unique_id
 
 from ._generic import GenericImporter
-from .._utils import float_to_decimal_and_none, zip_files
+from .._utils import float_to_decimal_and_none, zip_files, robot_file_content
 from fms_core.utils import str_cast_and_normalize, str_cast_and_normalize_lower, unique, check_truth_like
 
-from io import BytesIO
 from datetime import datetime
 import decimal
 
@@ -148,7 +148,6 @@ class NormalizationPlanningImporter(GenericImporter):
         Returns:
             A tuple containing : a list of dict that contains robot csv files and an updated version of the row_data (sorted and completed).
         """
-        FIRST_COORD_AXIS = 0
         TUBE = "tube"
         DILUENT = "Water"   # This is an hardcoded value for Biomek config file
         DILUENT_WELL = "4"  # This is an hardcoded value for Biomek config file
@@ -196,9 +195,7 @@ class NormalizationPlanningImporter(GenericImporter):
                 return CONTAINER_KIND_SPECS[container.kind].coordinate_spec
 
         def convert_to_numerical_robot_coord(coord_spec, fms_coord) -> int:
-            first_axis_len = len(coord_spec[FIRST_COORD_AXIS])
-            second_axis_coord = int(fms_coord[1:])
-            return (ord(fms_coord[:1]) - 64) + (first_axis_len * (second_axis_coord - 1)) # ord A is 65 we need to shift -64 to recenter it
+            return get_coordinate_lattice(coord_spec).ordinal(fms_coord, COLUMN) # Robot coordinates follow the columns
 
         mapping_dest_containers = {}
         mapping_src_containers = {}
@@ -263,100 +260,52 @@ class NormalizationPlanningImporter(GenericImporter):
             # Add type to the rows_data
             output_row_data["Type"] = type
 
+        robot_rows_data = [output_row_data for output_row_data in output_norm_rows_data if not output_row_data["Exclude From Robot"]]
         if type == LIBRARY_TYPE:
             # Creating the 2 robot files
-            add_diluent_io = BytesIO()
-            add_library_io = BytesIO()
-            add_diluent_lines = []
-            add_library_lines = []
-            add_diluent_lines.append((",".join(["DstNameForDiluent", "DstWellForDiluent", "DiluentVol"]) + "\n").encode())
-            add_library_lines.append((",".join(["SrcBarcode", "SrcName", "SrcWell", "DstName", "DstWell", "DNAVol"]) + "\n").encode())
-
-            for output_row_data in output_norm_rows_data:
-                if not output_row_data["Exclude From Robot"]:
-                    container_src_barcode = output_row_data["Source Container Barcode"]
-                    robot_src_barcode = output_row_data["Robot Source Container"]
-                    robot_dst_barcode = output_row_data["Robot Destination Container"]
-                    robot_src_coord = output_row_data["Robot Source Coord"]
-                    robot_dst_coord = output_row_data["Robot Destination Coord"]
-                    volume_library = decimal.Decimal(output_row_data["Volume Used (uL)"])
-                    volume_diluent = decimal.Decimal(output_row_data["Volume Diluent (uL)"])
-
-                    add_diluent_lines.append((",".join([robot_dst_barcode,
-                                                        str(robot_dst_coord),
-                                                        str(volume_diluent)]) + "\n").encode())
-                    add_library_lines.append((",".join([container_src_barcode,
-                                                        robot_src_barcode,
-                                                        str(robot_src_coord),
-                                                        robot_dst_barcode,
-                                                        str(robot_dst_coord),
-                                                        str(volume_library)]) + "\n").encode())
-
-            add_diluent_io.writelines(add_diluent_lines)
-            add_library_io.writelines(add_library_lines)
+            add_diluent_lines = [[output_row_data["Robot Destination Container"],
+                                  output_row_data["Robot Destination Coord"],
+                                  decimal.Decimal(output_row_data["Volume Diluent (uL)"])] for output_row_data in robot_rows_data]
+            add_library_lines = [[output_row_data["Source Container Barcode"],
+                                  output_row_data["Robot Source Container"],
+                                  output_row_data["Robot Source Coord"],
+                                  output_row_data["Robot Destination Container"],
+                                  output_row_data["Robot Destination Coord"],
+                                  decimal.Decimal(output_row_data["Volume Used (uL)"])] for output_row_data in robot_rows_data]
             robot_files = [
                 {"name": f"Normalization_{type.lower()}_diluent_{timestamp.replace(' ', '_')}.csv",
-                 "content": add_diluent_io.getvalue(),},
+                 "content": robot_file_content(["DstNameForDiluent", "DstWellForDiluent", "DiluentVol"], add_diluent_lines),},
                 {"name": f"Normalization_{type.lower()}_main_dilution_{timestamp.replace(' ', '_')}.csv",
-                 "content": add_library_io.getvalue(),},
+                 "content": robot_file_content(["SrcBarcode", "SrcName", "SrcWell", "DstName", "DstWell", "DNAVol"], add_library_lines),},
             ]
 
         elif robot == ROBOT_BIOMEK:
             # Create the single robot file
-            normalization_io = BytesIO()
-            normalization_lines = []
-            normalization_lines.append((",".join(["Source_plate", "Source_well", "Dest_plate", "Dest_well", "Volume_Sample", "Diluant_Bath", "Diluant_Well", "Volume_Diluant"]) + "\n").encode())
-
-            for output_row_data in output_norm_rows_data:
-                if not output_row_data["Exclude From Robot"]:
-                    robot_src_barcode = output_row_data["Robot Source Container"]
-                    robot_dst_barcode = output_row_data["Robot Destination Container"]
-                    robot_src_coord = get_source_container_coord(output_row_data, container_dict)
-                    robot_dst_coord = output_row_data["Destination Container Coord"]
-                    volume_sample = decimal.Decimal(output_row_data["Volume Used (uL)"])
-                    volume_diluent = decimal.Decimal(output_row_data["Volume Diluent (uL)"])
-
-                    normalization_lines.append((",".join([robot_src_barcode,
-                                                          robot_src_coord,
-                                                          robot_dst_barcode,
-                                                          robot_dst_coord,
-                                                          str(volume_sample),
-                                                          DILUENT,
-                                                          DILUENT_WELL,
-                                                          str(volume_diluent)]) + "\n").encode()) # Encode to store a bytes-like object
-
-            normalization_io.writelines(normalization_lines)
+            normalization_lines = [[output_row_data["Robot Source Container"],
+                                    get_source_container_coord(output_row_data, container_dict),
+                                    output_row_data["Robot Destination Container"],
+                                    output_row_data["Destination Container Coord"],
+                                    decimal.Decimal(output_row_data["Volume Used (uL)"]),
+                                    DILUENT,
+                                    DILUENT_WELL,
+                                    decimal.Decimal(output_row_data["Volume Diluent (uL)"])] for output_row_data in robot_rows_data]
             robot_files = [
                 {"name": f"Normalization_{type.lower()}_Biomek_{timestamp}.csv",
-                 "content": normalization_io.getvalue(),},
+                 "content": robot_file_content(["Source_plate", "Source_well", "Dest_plate", "Dest_well", "Volume_Sample", "Diluant_Bath", "Diluant_Well", "Volume_Diluant"],
+                                               normalization_lines),},
             ]
 
         elif robot == ROBOT_JANUS:
             # Create the single robot file
-            normalization_io = BytesIO()
-            normalization_lines = []
-            normalization_lines.append((",".join(["Src ID", "Src Coord", "Dst ID", "Dst Coord", "Diluent Vol", "Sample Vol"]) + "\n").encode())
-
-            for output_row_data in output_norm_rows_data:
-                if not output_row_data["Exclude From Robot"]:
-                    robot_src_barcode = output_row_data["Robot Source Container"]
-                    robot_dst_barcode = output_row_data["Robot Destination Container"]
-                    robot_src_coord = output_row_data["Robot Source Coord"]
-                    robot_dst_coord = output_row_data["Robot Destination Coord"]
-                    volume_sample = decimal.Decimal(output_row_data["Volume Used (uL)"])
-                    volume_diluent = decimal.Decimal(output_row_data["Volume Diluent (uL)"])
-
-                    normalization_lines.append((",".join([robot_src_barcode,
-                                                          str(robot_src_coord),
-                                                          robot_dst_barcode,
-                                                          str(robot_dst_coord),
-                                                          str(volume_diluent),
-                                                          str(volume_sample)]) + "\n").encode()) # Encode to store a bytes-like object
-
-            normalization_io.writelines(normalization_lines)
+            normalization_lines = [[output_row_data["Robot Source Container"],
+                                    output_row_data["Robot Source Coord"],
+                                    output_row_data["Robot Destination Container"],
+                                    output_row_data["Robot Destination Coord"],
+                                    decimal.Decimal(output_row_data["Volume Diluent (uL)"]),
+                                    decimal.Decimal(output_row_data["Volume Used (uL)"])] for output_row_data in robot_rows_data]
             robot_files = [
                 {"name": f"Normalization_{type.lower()}_Janus_{timestamp}.csv",
-                 "content": normalization_io.getvalue(),},
+                 "content": robot_file_content(["Src ID", "Src Coord", "Dst ID", "Dst Coord", "Diluent Vol", "Sample Vol"], normalization_lines),},
             ]
         else:
             raise ValidationError(f"Invalid robot for normalization.")
@@ -1,19 +1,20 @@
 from fms_core.template_prefiller.prefiller import PrefillTemplateFromDict
+from fms_core.template_prefiller.sample_attributes import build_prefill_rows
 from fms_core.template_importer.row_handlers.sample_pooling_planning import SamplePoolingPlanningRowHandler
 from fms_core.templates import SAMPLE_POOLING_PLANNING_TEMPLATE, SAMPLE_POOLING_TEMPLATE
 
 from fms_core.models import Container
 from ...containers import CONTAINER_KIND_SPECS
+from ...coordinates import COLUMN, get_coordinate_lattice
 from fms_core.services.id_generator import get_unique_id
 
 from ._generic import GenericImporter
-from .._utils import float_to_decimal_and_none, zip_files
+from .._utils import float_to_decimal_and_none, zip_files, robot_file_content
 from fms_core.utils import str_cast_and_normalize, unique
-from fms_core.services.index import validate_indices
+from fms_core.services.pool_compatibility import check_pool_compatibility, suggest_pool_moves
 from fms_core.models._constants import INDEX_READ_FORWARD
 from fms_core.template_importer._constants import INDEX_COLLISION_THRESHOLD
 
-from io import BytesIO
 from datetime import datetime
 import decimal
 from collections import OrderedDict
@@ -105,38 +106,32 @@ class SamplePoolingPlanningImporter(GenericImporter):
         if (len(destination_containers_barcodes) > MAX_DESTINATION_CONTAINERS):
             self.base_errors.append(f"Too many pools ({MAX_DESTINATION_CONTAINERS}) for the robot.")
 
-        # Build indices by pool dictionary
-        indices_by_pool = {}
+        # Build the samples by pool dictionary (rows with errors are skipped)
+        sample_ids_by_pool = {}
         for row in pooling_mapping_rows:
-            pool = indices_by_pool.get(row["Pool Name"], dict({"indices": [], "samples_name": []}))
-            sample_name = row["Source Sample"].name
-            for derived_sample in row["Source Sample"].derived_samples.all():
-                pool["indices"].append(derived_sample.library.index)
-                pool["samples_name"].append(sample_name)
-            indices_by_pool[row["Pool Name"]] = pool
-
-        # Validate indices from the samples being pooled
-        for pool_name, pool in indices_by_pool.items():
-            indices = pool["indices"]
-            samples_name = pool["samples_name"]
-            results, invalid_index_errors, _ = validate_indices(indices=indices,
-                                                                index_read_direction_5_prime=INDEX_READ_FORWARD,
-                                                                index_read_direction_3_prime=INDEX_READ_FORWARD,
-                                                                threshold=INDEX_COLLISION_THRESHOLD)
-            self.base_errors.extend(invalid_index_errors)
-
-            if not results["is_valid"] and results.get("distances", None) is not None:
-                # Verify first for direct collision (raise error in this case)
-                index_errors = []
-                for i, index_ref in enumerate(indices):
-                    for j, index_val in enumerate(indices):
-                        index_distance = results["distances"][i][j]
-                        if index_distance is not None and all(map(lambda x: x <= INDEX_COLLISION_THRESHOLD, index_distance)):
-                            index_errors.append(f"Pool {pool_name}: Index {index_ref.name} for sample {samples_name[i]} and "
-                                                f"Index {index_val.name} for sample {samples_name[j]} are not different "
-                                                f"for index validation length ({results['validation_length_3prime']}, "
-                                                f"{results['validation_length_5prime']}).")
-                self.base_errors.extend(index_errors)
+            if row is not None:
+                sample_ids_by_pool.setdefault(row["Pool Name"], []).append(row["Source Sample"].id)
+
+        # Validate indices from the samples being pooled (libraries of all the pools are loaded at once)
+        pool_results, invalid_index_errors, _ = check_pool_compatibility(sample_ids_by_pool=sample_ids_by_pool,
+                                                                         index_read_direction_5_prime=INDEX_READ_FORWARD,
+                                                                         index_read_direction_3_prime=INDEX_READ_FORWARD,
+                                                                         threshold=INDEX_COLLISION_THRESHOLD)
+        self.base_errors.extend(invalid_index_errors)
+        for pool_name, results in pool_results.items():
+            for collision in results["collisions"]:
+                self.base_errors.append(f"Pool {pool_name}: Index {collision['index_reference'].name} for sample {collision['sample_reference']} and "
+                                        f"Index {collision['index_validation'].name} for sample {collision['sample_validation']} are not different "
+                                        f"for index validation length ({results['validation_length_3prime']}, "
+                                        f"{results['validation_length_5prime']}).")
+        if not all(results["is_valid"] for results in pool_results.values()):
+            moves = suggest_pool_moves(pool_results,
+                                       index_read_direction_5_prime=INDEX_READ_FORWARD,
+                                       index_read_direction_3_prime=INDEX_READ_FORWARD,
+                                       threshold=INDEX_COLLISION_THRESHOLD)
+            for move in moves:
+                destination = f"pool {move['to_pool']}" if move["to_pool"] is not None else "a new pool"
+                self.base_warnings.append(f"Suggestion: move sample {move['sample']} from pool {move['from_pool']} to {destination}.")
 
         if len(base_error_rows) > 1:
             self.base_errors.append(f"Rows {base_error_rows} have errors.")
@@ -168,20 +163,8 @@ class SamplePoolingPlanningImporter(GenericImporter):
             }
             
     def default_prefilling(self, sample_rows, template_prefill_info):
-        rows_data = []
-        for sample_row in sample_rows:
-            sample = sample_row["Source Sample"]
-            row_dict = {}
-            # Use sample to extract the sample information guided by the template definition prefill info.
-            for _, column_name, _, attribute, func in template_prefill_info:
-                if func:
-                    value = func(getattr(sample, attribute))
-                else:
-                    value = getattr(sample, attribute)
-                row_dict[column_name] = value
-            rows_data.append(row_dict)
-
-        return rows_data
+        # Use samples to extract the sample information guided by the template definition prefill info.
+        return build_prefill_rows([sample_row["Source Sample"].id for sample_row in sample_rows], template_prefill_info)
 
     def prepare_robot_file(self, pooling_rows_data, pooling_type):
         """
@@ -198,7 +181,6 @@ class SamplePoolingPlanningImporter(GenericImporter):
             A tuple containing : a list of dict that contains robot csv files and an updated version of the sample row_data 
                                  (sorted and completed) and pool row_data.
         """
-        FIRST_COORD_AXIS = 0
         DILUENT_VOLUME = "0"  # This is an hardcoded value since no diluent volume is added to the pool
         
         ROBOT_SRC_PREFIX = "Src"
@@ -220,9 +202,7 @@ class SamplePoolingPlanningImporter(GenericImporter):
             return CONTAINER_KIND_SPECS[container.kind].coordinate_spec
 
         def convert_to_numerical_robot_coord(coord_spec, fms_coord) -> int:
-            first_axis_len = len(coord_spec[FIRST_COORD_AXIS])
-            second_axis_coord = int(fms_coord[1:])
-            return (ord(fms_coord[:1]) - 64) + (first_axis_len * (second_axis_coord - 1)) # ord A is 65 we need to shift -64 to recenter it
+            return get_coordinate_lattice(coord_spec).ordinal(fms_coord, COLUMN) # Robot coordinates follow the columns
         
         output_pool_rows_data = OrderedDict()
         output_sample_rows_data = pooling_rows_data[:]
@@ -258,46 +238,22 @@ class SamplePoolingPlanningImporter(GenericImporter):
         output_sample_rows_data.sort(key=lambda x: (x["Robot Destination Coord"], x["Robot Source Container"], x["Robot Source Coord"]), reverse=False)
 
         # Create the single robot file
-        pooling_io = BytesIO()
-        pooling_lines = []
-        pooling_lines.append((",".join(["Src ID", "Src Coord", "Dst ID", "Dst Coord", "Diluent Vol", "Sample Vol"]) + "\n").encode())
-
-        for output_row_data in output_sample_rows_data:
-                robot_src_barcode = output_row_data["Robot Source Container"]
-                robot_dst_barcode = output_row_data["Robot Destination Container"]
-                robot_src_coord = output_row_data["Robot Source Coord"]
-                robot_dst_coord = output_row_data["Robot Destination Coord"]
-                volume_sample = decimal.Decimal(output_row_data["Volume Used (uL)"])
-                volume_diluent = DILUENT_VOLUME
-
-                pooling_lines.append((",".join([robot_src_barcode,
-                                                str(robot_src_coord),
-                                                robot_dst_barcode,
-                                                str(robot_dst_coord),
-                                                str(volume_diluent),
-                                                str(volume_sample)]) + "\n").encode()) # Encode to store a bytes-like object
-
-        pooling_io.writelines(pooling_lines)
+        pooling_lines = [[output_row_data["Robot Source Container"],
+                          output_row_data["Robot Source Coord"],
+                          output_row_data["Robot Destination Container"],
+                          output_row_data["Robot Destination Coord"],
+                          DILUENT_VOLUME,
+                          decimal.Decimal(output_row_data["Volume Used (uL)"])] for output_row_data in output_sample_rows_data]
         robot_files = [
             {"name": f"Pooling_{pooling_type.lower()}_Janus_{timestamp}.csv",
-             "content": pooling_io.getvalue(),},
+             "content": robot_file_content(["Src ID", "Src Coord", "Dst ID", "Dst Coord", "Diluent Vol", "Sample Vol"], pooling_lines),},
         ]
 
         # Create the robot container mapping file
-        mapping_io = BytesIO()
-        mapping_lines = []
-        mapping_lines.append((",".join(["Robot Position", "Barcode"]) + "\n").encode())
-
-        for barcode, (_, position) in container_dict.items():
-            mapping_lines.append((",".join([position, barcode]) + "\n").encode()) # Encode to store a bytes-like object
-        
-        mapping_lines.append((",".join(["", ""]) + "\n").encode()) # separator csv line
-
-        for i, (_, barcode) in enumerate(dst_containers, start=1):
-            mapping_lines.append((",".join([ROBOT_DST_PREFIX + str(i), barcode]) + "\n").encode()) # Encode to store a bytes-like object
-
-        mapping_io.writelines(mapping_lines)
+        mapping_lines = [[position, barcode] for barcode, (_, position) in container_dict.items()]
+        mapping_lines.append(["", ""]) # separator csv line
+        mapping_lines.extend([ROBOT_DST_PREFIX + str(i), barcode] for i, (_, barcode) in enumerate(dst_containers, start=1))
         robot_files.append({"name": f"Container_Mapping_{timestamp}.csv",
-                            "content": mapping_io.getvalue(),})
+                            "content": robot_file_content(["Robot Position", "Barcode"], mapping_lines),})
 
         return robot_files, output_sample_rows_data, list(output_pool_rows_data.values())
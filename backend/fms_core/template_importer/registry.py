@@ -0,0 +1,25 @@
+from fms_core.template_importer import importers
+
+__all__ = ["LazyImporter"]
+
+
+class LazyImporter:
+    """
+    Reference to an importer class, resolved the first time the importer is used. Template action lists refer to their
+    importers through it so that loading a viewset does not load the importers.
+    """
+    def __init__(self, name: str):
+        if name not in importers.IMPORTER_MODULES:
+            raise ValueError(f"Unknown importer {name}.")
+        self.name = name
+
+    @property
+    def importer_class(self):
+        return getattr(importers, self.name)
+
+    def __call__(self, *args, **kwargs):
+        return self.importer_class(*args, **kwargs)
+
+    def __repr__(self):
+        return f"LazyImporter({self.name})"
+
@@ -1,39 +1,69 @@
-from datetime import datetime
+from django.core.exceptions import ValidationError
 
-from fms_core.models import Index
+from fms_core.models import Index, IndexSet
+from fms_core.models._validators import sequence_validator
 
 from fms_core.template_importer.row_handlers._generic import GenericRowHandler
 
-from fms_core.services.index import get_or_create_index_set, get_or_create_index, create_indices_3prime_by_sequence,  create_indices_5prime_by_sequence
-
 
 class IndexCreationHandler(GenericRowHandler):
+    """
+    Validate an index row against the data preloaded by the importer. Nothing is written here: the validated rows are
+    returned as row objects and the importer creates all the indices at once (see bulk_create_indices).
+    """
     def __init__(self):
         super().__init__()
 
-    def process_row_inner(self, set_name, index):
-        #get or create set
-        index_set_obj, set_created, self.errors['index_set'], self.warnings['index_set'] = get_or_create_index_set(set_name)
-
-        if not index_set_obj:
+    def process_row_inner(self, set_name, index, preloaded_data):
+        #validate set
+        if not set_name:
             self.warnings['index_set'] = ('Index will not be associated to a set.', [])
-        elif not set_created:
-            self.warnings['index_set'] = ('Using existing set {0}.', [index_set_obj.name])
-
-        #create index
-        index_obj, index_created, self.errors['index'], self.warnings['index'] = get_or_create_index(index_name=index['name'],
-                                                                                                     index_structure=index['index_structure'],
-                                                                                                     index_set=index_set_obj,
-                                                                                                     external_index_name=index['external_name'])
-
-        if index_obj and index_created:
-            if any([index['index_3prime'], index['index_5prime']]):
-                indices_3prime_by_sequence, self.errors['index_3prime'], self.warnings['index_3prime'] = \
-                    create_indices_3prime_by_sequence(index=index_obj,
-                                                      index_3prime=index['index_3prime'])
-
-                indices_5prime_by_sequence, self.errors['index_5prime'], self.warnings['index_5prime'] = \
-                    create_indices_5prime_by_sequence(index=index_obj,
-                                                      index_5prime=index['index_5prime'])
+        else:
+            existing_set_name = preloaded_data['index_sets'].get(set_name.lower(), None)
+            if existing_set_name is None:
+                try:
+                    IndexSet(name=set_name).clean_fields(exclude=['created_by', 'updated_by'])
+                except ValidationError as e:
+                    self.errors['index_set'].append(';'.join(e.messages))
+            elif existing_set_name != set_name:
+                self.errors['index_set'].append(f"Another index set with a similar name ({existing_set_name}) exists. Two index set names cannot be distinguished only by letter case.")
             else:
-                self.errors['index_sequences'] = 'At least one index sequence is required.'
\ No newline at end of file
+                self.warnings['index_set'] = ('Using existing set {0}.', [existing_set_name])
+
+        #validate index
+        if not index['name']:
+            self.errors['index'].append(f"Index name is required.")
+        if not index['index_structure']:
+            self.errors['index'].append(f"Index structure is required.")
+        elif index['index_structure'] not in preloaded_data['index_structures']:
+            self.errors['index'].append(f"Invalid index structure.")
+
+        if not self.has_errors():
+            existing_index = preloaded_data['indices'].get(index['name'].lower(), None)
+            if existing_index is not None:
+                if existing_index['name'] != index['name']:
+                    self.errors['index'].append(f"Another index with a similar name ({existing_index['name']}) exists. Two index names cannot be distinguished only by letter case.")
+                elif existing_index['index_structure'] != index['index_structure']:
+                    self.errors['index'].append(f"Provided index_structure {index['index_structure']} does not match the index structure {existing_index['index_structure']} of the index retrieved using the name {index['name']}.")
+            else:
+                try:
+                    Index(name=index['name'], external_name=index['external_name']).clean_fields(exclude=['index_structure', 'created_by', 'updated_by'])
+                except ValidationError as e:
+                    self.errors['index'].append(';'.join(e.messages))
+
+                #validate sequences of the new index
+                if any([index['index_3prime'], index['index_5prime']]):
+                    for sequence_key in ['index_3prime', 'index_5prime']:
+                        for value in index[sequence_key]:
+                            if value == "":
+                                self.errors[sequence_key].append(f"Index sequence for ({index['name']}) need to have at least one character.")
+                            else:
+                                try:
+                                    sequence_validator(value)
+                                except ValidationError as e:
+                                    self.errors[sequence_key].append(f"Invalid sequence [{value}] for index {index['name']}.")
+                else:
+                    self.errors['index_sequences'] = 'At least one index sequence is required.'
+
+        if not self.has_errors():
+            self.row_object = dict(set_name=set_name, **index)
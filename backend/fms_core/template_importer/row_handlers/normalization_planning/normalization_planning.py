@@ -3,6 +3,7 @@ from fms_core.template_importer._constants import VALID_ROBOT_CHOICES, GENOTYPIN
 from fms_core.services.container import get_container, is_container_valid_destination
 from fms_core.services.sample import get_sample_from_container
 from fms_core.services.library import convert_library_concentration_from_nm_to_ngbyul, convert_library_concentration_from_ngbyul_to_nm
+from fms_core.services.normalization import compute_normalization, NORMALIZATION_INSUFFICIENT_CONCENTRATION, NORMALIZATION_INSUFFICIENT_INPUT
 
 from fms_core.utils import decimal_rounded_to_precision
 
@@ -20,6 +21,7 @@ class NormalizationPlanningRowHandler(GenericRowHandler):
         concentration_nguL = None
         concentration_nm = None
         combined_concentration_nguL = None
+        input_requested = None
 
         # Check if robot output choice is valid
         if type == LIBRARY_TYPE and robot is not None:
@@ -59,8 +61,6 @@ class NormalizationPlanningRowHandler(GenericRowHandler):
             if not source_sample_obj.coordinates and container_obj.location is None: # sample without coordinate => tube
                 self.errors['robot_input_coordinates'] = 'Source samples in tubes must be in a rack for coordinates to be generated for robot.'
 
-            input_available = source_sample_obj.volume * source_sample_obj.concentration
-
             if measurements['concentration_ngul'] is not None:
                 concentration_nguL = measurements['concentration_ngul']
                 input_requested = decimal.Decimal(measurements['volume']) * decimal.Decimal(concentration_nguL)
@@ -73,10 +73,11 @@ class NormalizationPlanningRowHandler(GenericRowHandler):
                     # Calculate the concentration taking into account volume ratios
                     combined_concentration_nguL, self.errors['concentration_conversion'], self.warnings['concentration_conversion'] = \
                         convert_library_concentration_from_nm_to_ngbyul(source_sample_obj, concentration_nm)
-                    combined_concentration_nguL = decimal.Decimal(combined_concentration_nguL)
                     if combined_concentration_nguL is None:
                         self.errors['concentration'] = 'Concentration could not be converted from nM to ng/uL.'
-                input_requested = decimal.Decimal(measurements['volume']) * combined_concentration_nguL
+                    else:
+                        combined_concentration_nguL = decimal.Decimal(combined_concentration_nguL)
+                        input_requested = decimal.Decimal(measurements['volume']) * combined_concentration_nguL
             elif measurements['na_quantity'] is not None:
                 #compute concentration in ngul
                 concentration_nguL = decimal.Decimal(measurements['na_quantity']) / decimal.Decimal(measurements['volume'])
@@ -106,53 +107,47 @@ class NormalizationPlanningRowHandler(GenericRowHandler):
             # If the source concentration is too low we put as much from the source sample to reach final volume if not enough material is available
             # buffer is used to ensure that the final volume is reached.
             # If requested input is greater than available input, we put all source volume and add the difference in volume as buffer.
-           
-            adjusted_concentration = source_sample_obj.concentration
-            # is concentration insufficient ?
-            if combined_concentration_nguL > source_sample_obj.concentration:
-                volume_used = min(source_sample_obj.volume, decimal.Decimal(measurements['volume']))
-                adjusted_concentration = (volume_used / decimal.Decimal(measurements['volume'])) * adjusted_concentration
-                if measurements['bypass_input_requirement']:
-                    self.warnings['concentration'] = ('Insufficient concentration to comply. Bypassing input requirement by adjusting requested concentration to {0} ng/uL.', [adjusted_concentration])
-                else:
-                    self.errors['concentration'] = 'Requested concentration is higher than the source sample concentration. This cannot be achieved by dilution. Use bypass if you want to submit using this final volume value.'
-            # is source sample available input sufficient ?
-            elif input_requested > input_available:
-                volume_used = source_sample_obj.volume
-                adjusted_concentration = (volume_used / decimal.Decimal(measurements['volume'])) * adjusted_concentration
-                if measurements['bypass_input_requirement']:
-                    self.warnings['concentration'] = ('Insufficient available NA material to comply. Bypassing input requirement by adjusting requested concentration to {0} ng/uL.', [adjusted_concentration])
-                else:
-                    self.errors['concentration'] = 'Insufficient available NA material to comply. Use bypass if you want to submit using this final volume value.'
-            # Input sufficient
-            else:
-                volume_used = input_requested / source_sample_obj.concentration # calculate the volume of source sample to use.
-                adjusted_concentration = combined_concentration_nguL
-
-            # final volume adjustment for Manual Diluent
-            if measurements['manual_diluent_volume']:
-                volume_diluent = (decimal.Decimal(measurements['volume']) - volume_used) - decimal.Decimal(measurements['manual_diluent_volume'])
-                if volume_diluent < 0:
-                    volume_used = volume_used + volume_diluent
-                    adjusted_concentration = (volume_used / decimal.Decimal(measurements['volume'])) * source_sample_obj.concentration
-                    if measurements['bypass_input_requirement']:
-                        self.warnings['manual_diluent'] = ('Insufficient concentration to add {0} uL of diluent. Bypassing input requirement by adjusting requested concentration to {1} ng/uL.', [measurements['manual_diluent_volume'], adjusted_concentration])
-                    else:
-                        self.errors['manual_diluent'] = 'Volume of manual diluent required to comply cannot be supplied given the sample concentration. Use bypass if you want to submit and reduce the requested concentration.'
-            else:
-                volume_diluent = decimal.Decimal(measurements['volume']) - volume_used
-
-            volume_used = decimal_rounded_to_precision(volume_used)
-            volume_diluent = decimal_rounded_to_precision(volume_diluent)
-            final_volume = decimal_rounded_to_precision(decimal.Decimal(measurements['volume']))
-
-            if concentration_nm is not None:
+            # The volumes are computed by compute_normalization, shared with the planning API.
+            volume_used = volume_diluent = final_volume = adjusted_concentration = None
+            if combined_concentration_nguL is not None:
+                results, self.errors['volume_calculation'], _ = compute_normalization(initial_volumes=[source_sample_obj.volume],
+                                                                                      initial_concentrations=[source_sample_obj.concentration],
+                                                                                      final_volumes=[decimal.Decimal(measurements['volume'])],
+                                                                                      requested_concentrations=[combined_concentration_nguL],
+                                                                                      requested_inputs=[input_requested],
+                                                                                      manual_diluent_volumes=[measurements['manual_diluent_volume']])
+                if results:
+                    volume_used = results['volume_used'][0]
+                    volume_diluent = results['volume_diluent'][0]
+                    final_volume = results['final_volume'][0]
+                    adjusted_concentration = results['concentration'][0]
+
+                    if results['status'][0] == NORMALIZATION_INSUFFICIENT_CONCENTRATION:
+                        if measurements['bypass_input_requirement']:
+                            self.warnings['concentration'] = ('Insufficient concentration to comply. Bypassing input requirement by adjusting requested concentration to {0} ng/uL.', [adjusted_concentration])
+                        else:
+                            self.errors['concentration'] = 'Requested concentration is higher than the source sample concentration. This cannot be achieved by dilution. Use bypass if you want to submit using this final volume value.'
+                    elif results['status'][0] == NORMALIZATION_INSUFFICIENT_INPUT:
+                        if measurements['bypass_input_requirement']:
+                            self.warnings['concentration'] = ('Insufficient available NA material to comply. Bypassing input requirement by adjusting requested concentration to {0} ng/uL.', [adjusted_concentration])
+                        else:
+                            self.errors['concentration'] = 'Insufficient available NA material to comply. Use bypass if you want to submit using this final volume value.'
+
+                    # final volume adjustment for Manual Diluent
+                    if results['diluent_adjusted'][0]:
+                        if measurements['bypass_input_requirement']:
+                            self.warnings['manual_diluent'] = ('Insufficient concentration to add {0} uL of diluent. Bypassing input requirement by adjusting requested concentration to {1} ng/uL.', [measurements['manual_diluent_volume'], adjusted_concentration])
+                        else:
+                            self.errors['manual_diluent'] = 'Volume of manual diluent required to comply cannot be supplied given the sample concentration. Use bypass if you want to submit and reduce the requested concentration.'
+
+            if concentration_nm is not None and adjusted_concentration is not None:
                 adjusted_concentration_nm, errors_conversion, warnings_conversion = convert_library_concentration_from_ngbyul_to_nm(source_sample_obj, adjusted_concentration)
                 self.errors['concentration_conversion'].extend(errors_conversion)
                 self.warnings['concentration_conversion'].extend(warnings_conversion)
                 adjusted_concentration_nm = decimal_rounded_to_precision(adjusted_concentration_nm)
 
-            adjusted_concentration = decimal_rounded_to_precision(adjusted_concentration)
+            if adjusted_concentration is not None:
+                adjusted_concentration = decimal_rounded_to_precision(adjusted_concentration)
 
             if not self.has_errors():
                 self.row_object = {
@@ -176,7 +171,7 @@ class NormalizationPlanningRowHandler(GenericRowHandler):
                     'Initial Conc. (ng/uL)': source_sample_obj.concentration,
                     'Current Volume (uL)': source_sample_obj.volume,
                     'Volume Used (uL)': str(volume_used),
-                    'Volume Diluent (uL)': str(max(volume_diluent, decimal.Decimal("0.000"))), # We want the volume of diluent to insert in the robot csv
+                    'Volume Diluent (uL)': str(volume_diluent), # We want the volume of diluent to insert in the robot csv (never negative)
                     'Volume (uL)': str(final_volume),
                     'Conc. (ng/uL)': str(adjusted_concentration) if concentration_nguL is not None else '',
                     'Conc. (nM)': str(adjusted_concentration_nm) if concentration_nm is not None else '',
@@ -5,7 +5,7 @@ from fms_core.services.process import create_process
 from fms_core.services.sample import pool_samples
 from fms_core.services.container import get_container, get_or_create_container
 from fms_core.services.instrument import get_instrument_type
-from fms_core.services.index import validate_indices
+from fms_core.services.pool_compatibility import check_pool_compatibility
 
 from fms_core.template_importer._constants import DEFAULT_INDEX_VALIDATION_THRESHOLD, INDEX_COLLISION_THRESHOLD
 
@@ -63,34 +63,21 @@ class PoolsRowHandler(GenericRowHandler):
             if pool_is_library and seq_instrument_type is not None:
                 instrument_type_obj, self.errors["seq_instrument_type"], self.warnings["seq_instrument_type"] = get_instrument_type(seq_instrument_type)
                 if instrument_type_obj is not None:
-                    indices = []
-                    samples_name = []
-                    for sample in samples_info:
-                        sample_name = sample["Source Sample"].name
-                        for derived_sample in sample["Source Sample"].derived_samples.all():
-                            indices.append(derived_sample.library.index)
-                            samples_name.append(sample_name)
-                    results, self.errors["invalid_index"], _ = validate_indices(indices=indices,
-                                                                                index_read_direction_5_prime=instrument_type_obj.index_read_5_prime,
-                                                                                index_read_direction_3_prime=instrument_type_obj.index_read_3_prime,
-                                                                                threshold=DEFAULT_INDEX_VALIDATION_THRESHOLD)
-
-                    if not results["is_valid"] and results.get("distances", None) is not None:
-                        index_errors = []
-                        index_warnings = []
-                        for i, index_ref in enumerate(indices):
-                            for j, index_val in enumerate(indices):
-                                index_distance = results["distances"][i][j]
-                                # Errors if collision
-                                if index_distance is not None and all(map(lambda x: x <= INDEX_COLLISION_THRESHOLD, index_distance)):
-                                    index_errors.append(f"Index {index_ref.name} for sample {samples_name[i]} and "
-                                                        f"Index {index_val.name} for sample {samples_name[j]} are colliding.")
-                                # Warnings if too close
-                                elif index_distance is not None and all(map(lambda x: x <= DEFAULT_INDEX_VALIDATION_THRESHOLD, index_distance)):
-                                    index_warnings.append(("Index {0} for sample {1} and "
-                                                          "Index {2} for sample {3} are not different enough {4}.", [index_ref.name, samples_name[i], index_val.name, samples_name[j], index_distance]))
-                        self.errors["index_colision"] = index_errors
-                        self.warnings["index_colision"] = index_warnings
+                    sample_ids_by_pool = {pool["name"]: [sample["Source Sample"].id for sample in samples_info]}
+                    pool_results, self.errors["invalid_index"], _ = check_pool_compatibility(sample_ids_by_pool=sample_ids_by_pool,
+                                                                                             index_read_direction_5_prime=instrument_type_obj.index_read_5_prime,
+                                                                                             index_read_direction_3_prime=instrument_type_obj.index_read_3_prime,
+                                                                                             threshold=INDEX_COLLISION_THRESHOLD,
+                                                                                             warning_threshold=DEFAULT_INDEX_VALIDATION_THRESHOLD)
+                    results = pool_results[pool["name"]]
+                    # Errors if collision
+                    self.errors["index_colision"] = [f"Index {collision['index_reference'].name} for sample {collision['sample_reference']} and "
+                                                     f"Index {collision['index_validation'].name} for sample {collision['sample_validation']} are colliding."
+                                                     for collision in results["collisions"]]
+                    # Warnings if too close
+                    self.warnings["index_colision"] = [("Index {0} for sample {1} and Index {2} for sample {3} are not different enough {4}.",
+                                                        [pair["index_reference"].name, pair["sample_reference"], pair["index_validation"].name, pair["sample_validation"], pair["distance"]])
+                                                       for pair in results["close_pairs"]]
 
             # Create a process for each pool created
             process_by_protocol, self.errors["process"], self.warnings["process"] = create_process(protocol=protocol,
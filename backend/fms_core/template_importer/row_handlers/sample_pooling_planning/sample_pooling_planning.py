@@ -1,7 +1,7 @@
 from fms_core.template_importer.row_handlers._generic import GenericRowHandler
 from fms_core.services.container import get_container, is_container_valid_destination
 from fms_core.services.sample import get_sample_from_container
-from fms_core.utils import decimal_rounded_to_precision
+from fms_core.services.normalization import compute_pooling
 
 import decimal
 
@@ -42,15 +42,14 @@ class SamplePoolingPlanningRowHandler(GenericRowHandler):
             if measurements["na_quantity"] is None:
                 self.errors["na_quantity"] = "A nucleic acid quantity is required to pool sample."
             else:
-                #compute volume used
-                input_requested = decimal.Decimal(measurements["na_quantity"])
-                input_available = source_sample_obj.volume * source_sample_obj.concentration
-                # use volume for requested input else use all the source volume
-                if input_available >= input_requested:
-                    volume_used = decimal_rounded_to_precision(input_requested / source_sample_obj.concentration)
-                else:
-                    volume_used = source_sample_obj.volume
-                    self.warnings["na_quantity"] = ("Source sample {0} has insufficient available material. Adjusting requested input to {1} ng ({2} uL used).", [source_sample_obj.name, input_available, volume_used])
+                #compute volume used (use volume for requested input else use all the source volume)
+                results, self.errors["volume_calculation"], _ = compute_pooling(initial_volumes=[source_sample_obj.volume],
+                                                                                initial_concentrations=[source_sample_obj.concentration],
+                                                                                requested_quantities=[decimal.Decimal(measurements["na_quantity"])])
+                if results:
+                    volume_used = results["volume_used"][0]
+                    if not results["is_sufficient"][0]:
+                        self.warnings["na_quantity"] = ("Source sample {0} has insufficient available material. Adjusting requested input to {1} ng ({2} uL used).", [source_sample_obj.name, results["available_quantity"][0], volume_used])
 
             # Ensure the destination container exist or has enough information to be created.
             destination_container_dict = pool["container"]
@@ -0,0 +1,125 @@
+from collections import defaultdict
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from fms_core.models import Sample, DerivedBySample
+from fms_core.utils import decimal_rounded_to_precision
+
+# Prefill info entries name a Sample attribute or property for each prefilled column. Reading them one sample at a time
+# queries the related rows of each sample for each property. Here the related rows needed by all the requested
+# attributes are fetched once for all the samples (sample with container, location and coordinates, then the derived
+# samples with their library when library attributes are requested) and the values are computed from them.
+
+SAMPLE_RELATED_FIELDS = ["coordinate", "container", "container__coordinate", "container__location"]
+
+def _get_libraries(derived_by_samples: List[DerivedBySample]) -> List:
+    return [derived_by_sample.derived_sample.library for derived_by_sample in derived_by_samples]
+
+def _get_single_library(derived_by_samples: List[DerivedBySample]):
+    # Same as the sample properties : library attributes are only defined for a library that is not a pool
+    return derived_by_samples[0].derived_sample.library if len(derived_by_samples) == 1 else None
+
+def _resolve_index_name(sample: Sample, derived_by_samples: List[DerivedBySample]) -> Optional[str]:
+    library = _get_single_library(derived_by_samples)
+    return library.index.name if library is not None else None
+
+def _resolve_library_type(sample: Sample, derived_by_samples: List[DerivedBySample]) -> Optional[str]:
+    library = _get_single_library(derived_by_samples)
+    return library.library_type.name if library is not None else None
+
+def _resolve_strandedness(sample: Sample, derived_by_samples: List[DerivedBySample]) -> Optional[str]:
+    if len(derived_by_samples) > 1:
+        return None
+    library = _get_single_library(derived_by_samples)
+    # Samples that are not libraries use the sample kind (rare in labwork prefills, left to the sample property)
+    return library.strandedness if library is not None else sample.strandedness
+
+def _resolve_concentration_as_nm(sample: Sample, derived_by_samples: List[DerivedBySample]) -> Optional[Decimal]:
+    # Same computation as convert_library_concentration_from_ngbyul_to_nm, using the prefetched derived samples
+    libraries = _get_libraries(derived_by_samples)
+    if not any(library is not None for library in libraries) or sample.concentration is None:
+        return None
+    sum_adjusted_factor = 0
+    for derived_by_sample, library in zip(derived_by_samples, libraries):
+        if library is None or not sample.fragment_size or not library.strandedness:
+            return None
+        sum_adjusted_factor += sample.fragment_size * library.molecular_weight_approx * derived_by_sample.volume_ratio
+    return decimal_rounded_to_precision(Decimal((sample.concentration * 1000000) / sum_adjusted_factor))
+
+# Attributes computed from the derived samples. Every other attribute is read on the sample with its related rows loaded.
+DERIVED_SAMPLE_ATTRIBUTE_RESOLVERS: Dict[str, Callable[[Sample, List[DerivedBySample]], Any]] = {
+    "concentration_as_nm": _resolve_concentration_as_nm,
+    "index_name": _resolve_index_name,
+    "library_type": _resolve_library_type,
+    "strandedness": _resolve_strandedness,
+}
+
+def resolve_sample_attributes(sample_ids: Iterable[int], attributes: Iterable[str]) -> Dict[int, Dict[str, Any]]:
+    """
+    Compute the given attributes of the given samples with a fixed number of queries.
+
+    Args:
+        `sample_ids`: Ids of the samples.
+        `attributes`: Names of Sample attributes or properties (None entries are ignored).
+
+    Returns:
+        Dictionary of the attribute values (by attribute name) for each sample id found.
+    """
+    sample_ids = list(sample_ids)
+    attributes = {attribute for attribute in attributes if attribute is not None}
+
+    samples = Sample.objects.filter(id__in=sample_ids).select_related(*SAMPLE_RELATED_FIELDS)
+    derived_by_samples_by_sample = defaultdict(list)
+    if attributes & DERIVED_SAMPLE_ATTRIBUTE_RESOLVERS.keys():
+        derived_by_samples = (DerivedBySample.objects.filter(sample_id__in=sample_ids)
+                                                     .select_related("derived_sample__library__index",
+                                                                     "derived_sample__library__library_type")
+                                                     .order_by("sample_id", "derived_sample_id"))
+        for derived_by_sample in derived_by_samples:
+            derived_by_samples_by_sample[derived_by_sample.sample_id].append(derived_by_sample)
+
+    values_by_sample = {}
+    for sample in samples:
+        values = {}
+        for attribute in attributes:
+            resolver = DERIVED_SAMPLE_ATTRIBUTE_RESOLVERS.get(attribute, None)
+            if resolver is not None:
+                values[attribute] = resolver(sample, derived_by_samples_by_sample[sample.id])
+            else:
+                values[attribute] = getattr(sample, attribute)
+        values_by_sample[sample.id] = values
+    return values_by_sample
+
+def prefill_row_from_values(values: Dict[str, Any], prefill_info) -> Dict[str, Any]:
+    """
+    Build a prefilled row from the resolved attribute values of a sample.
+
+    Args:
+        `values`: Attribute values of the sample (see resolve_sample_attributes).
+        `prefill_info`: Template prefill info entries (sheet name, column name, queryset name, attribute name and
+                        optionally a conversion function).
+
+    Returns:
+        Row dictionary (column name to value).
+    """
+    row = {}
+    for info in prefill_info:
+        column_name, attribute = info[1], info[3]
+        func = info[4] if len(info) > 4 else None
+        value = values.get(attribute, None)
+        row[column_name] = func(value) if func else value
+    return row
+
+def build_prefill_rows(sample_ids: List[int], prefill_info) -> List[Dict[str, Any]]:
+    """
+    Build the prefilled rows of a list of samples from a template prefill info.
+
+    Args:
+        `sample_ids`: Ids of the samples, one row is built for each id (in the same order).
+        `prefill_info`: Template prefill info entries.
+
+    Returns:
+        List of row dictionaries (column name to value).
+    """
+    values_by_sample = resolve_sample_attributes(sample_ids, [info[3] for info in prefill_info])
+    return [prefill_row_from_values(values_by_sample[sample_id], prefill_info) for sample_id in sample_ids]
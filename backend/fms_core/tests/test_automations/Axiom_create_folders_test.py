@@ -6,6 +6,7 @@ from fms_core.automations import AxiomCreateFolders
 from fms_core.models import SampleKind
 from fms_core.services.container import get_or_create_container
 from fms_core.services.sample import create_full_sample
+from fms_core.template_importer._constants import DESTINATION_CONTAINER_BARCODE_MARKER
 
 class AxiomCreateFoldersTestCase(TestCase):
     def setUp(self) -> None:
@@ -47,7 +48,8 @@ class AxiomCreateFoldersTestCase(TestCase):
 
     def test_import(self):
         # Basic test for all templates - checks that template is valid
-        result, errors, warnings = self.automation.execute(self.list_sample_ids, self.additional_info)
+        samples = self.automation.load_samples(self.list_sample_ids)
+        result, errors, warnings = self.automation.execute(samples, self.additional_info)
         self.assertEqual(result['success'], True)
 
         self.assertEqual(errors, {})
@@ -82,4 +84,19 @@ class AxiomCreateFoldersTestCase(TestCase):
                     self.assertEqual(row[1], '"ArrayTest2"')
                     self.assertIn('AxiomTestSample3', row[2])
                 else:
-                    self.assertTrue(False)
\ No newline at end of file
+                    self.assertTrue(False)
+
+    def test_comment_containers(self):
+        samples = self.automation.load_samples(self.list_sample_ids)
+        result, errors, warnings = self.automation.execute(samples, self.additional_info)
+        self.assertEqual(result['success'], True)
+        self.assertEqual(errors, {})
+        for sample in samples:
+            sample.container.refresh_from_db()
+            self.assertTrue(sample.container.comment.startswith(DESTINATION_CONTAINER_BARCODE_MARKER + self.additional_info[sample.container.name] + " ."))
+
+    def test_missing_array_barcode(self):
+        samples = self.automation.load_samples(self.list_sample_ids)
+        result, errors, warnings = self.automation.execute(samples, {"AxiomTestPlate1": "ArrayTest1"})
+        self.assertEqual(result['success'], False)
+        self.assertEqual(errors["additional_data"], ["No array barcode provided for container AxiomTestPlate2."])
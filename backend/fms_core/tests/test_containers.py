@@ -2,6 +2,7 @@ from django.test import TestCase
 
 from ..coordinates import alphas, ints
 from ..containers import CONTAINER_SPEC_96_WELL_PLATE, CONTAINER_SPEC_SITE
+from ..viewsets._fetch_data import get_lanes_by_container_kind
 
 
 class AdminUtilsTestCase(TestCase):
@@ -20,3 +21,10 @@ class AdminUtilsTestCase(TestCase):
         })
 
         self.assertTrue(CONTAINER_SPEC_SITE.is_source)
+
+    def test_get_lanes_by_container_kind(self):
+        lanes_by_kind = get_lanes_by_container_kind(["illumina-novaseq-x-1.5b flowcell", "tube", "illumina-novaseq-x-1.5b flowcell"])
+        self.assertDictEqual(lanes_by_kind, {
+            "illumina-novaseq-x-1.5b flowcell": [1, 2],
+            "tube": [1],
+        })
@@ -1,5 +1,5 @@
 from django.test import TestCase
-from ..coordinates import CoordinateSpec, CoordinateError, alphas, convert_alpha_digit_coord_to_ordinal, convert_ordinal_to_alpha_digit_coord, ints, validate_and_normalize_coordinates
+from ..coordinates import CoordinateSpec, CoordinateError, COLUMN, alphas, convert_alpha_digit_coord_to_ordinal, convert_ordinal_to_alpha_digit_coord, get_coordinate_lattice, ints, validate_and_normalize_coordinates
 
 
 class CoordinateTestCase(TestCase):
@@ -104,4 +104,38 @@ class CoordinateTestCase(TestCase):
 
         for invalid in (0, 97):
             with self.assertRaises(CoordinateError):
-                convert_ordinal_to_alpha_digit_coord(invalid, cs)
\ No newline at end of file
+                convert_ordinal_to_alpha_digit_coord(invalid, cs)
+
+    def test_coordinate_lattice(self):
+        cs = (alphas(8), ints(12, pad_to=2))
+        lattice = get_coordinate_lattice(cs)
+
+        self.assertIs(lattice, get_coordinate_lattice((alphas(8), ints(12, pad_to=2))))
+        self.assertEqual(len(lattice), 96)
+        self.assertIn("H12", lattice)
+        self.assertNotIn("H13", lattice)
+        self.assertEqual(lattice.row_major[:3], ("A01", "A02", "A03"))
+        self.assertEqual(lattice.column_major[:3], ("A01", "B01", "C01"))
+
+        for ordinal, coordinate in enumerate(lattice.row_major, start=1):
+            self.assertEqual(lattice.ordinal(coordinate), ordinal)
+            self.assertEqual(lattice.coordinate(ordinal), coordinate)
+        for ordinal, coordinate in enumerate(lattice.column_major, start=1):
+            self.assertEqual(lattice.ordinal(coordinate, COLUMN), ordinal)
+            self.assertEqual(lattice.coordinate(ordinal, COLUMN), coordinate)
+
+        # Unpadded digits are accepted for ordinals
+        self.assertEqual(lattice.ordinal("B1", COLUMN), 2)
+        with self.assertRaises(CoordinateError):
+            lattice.ordinal("I01")
+        with self.assertRaises(CoordinateError):
+            lattice.coordinate(97, COLUMN)
+
+    def test_coordinate_lattice_no_coordinates(self):
+        lattice = get_coordinate_lattice(())
+
+        self.assertEqual(len(lattice), 0)
+        self.assertEqual(lattice.row_major, ())
+        self.assertIsNone(lattice.validate_and_normalize(None))
+        with self.assertRaises(CoordinateError):
+            lattice.validate_and_normalize("A01")
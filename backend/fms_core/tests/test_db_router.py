@@ -0,0 +1,64 @@
+import datetime
+import time
+
+from django.contrib.auth.models import User
+from django.db import DEFAULT_DB_ALIAS
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from fms_core.db_router import (ReplicaRouter, get_replica_alias, get_read_alias_for_user, has_recent_write,
+                                mark_recent_write, use_replica, _replica_status)
+from fms_core.models import Taxon, RecentWrite
+
+REPLICA_ALIAS = "replica"
+
+
+class ReplicaRouterTestCase(TestCase):
+    def setUp(self) -> None:
+        self.router = ReplicaRouter()
+        self.user = User.objects.create(username="replica_reader")
+        _replica_status.clear()
+
+    def tearDown(self) -> None:
+        _replica_status.clear()
+
+    def test_routing(self):
+        self.assertIsNone(self.router.db_for_read(Taxon))
+        with use_replica(REPLICA_ALIAS):
+            self.assertEqual(self.router.db_for_read(Taxon), REPLICA_ALIAS)
+            self.assertEqual(self.router.db_for_write(Taxon), DEFAULT_DB_ALIAS)
+            with use_replica(None):
+                self.assertIsNone(self.router.db_for_read(Taxon))
+            self.assertEqual(self.router.db_for_read(Taxon), REPLICA_ALIAS)
+        self.assertIsNone(self.router.db_for_read(Taxon))
+
+    def test_without_replica(self):
+        self.assertIsNone(get_replica_alias())
+        self.assertIsNone(get_read_alias_for_user(self.user))
+        mark_recent_write(self.user)
+        self.assertFalse(has_recent_write(self.user))
+
+    def test_sticky_after_write(self):
+        databases = {"default": {}, REPLICA_ALIAS: {}}
+        with override_settings(DATABASES=databases, REPLICA_STICKY_SECONDS=60):
+            self.assertEqual(get_replica_alias(), REPLICA_ALIAS)
+            self.assertFalse(self.router.allow_migrate(REPLICA_ALIAS, "fms_core"))
+            _replica_status[REPLICA_ALIAS] = (time.monotonic(), True) # replica checked and within the allowed lag
+            self.assertEqual(get_read_alias_for_user(self.user), REPLICA_ALIAS)
+            mark_recent_write(self.user)
+            self.assertTrue(has_recent_write(self.user))
+            self.assertIsNone(get_read_alias_for_user(self.user))
+            # The write is kept in the database, visible to the other processes, until it is older than the sticky delay
+            self.assertTrue(RecentWrite.objects.filter(user=self.user).exists())
+            RecentWrite.objects.filter(user=self.user).update(written_at=timezone.now() - datetime.timedelta(seconds=61))
+            self.assertFalse(has_recent_write(self.user))
+            self.assertEqual(get_read_alias_for_user(self.user), REPLICA_ALIAS)
+            mark_recent_write(self.user)
+            self.assertTrue(has_recent_write(self.user))
+            self.assertEqual(RecentWrite.objects.filter(user=self.user).count(), 1)
+
+    def test_lagging_replica(self):
+        databases = {"default": {}, REPLICA_ALIAS: {}}
+        with override_settings(DATABASES=databases):
+            _replica_status[REPLICA_ALIAS] = (time.monotonic(), False) # replica checked and lagging
+            self.assertIsNone(get_read_alias_for_user(self.user))
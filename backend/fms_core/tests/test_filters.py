@@ -0,0 +1,27 @@
+from django.test import TestCase
+
+from fms_core.filters import IndividualFilter
+from fms_core.models import Individual, Project
+from fms_core.tests.constants import create_individual
+
+
+class BatchFilterTestCase(TestCase):
+    def setUp(self) -> None:
+        for i in range(5):
+            Individual.objects.create(**create_individual(individual_name=f"BATCH_INDIVIDUAL_{i}"))
+
+    def test_any_lookup(self):
+        names = [f"BATCH_INDIVIDUAL_{i}" for i in range(0, 5, 2)] + ["NOT_AN_INDIVIDUAL"]
+        queryset = Individual.objects.filter(name__any=names)
+        self.assertIn("= ANY(", str(queryset.query))
+        self.assertCountEqual(queryset.values_list("name", flat=True), names[:-1])
+        self.assertFalse(Individual.objects.filter(name__any=[]).exists())
+
+    def test_lower_any_lookup(self):
+        Project.objects.create(name="Batch_Project")
+        self.assertTrue(Project.objects.filter(name__lower__any=["batch_project"]).exists())
+        self.assertFalse(Project.objects.filter(name__any=["batch_project"]).exists())
+
+    def test_batch_filter(self):
+        filterset = IndividualFilter(data={"name": "BATCH_INDIVIDUAL_1  BATCH_INDIVIDUAL_3\nBATCH_INDIVIDUAL_4"}, queryset=Individual.objects.all())
+        self.assertCountEqual(filterset.qs.values_list("name", flat=True), ["BATCH_INDIVIDUAL_1", "BATCH_INDIVIDUAL_3", "BATCH_INDIVIDUAL_4"])
@@ -0,0 +1,51 @@
+from django.test import TestCase
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+
+from fms_core.models import Taxon
+from fms_core.pagination import (get_keyset_ordering, encode_cursor, decode_cursor, keyset_condition, keyset_paginate,
+                                 get_count, COUNT_EXACT, COUNT_CACHED, COUNT_NONE)
+
+
+class KeysetPaginationTestCase(TestCase):
+    def setUp(self) -> None:
+        for i in range(7):
+            Taxon.objects.create(name=f"Paginatus {i % 3} {i}", ncbi_id=990000 + i)
+        self.queryset = Taxon.objects.filter(name__startswith="Paginatus")
+
+    def test_get_keyset_ordering(self):
+        self.assertEqual(get_keyset_ordering(self.queryset.order_by("name")), ["name", "id"])
+        self.assertEqual(get_keyset_ordering(self.queryset.order_by("-pk")), ["-id"])
+        self.assertEqual(get_keyset_ordering(self.queryset, ["-id"]), ["-id"])
+        self.assertEqual(get_keyset_ordering(self.queryset, "name"), ["name", "id"])
+        with self.assertRaises(ValidationError):
+            get_keyset_ordering(self.queryset.order_by("?"))
+
+    def test_cursor_encoding(self):
+        cursor = encode_cursor(["name", "id"], ["Paginatus", 3])
+        self.assertEqual(decode_cursor(cursor, ["name", "id"]), ["Paginatus", 3])
+        with self.assertRaises(NotFound):
+            decode_cursor(cursor, ["-name", "id"])
+        with self.assertRaises(NotFound):
+            decode_cursor("not-a-cursor", ["name", "id"])
+
+    def test_keyset_condition(self):
+        self.assertEqual(keyset_condition(["-id"], [5]), Q(id__lt=5))
+        # Null values are sorted last in ascending order
+        self.assertEqual(keyset_condition(["location", "-id"], [None, 5]), Q(location__isnull=True) & Q(id__lt=5))
+
+    def test_keyset_paginate(self):
+        for ordering in [["name"], ["-id"], ["ncbi_id"]]:
+            expected = list(self.queryset.order_by(*ordering, "id").values_list("id", flat=True))
+            paged = []
+            cursor = ""
+            while cursor is not None:
+                page, cursor = keyset_paginate(self.queryset.order_by(*ordering).values("id", "name"), cursor, 3)
+                self.assertLessEqual(len(page), 3)
+                paged.extend(row["id"] for row in page)
+            self.assertEqual(paged, expected)
+
+    def test_get_count(self):
+        self.assertEqual(get_count(self.queryset, COUNT_EXACT), 7)
+        self.assertEqual(get_count(self.queryset, COUNT_CACHED), 7)
+        self.assertIsNone(get_count(self.queryset, COUNT_NONE))
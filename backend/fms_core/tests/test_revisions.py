@@ -0,0 +1,41 @@
+import reversion
+from django.test import TestCase
+from reversion.models import Version
+
+from fms_core.models import Project
+from fms_core.revisions import deferred_revision_capture
+
+
+class DeferredRevisionCaptureTestCase(TestCase):
+    def test_saves_coalesced(self):
+        with reversion.create_revision():
+            with deferred_revision_capture():
+                project = Project.objects.create(name="Deferred_Project")
+                project.comment = "First update"
+                project.save()
+                project.comment = "Last update"
+                project.save()
+
+        versions = Version.objects.get_for_object(project)
+        self.assertEqual(versions.count(), 1)
+        self.assertEqual(versions.first().field_dict["comment"], "Last update")
+
+    def test_skip_unchanged(self):
+        with reversion.create_revision():
+            project = Project.objects.create(name="Deferred_Project")
+
+        with reversion.create_revision():
+            with deferred_revision_capture(skip_unchanged=True):
+                project.save()
+        self.assertEqual(Version.objects.get_for_object(project).count(), 1)
+
+        with reversion.create_revision():
+            with deferred_revision_capture(skip_unchanged=True):
+                project.comment = "Changed"
+                project.save()
+        self.assertEqual(Version.objects.get_for_object(project).count(), 2)
+
+    def test_inactive_without_revision(self):
+        with deferred_revision_capture():
+            project = Project.objects.create(name="Deferred_Project")
+        self.assertEqual(Version.objects.get_for_object(project).count(), 0)
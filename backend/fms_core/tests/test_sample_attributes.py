@@ -0,0 +1,53 @@
+from django.test import TestCase
+
+from fms_core.models import Container, SampleKind
+from fms_core.models._constants import DOUBLE_STRANDED
+from fms_core.services.index import get_or_create_index_set, create_index
+from fms_core.services.library import get_library_type, create_library
+from fms_core.services.platform import get_platform
+from fms_core.services.sample import create_full_sample
+from fms_core.template_prefiller.sample_attributes import resolve_sample_attributes, build_prefill_rows
+
+ATTRIBUTES = ["name", "volume", "concentration", "container_barcode", "container_name", "coordinates",
+              "container_location_barcode", "concentration_as_nm", "quantity_in_ng", "index_name", "library_type",
+              "library_size"]
+
+
+class SampleAttributesTestCase(TestCase):
+    def setUp(self) -> None:
+        kind_dna = SampleKind.objects.get(name="DNA")
+        library_type, _, _ = get_library_type("RNASeq")
+        index_set, _, _, _ = get_or_create_index_set("TEST_INDEX_SET")
+        index, _, _ = create_index("TEST_INDEX_1", "Nextera", index_set)
+        platform, _, _ = get_platform("ILLUMINA")
+        library, _, _ = create_library(library_type=library_type, index=index, platform=platform, strandedness=DOUBLE_STRANDED)
+
+        self.library_sample, _, _ = create_full_sample(name="PrefillLibrary", volume=100, collection_site="TestSite",
+                                                       creation_date="2022-10-01", sample_kind=kind_dna, library=library,
+                                                       container=Container.objects.create(barcode="PREFILLTUBE1", name="PrefillTube1", kind="tube"),
+                                                       concentration=10, fragment_size=150)
+        self.dna_sample, _, _ = create_full_sample(name="PrefillDNA", volume=50, collection_site="TestSite",
+                                                   creation_date="2022-10-01", sample_kind=kind_dna,
+                                                   container=Container.objects.create(barcode="PREFILLTUBE2", name="PrefillTube2", kind="tube"),
+                                                   concentration=5)
+
+    def test_resolve_sample_attributes(self):
+        samples = [self.library_sample, self.dna_sample]
+        values_by_sample = resolve_sample_attributes([sample.id for sample in samples], ATTRIBUTES)
+        for sample in samples:
+            for attribute in ATTRIBUTES:
+                self.assertEqual(values_by_sample[sample.id][attribute], getattr(sample, attribute), attribute)
+        values_by_sample = resolve_sample_attributes([self.library_sample.id], ["strandedness"])
+        self.assertEqual(values_by_sample[self.library_sample.id]["strandedness"], DOUBLE_STRANDED)
+
+    def test_resolve_sample_attributes_queries(self):
+        # Sample with its related rows, then derived samples with their library
+        with self.assertNumQueries(2):
+            resolve_sample_attributes([self.library_sample.id, self.dna_sample.id], ["container_barcode", "index_name", "concentration_as_nm"])
+
+    def test_build_prefill_rows(self):
+        prefill_info = [("Samples", "Sample Name", "name", "name", None),
+                        ("Samples", "Volume (uL)", "volume", "volume", float)]
+        rows = build_prefill_rows([self.dna_sample.id, self.library_sample.id, self.dna_sample.id], prefill_info)
+        self.assertEqual([row["Sample Name"] for row in rows], ["PrefillDNA", "PrefillLibrary", "PrefillDNA"])
+        self.assertEqual(rows[0]["Volume (uL)"], 50.0)
@@ -9,7 +9,7 @@ from fms_core.services.dataset import (create_dataset,
                                        get_experiment_run_lane_validation_status,
                                        set_dataset_release_status,
                                        get_dataset_root_folder)
-from fms_core.models._constants import ReleaseStatus, ValidationStatus, INDEX_READ_FORWARD, INDEX_READ_REVERSE
+from fms_core.models._constants import ReleaseStatus, ValidationStatus, TriggerFileType, INDEX_READ_FORWARD, INDEX_READ_REVERSE
 from fms_core.models import (
     RunType,
     Container,
@@ -23,8 +23,10 @@ from fms_core.models import (
     Dataset,
     DatasetFile,
     Readset,
-    Metric
+    Metric,
+    TriggerFile
 )
+from fms_report.models import ProductionQueue
 from fms_core.tests.constants import create_container
 
 class DatasetServicesTestCase(TestCase):
@@ -189,6 +191,8 @@ class DatasetServicesTestCase(TestCase):
         self.assertEqual(dataset_file.readset.validation_status, ValidationStatus.FAILED)
         self.assertIsNotNone(dataset_file.readset.validation_status_timestamp)
         self.assertEqual(dataset_file.readset.validated_by, self.currentuser)
+        # Readset is queued for report data preparation
+        self.assertTrue(ProductionQueue.objects.filter(readset=readset).exists())
 
     def test_set_experiment_run_lane_validation_status_missing_external_project_id(self):
         dataset, _, _ = create_dataset(project_id=self.project_without_external.pk, experiment_run_id=self.experiment_run.pk, lane=1)
@@ -222,6 +226,31 @@ class DatasetServicesTestCase(TestCase):
         self.assertIn("missing an external project id", errors[0])
         self.assertEqual(warnings, [])
 
+    def test_set_dataset_release_status(self):
+        dataset, _, _ = create_dataset(project_id=self.project.id, experiment_run_id=self.experiment_run.id, lane=1)
+        readset_released = Readset.objects.create(name="My_Readset_1", sample_name="My_1", dataset=dataset)
+        readset_blocked = Readset.objects.create(name="My_Readset_2", sample_name="My_2", dataset=dataset)
+        dataset_file, _, _ = create_dataset_file(readset=readset_released, file_path="file_path_1", size=3)
+        create_dataset_file(readset=readset_blocked, file_path="file_path_2", size=3)
+
+        count, errors, _ = set_dataset_release_status(dataset_id=dataset.id,
+                                                      readsets_release_status={str(readset_released.id): ReleaseStatus.RELEASED,
+                                                                               str(readset_blocked.id): ReleaseStatus.BLOCKED},
+                                                      released_by=self.currentuser)
+
+        readset_released.refresh_from_db()
+        readset_blocked.refresh_from_db()
+        self.assertEqual(errors, [])
+        self.assertEqual(count, 2)
+        self.assertEqual(readset_released.release_status, ReleaseStatus.RELEASED)
+        self.assertEqual(readset_blocked.release_status, ReleaseStatus.BLOCKED)
+        self.assertEqual(readset_released.released_by, self.currentuser)
+        self.assertEqual(readset_released.release_status_timestamp, readset_blocked.release_status_timestamp)
+        # The release trigger file is queued with the released readsets only
+        trigger_file = TriggerFile.objects.get(type=TriggerFileType.RELEASE_INFO)
+        self.assertIsNone(trigger_file.written_at)
+        self.assertEqual(trigger_file.content["files"], {str(dataset_file.id): {"readset_id": readset_released.id, "filepath": "file_path_1"}})
+
     def test_get_experiment_run_lane_validation_status(self):
         dataset, _, _ = create_dataset(project_id=self.project.id, experiment_run_id=self.experiment_run.id, lane=1)
         readset = Readset.objects.create(name="My_Readset", sample_name="My", dataset=dataset)
@@ -1,8 +1,10 @@
+import logging
 from pathlib import Path
 from os.path import exists
 from django.test import TestCase
 from django.contrib.contenttypes.models import ContentType
 from fms_core.services.experiment_run import start_experiment_run_processing, get_run_info_for_experiment, LAUNCH_MODES
+from fms_core.services.trigger_file import process_trigger_file_queue
 from fms_core.template_importer.importers import (
     SampleSubmissionImporter,
     LibraryPreparationImporter,
@@ -16,7 +18,8 @@ from fms_core.services.experiment_run_info import generate_run_info
 from fms_core.tests.test_template_importers._utils import load_template
 from fms_core.services.project import create_project
 
-from fms_core.models import Biosample, ExperimentRun, IndexSet, Index
+from fms_core.models import Biosample, ExperimentRun, IndexSet, Index, TriggerFile
+from fms_core.models._constants import TriggerFileType
 
 TEMPLATES_DIR = Path(__file__).parent.parent / "service-templates"
 
@@ -167,9 +170,14 @@ class ExperimentRunInfoTemplatesTestCase(TestCase):
 
         event_file, errors, warnings = start_experiment_run_processing(mgi_experiment.id)
 
-        self.assertTrue(exists(event_file))
         self.assertFalse(errors)
         self.assertFalse(warnings)
+        # The run info file is queued and written by the trigger file worker
+        self.assertTrue(TriggerFile.objects.filter(type=TriggerFileType.RUN_INFO, file_path=event_file, written_at__isnull=True).exists())
+        written_count, failed_count = process_trigger_file_queue(logging.getLogger())
+        self.assertEqual(written_count, 1)
+        self.assertEqual(failed_count, 0)
+        self.assertTrue(exists(event_file))
 
         event_file, errors, warnings = start_experiment_run_processing(mgi_experiment.id, LAUNCH_MODES.LAUNCH)
         self.assertIsNone(event_file)
@@ -3,6 +3,7 @@ from django.test import TestCase
 from fms_core.models import (
     RunType,
     Container,
+    ExperimentRun,
     Instrument,
     PropertyType,
     InstrumentType,
@@ -215,6 +216,8 @@ class ExperimentRunServicesTestCase(TestCase):
         self.assertIsNone(my_experiment_run.run_processing_end_time)
         self.assertIsNotNone(my_experiment_run.end_time)
         self.assertEqual(my_experiment_run.run_processing_start_time, my_experiment_run.end_time)
+        self.assertIsNone(my_experiment_run.run_processing_completion_time)
+        self.assertFalse(my_experiment_run.is_run_processing_complete)
 
     def test_set_run_processing_end_time(self):
         my_experiment_run, errors, warnings = experiment_run.create_experiment_run(experiment_run_name=self.experiment_name,
@@ -234,4 +237,13 @@ class ExperimentRunServicesTestCase(TestCase):
         self.assertEqual(warnings, [])
         self.assertIsNone(my_experiment_run.run_processing_start_time)
         self.assertIsNotNone(my_experiment_run.run_processing_end_time)
-        self.assertIsNone(my_experiment_run.end_time)
\ No newline at end of file
+        self.assertIsNone(my_experiment_run.end_time)
+        self.assertEqual(my_experiment_run.run_processing_completion_time, my_experiment_run.run_processing_end_time)
+        self.assertTrue(my_experiment_run.is_run_processing_complete)
+        self.assertTrue(ExperimentRun.objects.filter(id=my_experiment_run.id, run_processing_completion_time__isnull=False).exists())
+
+        my_experiment_run, errors, warnings = experiment_run.set_run_processing_start_time(my_experiment_run.id)
+
+        self.assertEqual(errors, [])
+        self.assertIsNone(my_experiment_run.run_processing_completion_time)
+        self.assertFalse(ExperimentRun.objects.filter(id=my_experiment_run.id, run_processing_completion_time__isnull=False).exists())
\ No newline at end of file
@@ -0,0 +1,89 @@
+import datetime
+import logging
+import os
+
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.utils import timezone
+
+from fms_core.models import Container, ImportJob
+from fms_core.models._constants import ImportJobStatus
+from fms_core.services.import_job import queue_import_job, process_import_job_queue, run_import_job, RUNNING_JOB_TIMEOUT
+from fms_core.template_importer.importers import ContainerCreationImporter
+from fms_core.tests.test_template_importers._utils import APP_DATA_ROOT
+
+
+class ImportJobServicesTestCase(TestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.get(username="biobankadmin")
+        with open(APP_DATA_ROOT / "Container_creation_v4_2_0.xlsx", "rb") as template_file:
+            self.file = SimpleUploadedFile("Container_creation_v4_2_0.xlsx", template_file.read())
+
+    def test_queue_import_job(self):
+        import_job, errors, warnings = queue_import_job(ContainerCreationImporter, self.file, self.user)
+
+        self.assertEqual(errors, [])
+        self.assertEqual(warnings, [])
+        self.assertEqual(import_job.status, ImportJobStatus.QUEUED)
+        self.assertEqual(import_job.importer, "fms_core.template_importer.importers.container_creation.ContainerCreationImporter")
+        self.assertEqual(import_job.file_name, "Container_creation_v4_2_0.xlsx")
+
+        import_job, errors, warnings = queue_import_job(ContainerCreationImporter, self.file, None)
+        self.assertIsNone(import_job)
+        self.assertEqual(errors, ["Missing user for the template submission."])
+
+    def test_process_import_job_queue(self):
+        import_job, _, _ = queue_import_job(ContainerCreationImporter, self.file, self.user)
+
+        processed_count = process_import_job_queue(logging.getLogger())
+
+        import_job.refresh_from_db()
+        self.assertEqual(processed_count, 1)
+        self.assertEqual(import_job.status, ImportJobStatus.SUCCEEDED)
+        self.assertEqual(import_job.error, "")
+        self.assertTrue(import_job.result["valid"])
+        self.assertIsNotNone(import_job.completed_at)
+        self.assertGreater(import_job.row_count, 0)
+        self.assertGreater(import_job.processed_row_count, 0)
+        self.assertTrue(Container.objects.filter(barcode="TubeBox_1").exists())
+        # The submitted template is removed once the job is completed
+        self.assertFalse(os.path.exists(import_job.file_path))
+        # The queue is empty once the job is run
+        self.assertEqual(process_import_job_queue(logging.getLogger()), 0)
+
+    def test_process_import_job_queue_fails_stale_jobs(self):
+        stale_job, _, _ = queue_import_job(ContainerCreationImporter, self.file, self.user)
+        running_job, _, _ = queue_import_job(ContainerCreationImporter, self.file, self.user)
+        ImportJob.objects.filter(id=stale_job.id).update(status=ImportJobStatus.RUNNING,
+                                                         started_at=timezone.now() - RUNNING_JOB_TIMEOUT - datetime.timedelta(minutes=1))
+        ImportJob.objects.filter(id=running_job.id).update(status=ImportJobStatus.RUNNING, started_at=timezone.now())
+
+        self.assertEqual(process_import_job_queue(logging.getLogger()), 0)
+
+        stale_job.refresh_from_db()
+        self.assertEqual(stale_job.status, ImportJobStatus.FAILED)
+        self.assertIsNotNone(stale_job.completed_at)
+        self.assertTrue(stale_job.error.startswith("The import job was interrupted."))
+        self.assertFalse(os.path.exists(stale_job.file_path))
+        # A job within the timeout may still be running in another worker
+        running_job.refresh_from_db()
+        self.assertEqual(running_job.status, ImportJobStatus.RUNNING)
+        self.assertIsNone(running_job.completed_at)
+        self.assertTrue(os.path.exists(running_job.file_path))
+        os.remove(running_job.file_path)
+
+    def test_run_import_job_failed_while_running(self):
+        import_job, _, _ = queue_import_job(ContainerCreationImporter, self.file, self.user)
+        import_job.status = ImportJobStatus.RUNNING
+        import_job.started_at = timezone.now() - RUNNING_JOB_TIMEOUT - datetime.timedelta(minutes=1)
+        import_job.save()
+        # Another worker fails the job while it is still running
+        process_import_job_queue(logging.getLogger())
+
+        import_job = run_import_job(import_job, logging.getLogger())
+
+        self.assertEqual(import_job.status, ImportJobStatus.FAILED)
+        self.assertTrue(import_job.error.startswith("The import job was interrupted."))
+        self.assertIsNone(import_job.result)
+        self.assertEqual(ImportJob.objects.get(id=import_job.id).status, ImportJobStatus.FAILED)
@@ -1,9 +1,10 @@
 from django.test import TestCase
 
-from fms_core.models import IndexStructure, InstrumentType
+from fms_core.models import Index, IndexBySet, IndexStructure, InstrumentType, Sequence
 
 from fms_core.services.index import (get_or_create_index_set, create_index, get_index, validate_indices, validate_distance_matrix,
-                                     create_indices_3prime_by_sequence, create_indices_5prime_by_sequence)
+                                     create_indices_3prime_by_sequence, create_indices_5prime_by_sequence, bulk_create_indices,
+                                     find_index_collisions)
 
 class IndexServicesTestCase(TestCase):
     def setUp(self) -> None:
@@ -172,3 +173,80 @@ class IndexServicesTestCase(TestCase):
         is_valid, collision_list = validate_distance_matrix(results["distances"], 2)
         self.assertFalse(is_valid)
         self.assertEqual(collision_list, [(1, 0), (2, 0), (5, 0), (6, 0), (7, 6)])
+
+    def test_bulk_create_indices(self):
+        # init
+        index_set_1, _, _, _ = get_or_create_index_set(self.index_set_name)
+        existing_index, _, _ = create_index(self.index_name_1, self.structure_name, index_set_1)
+        INDICES_TO_CREATE = [
+            dict(set_name=self.index_set_name, name="TEST_INDEX_2", external_name=self.external_index_name, index_structure=self.structure_name,
+                 index_3prime=["CCCCCCCCGG"], index_5prime=["CCCCCCCCCC"]),
+            dict(set_name="OTHER_INDEX_SET", name="TEST_INDEX_3", external_name=None, index_structure=self.structure_name,
+                 index_3prime=["CCCCCCCCGG", "AACCCCCCCC"], index_5prime=[]),
+            dict(set_name="OTHER_INDEX_SET", name=self.index_name_1, external_name=None, index_structure=self.structure_name,
+                 index_3prime=["TTTTTTTTTT"], index_5prime=[]),
+        ]
+        # test
+        indices_by_name, created_index_names, errors, warnings = bulk_create_indices(INDICES_TO_CREATE)
+        self.assertFalse(errors)
+        self.assertFalse(warnings)
+        self.assertEqual(created_index_names, ["TEST_INDEX_2", "TEST_INDEX_3"])
+        self.assertEqual(indices_by_name[self.index_name_1], existing_index)
+
+        index_2 = Index.objects.get(name="TEST_INDEX_2")
+        self.assertEqual(index_2.external_name, self.external_index_name)
+        self.assertEqual(index_2.index_structure, self.TruSeqLT_structure)
+        self.assertEqual(index_2.list_index_sets, [self.index_set_name])
+        self.assertEqual(index_2.list_3prime_sequences, ["CCCCCCCCGG"])
+        self.assertEqual(index_2.list_5prime_sequences, ["CCCCCCCCCC"])
+        index_3 = Index.objects.get(name="TEST_INDEX_3")
+        self.assertEqual(index_3.list_index_sets, ["OTHER_INDEX_SET"])
+        self.assertCountEqual(index_3.list_3prime_sequences, ["CCCCCCCCGG", "AACCCCCCCC"])
+        # Shared sequence is created only once
+        self.assertEqual(Sequence.objects.filter(value="CCCCCCCCGG").count(), 1)
+        # Existing index is linked to the new set but its sequences are not modified
+        self.assertTrue(IndexBySet.objects.filter(index=existing_index, index_set__name="OTHER_INDEX_SET").exists())
+        self.assertEqual(existing_index.list_3prime_sequences, [""])
+        self.assertFalse(Sequence.objects.filter(value="TTTTTTTTTT").exists())
+
+    def test_find_index_collisions(self):
+        # init
+        INDICES_TO_VALIDATE = [
+            (self.index_set_name, self.structure_name, "TEST_INDEX_1", "CCCCCCCCCC", "CCCCCCCCCC"),
+            (self.index_set_name, self.structure_name, "TEST_INDEX_2", "CCCCCCCCGG", "CCCCCCCCCC"),
+            (self.index_set_name, self.structure_name, "TEST_INDEX_3", "CCCCTCGCCC", "CCCCCCCCTT"),
+            (self.index_set_name, self.structure_name, "TEST_INDEX_4", "AACCACCCCC", "CCCCCCCCCC"),
+            (self.index_set_name, self.structure_name, "TEST_INDEX_5", "TTCCGCCCCC", "CCCCCCCCTT"),
+            (self.index_set_name, self.structure_name, "TEST_INDEX_6", "GGCCCCCCCC", "CCTGCCCCCC"),
+            (self.index_set_name, self.structure_name, "TEST_INDEX_7", "CCCCGGCCCC", "CCCCCCAACC"),
+            (self.index_set_name, self.structure_name, "TEST_INDEX_8", "CCCCTTCCCC", "CCCCAAAACC"),
+        ]
+        instrument_type_obj = InstrumentType.objects.get(type="Illumina NovaSeq 6000")
+        indices = []
+        for index_set_name, index_structure_name, index_name, sequence3prime, sequence5prime in INDICES_TO_VALIDATE:
+            index_set_obj, _, _, _ = get_or_create_index_set(index_set_name)
+            index_obj, _, _ = create_index(index_name, index_structure_name, index_set_obj)
+            create_indices_3prime_by_sequence(index_obj, [sequence3prime])
+            create_indices_5prime_by_sequence(index_obj, [sequence5prime])
+            indices.append(index_obj)
+        # test
+        results, errors, warnings = find_index_collisions(indices=indices,
+                                                          index_read_direction_5_prime=instrument_type_obj.index_read_5_prime,
+                                                          index_read_direction_3_prime=instrument_type_obj.index_read_3_prime,
+                                                          length_5_prime=10,
+                                                          length_3_prime=10,
+                                                          threshold=0)
+        self.assertTrue(results["is_valid"])
+        self.assertEqual(results["collisions"], [])
+        self.assertFalse(errors)
+        self.assertFalse(warnings)
+        # Same collisions as the full distance matrix
+        results, errors, warnings = find_index_collisions(indices=indices,
+                                                          index_read_direction_5_prime=instrument_type_obj.index_read_5_prime,
+                                                          index_read_direction_3_prime=instrument_type_obj.index_read_3_prime,
+                                                          length_5_prime=10,
+                                                          length_3_prime=10,
+                                                          threshold=2)
+        self.assertFalse(results["is_valid"])
+        self.assertEqual([(i, j) for i, j, _ in results["collisions"]], [(0, 1), (0, 2), (0, 5), (0, 6), (6, 7)])
+        self.assertFalse(errors)
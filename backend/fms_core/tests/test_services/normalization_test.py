@@ -0,0 +1,131 @@
+from django.test import TestCase
+
+import datetime
+from decimal import Decimal
+
+from fms_core.services.normalization import (compute_normalization, compute_pooling, plan_normalization, plan_pooling,
+                                             NORMALIZATION_VALID, NORMALIZATION_INSUFFICIENT_CONCENTRATION, NORMALIZATION_INSUFFICIENT_INPUT)
+from fms_core.services.sample import create_full_sample
+
+from fms_core.models.container import Container
+from fms_core.models.sample_kind import SampleKind
+
+
+class NormalizationServicesTestCase(TestCase):
+    def setUp(self) -> None:
+        container = Container.objects.create(barcode="TESTBARCODE1", name="TestName1", kind="tube")
+        self.sample, _, _ = create_full_sample(name="SAMPLE_TO_NORMALIZE",
+                                               volume=100,
+                                               collection_site="TestSite",
+                                               creation_date=datetime.date(2022, 8, 15),
+                                               container=container,
+                                               sample_kind=SampleKind.objects.get(name="DNA"),
+                                               concentration=20)
+
+    def test_compute_normalization(self):
+        results, errors, warnings = compute_normalization(initial_volumes=[Decimal("100"), Decimal("100"), Decimal("10"), Decimal("100")],
+                                                          initial_concentrations=[Decimal("20"), Decimal("5"), Decimal("20"), Decimal("20")],
+                                                          final_volumes=[Decimal("50"), Decimal("50"), Decimal("50"), Decimal("50")],
+                                                          requested_concentrations=[Decimal("10"), Decimal("10"), Decimal("10"), Decimal("10")],
+                                                          manual_diluent_volumes=[None, None, None, Decimal("40")])
+        self.assertFalse(errors)
+        self.assertFalse(warnings)
+        # Enough material
+        self.assertEqual(results["volume_used"][0], Decimal("25.000"))
+        self.assertEqual(results["volume_diluent"][0], Decimal("25.000"))
+        self.assertEqual(results["status"][0], NORMALIZATION_VALID)
+        self.assertTrue(results["is_valid"][0])
+        # Concentration too low, the final volume is filled with the sample
+        self.assertEqual(results["volume_used"][1], Decimal("50.000"))
+        self.assertEqual(results["volume_diluent"][1], Decimal("0.000"))
+        self.assertEqual(results["concentration"][1], Decimal("5"))
+        self.assertEqual(results["status"][1], NORMALIZATION_INSUFFICIENT_CONCENTRATION)
+        self.assertFalse(results["is_valid"][1])
+        # Not enough material, all the sample is used
+        self.assertEqual(results["volume_used"][2], Decimal("10.000"))
+        self.assertEqual(results["volume_diluent"][2], Decimal("40.000"))
+        self.assertEqual(results["concentration"][2], Decimal("4"))
+        self.assertEqual(results["status"][2], NORMALIZATION_INSUFFICIENT_INPUT)
+        # Manual diluent leaves room for 10 uL of sample only
+        self.assertEqual(results["volume_used"][3], Decimal("10.000"))
+        self.assertEqual(results["volume_diluent"][3], Decimal("0.000"))
+        self.assertEqual(results["concentration"][3], Decimal("4"))
+        self.assertTrue(results["diluent_adjusted"][3])
+
+    def test_compute_normalization_invalid_columns(self):
+        results, errors, _ = compute_normalization(initial_volumes=[Decimal("100")],
+                                                   initial_concentrations=[Decimal("20"), Decimal("20")],
+                                                   final_volumes=[Decimal("50")],
+                                                   requested_concentrations=[Decimal("10")])
+        self.assertFalse(results)
+        self.assertTrue(errors)
+
+        results, errors, _ = compute_normalization(initial_volumes=[Decimal("100")],
+                                                   initial_concentrations=[Decimal("20")],
+                                                   final_volumes=[Decimal("0")],
+                                                   requested_concentrations=[Decimal("10")])
+        self.assertFalse(results)
+        self.assertEqual(errors, ["Column final_volumes must only have values greater than 0."])
+
+    def test_compute_pooling(self):
+        results, errors, warnings = compute_pooling(initial_volumes=[Decimal("100"), Decimal("10")],
+                                                    initial_concentrations=[Decimal("3"), Decimal("2")],
+                                                    requested_quantities=[Decimal("100"), Decimal("100")])
+        self.assertFalse(errors)
+        self.assertFalse(warnings)
+        self.assertEqual(results["volume_used"], [Decimal("33.333"), Decimal("10")])
+        self.assertEqual(results["available_quantity"], [Decimal("300"), Decimal("20")])
+        self.assertEqual(results["is_sufficient"], [True, False])
+
+    def test_plan_normalization(self):
+        planned_rows, errors, warnings = plan_normalization([{"sample_id": self.sample.id, "final_volume": 50, "concentration_ngul": 10},
+                                                             {"sample_id": self.sample.id, "final_volume": 50, "na_quantity": 250}])
+        self.assertFalse(errors)
+        self.assertFalse(warnings)
+        self.assertEqual(planned_rows[0]["sample_id"], self.sample.id)
+        self.assertEqual(planned_rows[0]["volume_used"], Decimal("25.000"))
+        self.assertEqual(planned_rows[0]["concentration"], Decimal("10.000"))
+        self.assertEqual(planned_rows[1]["volume_used"], Decimal("12.500"))
+        self.assertEqual(planned_rows[1]["concentration"], Decimal("5.000"))
+
+        planned_rows, errors, _ = plan_normalization([{"sample_id": self.sample.id, "final_volume": 50, "concentration_ngul": 10, "na_quantity": 250}])
+        self.assertFalse(planned_rows)
+        self.assertEqual(errors, ["Row 1: Only one option must be specified out of the following: NA quantity, conc. ng/uL or conc. nM."])
+
+    def test_plan_normalization_invalid_values(self):
+        planned_rows, errors, _ = plan_normalization([{"sample_id": self.sample.id, "final_volume": 0, "na_quantity": 250},
+                                                      {"sample_id": self.sample.id, "final_volume": -10, "concentration_ngul": 10},
+                                                      {"sample_id": self.sample.id, "final_volume": 50, "na_quantity": -250},
+                                                      {"sample_id": self.sample.id, "final_volume": 50, "concentration_ngul": 10, "manual_diluent_volume": -5}])
+        self.assertFalse(planned_rows)
+        self.assertEqual(errors, ["Row 1: Final volume must be greater than 0.",
+                                  "Row 2: Final volume must be greater than 0.",
+                                  "Row 3: Concentrations, quantities and manual diluent volume cannot be negative.",
+                                  "Row 4: Concentrations, quantities and manual diluent volume cannot be negative."])
+
+    def test_plan_normalization_invalid_sample_ids(self):
+        planned_rows, errors, _ = plan_normalization([{"sample_id": "abc", "final_volume": 50, "na_quantity": 250},
+                                                      {"sample_id": [self.sample.id], "final_volume": 50, "na_quantity": 250},
+                                                      {"final_volume": 50, "na_quantity": 250}])
+        self.assertFalse(planned_rows)
+        self.assertEqual(errors, ["Row 1: A sample id is required and must be an integer.",
+                                  "Row 2: A sample id is required and must be an integer.",
+                                  "Row 3: A sample id is required and must be an integer."])
+
+        # Ids posted as strings name the same sample
+        planned_rows, errors, _ = plan_normalization([{"sample_id": str(self.sample.id), "final_volume": 50, "na_quantity": 250}])
+        self.assertFalse(errors)
+        self.assertEqual(planned_rows[0]["sample_id"], self.sample.id)
+
+    def test_plan_pooling(self):
+        planned_rows, errors, _ = plan_pooling([{"sample_id": self.sample.id, "na_quantity": 100}])
+        self.assertFalse(errors)
+        self.assertEqual(planned_rows, [{"sample_id": self.sample.id, "volume_used": Decimal("5.000"),
+                                         "available_quantity": Decimal("2000.000"), "is_sufficient": True}])
+
+    def test_plan_pooling_invalid_values(self):
+        planned_rows, errors, _ = plan_pooling([{"sample_id": "abc", "na_quantity": 100},
+                                                {"sample_id": self.sample.id, "na_quantity": -100}])
+        self.assertFalse(planned_rows)
+        self.assertEqual(errors, ["Row 1: A sample id is required and must be an integer.",
+                                  "Row 2: Quantities cannot be negative."])
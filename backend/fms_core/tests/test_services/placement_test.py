@@ -0,0 +1,56 @@
+from django.test import TestCase
+
+from fms_core.models import Container, SampleKind
+from fms_core.coordinates import COLUMN
+from fms_core.services.sample import create_full_sample
+from fms_core.services.placement import get_free_coordinates, plan_placement
+
+
+class PlacementServicesTestCase(TestCase):
+    def setUp(self) -> None:
+        self.plate1 = Container.objects.create(barcode="PLACEMENTPLATE1", name="PLACEMENTPLATE1", kind="96-well plate")
+        self.plate2 = Container.objects.create(barcode="PLACEMENTPLATE2", name="PLACEMENTPLATE2", kind="96-well plate")
+        self.tube = Container.objects.create(barcode="PLACEMENTTUBE", name="PLACEMENTTUBE", kind="tube")
+        sample_kind_dna, _ = SampleKind.objects.get_or_create(name="DNA")
+        for coordinates in ["A01", "B01"]:
+            create_full_sample(name=f"PlacedSample{coordinates}",
+                               volume=100,
+                               collection_site="Site",
+                               creation_date="2022-02-10",
+                               container=self.plate1,
+                               coordinates=coordinates,
+                               sample_kind=sample_kind_dna)
+
+    def test_get_free_coordinates(self):
+        free_coordinates, errors, warnings = get_free_coordinates([self.plate1, self.plate2], {self.plate2.id: ["A01"]})
+        self.assertEqual(errors, [])
+        self.assertEqual(warnings, [])
+        self.assertEqual(len(free_coordinates[self.plate1.id]), 94)
+        self.assertEqual(free_coordinates[self.plate1.id][:2], ["A02", "A03"])
+        self.assertEqual(len(free_coordinates[self.plate2.id]), 95)
+        self.assertNotIn("A01", free_coordinates[self.plate2.id])
+
+        free_coordinates, errors, warnings = get_free_coordinates([self.plate1], axis=COLUMN)
+        self.assertEqual(errors, [])
+        self.assertEqual(free_coordinates[self.plate1.id][:2], ["C01", "D01"])
+
+    def test_get_free_coordinates_without_coordinates(self):
+        free_coordinates, errors, warnings = get_free_coordinates([self.plate1, self.tube])
+        self.assertEqual(free_coordinates, {})
+        self.assertEqual(errors, ["Container PLACEMENTTUBE of kind tube has no coordinates to place samples into."])
+
+    def test_plan_placement(self):
+        placements, errors, warnings = plan_placement([self.plate1, self.plate2], 100, axis=COLUMN)
+        self.assertEqual(errors, [])
+        self.assertEqual(warnings, [])
+        self.assertEqual(len(placements), 2)
+        self.assertEqual(placements[0]["container"], self.plate1)
+        self.assertEqual(len(placements[0]["coordinates"]), 94)
+        self.assertEqual(placements[0]["coordinates"][0], "C01")
+        self.assertEqual(placements[1]["container"], self.plate2)
+        self.assertEqual(placements[1]["coordinates"], ["A01", "B01", "C01", "D01", "E01", "F01"])
+
+    def test_plan_placement_not_enough_space(self):
+        placements, errors, warnings = plan_placement([self.plate1], 95)
+        self.assertEqual(placements, [])
+        self.assertEqual(errors, ["Not enough free coordinates in the destination containers to place 95 samples (94 available)."])
@@ -0,0 +1,89 @@
+from django.test import TestCase
+
+import datetime
+
+from fms_core.services.index import get_or_create_index_set, create_index, create_indices_3prime_by_sequence, create_indices_5prime_by_sequence
+from fms_core.services.library import get_library_type, create_library
+from fms_core.services.platform import get_platform
+from fms_core.services.sample import create_full_sample
+from fms_core.services.pool_compatibility import load_pool_libraries, check_pool_compatibility, suggest_pool_moves
+
+from fms_core.models.container import Container
+from fms_core.models.sample_kind import SampleKind
+from fms_core.models._constants import DOUBLE_STRANDED
+
+
+class PoolCompatibilityServicesTestCase(TestCase):
+    def setUp(self) -> None:
+        self.library_type_obj, _, _ = get_library_type("RNASeq")
+        self.platform_obj, _, _ = get_platform("ILLUMINA")
+        self.index_set, _, _, _ = get_or_create_index_set("TEST_INDEX_SET")
+        kind_dna = SampleKind.objects.get(name="DNA")
+
+        sequences_by_index = {"TEST_INDEX_1": ("CGTTTTATA", "ATTGAATCA"),
+                              "TEST_INDEX_2": ("CGTTTTATA", "ATTGAATCA"), # Same sequences as TEST_INDEX_1
+                              "TEST_INDEX_3": ("GGCCAAGTC", "TCAGGCTTG")}
+        self.samples = {}
+        for i, (index_name, (sequence_3prime, sequence_5prime)) in enumerate(sequences_by_index.items(), start=1):
+            index, _, _ = create_index(index_name, "Nextera", self.index_set)
+            create_indices_3prime_by_sequence(index, [sequence_3prime])
+            create_indices_5prime_by_sequence(index, [sequence_5prime])
+            library, _, _ = create_library(library_type=self.library_type_obj,
+                                           index=index,
+                                           platform=self.platform_obj,
+                                           strandedness=DOUBLE_STRANDED)
+            container = Container.objects.create(barcode=f"TESTBARCODE{i}", name=f"TestName{i}", kind="tube")
+            sample, _, _ = create_full_sample(name=f"LIBRARY_{i}",
+                                              volume=100,
+                                              collection_site="TestSite",
+                                              creation_date=datetime.date(2022, 8, 15),
+                                              container=container,
+                                              sample_kind=kind_dna,
+                                              library=library,
+                                              concentration=10,
+                                              fragment_size=150)
+            self.samples[sample.name] = sample
+
+        self.sample_ids_by_pool = {"POOL_1": [self.samples["LIBRARY_1"].id, self.samples["LIBRARY_2"].id],
+                                   "POOL_2": [self.samples["LIBRARY_3"].id]}
+
+    def test_load_pool_libraries(self):
+        with self.assertNumQueries(3):
+            indices_by_pool, samples_name_by_pool = load_pool_libraries(self.sample_ids_by_pool)
+        self.assertEqual([index.name for index in indices_by_pool["POOL_1"]], ["TEST_INDEX_1", "TEST_INDEX_2"])
+        self.assertEqual(samples_name_by_pool["POOL_1"], ["LIBRARY_1", "LIBRARY_2"])
+        self.assertEqual(samples_name_by_pool["POOL_2"], ["LIBRARY_3"])
+
+    def test_check_pool_compatibility(self):
+        results, errors, warnings = check_pool_compatibility(self.sample_ids_by_pool)
+        self.assertFalse(errors)
+        self.assertFalse(warnings)
+        self.assertFalse(results["POOL_1"]["is_valid"])
+        self.assertTrue(results["POOL_2"]["is_valid"])
+        self.assertEqual(len(results["POOL_1"]["collisions"]), 1)
+        collision = results["POOL_1"]["collisions"][0]
+        self.assertEqual(collision["index_reference"].name, "TEST_INDEX_2")
+        self.assertEqual(collision["sample_reference"], "LIBRARY_2")
+        self.assertEqual(collision["index_validation"].name, "TEST_INDEX_1")
+        self.assertEqual(collision["sample_validation"], "LIBRARY_1")
+        self.assertEqual(tuple(collision["distance"]), (0, 0))
+        self.assertFalse(results["POOL_2"]["collisions"])
+
+    def test_check_pool_compatibility_close_pairs(self):
+        sample_ids_by_pool = {"POOL": [sample.id for sample in self.samples.values()]}
+        results, errors, warnings = check_pool_compatibility(sample_ids_by_pool, threshold=0, warning_threshold=9)
+        self.assertFalse(errors)
+        self.assertEqual(len(results["POOL"]["collisions"]), 1)
+        # Every other pair is within the warning threshold (9 differences at most for 9 bases indices)
+        self.assertEqual(len(results["POOL"]["close_pairs"]), 2)
+
+    def test_suggest_pool_moves(self):
+        results, _, _ = check_pool_compatibility(self.sample_ids_by_pool)
+        moves = suggest_pool_moves(results)
+        self.assertEqual(moves, [{"sample": "LIBRARY_1", "from_pool": "POOL_1", "to_pool": "POOL_2"}])
+
+    def test_suggest_pool_moves_new_pool(self):
+        sample_ids_by_pool = {"POOL_1": [self.samples["LIBRARY_1"].id, self.samples["LIBRARY_2"].id]}
+        results, _, _ = check_pool_compatibility(sample_ids_by_pool)
+        moves = suggest_pool_moves(results)
+        self.assertEqual(moves, [{"sample": "LIBRARY_1", "from_pool": "POOL_1", "to_pool": None}])
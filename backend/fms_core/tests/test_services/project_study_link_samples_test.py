@@ -42,6 +42,8 @@ class ProjectStudyLinkSamplesServicesTestCase(TestCase):
         self.assertTrue(link_created)
         self.assertEqual(errors, [])
         self.assertEqual(warnings, [])
+        self.full_sample.refresh_from_db()
+        self.assertEqual(self.full_sample.first_project, self.project)
 
     def test_create_duplicate_link(self):
         link_created, errors, warnings = create_link(self.full_sample, self.project)
@@ -59,6 +61,8 @@ class ProjectStudyLinkSamplesServicesTestCase(TestCase):
         self.assertTrue(link_removed)
         self.assertEqual(errors, [])
         self.assertEqual(warnings, [])
+        self.full_sample.refresh_from_db()
+        self.assertIsNone(self.full_sample.first_project)
 
     def test_remove_invalid_link(self):
         link_not_removed, errors, warnings = remove_link(self.full_sample, self.project)
@@ -1,11 +1,15 @@
 
 from django.test import TestCase
 
-from fms_core.models import PropertyType, Protocol, Container, SampleKind
+import datetime
+
+from fms_core.models import PropertyType, PropertyValue, TypedPropertyValue, Protocol, Container, SampleKind
 
 from fms_core.services.property_value import (validate_non_optional_properties, 
                                               create_process_measurement_properties,
-                                              create_process_properties,)
+                                              create_process_properties,
+                                              bulk_property_value_creation,
+                                              get_typed_value_fields,)
 from fms_core.services.process import create_process
 from fms_core.services.process_measurement import create_process_measurement
 from fms_core.services.sample import create_full_sample
@@ -79,6 +83,10 @@ class PropertyValueServicesTestCase(TestCase):
         self.assertEqual(len(values), 2)
         self.assertFalse(errors)
         self.assertFalse(warnings)
+        typed_value = TypedPropertyValue.objects.get(property_value=values[0])
+        self.assertEqual(typed_value.process_measurement, pm_qc)
+        self.assertIsNone(typed_value.process)
+        self.assertEqual(typed_value.numeric_value, 100)
 
     def test_create_process_properties(self):
         process_by_protocol_dnbseq, _, _ = create_process(protocol=self.protocol_obj_for_process,
@@ -87,4 +95,26 @@ class PropertyValueServicesTestCase(TestCase):
         values, errors, warnings = create_process_properties(self.property_dict_for_process, process_by_protocol_dnbseq)
         self.assertEqual(len(values), 12)
         self.assertFalse(errors)
-        self.assertFalse(warnings)
\ No newline at end of file
+        self.assertFalse(warnings)
+        self.assertTrue(all(value.pk is not None for value in values))
+        self.assertEqual(TypedPropertyValue.objects.filter(process__in=process_by_protocol_dnbseq.values()).count(), 12)
+
+    def test_bulk_property_value_creation(self):
+        process_by_protocol_dnbseq, _, _ = create_process(protocol=self.protocol_obj_for_process,
+                                                          creation_comment="This is a test",
+                                                          create_children=True,)
+        with bulk_property_value_creation():
+            values, errors, warnings = create_process_properties(self.property_dict_for_process, process_by_protocol_dnbseq)
+            self.assertFalse(errors)
+            # Inserted at the end of the block
+            self.assertTrue(all(value.pk is None for value in values))
+            self.assertFalse(PropertyValue.objects.filter(property_type__object_id=self.protocol_obj_for_process.id).exists())
+        self.assertEqual(PropertyValue.objects.filter(property_type__object_id=self.protocol_obj_for_process.id).count(), 12)
+        self.assertEqual(TypedPropertyValue.objects.filter(process__in=process_by_protocol_dnbseq.values()).count(), 12)
+
+    def test_get_typed_value_fields(self):
+        self.assertEqual(get_typed_value_fields("12.5"), dict(numeric_value=12.5, date_value=None, text_value="12.5", text_key="12.5"))
+        self.assertEqual(get_typed_value_fields("2022-10-21")["date_value"], datetime.date(2022, 10, 21))
+        self.assertIsNone(get_typed_value_fields("2022-13-45")["date_value"])
+        self.assertIsNone(get_typed_value_fields("nan")["numeric_value"])
+        self.assertEqual(get_typed_value_fields(" Positive ")["text_key"], "positive")
@@ -1,10 +1,12 @@
 from django.test import TestCase
+import logging
 
 from fms_core.models import Readset
 from fms_core.services.dataset import create_dataset
-from fms_core.services.readset import create_readset
+from fms_core.services.readset import create_readset, update_dataset_status_counters
 from fms_core.models._constants import ReleaseStatus, ValidationStatus, INDEX_READ_FORWARD, INDEX_READ_REVERSE
 from fms_core.models import (
+    Dataset,
     RunType,
     Container,
     Instrument,
@@ -17,6 +19,7 @@ from fms_core.models import (
     Readset
 )
 from fms_core.tests.constants import create_container
+from fms_core.management.commands._delete_dataset import delete_dataset
 
 class ReadsetServicesTestCase(TestCase):
     def setUp(self) -> None:
@@ -71,4 +74,50 @@ class ReadsetServicesTestCase(TestCase):
         self.assertIsNotNone(readset.validation_status_timestamp)
         self.assertIsNone(readset.derived_sample)
         self.assertEqual(readset.validated_by.username, "biobankadmin")
-        
\ No newline at end of file
+        
+
+    def test_update_dataset_status_counters(self):
+        dataset, _, _ = create_dataset(project_id=self.project.id, experiment_run_id=self.experiment_run.id, lane=1)
+        create_readset(dataset=dataset, name="SampleName_RunName", sample_name="SampleName", validation_status=ValidationStatus.PASSED)
+        create_readset(dataset=dataset, name="OtherName_RunName", sample_name="OtherName", release_status=ReleaseStatus.BLOCKED)
+
+        dataset = Dataset.objects.get(id=dataset.id)
+        self.assertEqual(dataset.readset_count, 2)
+        self.assertEqual(dataset.released_status_count, 0)
+        self.assertEqual(dataset.blocked_status_count, 1)
+        self.assertEqual(dataset.unreleased_count, 1)
+        self.assertEqual(dataset.unvalidated_count, 1)
+        self.assertIsNotNone(dataset.latest_release_update)
+        self.assertIsNotNone(dataset.latest_validation_update)
+        experiment_run = ExperimentRun.objects.get(id=self.experiment_run.id)
+        self.assertEqual(experiment_run.readset_count, 2)
+        self.assertEqual(experiment_run.unreleased_readset_count, 1)
+        self.assertEqual(experiment_run.unvalidated_readset_count, 1)
+
+        # Counters are recomputed from the readsets
+        Readset.objects.filter(dataset=dataset).delete()
+        datasets, errors, warnings = update_dataset_status_counters([dataset.id])
+        self.assertEqual(errors, [])
+        self.assertEqual(warnings, [])
+        self.assertEqual(datasets[0].readset_count, 0)
+        self.assertIsNone(datasets[0].latest_release_update)
+        self.assertEqual(ExperimentRun.objects.get(id=self.experiment_run.id).readset_count, 0)
+
+    def test_delete_dataset_curation_updates_counters(self):
+        dataset_kept, _, _ = create_dataset(project_id=self.project.id, experiment_run_id=self.experiment_run.id, lane=1)
+        dataset_deleted, _, _ = create_dataset(project_id=self.project.id, experiment_run_id=self.experiment_run.id, lane=2)
+        create_readset(dataset=dataset_kept, name="SampleName_RunName", sample_name="SampleName")
+        create_readset(dataset=dataset_deleted, name="OtherName_RunName", sample_name="OtherName", validation_status=ValidationStatus.PASSED)
+        self.assertEqual(ExperimentRun.objects.get(id=self.experiment_run.id).readset_count, 2)
+
+        objects_to_delete = []
+        curation_code = delete_dataset({"curation_index": 1, "action": "delete_dataset", "dataset_ids": [dataset_deleted.id]},
+                                       objects_to_delete, logging.getLogger(__name__))
+        self.assertIsNone(curation_code)
+        for obj in objects_to_delete:
+            obj.delete()
+
+        experiment_run = ExperimentRun.objects.get(id=self.experiment_run.id)
+        self.assertEqual(experiment_run.readset_count, 1)
+        self.assertEqual(experiment_run.unreleased_readset_count, 1)
+        self.assertEqual(experiment_run.unvalidated_readset_count, 1)
@@ -4,7 +4,8 @@ from django.test import TestCase
 from fms_core.models import Container, SampleKind, SampleIdentity
 from fms_core.models._constants import SEX_MALE, SEX_FEMALE, SEX_UNKNOWN
 
-from fms_core.services.sample_identity import create_sample_identity, create_sample_identity_matches, ingest_identity_testing_report
+from fms_core.services.sample_identity import (create_sample_identity, create_sample_identities, create_sample_identity_matches,
+                                               bulk_create_sample_identity_matches, get_identity_concordance, ingest_identity_testing_report)
 from fms_core.services.individual import get_or_create_individual, get_taxon
 from fms_core.services.sample import create_full_sample
 
@@ -312,3 +313,76 @@ class SampleIdentityServicesTestCase(TestCase):
         self.assertEqual(identity_for_sample_5.biosample.alias, "SampleFromEnrique")
         self.assertEqual(identity_for_sample_5.identity_matches.count(), 0)
 
+    def test_create_sample_identities(self):
+        tested_biosample_id = self.full_sample.derived_sample_not_pool.biosample.id
+        matched_biosample_id = self.full_matching_sample.derived_sample_not_pool.biosample.id
+        sample_identity_matched, _, _, _ = create_sample_identity(biosample_id=matched_biosample_id,
+                                                                  conclusive=False,
+                                                                  predicted_sex=SEX_MALE,
+                                                                  replace=False)
+        identity_info_by_biosample_id = {tested_biosample_id: {"conclusive": True, "predicted_sex": SEX_MALE},
+                                         matched_biosample_id: {"conclusive": True, "predicted_sex": SEX_FEMALE}}
+        identity_by_biosample_id, kept_existing_by_biosample_id, errors, warnings = create_sample_identities(identity_info_by_biosample_id)
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(warnings), 2)
+        self.assertTrue("Predicted sex changed from" in warnings[0])
+        self.assertTrue("Conclusive identity changed from" in warnings[1])
+        self.assertFalse(kept_existing_by_biosample_id[tested_biosample_id])
+        self.assertFalse(kept_existing_by_biosample_id[matched_biosample_id])
+        self.assertEqual(SampleIdentity.objects.get(biosample_id=tested_biosample_id), identity_by_biosample_id[tested_biosample_id])
+        self.assertEqual(identity_by_biosample_id[matched_biosample_id].id, sample_identity_matched.id)
+        sample_identity_matched.refresh_from_db()
+        self.assertTrue(sample_identity_matched.conclusive)
+        self.assertEqual(sample_identity_matched.predicted_sex, SEX_FEMALE)
+
+        # Conclusive identities are kept unless replaced
+        _, kept_existing_by_biosample_id, errors, warnings = create_sample_identities({tested_biosample_id: {"conclusive": True, "predicted_sex": SEX_FEMALE}})
+        self.assertTrue(kept_existing_by_biosample_id[tested_biosample_id])
+        self.assertTrue("Identity difference for biosample ID" in errors[0])
+
+    def test_bulk_create_sample_identity_matches(self):
+        sample_identity_tested, _, _, _ = create_sample_identity(biosample_id=self.full_sample.derived_sample_not_pool.biosample.id,
+                                                                 conclusive=True,
+                                                                 predicted_sex=SEX_MALE,
+                                                                 replace=False)
+        sample_identity_matched, _, _, _ = create_sample_identity(biosample_id=self.full_matching_sample.derived_sample_not_pool.biosample.id,
+                                                                  conclusive=True,
+                                                                  predicted_sex=SEX_MALE,
+                                                                  replace=False)
+        match_info = self.match_dictionary[sample_identity_matched.biosample_id]
+        match_entries = [(sample_identity_tested, sample_identity_matched.biosample_id, match_info, None),
+                         (sample_identity_matched, sample_identity_tested.biosample_id, match_info, None)]
+        errors, warnings = bulk_create_sample_identity_matches(match_entries)
+        self.assertEqual(errors, [])
+        self.assertEqual(len(warnings), 1)
+        self.assertTrue("already exist" in warnings[0])
+        self.assertEqual(sample_identity_tested.identity_matches.count(), 1)
+        self.assertEqual(sample_identity_matched.identity_matches.count(), 1)
+
+        errors, warnings = bulk_create_sample_identity_matches([(sample_identity_tested, 0, match_info, None)])
+        self.assertEqual(errors, ["Sample identity for biosample 0 does not exist."])
+
+    def test_get_identity_concordance(self):
+        sample_identity_tested, _, _, _ = create_sample_identity(biosample_id=self.full_sample.derived_sample_not_pool.biosample.id,
+                                                                 conclusive=True,
+                                                                 predicted_sex=SEX_MALE,
+                                                                 replace=False)
+        sample_identity_matched, _, _, _ = create_sample_identity(biosample_id=self.full_matching_sample.derived_sample_not_pool.biosample.id,
+                                                                  conclusive=True,
+                                                                  predicted_sex=SEX_MALE,
+                                                                  replace=False)
+        create_sample_identity_matches(tested_identity=sample_identity_tested, matches_by_biosample_id=self.match_dictionary)
+
+        matches, errors, warnings = get_identity_concordance([sample_identity_tested.biosample_id], min_matching_site_ratio=Decimal("0.5"))
+        self.assertEqual(errors, [])
+        self.assertEqual(warnings, [])
+        self.assertEqual(len(matches), 1)
+        self.assertEqual(matches[0]["biosample_id"], sample_identity_tested.biosample_id)
+        self.assertEqual(matches[0]["matched_biosample_id"], sample_identity_matched.biosample_id)
+        self.assertIsNone(matches[0]["readset_id"])
+        self.assertEqual(matches[0]["matching_site_ratio"], Decimal("0.66666"))
+        self.assertEqual(matches[0]["compared_sites"], 63)
+
+        matches, _, _ = get_identity_concordance([sample_identity_tested.biosample_id], min_matching_site_ratio=Decimal("0.9"))
+        self.assertEqual(matches, [])
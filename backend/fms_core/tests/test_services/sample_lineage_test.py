@@ -1,9 +1,15 @@
 from django.test import TestCase
 from pathlib import Path
 
-from fms_core.models import Container, SampleKind, ProcessMeasurement, Protocol, Process
-
-from fms_core.services.sample_lineage import create_sample_lineage
+from fms_core.models import Container, SampleKind, ProcessMeasurement, Protocol, Process, SampleAncestry, SampleLineage
+
+from fms_core.services.sample_lineage import (create_sample_lineage,
+                                              get_derived_sample_ancestors,
+                                              get_sample_sources_from_derived_samples,
+                                              get_sample_source_from_derived_sample,
+                                              traverse_sample_lineage,
+                                              LINEAGE_DIRECTION_ANCESTORS,
+                                              LINEAGE_DIRECTION_DESCENDANTS)
 from fms_core.services.derived_sample import get_library_size_for_derived_sample
 from fms_core.services.sample import create_full_sample, get_sample_from_container
 from fms_core.services.project import create_project
@@ -65,6 +71,79 @@ class SampleLineageServicesTestCase(TestCase):
         self.assertEqual(lineage.child, self.full_sample_child)
         self.assertEqual(lineage.process_measurement, self.process_measurement)
 
+    def test_create_sample_ancestry(self):
+        lineage, errors, warnings = create_sample_lineage(self.full_sample_parent, self.full_sample_child, self.process_measurement)
+        self.assertEqual(errors, [])
+        parent_derived_sample = self.full_sample_parent.derived_sample_not_pool
+        ancestry = SampleAncestry.objects.get(sample=self.full_sample_child)
+        self.assertEqual(ancestry.derived_sample, parent_derived_sample)
+        self.assertEqual(ancestry.ancestor, self.full_sample_parent)
+        self.assertEqual(ancestry.depth, 1)
+        self.assertEqual(ancestry.protocol, self.protocol_extraction)
+
+        ancestors_by_pair, errors, warnings = get_derived_sample_ancestors([(self.full_sample_child.id, parent_derived_sample.id)])
+        self.assertEqual(errors, [])
+        self.assertEqual(ancestors_by_pair[(self.full_sample_child.id, parent_derived_sample.id)], [(self.full_sample_parent.id, 1, self.protocol_extraction.id)])
+
+    def test_create_sample_ancestry_without_service(self):
+        SampleLineage.objects.create(parent=self.full_sample_parent, child=self.full_sample_child, process_measurement=self.process_measurement)
+        parent_derived_sample = self.full_sample_parent.derived_sample_not_pool
+        ancestry = SampleAncestry.objects.get(sample=self.full_sample_child)
+        self.assertEqual(ancestry.derived_sample, parent_derived_sample)
+        self.assertEqual(ancestry.ancestor, self.full_sample_parent)
+        self.assertEqual(ancestry.depth, 1)
+
+        pair = (self.full_sample_child.id, parent_derived_sample.id)
+        sample_source_by_pair, errors, warnings = get_sample_sources_from_derived_samples([pair], materialized=True)
+        self.assertEqual(errors, [])
+        self.assertEqual(sample_source_by_pair[pair], self.full_sample_parent.id)
+
+    def test_get_sample_sources_from_derived_samples(self):
+        create_sample_lineage(self.full_sample_parent, self.full_sample_child, self.process_measurement)
+        parent_derived_sample = self.full_sample_parent.derived_sample_not_pool
+        pairs = [(self.full_sample_child.id, parent_derived_sample.id), (self.full_sample_parent.id, parent_derived_sample.id)]
+        for materialized in [True, False]:
+            sample_source_by_pair, errors, warnings = get_sample_sources_from_derived_samples(pairs, materialized=materialized)
+            self.assertEqual(errors, [])
+            self.assertEqual(warnings, [])
+            self.assertEqual(sample_source_by_pair[pairs[0]], self.full_sample_parent.id)
+            self.assertIsNone(sample_source_by_pair[pairs[1]])
+
+        sample_source, errors, warnings = get_sample_source_from_derived_sample(self.full_sample_child.id, parent_derived_sample.id)
+        self.assertEqual(errors, [])
+        self.assertEqual(sample_source, self.full_sample_parent.id)
+
+    def test_traverse_sample_lineage(self):
+        create_sample_lineage(self.full_sample_parent, self.full_sample_child, self.process_measurement)
+        parent = self.full_sample_parent
+        child = self.full_sample_child
+        edge = [self.process_measurement.id, parent.id, child.id, "Extraction"]
+
+        nodes, edges, next_after, errors, warnings = traverse_sample_lineage(parent.id, direction=LINEAGE_DIRECTION_DESCENDANTS, max_depth=5)
+        self.assertEqual(errors, [])
+        self.assertEqual(warnings, [])
+        self.assertEqual([(node[0], node[-1]) for node in nodes], [(parent.id, 0), (child.id, 1)])
+        self.assertEqual(edges, [edge])
+        self.assertIsNone(next_after)
+
+        nodes, edges, next_after, errors, warnings = traverse_sample_lineage(child.id, direction=LINEAGE_DIRECTION_ANCESTORS, max_depth=0)
+        self.assertEqual(errors, [])
+        self.assertEqual([node[0] for node in nodes], [child.id])
+        self.assertEqual(edges, [])
+
+        # Paged traversal
+        nodes, edges, next_after, errors, warnings = traverse_sample_lineage(child.id, direction=LINEAGE_DIRECTION_ANCESTORS, node_limit=1)
+        self.assertEqual([node[0] for node in nodes], [child.id])
+        self.assertEqual(edges, [])
+        self.assertEqual(next_after, (0, child.id))
+        nodes, edges, next_after, errors, warnings = traverse_sample_lineage(child.id, direction=LINEAGE_DIRECTION_ANCESTORS, node_limit=1, after=next_after)
+        self.assertEqual([node[0] for node in nodes], [parent.id])
+        self.assertEqual(edges, [edge])
+        self.assertIsNone(next_after)
+
+        _, _, _, errors, _ = traverse_sample_lineage(child.id, direction="sideways")
+        self.assertEqual(errors, ["Direction must be one of ancestors, descendants."])
+
     def test_lineage_invalid_child(self):
         lineage, errors, warnings = create_sample_lineage(self.full_sample_parent, self.full_sample_parent, self.process_measurement)
         self.assertEqual(lineage, None)
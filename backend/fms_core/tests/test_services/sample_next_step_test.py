@@ -1,12 +1,18 @@
 import datetime
+import io
+import json
+import os
+import tempfile
+from unittest import mock
 
 from django.core.exceptions import ValidationError
+from django.core.management import call_command
 from django.test import TestCase
 
 from fms_core.models import (SampleNextStep, SampleNextStepByStudy, Study, Workflow,
                              Individual, Container, SampleKind, Project, Protocol,
                              StepHistory, Step, StepOrder, Process, ProcessMeasurement,
-                             SampleLineage)
+                             SampleLineage, StudyStepCounter)
 from fms_core.tests.constants import create_individual, create_fullsample, create_sample_container
 from fms_core.services.sample_next_step import (dequeue_sample_from_specific_step_study_workflow_with_updated_last_step_history, queue_sample_to_study_workflow,
                                                 dequeue_sample_from_all_steps_study_workflow,
@@ -17,7 +23,8 @@ from fms_core.services.sample_next_step import (dequeue_sample_from_specific_ste
                                                 dequeue_sample_from_all_study_workflows_matching_step,
                                                 remove_sample_from_workflow,
                                                 record_step_history,
-                                                execute_workflow_action)
+                                                execute_workflow_action,
+                                                reconcile_study_step_counters)
 from fms_core._constants import WorkflowAction
 
 import pytest
@@ -762,3 +769,55 @@ class SampleNextStepServicesTestCase(TestCase):
 
                     # Leave earlier step history alone
                     self.assertEqual(list(StepHistory.objects.filter(process_measurement__lineage__child=sample_out.pk, step_order__order=1).values_list('workflow_action', flat=True)), [WorkflowAction.NEXT_STEP])
+
+    def test_study_step_counters(self):
+        step_order = StepOrder.objects.get(order=3, workflow=self.workflow_pcr_free)
+        _, errors, _ = queue_sample_to_study_workflow(self.sample_DNA, self.study, 3)
+        self.assertEqual(errors, [])
+        counter = StudyStepCounter.objects.get(study=self.study, step_order=step_order)
+        self.assertEqual(counter.queued_count, 1)
+        self.assertEqual(counter.completed_count, 0)
+
+        process = Process.objects.create(protocol=step_order.step.protocol)
+        process_measurement = ProcessMeasurement.objects.create(process=process,
+                                                                source_sample=self.sample_DNA,
+                                                                execution_date=datetime.date(2021, 1, 10),
+                                                                volume_used=10)
+        _, errors, _ = move_sample_to_next_step(step_order.step, self.sample_DNA, process_measurement, WorkflowAction.NEXT_STEP)
+        self.assertEqual(errors, [])
+        counter.refresh_from_db()
+        self.assertEqual(counter.queued_count, 0)
+        self.assertEqual(counter.completed_count, 1)
+
+        _, errors, _ = queue_sample_to_study_workflow(self.sample_BLOOD, self.study)
+        self.assertEqual(errors, [])
+        self.assertEqual(StudyStepCounter.objects.get(study=self.study, step_order=self.step_order).queued_count, 1)
+        dequeued, errors, _ = dequeue_sample_from_specific_step_study_workflow(self.sample_BLOOD, self.study, 1)
+        self.assertTrue(dequeued)
+        self.assertEqual(StudyStepCounter.objects.get(study=self.study, step_order=self.step_order).queued_count, 0)
+
+    def test_reconcile_study_step_counters(self):
+        queue_sample_to_study_workflow(self.sample_BLOOD, self.study)
+        queue_sample_to_study_workflow(self.sample_DNA, self.study, 3)
+        StudyStepCounter.objects.filter(study=self.study).update(queued_count=5, completed_count=5)
+
+        counters, errors, warnings = reconcile_study_step_counters([self.study.id])
+        self.assertEqual(errors, [])
+        self.assertEqual(warnings, [])
+        self.assertEqual(len(counters), 2)
+        self.assertEqual(sorted(StudyStepCounter.objects.filter(study=self.study).values_list("step_order__order", "queued_count", "completed_count")),
+                         [(1, 1, 0), (3, 1, 0)])
+
+    def test_delete_sample_curation_reconciles_counters(self):
+        queue_sample_to_study_workflow(self.sample_BLOOD, self.study)
+        self.assertEqual(StudyStepCounter.objects.get(study=self.study, step_order=self.step_order).queued_count, 1)
+
+        with tempfile.TemporaryDirectory() as home:
+            os.makedirs(os.path.join(home, "curation"))
+            with open(os.path.join(home, "curation", "delete_queued_sample.json"), "w") as file:
+                json.dump([{"curation_index": 1, "action": "delete_sample", "sample_identifiers": [{"id": self.sample_BLOOD.id}]}], file)
+            with mock.patch("fms_core.management.commands.curation.HOME", home):
+                call_command("curation", "-p", "delete_queued_sample", stdout=io.StringIO())
+
+        self.assertFalse(SampleNextStepByStudy.objects.filter(study=self.study).exists())
+        self.assertFalse(StudyStepCounter.objects.filter(study=self.study, step_order=self.step_order).exists())
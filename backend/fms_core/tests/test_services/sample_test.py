@@ -17,7 +17,7 @@ from fms_core.services.sample import (create_full_sample, get_sample_from_contai
                                       inherit_sample, transfer_sample, extract_sample, pool_samples,
                                       prepare_library, _process_sample, update_qc_flags, remove_qc_flags,
                                       add_sample_metadata, update_sample_metadata, remove_sample_metadata,
-                                      validate_normalization, pool_submitted_samples)
+                                      validate_normalization, pool_submitted_samples, update_sample_summary)
 from fms_core.services.derived_sample import inherit_derived_sample
 from fms_core.services.container import create_container, get_container, get_or_create_container
 from fms_core.services.individual import get_or_create_individual
@@ -170,6 +170,11 @@ class SampleServicesTestCase(TestCase):
         self.assertEqual(new_sample.derived_samples.first().library, self.TEST_SAMPLES[0]["library"])
         self.assertEqual(new_sample.derived_by_samples.first().project, self.TEST_SAMPLES[0]["project"])
         self.assertEqual(new_sample.fragment_size, self.TEST_SAMPLES[0]["fragment_size"])
+        self.assertEqual(new_sample.derived_sample_count, 1)
+        self.assertFalse(new_sample.is_pooled)
+        self.assertTrue(new_sample.has_library)
+        self.assertEqual(new_sample.first_project, self.TEST_SAMPLES[0]["project"])
+        self.assertEqual(new_sample.first_biosample, new_sample.derived_samples.first().biosample)
         self.assertFalse(errors)
         self.assertFalse(warnings)
 
@@ -403,7 +408,44 @@ class SampleServicesTestCase(TestCase):
         self.assertEqual(derived_by_sample_pool_2.project.name, "Projecto")
         self.assertEqual(derived_sample_2.biosample.individual, self.test_individuals[1])
         self.assertEqual(derived_sample_2.library, self.test_libraries[1])
-        
+
+        pool.refresh_from_db()
+        self.assertEqual(pool.derived_sample_count, 2)
+        self.assertTrue(pool.is_pooled)
+        self.assertTrue(pool.is_pool)
+        self.assertTrue(pool.has_library)
+        self.assertEqual(pool.first_project, self.project_testouille)
+        self.assertEqual(pool.first_biosample, derived_sample_1.biosample)
+
+    def test_update_sample_summary(self):
+        sample = self.samples[0]
+        derived_sample_other = self.samples[1].derived_samples.first()
+        DerivedBySample.objects.filter(sample=sample).update(volume_ratio=Decimal("0.5"))
+        DerivedBySample.objects.create(sample=sample, derived_sample=derived_sample_other, volume_ratio=Decimal("0.5"), project=self.project_projecto)
+        # The pool is known before its summary is updated
+        sample.refresh_from_db()
+        self.assertEqual(sample.derived_sample_count, 1)
+        self.assertTrue(sample.is_pool)
+
+        samples, errors, warnings = update_sample_summary([sample])
+        self.assertFalse(errors)
+        self.assertFalse(warnings)
+        self.assertEqual(samples, [sample])
+
+        sample.refresh_from_db()
+        self.assertEqual(sample.derived_sample_count, 2)
+        self.assertTrue(sample.is_pooled)
+        self.assertTrue(sample.is_pool)
+        self.assertTrue(sample.has_library)
+        self.assertEqual(sample.first_project, self.project_testouille)
+        self.assertNotEqual(sample.first_biosample, derived_sample_other.biosample)
+
+        # Unsaved samples are ignored
+        samples, errors, warnings = update_sample_summary([Sample(name="Unsaved")])
+        self.assertEqual(samples, [])
+        self.assertFalse(errors)
+        self.assertFalse(warnings)
+
     def test_prepare_library(self):
         source_sample, _, _ = create_full_sample(name=self.TEST_SAMPLES[2]["name"],
                                                  volume=self.TEST_SAMPLES[2]["volume"],
@@ -591,6 +633,7 @@ class SampleServicesTestCase(TestCase):
         self.assertEqual(metadata_added, metadata)
         for metadata_field in new_sample.derived_samples.first().biosample.metadata.all():
             self.assertEqual(metadata[metadata_field.name], metadata_field.value)
+        self.assertEqual(new_sample.derived_samples.first().biosample.metadata_values, metadata)
         self.assertFalse(errors)
         self.assertFalse(warnings)
 
@@ -645,6 +688,7 @@ class SampleServicesTestCase(TestCase):
         self.assertEqual(metadata_updated, new_metadata)
         for metadata_field in new_sample.derived_samples.first().biosample.metadata.all():
             self.assertEqual(new_metadata[metadata_field.name], metadata_field.value)
+        self.assertEqual(new_sample.derived_samples.first().biosample.metadata_values, new_metadata)
         self.assertFalse(errors)
         self.assertFalse(warnings)
 
@@ -678,6 +722,8 @@ class SampleServicesTestCase(TestCase):
         self.assertFalse(SampleMetadata.objects.filter(biosample=new_sample.derived_samples.first().biosample, name="PatatePoil").exists())
         for metadata_field in new_sample.derived_samples.first().biosample.metadata.all():
             self.assertEqual(metadata[metadata_field.name], metadata_field.value)
+        self.assertEqual(new_sample.derived_samples.first().biosample.metadata_values,
+                         {"TestField1": "I am a potato.", "TestField2": "You are a tomato."})
         self.assertFalse(errors)
         self.assertFalse(warnings)
 
@@ -0,0 +1,59 @@
+import json
+import logging
+import os
+import tempfile
+
+from django.test import TestCase
+
+from fms_core.models import TriggerFile
+from fms_core.models._constants import TriggerFileType
+from fms_core.services.trigger_file import queue_trigger_file, process_trigger_file_queue
+
+
+class TriggerFileServicesTestCase(TestCase):
+    def setUp(self) -> None:
+        self.log = logging.getLogger(__name__)
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_queue_trigger_file(self):
+        trigger_file, errors, warnings = queue_trigger_file(TriggerFileType.RUN_INFO, "", {})
+        self.assertIsNone(trigger_file)
+        self.assertEqual(errors, ["Missing trigger file path."])
+        self.assertEqual(warnings, [])
+
+    def test_process_trigger_file_queue(self):
+        file_path = os.path.join(self.directory.name, "run_info.json")
+        trigger_file, errors, warnings = queue_trigger_file(TriggerFileType.RUN_INFO, file_path, {"run": "RUN1"})
+        self.assertEqual(errors, [])
+        self.assertEqual(warnings, [])
+
+        written_count, failed_count = process_trigger_file_queue(self.log)
+        self.assertEqual((written_count, failed_count), (1, 0))
+        with open(file_path, encoding="utf-8") as fp:
+            self.assertEqual(json.load(fp), {"run": "RUN1"})
+        trigger_file.refresh_from_db()
+        self.assertIsNotNone(trigger_file.written_at)
+
+        # Written trigger files are not written again
+        self.assertEqual(process_trigger_file_queue(self.log), (0, 0))
+
+    def test_process_trigger_file_queue_max_attempts(self):
+        file_path = os.path.join(self.directory.name, "missing_directory", "run_info.json")
+        trigger_file, errors, warnings = queue_trigger_file(TriggerFileType.RUN_INFO, file_path, {"run": "RUN1"})
+        self.assertEqual(errors, [])
+
+        for _ in range(2):
+            self.assertEqual(process_trigger_file_queue(self.log, max_attempts=2), (0, 1))
+        # The trigger file reached the maximum number of attempts and is no longer retried
+        self.assertEqual(process_trigger_file_queue(self.log, max_attempts=2), (0, 0))
+        trigger_file.refresh_from_db()
+        self.assertIsNone(trigger_file.written_at)
+        self.assertEqual(trigger_file.attempt_count, 2)
+        self.assertNotEqual(trigger_file.last_error, "")
+
+        # Resetting the attempt count retries the trigger file
+        os.makedirs(os.path.dirname(file_path))
+        TriggerFile.objects.filter(id=trigger_file.id).update(attempt_count=0)
+        self.assertEqual(process_trigger_file_queue(self.log, max_attempts=2), (1, 0))
+        self.assertTrue(os.path.exists(file_path))
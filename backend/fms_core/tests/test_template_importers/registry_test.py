@@ -0,0 +1,15 @@
+from django.test import TestCase
+
+from fms_core.template_importer.importers import ContainerCreationImporter
+from fms_core.template_importer.registry import LazyImporter
+
+
+class LazyImporterTestCase(TestCase):
+    def test_lazy_importer(self):
+        lazy_importer = LazyImporter("ContainerCreationImporter")
+        self.assertIs(lazy_importer.importer_class, ContainerCreationImporter)
+        self.assertIsInstance(lazy_importer(), ContainerCreationImporter)
+
+    def test_unknown_importer(self):
+        with self.assertRaises(ValueError):
+            LazyImporter("NotAnImporter")
@@ -101,6 +101,7 @@ class SamplePoolingplanningTestCase(TestCase):
             # Basic test for all templates - checks that template is valid
             result = load_template(importer=self.importer, file=file)
             self.assertEqual(result["valid"], True)
+            self.assertEqual(result["base_warnings"], [])
 
             if result['valid']:
                 content_zipped = zipfile.ZipFile(BytesIO(result['output_file']['content']))
@@ -0,0 +1,50 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+import datetime
+
+from fms_core.models import Container, SampleKind
+from fms_core.services.sample import create_full_sample
+
+
+class ContainerViewSetPlacementTestCase(TestCase):
+    def setUp(self) -> None:
+        self.plate1 = Container.objects.create(barcode="PLACEMENTAPIPLATE1", name="PLACEMENTAPIPLATE1", kind="96-well plate")
+        self.plate2 = Container.objects.create(barcode="PLACEMENTAPIPLATE2", name="PLACEMENTAPIPLATE2", kind="96-well plate")
+        create_full_sample(name="PlacementApiSample",
+                           volume=100,
+                           collection_site="Site",
+                           creation_date=datetime.date(2022, 2, 10),
+                           container=self.plate1,
+                           coordinates="A01",
+                           sample_kind=SampleKind.objects.get(name="DNA"))
+        self.client = APIClient()
+        self.client.force_authenticate(user=User.objects.create(username="placer"))
+
+    def test_free_coordinates(self):
+        response = self.client.post("/api/containers/placement/",
+                                    {"container_ids": [self.plate1.id], "occupied_coordinates": {str(self.plate1.id): ["A02"]}},
+                                    format="json")
+        self.assertEqual(response.status_code, 200)
+        free_coordinates = response.data["free_coordinates"][self.plate1.id]
+        self.assertEqual(len(free_coordinates), 94)
+        self.assertEqual(free_coordinates[0], "A03")
+
+    def test_plan(self):
+        response = self.client.post("/api/containers/placement/",
+                                    {"container_ids": [self.plate1.id, self.plate2.id], "sample_count": 97, "axis": "column"},
+                                    format="json")
+        self.assertEqual(response.status_code, 200)
+        placements = response.data["placements"]
+        self.assertEqual([placement["container_barcode"] for placement in placements], ["PLACEMENTAPIPLATE1", "PLACEMENTAPIPLATE2"])
+        self.assertEqual(placements[0]["coordinates"][0], "B01")
+        self.assertEqual(placements[1]["coordinates"], ["A01", "B01"])
+
+    def test_plan_errors(self):
+        response = self.client.post("/api/containers/placement/", {"container_ids": [self.plate1.id], "sample_count": 96}, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"detail": ["Not enough free coordinates in the destination containers to place 96 samples (95 available)."]})
+
+        response = self.client.post("/api/containers/placement/", {"container_ids": [self.plate1.id], "axis": "diagonal"}, format="json")
+        self.assertEqual(response.status_code, 400)
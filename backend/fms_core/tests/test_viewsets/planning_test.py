@@ -0,0 +1,60 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+import datetime
+
+from fms_core.services.sample import create_full_sample
+
+from fms_core.models.container import Container
+from fms_core.models.sample_kind import SampleKind
+
+
+class PlanningViewSetTestCase(TestCase):
+    def setUp(self) -> None:
+        container = Container.objects.create(barcode="PLANNINGBARCODE1", name="PlanningName1", kind="tube")
+        self.sample, _, _ = create_full_sample(name="SAMPLE_TO_PLAN",
+                                               volume=100,
+                                               collection_site="TestSite",
+                                               creation_date=datetime.date(2022, 8, 15),
+                                               container=container,
+                                               sample_kind=SampleKind.objects.get(name="DNA"),
+                                               concentration=20)
+        self.client = APIClient()
+        self.client.force_authenticate(user=User.objects.create(username="planner"))
+
+    def test_normalization(self):
+        response = self.client.post("/api/planning/normalization/",
+                                    {"rows": [{"sample_id": self.sample.id, "final_volume": 50, "concentration_ngul": 10}]},
+                                    format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["warnings"], [])
+        self.assertEqual(len(response.data["rows"]), 1)
+        self.assertEqual(response.data["rows"][0]["sample_id"], self.sample.id)
+        self.assertEqual(float(response.data["rows"][0]["volume_used"]), 25)
+
+    def test_normalization_invalid_final_volume(self):
+        response = self.client.post("/api/planning/normalization/",
+                                    {"rows": [{"sample_id": self.sample.id, "final_volume": 0, "na_quantity": 250}]},
+                                    format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"detail": ["Row 1: Final volume must be greater than 0."]})
+
+    def test_normalization_without_rows(self):
+        response = self.client.post("/api/planning/normalization/", {}, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"detail": "A list of rows is required."})
+
+    def test_normalization_invalid_sample_id(self):
+        response = self.client.post("/api/planning/normalization/",
+                                    {"rows": [{"sample_id": "abc", "final_volume": 50, "na_quantity": 250}]},
+                                    format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"detail": ["Row 1: A sample id is required and must be an integer."]})
+
+    def test_pooling(self):
+        response = self.client.post("/api/planning/pooling/",
+                                    {"rows": [{"sample_id": self.sample.id, "na_quantity": 100}]},
+                                    format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["rows"][0]["is_sufficient"], True)
@@ -0,0 +1,32 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from fms_core.models import Container, SampleKind
+from fms_core.pagination import encode_cursor
+from fms_core.services.sample import create_full_sample
+from fms_core.viewsets.sample_lineage import LINEAGE_CURSOR_ORDERING
+
+
+class SampleLineageViewSetTraverseTestCase(TestCase):
+    def setUp(self) -> None:
+        container = Container.objects.create(barcode="TRAVERSEBARCODE", name="TraverseName", kind="tube")
+        self.sample, _, _ = create_full_sample(name="SampleToTraverse",
+                                               volume=20,
+                                               collection_site="TestCollectionSite",
+                                               container=container,
+                                               sample_kind=SampleKind.objects.get(name="BLOOD"),
+                                               creation_date="2022-01-01")
+        self.client = APIClient()
+        self.client.force_authenticate(user=User.objects.create(username="traverser"))
+
+    def test_traverse(self):
+        response = self.client.get(f"/api/sample-lineage/{self.sample.id}/traverse/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([node[0] for node in response.data["nodes"]], [self.sample.id])
+        self.assertIsNone(response.data["next"])
+
+    def test_traverse_invalid_cursor(self):
+        for cursor in ["not-a-cursor", encode_cursor(LINEAGE_CURSOR_ORDERING, ["0", "abc"]), encode_cursor(LINEAGE_CURSOR_ORDERING, [0, None])]:
+            response = self.client.get(f"/api/sample-lineage/{self.sample.id}/traverse/", {"cursor": cursor})
+            self.assertEqual(response.status_code, 404)
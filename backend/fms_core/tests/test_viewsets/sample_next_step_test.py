@@ -0,0 +1,71 @@
+from urllib.parse import urlencode
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from fms_core.models import Study, Workflow, Individual, Container, SampleKind, Project, Step
+from fms_core.tests.constants import create_individual, create_fullsample, create_sample_container
+from fms_core.services.sample_next_step import queue_sample_to_study_workflow
+
+
+class SampleNextStepViewSetLabworkTestCase(TestCase):
+    def setUp(self) -> None:
+        individual = Individual.objects.create(**create_individual(individual_name='labworkdoe'))
+        sample_kind_BLOOD, _ = SampleKind.objects.get_or_create(name="BLOOD", is_extracted=False)
+        project = Project.objects.create(name="TestLabworkStep")
+        study = Study.objects.create(letter="A",
+                                     project=project,
+                                     workflow=Workflow.objects.get(name="PCR-free Illumina"),
+                                     start=1,
+                                     end=3)
+        self.step = Step.objects.get(name="Extraction (DNA)")
+        self.group = "tubes without parent container"
+        self.sample_ids = []
+        for i in range(3):
+            container = Container.objects.create(**create_sample_container(kind='tube', name=f'LabworkTube0{i}', barcode=f'LABWORKTUBE0{i}'))
+            sample = create_fullsample(name=f"LabworkSample{i}",
+                                       alias=f"labwork{i}",
+                                       volume=5000,
+                                       individual=individual,
+                                       sample_kind=sample_kind_BLOOD,
+                                       container=container)
+            for derived_by_sample in sample.derived_by_samples.all():
+                derived_by_sample.project_id = project.id
+                derived_by_sample.save()
+            _, errors, _ = queue_sample_to_study_workflow(sample, study)
+            self.assertEqual(errors, [])
+            self.sample_ids.append(sample.id)
+        self.client = APIClient()
+        self.client.force_authenticate(user=User.objects.create(username="labworker"))
+
+    def test_labwork_step_info_without_locators(self):
+        response = self.client.post(f"/api/sample-next-step/labwork_step_info/?step__id__in={self.step.id}&group_by=ordering_container_name&with_locators=false",
+                                    {}, format="json")
+        self.assertEqual(response.status_code, 200)
+        samples = response.data["results"]["samples"]
+        self.assertEqual(samples["grouping_column"], "ordering_container_name")
+        self.assertEqual(samples["groups"], [{"name": self.group, "count": 3}])
+
+    def test_labwork_step_group_locators_paging(self):
+        url = f"/api/sample-next-step/labwork_step_group_locators/?step__id__in={self.step.id}&group_by=ordering_container_name&{urlencode({'group': self.group})}&limit=2"
+        response = self.client.post(url, {}, format="json")
+        self.assertEqual(response.status_code, 200)
+        first_page = response.data["results"]
+        self.assertEqual(first_page["name"], self.group)
+        self.assertEqual([locator["sample_name"] for locator in first_page["sample_locators"]], ["LabworkSample0", "LabworkSample1"])
+        self.assertIsNotNone(first_page["next"])
+
+        response = self.client.post(f"{url}&{urlencode({'cursor': first_page['next']})}", {}, format="json")
+        self.assertEqual(response.status_code, 200)
+        second_page = response.data["results"]
+        self.assertEqual([locator["sample_name"] for locator in second_page["sample_locators"]], ["LabworkSample2"])
+        self.assertIsNone(second_page["next"])
+
+        sample_ids = [locator["sample_id"] for locator in first_page["sample_locators"] + second_page["sample_locators"]]
+        self.assertEqual(sorted(sample_ids), sorted(self.sample_ids))
+
+    def test_labwork_step_group_locators_invalid_limit(self):
+        response = self.client.post(f"/api/sample-next-step/labwork_step_group_locators/?step__id__in={self.step.id}&group_by=ordering_container_name&limit=0",
+                                    {}, format="json")
+        self.assertEqual(response.status_code, 400)
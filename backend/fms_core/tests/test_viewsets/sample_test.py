@@ -0,0 +1,63 @@
+import time
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from fms_core.db_router import has_recent_write, _replica_status
+from fms_core.models import Container, SampleKind, RecentWrite
+from fms_core.services.sample import create_full_sample
+
+REPLICA_ALIAS = "replica"
+
+
+class SampleViewSetListFilteredTestCase(TestCase):
+    def setUp(self) -> None:
+        container = Container.objects.create(barcode="LISTFILTEREDRACK", name="ListFilteredRack", kind="96-well plate")
+        self.samples = []
+        for coordinates in ["A01", "A02", "A03"]:
+            sample, _, _ = create_full_sample(name=f"ListFiltered{coordinates}",
+                                              volume=20,
+                                              collection_site="TestCollectionSite",
+                                              container=container,
+                                              coordinates=coordinates,
+                                              sample_kind=SampleKind.objects.get(name="DNA"),
+                                              creation_date="2022-01-01")
+            self.samples.append(sample)
+        self.user = User.objects.create(username="list_filterer")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        _replica_status.clear()
+
+    def tearDown(self) -> None:
+        _replica_status.clear()
+
+    def result_names(self, response):
+        self.assertEqual(response.status_code, 200)
+        return sorted(sample["name"] for sample in response.data["results"])
+
+    def test_batch_filter(self):
+        # List values of a batch filter are joined with spaces
+        response = self.client.post("/api/samples/list_filtered/", {"name": ["ListFilteredA01", "ListFilteredA03"]}, format="json")
+        self.assertEqual(self.result_names(response), ["ListFilteredA01", "ListFilteredA03"])
+
+    def test_in_filter(self):
+        # List values of the other filters are joined with commas
+        response = self.client.post("/api/samples/list_filtered/",
+                                    {"id__in": [self.samples[1].id, self.samples[2].id], "ordering": "name"},
+                                    format="json")
+        self.assertEqual(self.result_names(response), ["ListFilteredA02", "ListFilteredA03"])
+
+    def test_invalid_body(self):
+        response = self.client.post("/api/samples/list_filtered/", [self.samples[0].id], format="json")
+        self.assertEqual(response.status_code, 400)
+
+    def test_not_sticky(self):
+        databases = {"default": {}, REPLICA_ALIAS: {}}
+        with override_settings(DATABASES=databases):
+            _replica_status[REPLICA_ALIAS] = (time.monotonic(), False) # replica checked and lagging, reads stay on the default database
+            response = self.client.post("/api/samples/list_filtered/", {"name": ["ListFilteredA01"]}, format="json")
+            self.assertEqual(self.result_names(response), ["ListFilteredA01"])
+            # A posted list does not write, the user keeps reading from the replica
+            self.assertFalse(has_recent_write(self.user))
+            self.assertFalse(RecentWrite.objects.filter(user=self.user).exists())
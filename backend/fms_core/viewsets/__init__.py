@@ -27,6 +27,7 @@ from .library_type import LibraryTypeViewSet
 from .taxon import TaxonViewSet
 from .sample_lineage import SampleLineageViewSet
 from .imported_file import ImportedFileViewSet
+from .import_job import ImportJobViewSet
 from .dataset import DatasetViewSet
 from .dataset_file import DatasetFileViewSet
 from .sample_pooled import PooledSamplesViewSet
@@ -46,6 +47,7 @@ from .sample_identity import SampleIdentityViewSet
 from .sample_identity_match import SampleIdentityMatchViewSet
 from .profile import ProfileViewSet
 from .derived_sample import DerivedSampleViewSet
+from .planning import PlanningViewSet
 
 __all__ = [
     "BiosampleViewSet",
@@ -76,6 +78,7 @@ __all__ = [
     "LibraryTypeViewSet",
     "TaxonViewSet",
     "ImportedFileViewSet",
+    "ImportJobViewSet",
     "SampleLineageViewSet",
     "DatasetViewSet",
     "DatasetFileViewSet",
@@ -96,4 +99,5 @@ __all__ = [
     "SampleIdentityMatchViewSet",
     "ProfileViewSet",
     "DerivedSampleViewSet",
+    "PlanningViewSet",
 ]
\ No newline at end of file
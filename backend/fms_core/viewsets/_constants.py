@@ -118,6 +118,8 @@ _sample_filterset_fields: FiltersetFields = {
     **_prefix_keys("container__", _container_filterset_fields),
     "container__location__barcode": CATEGORICAL_FILTERS_LOOSE,
     **_prefix_keys("derived_by_samples__project__", _project_minimal_filterset_fields),
+    **_prefix_keys("first_project__", _project_minimal_filterset_fields),
+    "derived_sample_count": SCALAR_FILTERS,
     **_prefix_keys("derived_samples__biosample__individual__", _individual_filterset_fields),
     **_prefix_keys("derived_samples__sample_kind__", _sample_kind_filterset_fields),
     "sample_next_steps__step__name": CATEGORICAL_FILTERS_LOOSE,
@@ -243,6 +245,14 @@ _imported_file_filterset_fields: FiltersetFields = {
     "filename": FREE_TEXT_FILTERS,
 }
 
+_import_job_filterset_fields: FiltersetFields = {
+    "id": PK_FILTERS,
+    "status": CATEGORICAL_FILTERS,
+    "file_name": FREE_TEXT_FILTERS,
+    "created_by": FK_FILTERS,
+    "created_at": DATE_FILTERS,
+}
+
 # library uses a sample queryset. basic fields are sample fields.
 _library_filterset_fields: FiltersetFields = {
     "id": PK_FILTERS,
@@ -258,6 +268,8 @@ _library_filterset_fields: FiltersetFields = {
     **_prefix_keys("container__", _container_filterset_fields),
 
     **_prefix_keys("derived_by_samples__project__", _project_minimal_filterset_fields),
+    **_prefix_keys("first_project__", _project_minimal_filterset_fields),
+    "derived_sample_count": SCALAR_FILTERS,
 
     "derived_samples__library": FK_FILTERS,  # PK
     **_prefix_keys("derived_samples__library__library_type__", _library_type_filterset_fields),
@@ -286,6 +298,7 @@ _experiment_run_filterset_fields: FiltersetFields = {
     "container": FK_FILTERS,
     "run_processing_launch_time": DATE_FILTERS,
     "run_processing_end_time": DATE_FILTERS,
+    "run_processing_completion_time": DATE_FILTERS,
 
     **_prefix_keys("run_type__", _run_type_filterset_fields),
     **_prefix_keys("instrument__", _instrument_filterset_fields),
@@ -381,6 +394,7 @@ _sample_next_step_filterset_fields: FiltersetFields = {
     "sample__derived_samples__library__index__name": CATEGORICAL_FILTERS_LOOSE,
     "sample__derived_samples__library__platform__name": CATEGORICAL_FILTERS_LOOSE,
     "sample__derived_by_samples__project__name": CATEGORICAL_FILTERS_LOOSE,
+    "sample__first_project__name": CATEGORICAL_FILTERS_LOOSE,
     **_prefix_keys("step__", _step_filterset_fields),
 }
 
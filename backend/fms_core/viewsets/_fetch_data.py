@@ -3,10 +3,13 @@ import json
 import datetime
 from typing import List, Tuple
 from collections import defaultdict
-from django.db.models import Q, ExpressionWrapper, BooleanField, Prefetch
+from django.db.models import Q, ExpressionWrapper, BooleanField, Prefetch, Count
 
 from fms.settings import REST_FRAMEWORK
-from fms_core.models import Sample, DerivedSample, SampleLineage, ProcessMeasurement, SampleMetadata, DerivedBySample, Project
+from fms_core.pagination import CURSOR_QUERY_PARAM, COUNT_EXACT, is_cursor_request, get_count_mode, get_count, keyset_paginate
+from fms_core.models import (Sample, Biosample, DerivedSample, SampleLineage, ProcessMeasurement, DerivedBySample, Project,
+                             Container, ExperimentRun, Process)
+from fms_core.containers import CONTAINER_KIND_SPECS
 from fms_core.services.library import convert_library_concentration_from_ngbyul_to_nm
 
 from ..utils import decimal_rounded_to_precision
@@ -17,6 +20,10 @@ class FetchData:
     """
     fetch_limit = None
     fetch_offset = None
+    fetch_cursor_mode = False
+    fetch_cursor = None
+    fetch_next_cursor = None
+    fetch_count_mode = COUNT_EXACT
 
     def fetch_data(self, ids: List[int] =[]) -> Tuple[List, int]:
         """
@@ -35,8 +42,59 @@ class FetchData:
         # pagination params
         self.fetch_limit = int(self.request.query_params.get('limit', REST_FRAMEWORK["PAGE_SIZE"]))
         self.fetch_offset = int(self.request.query_params.get('offset', 0))
+        # keyset pagination params (opt-in using the cursor param)
+        self.fetch_cursor_mode = is_cursor_request(self.request)
+        self.fetch_cursor = self.request.query_params.get(CURSOR_QUERY_PARAM) if self.fetch_cursor_mode else None
+        self.fetch_next_cursor = None
+        self.fetch_count_mode = get_count_mode(self.request)
 
         return (None, None) # abstract function, must be overloaded. call base function for initialization
+
+    def fetch_count(self, queryset) -> int | None:
+        """
+        Count the objects of the queryset according to the requested count mode (exact, cached, estimate or none).
+
+        Args:
+            queryset: Queryset to count.
+
+        Returns:
+            The count of objects, None if the count was not requested.
+        """
+        return get_count(queryset, self.fetch_count_mode)
+
+    def fetch_page(self, queryset):
+        """
+        Page the queryset using either limit/offset or keyset pagination. In keyset mode, fetch_next_cursor is
+        set to the cursor of the next page.
+
+        Args:
+            queryset: Ordered queryset to page.
+
+        Returns:
+            The paged queryset (or list of rows in keyset mode).
+        """
+        if self.fetch_cursor_mode:
+            page, self.fetch_next_cursor = keyset_paginate(queryset, self.fetch_cursor, self.fetch_limit, getattr(self, "ordering", None))
+            return page
+        if self.fetch_limit is not None and self.fetch_offset is not None:
+            return queryset[self.fetch_offset:self.fetch_offset+self.fetch_limit] # page the queryset
+        return queryset
+
+    def fetch_list_response_data(self, serialized_data: List, count: int | None) -> dict:
+        """
+        Build the list response content. The cursor of the next page is included in keyset mode.
+
+        Args:
+            serialized_data: List of serialized objects returned by fetch_data.
+            count: Count returned by fetch_data.
+
+        Returns:
+            Dictionary to return in the list response.
+        """
+        data = {"results": serialized_data, "count": count}
+        if self.fetch_cursor_mode:
+            data["next"] = self.fetch_next_cursor
+        return data
         
     def fetch_export_data(self, ids: List[int] =[]) -> Tuple[List, int]:
         """
@@ -81,7 +139,7 @@ class FetchSampleData(FetchData):
         super().fetch_data(ids) # Initialize queryset by calling base abstract function
         self.queryset = self.queryset.values('id')
 
-        count = self.queryset.count() # Get count after value to have rows merged but before paging to have complete count
+        count = self.fetch_count(self.queryset) # Get count after value to have rows merged but before paging to have complete count
 
         self.queryset = self.filter_queryset(self.get_queryset())
         if len(ids) > 0:
@@ -108,8 +166,7 @@ class FetchSampleData(FetchData):
             'deleted',
         )
 
-        if self.fetch_limit is not None and self.fetch_offset is not None:
-            self.queryset = self.queryset[self.fetch_offset:self.fetch_offset+self.fetch_limit] # page the queryset
+        self.queryset = self.fetch_page(self.queryset)
 
         if not self.queryset:
             return ([], 0) # Do not lose time processing data for an empty queryset
@@ -435,16 +492,8 @@ class FetchSampleData(FetchData):
             derived_by_samples[derived_by_sample["derived_sample_id"]][derived_by_sample["sample_id"]] = derived_by_sample["project__name"]
 
         biosample_ids = derived_sample_values_queryset.values_list('biosample__id', flat=True)
-        metadata_queryset = SampleMetadata.objects.filter(biosample_id__in=biosample_ids)
-        metadata_obj = metadata_queryset.values('biosample','name', 'value')
-
-        metadata_per_biosample = {}
-        for metadata in metadata_obj:
-            biosample = metadata['biosample']
-            if biosample in metadata_per_biosample.keys():
-                metadata_per_biosample[biosample].append(metadata)
-            else:
-                metadata_per_biosample[biosample] = [metadata]
+        # Metadata projection already pivoted by biosample (name to value dictionary)
+        metadata_per_biosample = dict(Biosample.objects.filter(id__in=biosample_ids).values_list('id', 'metadata_values'))
 
         serialized_data = []
         if not samples_by_derived:
@@ -456,7 +505,7 @@ class FetchSampleData(FetchData):
                 derived_sample = derived_samples[derived_sample_id]
                 # Prevents crashing if sample has no metadata
                 biosample_id = derived_sample["biosample__id"]
-                metadata = metadata_per_biosample[biosample_id] if biosample_id in metadata_per_biosample else None
+                metadata = metadata_per_biosample.get(biosample_id, None)
                 data = {
                     'alias': derived_sample["biosample__alias"],
                     'biosample_id': biosample_id ,
@@ -465,7 +514,7 @@ class FetchSampleData(FetchData):
                     'container_barcode': sample["container__barcode"],
                     'coordinates': sample["coordinate__name"],
                     'project': derived_by_samples[derived_sample_id][sample["id"]],
-                    **(dict((item["name"], item["value"]) for item in metadata) if metadata else dict())
+                    **(metadata if metadata else dict())
                 }
 
                 metadata_names.extend([data_key for data_key in data.keys() if data_key not in metadata_names])
@@ -499,7 +548,7 @@ class FetchLibraryData(FetchData):
         """
         super().fetch_data(ids) # Initialize queryset by calling base abstract function
         self.queryset = self.queryset.values('id')
-        count = self.queryset.count() # Get count after value to have rows merged but before paging to have complete count
+        count = self.fetch_count(self.queryset) # Get count after value to have rows merged but before paging to have complete count
 
         self.queryset = self.filter_queryset(self.get_queryset())
         if len(ids) > 0:
@@ -520,8 +569,7 @@ class FetchLibraryData(FetchData):
             'identity_flag',
             'depleted',
         )
-        if self.fetch_limit is not None and self.fetch_offset is not None:
-            self.queryset = self.queryset[self.fetch_offset:self.fetch_offset+self.fetch_limit] # page the queryset
+        self.queryset = self.fetch_page(self.queryset)
 
         if not self.queryset:
             return ([], 0) # Do not lose time processing data for an empty queryset
@@ -694,3 +742,323 @@ class FetchLibraryData(FetchData):
                 }
                 serialized_data.append(data)
             return serialized_data
+
+
+#####################################################################################################################################################
+
+
+def get_lanes_by_container_kind(container_kinds) -> dict:
+    """
+    Compute the lanes of each container kind from its coordinate spec. Each kind is computed once.
+
+    Args:
+        container_kinds: Iterable of container kinds.
+
+    Returns:
+        Dictionary of the list of lane numbers (starting at 1) by container kind.
+    """
+    lanes_by_kind = {}
+    for kind in set(container_kinds):
+        container_spec = CONTAINER_KIND_SPECS.get(kind, None)
+        nb_lanes = 1
+        for dimension in (container_spec.coordinate_spec if container_spec else ()):
+            nb_lanes = nb_lanes * len(dimension)
+        lanes_by_kind[kind] = list(range(1, nb_lanes + 1))
+    return lanes_by_kind
+
+
+class FetchExperimentRunData(FetchData):
+    """
+    Derived class specialized in fetching experiment run data.
+
+    Args:
+        fetch_data: base class
+    """
+
+    def fetch_data(self, ids: List[int] =[]) -> Tuple[List, int]:
+        """
+        Function used to replace the experiment run serializer across various viewsets.
+
+        Args:
+            self: base_class(viewset) + fetch_data
+            ids: List of ids to select specific experiment runs. Defaults to [].
+
+        Returns:
+            Returns a tuple of a list of serialized data dictionary (experiment runs) and the count before pagination
+        """
+        super().fetch_data(ids) # Initialize queryset by calling base abstract function
+        count = self.fetch_count(self.queryset.values('id')) # Get count before paging to have complete count
+
+        self.queryset = self.queryset.values(
+            'id',
+            'name',
+            'external_name',
+            'run_type_id',
+            'container_id',
+            'container__kind',
+            'instrument_id',
+            'instrument__type__type',
+            'instrument__type__platform__name',
+            'start_date',
+            'end_time',
+            'process_id',
+            'run_processing_launch_time',
+            'run_processing_start_time',
+            'run_processing_completion_time',
+            'readset_count',
+            'unreleased_readset_count',
+            'unvalidated_readset_count',
+            'created_by_id',
+            'created_at',
+            'updated_by_id',
+            'updated_at',
+            'deleted',
+        )
+        self.queryset = self.fetch_page(self.queryset)
+
+        if not self.queryset:
+            return ([], count) # Do not lose time processing data for an empty queryset
+        else:
+            experiment_runs = list(self.queryset)
+            lanes_by_kind = get_lanes_by_container_kind(experiment_run["container__kind"] for experiment_run in experiment_runs)
+
+            children_processes = defaultdict(list)
+            processes_values_queryset = (
+                Process.objects
+                .filter(parent_process_id__in=[experiment_run["process_id"] for experiment_run in experiment_runs])
+                .order_by("id")
+                .values("id", "parent_process_id")
+            )
+            for process in processes_values_queryset:
+                children_processes[process["parent_process_id"]].append(process["id"])
+
+            serialized_data = []
+            for experiment_run in experiment_runs:
+                data = {
+                    'id': experiment_run["id"],
+                    'children_processes': children_processes[experiment_run["process_id"]],
+                    'instrument_type': experiment_run["instrument__type__type"],
+                    'platform': experiment_run["instrument__type__platform__name"],
+                    'lanes': lanes_by_kind[experiment_run["container__kind"]],
+                    'run_processing_end_time': experiment_run["run_processing_completion_time"],
+                    'name': experiment_run["name"],
+                    'external_name': experiment_run["external_name"],
+                    'start_date': experiment_run["start_date"],
+                    'end_time': experiment_run["end_time"],
+                    'run_processing_launch_time': experiment_run["run_processing_launch_time"],
+                    'run_processing_start_time': experiment_run["run_processing_start_time"],
+                    'run_processing_completion_time': experiment_run["run_processing_completion_time"],
+                    'readset_count': experiment_run["readset_count"],
+                    'unreleased_readset_count': experiment_run["unreleased_readset_count"],
+                    'unvalidated_readset_count': experiment_run["unvalidated_readset_count"],
+                    'run_type': experiment_run["run_type_id"],
+                    'container': experiment_run["container_id"],
+                    'instrument': experiment_run["instrument_id"],
+                    'process': experiment_run["process_id"],
+                    'created_by': experiment_run["created_by_id"],
+                    'created_at': experiment_run["created_at"],
+                    'updated_by': experiment_run["updated_by_id"],
+                    'updated_at': experiment_run["updated_at"],
+                    'deleted': experiment_run["deleted"],
+                }
+                serialized_data.append(data)
+            return (serialized_data, count)
+
+    def fetch_export_data(self, ids: List[int] =[]) -> Tuple[List, int]:
+        """
+        Function used to replace the experiment run serializer when exporting data.
+
+        Args:
+            self: base_class(viewset) + fetch_data
+            ids: List of ids to select specific experiment runs. Defaults to [].
+
+        Returns:
+            Returns a list of serialized data dictionary (experiment runs)
+        """
+        super().fetch_export_data(ids) # Initialize queryset by calling base abstract function
+
+        experiment_runs = list(self.queryset.values(
+            'id',
+            'name',
+            'run_type__name',
+            'instrument__name',
+            'container__kind',
+            'container__name',
+            'container__barcode',
+            'start_date',
+            'end_time',
+            'run_processing_launch_time',
+            'run_processing_start_time',
+            'run_processing_end_time',
+        ))
+
+        if not experiment_runs:
+            return [{}] # Allow the returned csv file to be named instead of random name.
+
+        lanes_by_kind = get_lanes_by_container_kind(experiment_run["container__kind"] for experiment_run in experiment_runs)
+        serialized_data = []
+        for experiment_run in experiment_runs:
+            data = {
+                'experiment_run_id': experiment_run["id"],
+                'experiment_run_name': experiment_run["name"],
+                'run_type': experiment_run["run_type__name"],
+                'instrument': experiment_run["instrument__name"],
+                'container_kind': experiment_run["container__kind"],
+                'container_name': experiment_run["container__name"],
+                'container_barcode': experiment_run["container__barcode"],
+                'start_date': experiment_run["start_date"],
+                'end_time': experiment_run["end_time"],
+                'run_processing_launch_time': experiment_run["run_processing_launch_time"],
+                'run_processing_start_time': experiment_run["run_processing_start_time"],
+                'run_processing_end_time': experiment_run["run_processing_end_time"],
+                'lanes': ", ".join([str(lane) for lane in lanes_by_kind[experiment_run["container__kind"]]]),
+            }
+            serialized_data.append(data)
+        return serialized_data
+
+
+#####################################################################################################################################################
+
+
+class FetchContainerData(FetchData):
+    """
+    Derived class specialized in fetching container data.
+
+    Args:
+        fetch_data: base class
+    """
+
+    def fetch_data(self, ids: List[int] =[]) -> Tuple[List, int]:
+        """
+        Function used to replace the container serializer across various viewsets.
+
+        Args:
+            self: base_class(viewset) + fetch_data
+            ids: List of ids to select specific containers. Defaults to [].
+
+        Returns:
+            Returns a tuple of a list of serialized data dictionary (containers) and the count before pagination
+        """
+        super().fetch_data(ids) # Initialize queryset by calling base abstract function
+        count = self.fetch_count(self.queryset.values('id')) # Get count before paging to have complete count
+
+        self.queryset = self.queryset.values(
+            'id',
+            'kind',
+            'name',
+            'barcode',
+            'location_id',
+            'coordinate_id',
+            'comment',
+            'update_comment',
+            'created_by_id',
+            'created_at',
+            'updated_by_id',
+            'updated_at',
+            'deleted',
+        )
+        self.queryset = self.fetch_page(self.queryset)
+
+        if not self.queryset:
+            return ([], count) # Do not lose time processing data for an empty queryset
+        else:
+            containers = {c["id"]: c for c in self.queryset}
+            containers_ids = containers.keys()
+
+            children_by_container = defaultdict(list)
+            for child in Container.objects.filter(location_id__in=containers_ids).order_by("id").values("id", "location_id"):
+                children_by_container[child["location_id"]].append(child["id"])
+
+            samples_by_container = defaultdict(list)
+            samples_values_queryset = (
+                Sample.objects
+                .filter(container_id__in=containers_ids)
+                .order_by("coordinate__column", "id")
+                .values("id", "container_id")
+            )
+            for sample in samples_values_queryset:
+                samples_by_container[sample["container_id"]].append(sample["id"])
+
+            experiment_run_by_container = dict(ExperimentRun.objects.filter(container_id__in=containers_ids).values_list("container_id", "id"))
+
+            serialized_data = []
+            for container in containers.values():
+                data = {
+                    'id': container["id"],
+                    'children': children_by_container[container["id"]],
+                    'samples': samples_by_container[container["id"]],
+                    'experiment_run': experiment_run_by_container.get(container["id"], None),
+                    'kind': container["kind"],
+                    'name': container["name"],
+                    'barcode': container["barcode"],
+                    'comment': container["comment"],
+                    'update_comment': container["update_comment"],
+                    'location': container["location_id"],
+                    'coordinate': container["coordinate_id"],
+                    'created_by': container["created_by_id"],
+                    'created_at': container["created_at"],
+                    'updated_by': container["updated_by_id"],
+                    'updated_at': container["updated_at"],
+                    'deleted': container["deleted"],
+                }
+                serialized_data.append(data)
+            return (serialized_data, count)
+
+    def fetch_export_data(self, ids: List[int] =[]) -> Tuple[List, int]:
+        """
+        Function used to replace the container serializer when exporting data. Children and sample counts are
+        aggregated for all the exported containers at once.
+
+        Args:
+            self: base_class(viewset) + fetch_data
+            ids: List of ids to select specific containers. Defaults to [].
+
+        Returns:
+            Returns a list of serialized data dictionary (containers)
+        """
+        super().fetch_export_data(ids) # Initialize queryset by calling base abstract function
+
+        containers = list(self.queryset.values(
+            'id',
+            'name',
+            'kind',
+            'barcode',
+            'location__barcode',
+            'coordinate__name',
+            'comment',
+        ))
+
+        if not containers:
+            return [{}] # Allow the returned csv file to be named instead of random name.
+
+        # The filtered queryset is used as a subquery to avoid sending the complete list of ids
+        containers_ids_queryset = self.queryset.order_by().values('id')
+        children_count_by_container = dict(
+            Container.objects.filter(location_id__in=containers_ids_queryset)
+                             .order_by()
+                             .values("location_id")
+                             .annotate(count=Count("id"))
+                             .values_list("location_id", "count")
+        )
+        samples_count_by_container = dict(
+            Sample.objects.filter(container_id__in=containers_ids_queryset)
+                          .order_by()
+                          .values("container_id")
+                          .annotate(count=Count("id"))
+                          .values_list("container_id", "count")
+        )
+
+        serialized_data = []
+        for container in containers:
+            data = {
+                'name': container["name"],
+                'container_kind': container["kind"],
+                'barcode': container["barcode"],
+                'location': container["location__barcode"],
+                'coordinate': container["coordinate__name"],
+                'children_containers_count': children_count_by_container.get(container["id"], 0),
+                'samples_contained_count': samples_count_by_container.get(container["id"], 0),
+                'comment': container["comment"],
+            }
+            serialized_data.append(data)
+        return serialized_data
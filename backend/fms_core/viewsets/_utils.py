@@ -7,21 +7,26 @@ from django.conf import settings
 from django.core.exceptions import ValidationError
 
 from rest_framework.decorators import action
+from rest_framework.permissions import SAFE_METHODS
 from rest_framework.response import Response
 from reversion.models import Version
 
 import json
 import os
 
-from fms_core.template_importer.importers._generic import GenericImporter
 from fms_core.templates import TemplateIdentity
-from fms_core import automations
-from fms_core.serializers import VersionSerializer
-from fms_core.template_prefiller.prefiller import PrefillTemplate, PrefillTemplateFromDict
-from fms_core.models import Sample, Protocol, Step, StepSpecification
+from fms_core.serializers import VersionSerializer, ImportJobSerializer
+from fms_core.template_importer.registry import LazyImporter
+from fms_core.models import Sample, Protocol, Step, StepSpecification, StudyStepCounter
 from fms_core.services.sample_next_step import execute_workflow_action
+from fms_core.services.import_job import queue_import_job
+from fms_core.template_prefiller.sample_attributes import resolve_sample_attributes, prefill_row_from_values
 from fms_core._constants import WorkflowAction
 from fms_core.utils import has_errors
+from fms_core.db_router import get_read_alias_for_user, set_read_alias, reset_read_alias
+
+# Importers, prefillers and automations load pandas and openpyxl. They are imported when first used, not when the
+# viewsets are loaded.
 
 def versions_detail(obj):
     versions = Version.objects.get_for_object(obj)
@@ -35,6 +40,33 @@ def _prefix_keys(prefix: str, d: Dict[str, Any]) -> Dict[str, Any]:
 def _list_keys(d: Dict[str, Any]) -> Dict[str, Any]:
     return [k  for k, v in d.items()]
 
+def study_step_counts(count_field: str, study_id=None) -> List[Dict[str, Any]]:
+    """
+    Lists the steps of the studies with their count read from the study step counters. Steps with a count of 0 are omitted.
+
+    Args:
+        `count_field`: Counter field to report ("queued_count" or "completed_count").
+        `study_id`: Id of the study to report. Optional: defaults to all the studies.
+
+    Returns:
+        A list of studies, each with its study id and the list of its counted steps.
+    """
+    counters = StudyStepCounter.objects.filter(**{f"{count_field}__gt": 0})
+    if study_id is not None:
+        counters = counters.filter(study__id=study_id)
+    counted = counters.values("study_id", "step_order_id", "step_order__order", "step_order__step__name", count_field).order_by("study_id", "step_order__order")
+
+    studies = dict()
+    for counter in counted:
+        study = studies.setdefault(counter["study_id"], {"study_id": counter["study_id"], "steps": []})
+        study["steps"].append({
+            "step_order_id": counter["step_order_id"],
+            "order": counter["step_order__order"],
+            "step_name": counter["step_order__step__name"],
+            "count": counter[count_field]
+        })
+    return list(studies.values())
+
 
 class FZY(Func):
     template = "%(function)s(%(expressions)s::cstring)"
@@ -47,6 +79,60 @@ class FZY(Func):
             **extras
         )
 
+class ReplicaReadMixin:
+    """
+    Serves the safe read-only actions of a viewset from the replica database, when one is configured and usable
+    (see fms_core.db_router). Must come before the viewset class in the bases.
+    """
+    replica_read_actions = ["list", "retrieve", "list_export", "list_export_metadata", "search"]
+    # Actions posted only to send their parameters in the body. They do not write.
+    replica_read_post_actions = ["list_filtered"]
+
+    _read_alias_token = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if self.action in self.replica_read_post_actions:
+            request._request.replica_read_only = True # Not a write for ReplicaStickinessMiddleware
+        if ((request.method in SAFE_METHODS and self.action in self.replica_read_actions)
+            or self.action in self.replica_read_post_actions):
+            self._read_alias_token = set_read_alias(get_read_alias_for_user(request.user))
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            if self._read_alias_token is not None:
+                reset_read_alias(self._read_alias_token)
+                self._read_alias_token = None
+
+
+class PostedFiltersMixin:
+    """
+    Adds the list_filtered action, that lists like the list action with the query parameters (filters, ordering and
+    pagination) posted as a json object in the request body. Lists of values, like the thousands of names given to a
+    batch filter, can then be longer than what fits in a URL. List values are joined with spaces for the batch filters
+    and with commas for the other filters (ie. __in filters).
+    """
+    BATCH_FILTER_METHODS = ["batch_filter", "insensitive_batch_filter"]
+
+    @action(detail=False, methods=["post"])
+    def list_filtered(self, request, *args, **kwargs):
+        if not isinstance(request.data, dict):
+            return HttpResponseBadRequest(json.dumps({"detail": "Filters must be posted as a json object."}), content_type="application/json")
+        filterset_class = getattr(self, "filterset_class", None)
+        filters = filterset_class.base_filters if filterset_class is not None else {}
+        query_params = request.query_params.copy()
+        for key, value in request.data.items():
+            if isinstance(value, (list, tuple)):
+                filter = filters.get(key, None)
+                separator = " " if filter is not None and filter.method in self.BATCH_FILTER_METHODS else ","
+                value = separator.join(str(v) for v in value)
+            query_params[key] = str(value)
+        request._request.GET = query_params
+        return self.list(request, *args, **kwargs)
+
+
 class AutomationsMixin:
     # Automation are defined in their workflow step specification.
     # To launch an automation we only require the step id and the parameters from the request are forwarded to the automation.
@@ -77,12 +163,14 @@ class AutomationsMixin:
             automation_class_name = StepSpecification.objects.filter(step_id=step_id, name="AutomationClass").values_list("value", flat=True)[0]
             if automation_class_name is not None:
                 queryset = self.filter_queryset(self.get_queryset())
-                sample_ids = queryset.values_list("sample_id", flat=True)
+                sample_ids = list(queryset.values_list("sample_id", flat=True))
+                from fms_core import automations
                 automation = getattr(automations, automation_class_name)()              # Instantiate
-                result, errors, warnings = automation.execute(sample_ids=sample_ids, additional_data=additional_data)    # Execute
+                # Samples are loaded once, for the automation and the workflow
+                samples = automation.load_samples(sample_ids)
+                result, errors, warnings = automation.execute(samples=samples, additional_data=additional_data)    # Execute
                 # if no errors move to next worflow step
                 if len(errors) == 0:
-                    samples = Sample.objects.filter(id__in=sample_ids).all()
                     try:
                         step = Step.objects.get(id=step_id)
                     except Step.DoesNotExist:
@@ -114,7 +202,7 @@ class TemplateActionDefinition(TypedDict):
     name: str
     description: str
     template: list[TemplateIdentity]
-    importer: type[GenericImporter]
+    importer: LazyImporter # Resolves to a type[GenericImporter]
 
 class TemplateActionsMixin:
     # When this mixin is used, this list will be overridden to provide a list
@@ -218,6 +306,8 @@ class TemplateActionsMixin:
         Submits a template action. Should be done only after an initial check,
         since this endpoint does not return any helpful error messages. Will
         save any submitted data to the database unless an error occurs.
+        With async set to true, the template is imported in the background and
+        the queued import job is returned.
         """
 
         error, action_data = self._get_action(request)
@@ -226,6 +316,13 @@ class TemplateActionsMixin:
 
         action_def, file = action_data
 
+        # Long imports can be submitted to run in the background. The job status is then polled on the import-jobs endpoint.
+        if request.POST.get("async", "").lower() in ["true", "1"]:
+            import_job, errors, _ = queue_import_job(action_def["importer"].importer_class, file, request.user)
+            if errors:
+                return HttpResponseBadRequest(json.dumps({"detail": errors}), content_type="application/json")
+            return Response(ImportJobSerializer(import_job).data, status=202)
+
         importer_instance = action_def["importer"]()
 
         try:
@@ -292,6 +389,7 @@ class TemplatePrefillsMixin:
         try:
             filename = "/".join(template["identity"]["file"].split("/")[-2:]) # Remove the /static/ from the served path to search for local path
             template_path = os.path.join(settings.STATIC_ROOT, filename)
+            from fms_core.template_prefiller.prefiller import PrefillTemplate
             prefilled_template = PrefillTemplate(template_path, template, queryset)
         except Exception as err:
             return HttpResponseBadRequest(json.dumps({"detail": str(err)}), content_type="application/json")
@@ -333,6 +431,7 @@ class TemplatePrefillsWithDictMixin(TemplatePrefillsMixin):
             return HttpResponseBadRequest(json.dumps({"detail": f"No prefilling available for current template."}), content_type="application/json")
         else:
             try:
+                from fms_core.template_prefiller.prefiller import PrefillTemplateFromDict
                 rows_dicts = self._prepare_prefill_dicts(template, queryset, user_prefill_data, placement_data)
                 prefilled_template = PrefillTemplateFromDict(template, rows_dicts)
             except ValidationError as err:
@@ -353,15 +452,9 @@ class TemplatePrefillsLabWorkMixin(TemplatePrefillsWithDictMixin):
     @classmethod
     def _prepare_prefill_dicts(cls, template, queryset, user_prefill_data, placement_data) -> List:
 
-        def default_prefilling(sample: Sample, template, user_prefill_data):
-            sample_row_dict = {}
-            # Use sample to extract the sample information guided by the template definition prefill info.
-            for _, column_name, _, attribute, func in template["prefill info"]:
-                if func:
-                    value = func(getattr(sample, attribute))
-                else:
-                    value = getattr(sample, attribute)
-                sample_row_dict[column_name] = value
+        def default_prefilling(sample_values: Dict[str, Any], template, user_prefill_data):
+            # Use sample attribute values to extract the sample information guided by the template definition prefill info.
+            sample_row_dict = prefill_row_from_values(sample_values, template["prefill info"])
             # Insert user inputted info to prefill template
             if user_prefill_data:
                 for column_name, value in user_prefill_data.items():
@@ -422,16 +515,21 @@ class TemplatePrefillsLabWorkMixin(TemplatePrefillsWithDictMixin):
         else:
             step_dict = {}
             batch_container_dict = {}
-            for sample_id, step_id in queryset.values_list("sample", "step").distinct():
+            sample_step_ids = list(queryset.values_list("sample", "step").distinct())
+            # Resolve the prefilled attributes of all the samples and load the steps at once
+            prefill_attributes = [prefill[3] for prefill in template["prefill info"]] + ["container_name", "container_barcode"]
+            values_by_sample = resolve_sample_attributes({sample_id for sample_id, _ in sample_step_ids}, prefill_attributes)
+            steps_by_id = Step.objects.prefetch_related("step_specifications").in_bulk({step_id for _, step_id in sample_step_ids})
+            for sample_id, step_id in sample_step_ids:
                 new_step = False
                 new_batch_container = False
-                sample = Sample.objects.get(id=sample_id)
+                sample_values = values_by_sample[sample_id]
                 # without placement there is only 1 destination for each sample
                 if placement_data is None or placement_data.get(str(sample_id)) is None:
-                    sample_row_dict = default_prefilling(sample, template, user_prefill_data)
+                    sample_row_dict = default_prefilling(sample_values, template, user_prefill_data)
                     batch_row_dict = {}
                     # Use step to extract specifications and attach it to the correct sheet and column
-                    step = Step.objects.get(id=step_id)
+                    step = steps_by_id[step_id]
                     for spec in step.step_specifications.all():
                         if spec.sheet_name == dict_batch_sheet.get(False, spec.sheet_name): # Sheet defaults to sample sheet
                             sample_row_dict[spec.column_name] = spec.value
@@ -448,15 +546,13 @@ class TemplatePrefillsLabWorkMixin(TemplatePrefillsWithDictMixin):
                     # Extra prefilling step for Axiom experiment - get experiment container barcode from comment
                     if step.name == AXIOM_EXPERIMENT_STEP:
                         # Replace stitch fields by source container name
-                        sample_row_dict[dict_stitch[dict_batch_sheet.get(False, None)]] = sample.container_name
-                        if not batch_container_dict.get(sample.container_name, None):
-                            batch_row_dict[dict_stitch[dict_batch_sheet.get(True, None)]] = sample.container_name
+                        sample_row_dict[dict_stitch[dict_batch_sheet.get(False, None)]] = sample_values["container_name"]
+                        if not batch_container_dict.get(sample_values["container_name"], None):
+                            batch_row_dict[dict_stitch[dict_batch_sheet.get(True, None)]] = sample_values["container_name"]
                             batch_prefill_info = [prefill for prefill in template["prefill info"] if prefill[0] == dict_batch_sheet.get(True, None)] # prefill[0] is the template sheet name
                             # Get batch field value
-                            for _, column_name, _, attribute, func in batch_prefill_info:
-                                value = getattr(sample, attribute)
-                                batch_row_dict[column_name] = func(value) if func else value
-                            batch_container_dict[sample.container_barcode] = sample.container_barcode # share the dict
+                            batch_row_dict.update(prefill_row_from_values(sample_values, batch_prefill_info))
+                            batch_container_dict[sample_values["container_barcode"]] = sample_values["container_barcode"] # share the dict
                     # Append current rows to the dict for the sample sheet
                     dict_sheets_rows_dicts[dict_batch_sheet[False]].append(sample_row_dict)
                     # Append current rows to the dict for the extra sheets
@@ -470,9 +566,9 @@ class TemplatePrefillsLabWorkMixin(TemplatePrefillsWithDictMixin):
                     sample_id = str(sample_id)
                     for placement in placement_data[sample_id]:
                         # for each placement collect basic prefilling
-                        sample_row_dict = default_prefilling(sample, template, user_prefill_data)
+                        sample_row_dict = default_prefilling(sample_values, template, user_prefill_data)
                         batch_row_dict = {}
-                        step = Step.objects.get(id=step_id)
+                        step = steps_by_id[step_id]
                         for sheet_name, column_name, identifier in template["placement info"]:
                             if sheet_name == dict_batch_sheet.get(False, sheet_name): # Sheet defaults to sample sheet
                                 sample_row_dict[column_name] = placement[identifier]
@@ -503,18 +599,13 @@ class TemplatePrefillsLabWorkMixin(TemplatePrefillsWithDictMixin):
                         # Extra prefilling step for Axiom experiment - get experiment container barcode from comment
                         if step.name == AXIOM_EXPERIMENT_STEP:
                             # Replace stitch fields by source container name
-                            sample_row_dict[dict_stitch[dict_batch_sheet.get(False, None)]] = sample.container_name
-                            if not batch_container_dict.get(sample.container_name, None):
-                                batch_row_dict[dict_stitch[dict_batch_sheet.get(True, None)]] = sample.container_name
+                            sample_row_dict[dict_stitch[dict_batch_sheet.get(False, None)]] = sample_values["container_name"]
+                            if not batch_container_dict.get(sample_values["container_name"], None):
+                                batch_row_dict[dict_stitch[dict_batch_sheet.get(True, None)]] = sample_values["container_name"]
                                 batch_prefill_info = [prefill for prefill in template["prefill info"] if prefill[0] == dict_batch_sheet.get(True, None)] # prefill[0] is the template sheet name
                                 # Get batch field value
-                                for _, column_name, _, attribute, func in batch_prefill_info:
-                                    if func:
-                                        value = func(getattr(sample, attribute))
-                                    else:
-                                        value = getattr(sample, attribute)
-                                    batch_row_dict[column_name] = value
-                                batch_container_dict[sample.container_barcode] = sample.container_barcode # share the dict
+                                batch_row_dict.update(prefill_row_from_values(sample_values, batch_prefill_info))
+                                batch_container_dict[sample_values["container_barcode"]] = sample_values["container_barcode"] # share the dict
 
                         # Append current rows to the dict for the sample sheet
                         dict_sheets_rows_dicts[dict_batch_sheet[False]].append(sample_row_dict)
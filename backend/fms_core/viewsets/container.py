@@ -3,17 +3,20 @@ from django.core.exceptions import ValidationError
 from django.db.models import Count, Q, Prefetch, F, When, Case, Value, CharField
 from fms_core.utils import remove_empty_str_from_dict
 from fms_core.services.container import create_container
+from fms_core.services.placement import get_free_coordinates, plan_placement
+from django.http import HttpResponseBadRequest
 
 from rest_framework import viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
 from fms_core.containers import PARENT_CONTAINER_KINDS, SAMPLE_CONTAINER_KINDS
+from fms_core.coordinates import ROW, COLUMN
 from fms_core.models import Container, Sample, Coordinate
 from fms_core.filters import ContainerFilter
 from ._constants import _container_filterset_fields
 
-from fms_core.template_importer.importers import ContainerCreationImporter, ContainerRenameImporter, ContainerMoveImporter
+from fms_core.template_importer.registry import LazyImporter
 
 from fms_core.serializers import (
     ContainerSerializer,
@@ -26,11 +29,14 @@ from fms_core.templates import (
     CONTAINER_RENAME_TEMPLATE,
 )
 
-from ._utils import TemplateActionsMixin, TemplatePrefillsMixin, versions_detail, _list_keys
+from ._utils import TemplateActionsMixin, TemplatePrefillsMixin, versions_detail, _list_keys, ReplicaReadMixin, PostedFiltersMixin
+from ._fetch_data import FetchContainerData
 
-class ContainerViewSet(viewsets.ModelViewSet, TemplateActionsMixin, TemplatePrefillsMixin):
-    queryset = Container.objects.select_related("location").prefetch_related("children",
-                          Prefetch('samples', queryset=Sample.objects.order_by('coordinate__column'))).all().distinct()
+import json
+
+class ContainerViewSet(ReplicaReadMixin, viewsets.ModelViewSet, PostedFiltersMixin, TemplateActionsMixin, TemplatePrefillsMixin, FetchContainerData):
+    replica_read_post_actions = ["list_filtered", "placement"]
+    queryset = Container.objects.all().distinct()
 
     serializer_class = ContainerSerializer
     filterset_class = ContainerFilter
@@ -47,19 +53,19 @@ class ContainerViewSet(viewsets.ModelViewSet, TemplateActionsMixin, TemplatePref
             "name": "Add Containers",
             "description": "Upload the provided template with up to 100 new containers.",
             "template": [CONTAINER_CREATION_TEMPLATE["identity"]],
-            "importer": ContainerCreationImporter,
+            "importer": LazyImporter("ContainerCreationImporter"),
         },
         {
             "name": "Move Containers",
             "description": "Upload the provided template with up to 100 containers to move.",
             "template": [CONTAINER_MOVE_TEMPLATE["identity"]],
-            "importer": ContainerMoveImporter,
+            "importer": LazyImporter("ContainerMoveImporter"),
         },
         {
             "name": "Rename Containers",
             "description": "Upload the provided template with up to 384 containers to rename.",
             "template": [CONTAINER_RENAME_TEMPLATE["identity"]],
-            "importer": ContainerRenameImporter,
+            "importer": LazyImporter("ContainerRenameImporter"),
         },
     ]
 
@@ -184,10 +190,21 @@ class ContainerViewSet(viewsets.ModelViewSet, TemplateActionsMixin, TemplatePref
         serializer = self.get_serializer(page, many=True)
         return self.get_paginated_response(serializer.data)
 
+    def retrieve(self, _request, pk=None, *args, **kwargs):
+        self.queryset = self.filter_queryset(self.get_queryset())
+        serialized_data, _ = self.fetch_data([pk] if pk is not None else [])
+        return Response(serialized_data[0] if serialized_data else {})
+
+    def list(self, _request, *args, **kwargs):
+        self.queryset = self.filter_queryset(self.get_queryset())
+        serialized_data, count = self.fetch_data()
+        return Response(self.fetch_list_response_data(serialized_data, count))
+
     @action(detail=False, methods=["get"])
     def list_export(self, _request):
-        serializer = ContainerExportSerializer(self.filter_queryset(self.get_queryset()), many=True)
-        return Response(serializer.data)
+        self.queryset = self.filter_queryset(self.get_queryset())
+        serialized_data = self.fetch_export_data()
+        return Response(serialized_data)
 
     @action(detail=True, methods=["get"])
     def list_children(self, _request, pk=None):
@@ -215,6 +232,58 @@ class ContainerViewSet(viewsets.ModelViewSet, TemplateActionsMixin, TemplatePref
         serializer = self.get_serializer(containers, many=True)
         return Response(serializer.data)
 
+    @action(detail=False, methods=["post"])
+    def placement(self, request):
+        """
+        Lists the free coordinates of destination containers or, when a sample count is given, plans the placement of
+        that number of samples into the containers (filled in the given order).
+
+        request contains a body with a json object structure as follows:
+            {"container_ids": [1020, 1021],
+             "sample_count": 120,                      # Optional : omit to get the free coordinates
+             "occupied_coordinates": {"1020": ["A01"]}, # Optional : coordinates already planned for other samples
+             "axis": "column"}                         # Optional : "row" (A01, A02, ...) or "column" (A01, B01, ...), defaults to "row"
+
+        Returns:
+          The free coordinates by container id, or the placements as a list of container id, container barcode and coordinates.
+        """
+        def bad_request(detail):
+            return HttpResponseBadRequest(json.dumps({"detail": detail}), content_type="application/json")
+
+        data = request.data if isinstance(request.data, dict) else {}
+        axis = data.get("axis", ROW)
+        if axis not in [ROW, COLUMN]:
+            return bad_request(f"Axis must be {ROW} or {COLUMN}.")
+        try:
+            container_ids = [int(container_id) for container_id in data.get("container_ids", [])]
+            sample_count = int(data["sample_count"]) if data.get("sample_count", None) is not None else None
+            occupied_coordinates_by_container_id = {int(container_id): list(coordinates)
+                                                    for container_id, coordinates in (data.get("occupied_coordinates", None) or {}).items()}
+        except (TypeError, ValueError, AttributeError):
+            return bad_request("Invalid placement parameters.")
+        if not container_ids:
+            return bad_request("At least one container id is required.")
+
+        containers_by_id = Container.objects.in_bulk(container_ids)
+        missing_ids = [container_id for container_id in container_ids if container_id not in containers_by_id]
+        if missing_ids:
+            return bad_request(f"Containers not found : {missing_ids}.")
+        containers = [containers_by_id[container_id] for container_id in dict.fromkeys(container_ids)]
+
+        if sample_count is None:
+            free_coordinates_by_container_id, errors, warnings = get_free_coordinates(containers, occupied_coordinates_by_container_id, axis)
+            if errors:
+                return bad_request(errors)
+            return Response({"free_coordinates": free_coordinates_by_container_id, "warnings": warnings})
+
+        placements, errors, warnings = plan_placement(containers, sample_count, occupied_coordinates_by_container_id, axis)
+        if errors:
+            return bad_request(errors)
+        return Response({"placements": [{"container_id": placement["container"].id,
+                                         "container_barcode": placement["container"].barcode,
+                                         "coordinates": placement["coordinates"]} for placement in placements],
+                         "warnings": warnings})
+
     # noinspection PyUnusedLocal
     @action(detail=True, methods=["get"])
     def versions(self, request, pk=None):
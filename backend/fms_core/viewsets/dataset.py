@@ -1,7 +1,6 @@
 from django.utils import timezone
 from django.http import HttpResponseBadRequest, HttpResponseServerError
 from django.db import transaction
-from django.db.models import Q, Max, Count
 
 from rest_framework import viewsets
 from rest_framework.response import Response
@@ -19,15 +18,7 @@ from ._constants import _dataset_filterset_fields
 
 
 class DatasetViewSet(viewsets.ModelViewSet):
-    queryset = Dataset.objects.all()
-    queryset = queryset.annotate(
-        latest_release_update=Max("readsets__release_status_timestamp"),
-        latest_validation_update=Max("readsets__validation_status_timestamp")
-    )
-    queryset = queryset.annotate(
-        released_status_count=Count("readsets", filter=Q(readsets__release_status=ReleaseStatus.RELEASED), distinct=True),
-        blocked_status_count=Count("readsets", filter=Q(readsets__release_status=ReleaseStatus.BLOCKED), distinct=True)
-    )
+    queryset = Dataset.objects.select_related("project", "experiment_run").all()
 
     serializer_class = DatasetSerializer
 
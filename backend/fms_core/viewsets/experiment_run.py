@@ -17,12 +17,13 @@ from fms_core.services.experiment_run import (start_experiment_run_processing,
                                               LAUNCH_MODES)
 from fms_core.services.dataset import  set_experiment_run_lane_validation_status, get_experiment_run_lane_validation_status
 
-from ._utils import TemplateActionsMixin, _list_keys
+from ._utils import TemplateActionsMixin, _list_keys, ReplicaReadMixin
+from ._fetch_data import FetchExperimentRunData
 from ._constants import _experiment_run_filterset_fields
 from fms_core.permissions import LaunchExperimentRun, RelaunchExperimentRun
 
 
-class ExperimentRunViewSet(viewsets.ModelViewSet, TemplateActionsMixin):
+class ExperimentRunViewSet(ReplicaReadMixin, viewsets.ModelViewSet, TemplateActionsMixin, FetchExperimentRunData):
     queryset = ExperimentRun.objects.select_related("run_type", "container", "instrument").distinct()
     serializer_class = ExperimentRunSerializer
     serializer_export_class = ExperimentRunExportSerializer
@@ -62,10 +63,21 @@ class ExperimentRunViewSet(viewsets.ModelViewSet, TemplateActionsMixin):
             context['labels'] = {i: i.replace('_', ' ').capitalize() for i in fields}
         return context
 
+    def retrieve(self, _request, pk=None, *args, **kwargs):
+        self.queryset = self.filter_queryset(self.get_queryset())
+        serialized_data, _ = self.fetch_data([pk] if pk is not None else [])
+        return Response(serialized_data[0] if serialized_data else {})
+
+    def list(self, _request, *args, **kwargs):
+        self.queryset = self.filter_queryset(self.get_queryset())
+        serialized_data, count = self.fetch_data()
+        return Response(self.fetch_list_response_data(serialized_data, count))
+
     @action(detail=False, methods=["get"])
     def list_export(self, _request):
-        serializer = self.serializer_export_class(self.filter_queryset(self.get_queryset()), many=True)
-        return Response(serializer.data)
+        self.queryset = self.filter_queryset(self.get_queryset())
+        serialized_data = self.fetch_export_data()
+        return Response(serialized_data)
 
     @action(detail=True, methods=["post"])
     def set_experiment_run_end_time(self, _request, pk=None):
@@ -0,0 +1,56 @@
+import json
+
+from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from django.http import HttpResponseBadRequest, HttpResponse
+
+from fms_core.models import ImportJob
+from fms_core.serializers import ImportJobSerializer
+
+from ._constants import _import_job_filterset_fields
+
+
+class ImportJobViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Template submissions imported in the background (template_submit with async set to true). Clients poll the job to
+    follow its progress. Once completed, the result has the same content as the result of a synchronous import.
+    """
+    queryset = ImportJob.objects.all()
+    serializer_class = ImportJobSerializer
+    permission_classes = [IsAuthenticated]
+    ordering = ["-id"]
+
+    filterset_fields = {
+        **_import_job_filterset_fields,
+    }
+
+    def get_queryset(self):
+        # Users only follow their own submissions
+        queryset = super().get_queryset()
+        if not self.request.user.is_superuser:
+            queryset = queryset.filter(created_by=self.request.user)
+        return queryset
+
+    @action(detail=True, methods=["get"])
+    def output_file(self, _request, pk) -> Response:
+        """
+        Returns the output file produced by the import job identified by the provided ID.
+
+        Returns:
+            Zip file attached to the response.
+        """
+        import_job = self.get_object()
+        if not import_job.output_file_path:
+            return HttpResponseBadRequest(json.dumps({"detail": f"Import job {import_job.id} has no output file."}), content_type="application/json")
+
+        try:
+            with open(import_job.output_file_path, "rb") as file:
+                response = HttpResponse(file.read(), content_type="application/zip")
+                response["Content-Disposition"] = f"attachment; filename={import_job.result['output_file']['name']}"
+        except Exception:
+            return HttpResponseBadRequest(json.dumps({"detail": "Failure to attach the output file to the response."}), content_type="application/json")
+
+        return response
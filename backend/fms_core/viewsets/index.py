@@ -8,11 +8,11 @@ from rest_framework.response import Response
 from fms_core.services.index import validate_indices
 from fms_core.models import Index, IndexSet, InstrumentType
 from fms_core.serializers import IndexSerializer, IndexExportSerializer, IndexSetSerializer
-from fms_core.template_importer.importers import IndexCreationImporter
+from fms_core.template_importer.registry import LazyImporter
 from fms_core.templates import INDEX_CREATION_TEMPLATE
 from fms_core.utils import serialize_warnings
 
-from ._utils import TemplateActionsMixin, _list_keys
+from ._utils import TemplateActionsMixin, _list_keys, ReplicaReadMixin
 from ..utils import blank_str_to_none
 from ._constants import _index_filterset_fields
 
@@ -21,7 +21,7 @@ from fms_core.filters import IndexFilter
 from collections import defaultdict
 
 
-class IndexViewSet(viewsets.ModelViewSet, TemplateActionsMixin):
+class IndexViewSet(ReplicaReadMixin, viewsets.ModelViewSet, TemplateActionsMixin):
     queryset = Index.objects.all().distinct()
     serializer_class = IndexSerializer
     filterset_class = IndexFilter
@@ -37,7 +37,7 @@ class IndexViewSet(viewsets.ModelViewSet, TemplateActionsMixin):
             "name": "Add indices",
             "description": "Upload the provided template with a list of indices grouped by set.",
             "template": [INDEX_CREATION_TEMPLATE["identity"]],
-            "importer": IndexCreationImporter,
+            "importer": LazyImporter("IndexCreationImporter"),
         }
     ]
 
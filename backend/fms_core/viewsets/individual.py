@@ -12,11 +12,11 @@ from fms_core.models import Individual
 from fms_core.serializers import IndividualSerializer, IndividualExportSerializer
 from fms_core.filters import IndividualFilter
 
-from ._utils import TemplateActionsMixin, versions_detail, _list_keys
+from ._utils import TemplateActionsMixin, versions_detail, _list_keys, ReplicaReadMixin, PostedFiltersMixin
 from ._constants import _individual_filterset_fields
 
 
-class IndividualViewSet(viewsets.ModelViewSet):
+class IndividualViewSet(ReplicaReadMixin, viewsets.ModelViewSet, PostedFiltersMixin):
     queryset = Individual.objects.select_related("taxon").all()
     serializer_class = IndividualSerializer
     ordering_fields = (
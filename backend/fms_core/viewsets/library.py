@@ -1,10 +1,10 @@
 from rest_framework import viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.db.models import Q, When, Count, Case, BooleanField, F, OuterRef, Subquery
+from django.db.models import Q, When, Count, Case, BooleanField, F
 
 from fms_core.filters import LibraryFilter
-from fms_core.models import Sample, DerivedBySample
+from fms_core.models import Sample
 from fms_core.serializers import LibraryExportSerializer
 
 from fms_core.templates import ( EXPERIMENT_MGI_TEMPLATE,
@@ -15,21 +15,15 @@ from fms_core.templates import ( EXPERIMENT_MGI_TEMPLATE,
                                  NORMALIZATION_PLANNING_TEMPLATE,
                                  NORMALIZATION_TEMPLATE,
                                  SAMPLE_POOLING_TEMPLATE )
-from fms_core.template_importer.importers import ( ExperimentRunImporter,
-                                                   LibraryCaptureImporter,
-                                                   LibraryConversionImporter,
-                                                   LibraryQCImporter,
-                                                   NormalizationPlanningImporter,
-                                                   NormalizationImporter,
-                                                   SamplePoolingImporter )
-
-from ._utils import TemplateActionsMixin, TemplatePrefillsMixin, _list_keys
+from fms_core.template_importer.registry import LazyImporter
+
+from ._utils import TemplateActionsMixin, TemplatePrefillsMixin, _list_keys, ReplicaReadMixin, PostedFiltersMixin
 from ._fetch_data import FetchLibraryData
 from ._constants import _library_filterset_fields
 
 from datetime import datetime
 
-class LibraryViewSet(viewsets.ModelViewSet, TemplateActionsMixin, TemplatePrefillsMixin, FetchLibraryData):
+class LibraryViewSet(ReplicaReadMixin, viewsets.ModelViewSet, PostedFiltersMixin, TemplateActionsMixin, TemplatePrefillsMixin, FetchLibraryData):
     queryset = Sample.objects.none() # Should not be called directly
 
     ordering_fields = (
@@ -51,43 +45,43 @@ class LibraryViewSet(viewsets.ModelViewSet, TemplateActionsMixin, TemplatePrefil
             "name": "Add Experiments",
             "description": "Upload the provided template with experiment run information.",
             "template": [EXPERIMENT_ILLUMINA_TEMPLATE['identity'], EXPERIMENT_MGI_TEMPLATE['identity']],
-            "importer": ExperimentRunImporter,
+            "importer": LazyImporter("ExperimentRunImporter"),
         },
         {
             "name": "Capture Libraries",
             "description": "Upload the provided template with libraries or pooled libraries to capture.",
             "template": [LIBRARY_CAPTURE_TEMPLATE["identity"]],
-            "importer": LibraryCaptureImporter,
+            "importer": LazyImporter("LibraryCaptureImporter"),
         },
         {
             "name": "Convert Libraries",
             "description": "Upload the provided template with libraries to convert.",
             "template": [LIBRARY_CONVERSION_TEMPLATE["identity"]],
-            "importer": LibraryConversionImporter,
+            "importer": LazyImporter("LibraryConversionImporter"),
         },
         {
             "name": "Library Quality Control",
             "description": "Upload the provided template with libraries that underwent a quality control.",
             "template": [LIBRARY_QC_TEMPLATE["identity"]],
-            "importer": LibraryQCImporter,
+            "importer": LazyImporter("LibraryQCImporter"),
         },
         {
             "name": "Normalize Libraries",
             "description": "Upload the provided template with information to normalize libraries.",
             "template": [NORMALIZATION_TEMPLATE["identity"]],
-            "importer": NormalizationImporter,
+            "importer": LazyImporter("NormalizationImporter"),
         },
         {
             "name": "Perform Normalization Planning",
             "description": "Upload the provided template with normalization information to populate normalization template and the robot file.",
             "template": [NORMALIZATION_PLANNING_TEMPLATE["identity"]],
-            "importer": NormalizationPlanningImporter,
+            "importer": LazyImporter("NormalizationPlanningImporter"),
         },
         {
             "name": "Pool Libraries",
             "description": "Upload the provided template with information to pool libraries.",
             "template": [SAMPLE_POOLING_TEMPLATE["identity"]],
-            "importer": SamplePoolingImporter,
+            "importer": LazyImporter("SamplePoolingImporter"),
         },
     ]
 
@@ -104,7 +98,7 @@ class LibraryViewSet(viewsets.ModelViewSet, TemplateActionsMixin, TemplatePrefil
 
     def get_queryset(self):
         self.queryset = Sample.objects.select_related("container").all().distinct()
-        self.queryset = self.queryset.filter(derived_samples__library__isnull=False)
+        self.queryset = self.queryset.filter(has_library=True)
         self.queryset = self.queryset.annotate(
             qc_flag=Case(
                 When(Q(quality_flag=False) | Q(quantity_flag=False)| Q(identity_flag=False), then=False),
@@ -116,13 +110,6 @@ class LibraryViewSet(viewsets.ModelViewSet, TemplateActionsMixin, TemplatePrefil
         self.queryset = self.queryset.annotate(
             quantity_ng=F('concentration')*F('volume')
         )
-        self.queryset = self.queryset.annotate(
-            first_volume_ratio=Subquery(
-                DerivedBySample.objects
-                .filter(sample=OuterRef("pk"))
-                .values_list("volume_ratio", flat=True)[:1]
-            )
-        )
         return self.queryset
 
     def retrieve(self, _request, pk=None, *args, **kwargs):
@@ -133,7 +120,7 @@ class LibraryViewSet(viewsets.ModelViewSet, TemplateActionsMixin, TemplatePrefil
     def list(self, _request, *args, **kwargs):
         self.queryset = self.filter_queryset(self.get_queryset())
         serialized_data, count = self.fetch_data()
-        return Response({"results": serialized_data, "count": count})
+        return Response(self.fetch_list_response_data(serialized_data, count))
 
     @action(detail=False, methods=["get"])
     def list_export(self, _request):
@@ -166,6 +153,6 @@ class LibraryViewSet(viewsets.ModelViewSet, TemplateActionsMixin, TemplatePrefil
 
         self.queryset = self.get_queryset().filter(query)
         serialized_data, count = self.fetch_data()
-        return Response({"results": serialized_data, "count": count})
+        return Response(self.fetch_list_response_data(serialized_data, count))
 
 
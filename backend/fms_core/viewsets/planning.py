@@ -0,0 +1,58 @@
+from rest_framework import viewsets
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from django.http import HttpResponseBadRequest
+
+from fms_core.services.normalization import plan_normalization, plan_pooling
+
+import json
+
+class PlanningViewSet(viewsets.GenericViewSet):
+    """
+    Interactive planning of normalizations and poolings, using the same calculations as the planning templates.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def _plan(self, request, plan_function):
+        rows = request.data.get("rows", None) if isinstance(request.data, dict) else None
+        if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+            return HttpResponseBadRequest(json.dumps({"detail": "A list of rows is required."}), content_type="application/json")
+        planned_rows, errors, warnings = plan_function(rows)
+        if errors:
+            return HttpResponseBadRequest(json.dumps({"detail": errors}), content_type="application/json")
+        return Response({"rows": planned_rows, "warnings": warnings})
+
+    @action(detail=False, methods=["post"])
+    def normalization(self, request):
+        """
+        Computes the volumes of a normalization.
+
+        request contains a body with a json object structure as follows:
+            {"rows": [{"sample_id": 140123, "final_volume": 50, "concentration_ngul": 10},
+                      {"sample_id": 404123, "final_volume": 50, "concentration_nm": 4, "manual_diluent_volume": 5},
+                      {"sample_id": 404124, "final_volume": 50, "na_quantity": 200},
+                      ...]
+            }
+
+        Returns:
+          The rows with the sample volume used, the diluent volume, the final volume, the concentration (ng/uL and nM
+          if requested in nM), the status of the calculation and its validity.
+        """
+        return self._plan(request, plan_normalization)
+
+    @action(detail=False, methods=["post"])
+    def pooling(self, request):
+        """
+        Computes the volumes of a pooling.
+
+        request contains a body with a json object structure as follows:
+            {"rows": [{"sample_id": 140123, "na_quantity": 100},
+                      ...]
+            }
+
+        Returns:
+          The rows with the sample volume used, the available quantity and whether it is sufficient.
+        """
+        return self._plan(request, plan_pooling)
@@ -7,14 +7,14 @@ from rest_framework.response import Response
 
 from fms_core.models import ProcessMeasurement
 from fms_core.serializers import ProcessMeasurementSerializer, ProcessMeasurementExportSerializer, ProcessMeasurementWithPropertiesExportSerializer
-from fms_core.template_importer.importers import ExtractionImporter, TransferImporter
+from fms_core.template_importer.registry import LazyImporter
 from fms_core.templates import SAMPLE_EXTRACTION_TEMPLATE, SAMPLE_TRANSFER_TEMPLATE
 
-from ._utils import TemplateActionsMixin, _list_keys
+from ._utils import TemplateActionsMixin, _list_keys, ReplicaReadMixin
 from ._constants import _process_measurement_filterset_fields
 
 
-class ProcessMeasurementViewSet(viewsets.ModelViewSet, TemplateActionsMixin):
+class ProcessMeasurementViewSet(ReplicaReadMixin, viewsets.ModelViewSet, TemplateActionsMixin):
     queryset = ProcessMeasurement.objects.all().select_related("process").prefetch_related("lineage")
     queryset = queryset.annotate(child_sample=F("lineage__child"))
     queryset = queryset.annotate(child_sample_name=F("lineage__child__name"))
@@ -37,13 +37,13 @@ class ProcessMeasurementViewSet(viewsets.ModelViewSet, TemplateActionsMixin):
             "name": "Process Extractions",
             "description": "Upload the provided template with extraction information.",
             "template": [SAMPLE_EXTRACTION_TEMPLATE["identity"]],
-            "importer": ExtractionImporter,
+            "importer": LazyImporter("ExtractionImporter"),
         },
         {
             "name": "Process Transfers",
             "description": "Upload the provided template with samples to be transfered.",
             "template": [SAMPLE_TRANSFER_TEMPLATE["identity"]],
-            "importer": TransferImporter,
+            "importer": LazyImporter("TransferImporter"),
         },
     ]
 
@@ -6,14 +6,14 @@ from django.db.models import F
 
 from fms_core.models import Project
 from fms_core.serializers import ProjectSerializer, ProjectExportSerializer
-from fms_core.template_importer.importers import ProjectStudyLinkSamples
+from fms_core.template_importer.registry import LazyImporter
 from fms_core.templates import PROJECT_STUDY_LINK_SAMPLES_TEMPLATE
 
-from ._utils import TemplateActionsMixin, _list_keys
+from ._utils import TemplateActionsMixin, _list_keys, ReplicaReadMixin
 from ._constants import _project_filterset_fields
 
 
-class ProjectViewSet(viewsets.ModelViewSet, TemplateActionsMixin):
+class ProjectViewSet(ReplicaReadMixin, viewsets.ModelViewSet, TemplateActionsMixin):
     queryset = Project.objects.all().distinct()
     serializer_class = ProjectSerializer
 
@@ -32,7 +32,7 @@ class ProjectViewSet(viewsets.ModelViewSet, TemplateActionsMixin):
             "name": "Link Projects and Studies with Samples",
             "description": "Upload the provided template with links between projects, studies and samples.",
             "template": [PROJECT_STUDY_LINK_SAMPLES_TEMPLATE["identity"]],
-            "importer": ProjectStudyLinkSamples,
+            "importer": LazyImporter("ProjectStudyLinkSamples"),
         }
     ]
 
@@ -3,6 +3,7 @@ from rest_framework.permissions import IsAuthenticated
 
 from fms_core.models import PropertyValue
 from fms_core.serializers import PropertyValueSerializer
+from fms_core.services.property_value import update_typed_property_values
 
 from ._constants import FK_FILTERS, PK_FILTERS, CATEGORICAL_FILTERS
 
@@ -21,4 +22,13 @@ class PropertyValueViewSet(viewsets.ModelViewSet):
         "content_type__model": CATEGORICAL_FILTERS,
     }
     
-    ordering = ["id"]
\ No newline at end of file
+    ordering = ["id"]
+
+    # Keep the typed projection in sync with the property values edited through the API.
+    def perform_create(self, serializer):
+        super().perform_create(serializer)
+        update_typed_property_values([serializer.instance])
+
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        update_typed_property_values([serializer.instance])
@@ -9,11 +9,11 @@ from rest_framework.response import Response
 from fms_core.models import Container, Individual, Sample, Project
 from fms_core.serializers import ContainerSerializer, IndividualSerializer, SampleSerializer, UserSerializer, ProjectSerializer
 
-from ._utils import FZY
+from ._utils import FZY, ReplicaReadMixin
 from .sample import SampleViewSet
 
 # noinspection PyMethodMayBeStatic,PyUnusedLocal
-class QueryViewSet(viewsets.ViewSet):
+class QueryViewSet(ReplicaReadMixin, viewsets.ViewSet):
     basename = "query"
 
     @action(detail=False, methods=["get"])
@@ -9,11 +9,12 @@ from django.db.models import Subquery, OuterRef, Q
 from fms_core.models import Metric, Readset
 from fms_core.serializers import ReadsetSerializer, ReadsetWithMetricsSerializer
 from fms_core.models._constants import ValidationStatus
+from fms_core.services.readset import get_readsets_sample_source
 
-from ._utils import _list_keys
+from ._utils import _list_keys, ReplicaReadMixin, PostedFiltersMixin
 from ._constants import _readset_filterset_fields
 
-class ReadsetViewSet(viewsets.ModelViewSet):
+class ReadsetViewSet(ReplicaReadMixin, viewsets.ModelViewSet, PostedFiltersMixin):
     queryset = Readset.objects.select_related("dataset").select_related("dataset__experiment_run").all().distinct()
     queryset = queryset.annotate(
         number_reads = Subquery(
@@ -40,3 +41,14 @@ class ReadsetViewSet(viewsets.ModelViewSet):
             return ReadsetWithMetricsSerializer
         return ReadsetSerializer
 
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        readsets = page if page is not None else list(queryset)
+        # Trace the sample source of the whole page at once instead of once per readset
+        sample_source_by_readset, _, _ = get_readsets_sample_source([readset.id for readset in readsets])
+        context = {**self.get_serializer_context(), "sample_source_by_readset": sample_source_by_readset}
+        serializer = self.get_serializer(readsets, many=True, context=context)
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
@@ -5,8 +5,9 @@ from rest_framework.permissions import IsAuthenticated
 from django.http import QueryDict, HttpResponse
 
 from ..services.report import list_reports, list_report_information, get_report, get_report_as_excel, TimeWindow
+from ._utils import ReplicaReadMixin
 
-class ReportViewSet(viewsets.ViewSet):
+class ReportViewSet(ReplicaReadMixin, viewsets.ViewSet):
     permission_classes = [IsAuthenticated]
     
     def list(self, request):
@@ -2,7 +2,7 @@ from collections import defaultdict
 from rest_framework import viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.db.models import Q, When, Case, BooleanField, Prefetch, Count, Subquery, OuterRef
+from django.db.models import Q, When, Case, BooleanField, Prefetch
 from django.core.exceptions import ValidationError
 from django.db import transaction
 
@@ -11,27 +11,27 @@ from ..utils import RE_SEPARATOR
 from fms_core.models import Sample, Container, Biosample, DerivedSample, DerivedBySample, SampleMetadata, Coordinate, Project
 from fms_core.serializers import SampleSerializer, SampleExportSerializer
 from fms_core.services.project import add_sample_to_study
+from fms_core.services.sample import update_sample_summary
 
-from fms_core.template_importer.importers import SampleSubmissionImporter, SampleUpdateImporter, TransferImporter, SampleQCImporter, SampleMetadataImporter, SamplePoolingImporter
-from fms_core.template_importer.importers import SampleSelectionQPCRImporter, LibraryPreparationImporter, ExperimentRunImporter, NormalizationImporter, NormalizationPlanningImporter
-from fms_core.template_importer.importers import AxiomPreparationImporter
+from fms_core.template_importer.registry import LazyImporter
 
 from fms_core.templates import SAMPLE_POOLING_TEMPLATE, SAMPLE_SUBMISSION_TEMPLATE, SAMPLE_UPDATE_TEMPLATE, SAMPLE_QC_TEMPLATE, LIBRARY_PREPARATION_TEMPLATE
 from fms_core.templates import PROJECT_STUDY_LINK_SAMPLES_TEMPLATE, SAMPLE_EXTRACTION_TEMPLATE, SAMPLE_TRANSFER_TEMPLATE, SAMPLE_SELECTION_QPCR_TEMPLATE, SAMPLE_METADATA_TEMPLATE, NORMALIZATION_TEMPLATE
 from fms_core.templates import EXPERIMENT_INFINIUM_TEMPLATE, EXPERIMENT_AXIOM_TEMPLATE, NORMALIZATION_PLANNING_TEMPLATE, AXIOM_PREPARATION_TEMPLATE
 
-from ._utils import TemplateActionsMixin, TemplatePrefillsMixin, _list_keys, versions_detail
+from ._utils import TemplateActionsMixin, TemplatePrefillsMixin, _list_keys, versions_detail, ReplicaReadMixin, PostedFiltersMixin
 from ._fetch_data import FetchSampleData
 from ._constants import _sample_filterset_fields
 from fms_core.filters import SampleFilter
 
-class SampleViewSet(viewsets.ModelViewSet, TemplateActionsMixin, TemplatePrefillsMixin, FetchSampleData):
+class SampleViewSet(ReplicaReadMixin, viewsets.ModelViewSet, PostedFiltersMixin, TemplateActionsMixin, TemplatePrefillsMixin, FetchSampleData):
     queryset = Sample.objects.none() # Should not be called directly
     serializer_class = SampleSerializer
 
     ordering_fields = (
         *_list_keys(_sample_filterset_fields),
-        "qc_flag"
+        "qc_flag",
+        "is_pooled",
     )
 
     ordering = ["-id"]
@@ -47,73 +47,73 @@ class SampleViewSet(viewsets.ModelViewSet, TemplateActionsMixin, TemplatePrefill
             "name": "Add Samples",
             "description": "Upload the provided template with up to 384 new samples.",
             "template": [SAMPLE_SUBMISSION_TEMPLATE["identity"]],
-            "importer": SampleSubmissionImporter,
+            "importer": LazyImporter("SampleSubmissionImporter"),
         },
         {
             "name": "Update Samples",
             "description": "Upload the provided template with up to 384 samples to update.",
             "template": [SAMPLE_UPDATE_TEMPLATE["identity"]],
-            "importer": SampleUpdateImporter,
+            "importer": LazyImporter("SampleUpdateImporter"),
         },
         {
             "name": "Transfer Samples",
             "description": "Upload the provided template to transfer samples.",
             "template": [SAMPLE_TRANSFER_TEMPLATE["identity"]],
-            "importer": TransferImporter,
+            "importer": LazyImporter("TransferImporter"),
         },
         {
             "name": "Sample Quality Control",
             "description": "Upload the provided template with samples that underwent a quality control.",
             "template": [SAMPLE_QC_TEMPLATE["identity"]],
-            "importer": SampleQCImporter,
+            "importer": LazyImporter("SampleQCImporter"),
         },
         {
             "name": "Sample Selection Using qPCR",
             "description": "Upload the provided template with samples to perform a sample selection using qPCR.",
             "template": [SAMPLE_SELECTION_QPCR_TEMPLATE["identity"]],
-            "importer": SampleSelectionQPCRImporter,
+            "importer": LazyImporter("SampleSelectionQPCRImporter"),
         },
         {
             "name": "Prepare Libraries",
             "description": "Upload the provided template with information to prepare libraries with the possibility to group them by batch.",
             "template": [LIBRARY_PREPARATION_TEMPLATE["identity"]],
-            "importer": LibraryPreparationImporter,
+            "importer": LazyImporter("LibraryPreparationImporter"),
         },
         {
             "name": "Add Experiments",
             "description": "Upload the provided template with experiment run information.",
             "template": [EXPERIMENT_INFINIUM_TEMPLATE["identity"], EXPERIMENT_AXIOM_TEMPLATE["identity"]],
-            "importer": ExperimentRunImporter,
+            "importer": LazyImporter("ExperimentRunImporter"),
         },
         {
             "name": "Add Metadata to Samples",
             "description": "Upload the provided template with custom metadata to be added to samples.",
             "template": [SAMPLE_METADATA_TEMPLATE["identity"]],
-            "importer": SampleMetadataImporter,
+            "importer": LazyImporter("SampleMetadataImporter"),
         },
         {
             "name": "Perform Normalization Planning",
             "description": "Upload the provided template with normalization information to populate normalization template and the robot file.",
             "template": [NORMALIZATION_PLANNING_TEMPLATE["identity"]],
-            "importer": NormalizationPlanningImporter,
+            "importer": LazyImporter("NormalizationPlanningImporter"),
         },
         {
             "name": "Normalize Samples or Libraries",
             "description": "Upload the provided template with information to normalize samples or libraries.",
             "template": [NORMALIZATION_TEMPLATE["identity"]],
-            "importer": NormalizationImporter,
+            "importer": LazyImporter("NormalizationImporter"),
         },
         {
             "name": "Pool Samples or Libraries",
             "description": "Upload the provided template with information to pool samples or libraries.",
             "template": [SAMPLE_POOLING_TEMPLATE["identity"]],
-            "importer": SamplePoolingImporter,
+            "importer": LazyImporter("SamplePoolingImporter"),
         },
         {
             "name": "Prepare Samples for Axiom Genotyping",
             "description": "Upload the provided template with information to prepare samples Axiom genotyping.",
             "template": [AXIOM_PREPARATION_TEMPLATE["identity"]],
-            "importer": AxiomPreparationImporter,
+            "importer": LazyImporter("AxiomPreparationImporter"),
         },
     ]
 
@@ -148,35 +148,6 @@ class SampleViewSet(viewsets.ModelViewSet, TemplateActionsMixin, TemplatePrefill
                 output_field=BooleanField()
             )
         )
-        self.queryset = self.queryset.annotate(count_derived_samples=Count('derived_samples'))
-        self.queryset = self.queryset.annotate(
-            first_volume_ratio=Subquery(
-                DerivedBySample.objects
-                .filter(sample=OuterRef("pk"))
-                .values_list("volume_ratio", flat=True)[:1]
-            )
-        )
-        self.queryset = self.queryset.annotate(
-            first_project_id=Subquery(
-                DerivedBySample.objects
-                .filter(sample=OuterRef("pk"))
-                .values_list("project_id", flat=True)[:1]
-            )
-        )
-        self.queryset = self.queryset.annotate(
-            is_pooled=Case(
-                When(Q(first_volume_ratio__lt=1) | Q(count_derived_samples__gt=1), then=True),
-                default=False,
-                output_field=BooleanField()
-            )
-        )
-        self.queryset = self.queryset.annotate(
-            first_derived_sample=Subquery(
-                DerivedBySample.objects
-                .filter(sample=OuterRef("pk"))
-                .values_list("derived_sample", flat=True)[:1]
-            )
-        )
         container_barcode = self.request.query_params.get('container__barcode__recursive')
         container_name = self.request.query_params.get('container__name__recursive')
         recursive = container_barcode or container_name
@@ -250,6 +221,8 @@ class SampleViewSet(viewsets.ModelViewSet, TemplateActionsMixin, TemplatePrefill
                                            sample_id=sample.id,
                                            volume_ratio=1)
 
+            update_sample_summary([sample])
+
         except ValidationError as err:
             raise ValidationError(err)
 
@@ -351,7 +324,7 @@ class SampleViewSet(viewsets.ModelViewSet, TemplateActionsMixin, TemplatePrefill
     def list(self, _request, *args, **kwargs):
         self.queryset = self.filter_queryset(self.get_queryset())
         serialized_data, count = self.fetch_data()
-        return Response({"results": serialized_data, "count": count})
+        return Response(self.fetch_list_response_data(serialized_data, count))
 
     @action(detail=False, methods=["get"])
     def list_export(self, _request):
@@ -405,7 +378,7 @@ class SampleViewSet(viewsets.ModelViewSet, TemplateActionsMixin, TemplatePrefill
             self.queryset = self.get_queryset().filter(query)            
 
         serialized_data, count = self.fetch_data()
-        return Response({"results": serialized_data, "count": count})
+        return Response(self.fetch_list_response_data(serialized_data, count))
 
     # noinspection PyUnusedLocal
     @action(detail=True, methods=["get"])
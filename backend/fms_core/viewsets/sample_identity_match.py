@@ -1,13 +1,22 @@
 from fms_core.models import SampleIdentityMatch
 
 from fms_core.serializers import SampleIdentityMatchSerializer
+from fms_core.services.sample_identity import get_identity_concordance
+
+from django.http import HttpResponseBadRequest
 
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from decimal import Decimal, InvalidOperation
+import json
 
-from ._utils import _list_keys
+from ._utils import _list_keys, ReplicaReadMixin
 from ._constants import _sample_identity_match_filterset_fields
 
-class SampleIdentityMatchViewSet(viewsets.ModelViewSet):
+class SampleIdentityMatchViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
+    replica_read_actions = ["list", "retrieve", "concordance"]
     queryset = SampleIdentityMatch.objects.select_related("tested__biosample").select_related("matched__biosample").all().distinct()
     serializer_class = SampleIdentityMatchSerializer
     ordering_fields = (
@@ -17,4 +26,32 @@ class SampleIdentityMatchViewSet(viewsets.ModelViewSet):
     filterset_fields = {
         **_sample_identity_match_filterset_fields
     }
-    ordering = ["id"]
\ No newline at end of file
+    ordering = ["id"]
+
+    @action(detail=False, methods=["get"])
+    def concordance(self, request):
+        """
+        Lists the identity matches of one or more biosamples, from the most to the least concordant.
+        Pass a comma-separated list of biosample ids in a `biosample_id__in` query parameter. Use the
+        optional `min_matching_site_ratio` and `min_compared_sites` query parameters to only keep the
+        matches above these values.
+
+        Returns:
+        An array of matches, each with the biosample id, the matched biosample id, the readset id
+        (for matches against sequencing data), the matching site ratio and the number of compared sites.
+        """
+        try:
+            biosample_ids = [int(biosample_id) for biosample_id in request.GET.get("biosample_id__in", "").split(",") if biosample_id]
+            min_matching_site_ratio = request.GET.get("min_matching_site_ratio", None)
+            min_matching_site_ratio = Decimal(min_matching_site_ratio) if min_matching_site_ratio is not None else None
+            min_compared_sites = request.GET.get("min_compared_sites", None)
+            min_compared_sites = int(min_compared_sites) if min_compared_sites is not None else None
+        except (ValueError, InvalidOperation):
+            return HttpResponseBadRequest(json.dumps({"detail": "Invalid concordance parameters."}), content_type="application/json")
+        if not biosample_ids:
+            return HttpResponseBadRequest(json.dumps({"detail": "At least one biosample id is required."}), content_type="application/json")
+
+        matches, errors, _ = get_identity_concordance(biosample_ids, min_matching_site_ratio, min_compared_sites)
+        if errors:
+            return HttpResponseBadRequest(json.dumps({"detail": errors}), content_type="application/json")
+        return Response(matches)
@@ -1,9 +1,19 @@
-from fms_core.services.sample_lineage import create_sample_lineage_graph
+from fms_core.services.sample_lineage import (create_sample_lineage_graph,
+                                              traverse_sample_lineage,
+                                              LINEAGE_DIRECTION_DESCENDANTS,
+                                              LINEAGE_NODE_FIELDS,
+                                              LINEAGE_EDGE_FIELDS)
+from fms_core.pagination import CURSOR_QUERY_PARAM, encode_cursor, decode_cursor
 from rest_framework import viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
 from django.core.exceptions import ValidationError
 
+LINEAGE_CURSOR_ORDERING = ["depth", "id"]
+LINEAGE_DEFAULT_MAX_DEPTH = 10
+LINEAGE_DEFAULT_NODE_LIMIT = 500
+
 
 class SampleLineageViewSet(viewsets.ViewSet):
     @action(detail=True, methods=["get"])
@@ -33,3 +43,51 @@ class SampleLineageViewSet(viewsets.ViewSet):
                 "nodes": nodes,
                 "edges": edges,
             })
+
+    @action(detail=True, methods=["get"])
+    def traverse(self, request, pk: int) -> Response:
+        """
+        Traverses the sample lineage from a sample toward its ancestors or its descendants, a page of nodes at a time.
+        For more information, visit `fms_core.services.sample_lineage.traverse_sample_lineage`.
+
+        Args:
+            `request`: Query params `direction` (ancestors or descendants), `max_depth`, `limit` (maximum number of nodes)
+                       and `cursor` (next value of the previous page).
+
+            `pk`: ID of an existing sample
+
+        Returns:
+            `Response` object consisting of `"node_fields"`, `"nodes"`, `"edge_fields"`, `"edges"` and `"next"`.
+            Nodes and edges are lists of values ordered as their fields.
+
+        Raises:
+            `ValidationError`: the parameters are invalid or the ID corresponds to a sample that does not exist.
+        """
+        direction = request.query_params.get("direction", LINEAGE_DIRECTION_DESCENDANTS)
+        try:
+            max_depth = int(request.query_params.get("max_depth", LINEAGE_DEFAULT_MAX_DEPTH))
+            node_limit = int(request.query_params.get("limit", LINEAGE_DEFAULT_NODE_LIMIT))
+        except ValueError:
+            raise ValidationError("Maximum depth and limit must be integers.")
+        cursor = request.query_params.get(CURSOR_QUERY_PARAM, None)
+        after = tuple(decode_cursor(cursor, LINEAGE_CURSOR_ORDERING)) if cursor else None
+        # The depth and id of the cursor are used in the traversal query
+        if after is not None and not all(isinstance(value, int) and not isinstance(value, bool) for value in after):
+            raise NotFound("Invalid cursor.")
+
+        nodes, edges, next_after, errors, _ = traverse_sample_lineage(pk,
+                                                                      direction=direction,
+                                                                      max_depth=max_depth,
+                                                                      node_limit=node_limit,
+                                                                      after=after)
+
+        if errors:
+            raise ValidationError(errors)
+        else:
+            return Response({
+                "node_fields": LINEAGE_NODE_FIELDS,
+                "nodes": nodes,
+                "edge_fields": LINEAGE_EDGE_FIELDS,
+                "edges": edges,
+                "next": encode_cursor(LINEAGE_CURSOR_ORDERING, list(next_after)) if next_after is not None else None,
+            })
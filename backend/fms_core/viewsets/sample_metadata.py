@@ -5,6 +5,7 @@ from rest_framework.response import Response
 
 from fms_core.models import SampleMetadata
 from fms_core.serializers import SampleMetadataSerializer
+from fms_core.services.sample import update_biosample_metadata_values
 
 from ._constants import _sample_metadata_filterset_fields
 from ._constants import FK_FILTERS
@@ -30,4 +31,19 @@ class SampleMetadataViewSet(viewsets.ModelViewSet):
         search_input = _request.GET.get("q")
 
         metadata_data = SampleMetadata.objects.filter(name__icontains=search_input).distinct().values('name')
-        return Response(metadata_data)
\ No newline at end of file
+        return Response(metadata_data)
+
+    # Keep the biosample metadata projection in sync with the metadata edited through the API.
+    def perform_create(self, serializer):
+        super().perform_create(serializer)
+        update_biosample_metadata_values([serializer.instance.biosample])
+
+    def perform_update(self, serializer):
+        previous_biosample = serializer.instance.biosample
+        super().perform_update(serializer)
+        update_biosample_metadata_values(list({previous_biosample, serializer.instance.biosample}))
+
+    def perform_destroy(self, instance):
+        biosample = instance.biosample
+        super().perform_destroy(instance)
+        update_biosample_metadata_values([biosample])
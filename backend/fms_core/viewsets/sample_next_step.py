@@ -1,5 +1,5 @@
 import json
-from django.db.models import F, Q, When, Case, BooleanField, CharField, IntegerField, Value
+from django.db.models import F, Q, When, Case, BooleanField, CharField, IntegerField, Value, Count
 from django.http import HttpRequest, HttpResponseBadRequest, QueryDict
 from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated
@@ -7,11 +7,12 @@ from rest_framework.response import Response
 from rest_framework.decorators import action
 
 from fms_core.filters import SampleNextStepFilter
+from fms_core.pagination import keyset_paginate, CURSOR_QUERY_PARAM
 
 from collections import defaultdict
 
 
-from ._utils import TemplateActionsMixin, TemplatePrefillsLabWorkMixin, AutomationsMixin, _list_keys
+from ._utils import TemplateActionsMixin, TemplatePrefillsLabWorkMixin, AutomationsMixin, _list_keys, ReplicaReadMixin
 from ._constants import _sample_next_step_filterset_fields
 from fms_core.models import SampleNextStep, StepSpecification, Protocol, Step, Workflow
 from fms_core.serializers import SampleNextStepSerializer, StepSpecificationSerializer
@@ -20,12 +21,19 @@ from fms_core.templates import (EXPERIMENT_PACBIO_TEMPLATE, SAMPLE_EXTRACTION_TE
                                 SAMPLE_POOLING_TEMPLATE, LIBRARY_CAPTURE_TEMPLATE, LIBRARY_CONVERSION_TEMPLATE, EXPERIMENT_ILLUMINA_TEMPLATE,
                                 EXPERIMENT_MGI_TEMPLATE, EXPERIMENT_INFINIUM_TEMPLATE, AXIOM_PREPARATION_TEMPLATE, EXPERIMENT_ULTIMA_TEMPLATE,
                                 QUALITY_CONTROL_INTEGRATION_SPARK_TEMPLATE, EXPERIMENT_AXIOM_TEMPLATE, SAMPLE_IDENTITY_QC_TEMPLATE)
-from fms_core.template_importer.importers import (ExtractionImporter, SampleQCImporter, NormalizationPlanningImporter, NormalizationImporter,
-                                                  LibraryPreparationImporter, LibraryPreparationWithSelectionImporter, TransferImporter, LibraryQCImporter, SamplePoolingImporter,
-                                                  SamplePoolingPlanningImporter, LibraryCaptureImporter, LibraryConversionImporter,
-                                                  ExperimentRunImporter, AxiomPreparationImporter, QCIntegrationSparkImporter, SampleIdentityQCImporter)
-
-class SampleNextStepViewSet(viewsets.ModelViewSet, TemplateActionsMixin, TemplatePrefillsLabWorkMixin, AutomationsMixin):
+from fms_core.template_importer.registry import LazyImporter
+
+LABWORK_STEP_GROUPING_COLUMNS = ["sample__derived_by_samples__project__name",
+                                  "ordering_container_name",
+                                  "sample__creation_date",
+                                  "sample__created_by__username",
+                                  "qc_flag"]
+LABWORK_GROUP_LOCATORS_LIMIT = 100
+LABWORK_GROUP_LOCATORS_MAX_LIMIT = 1000
+
+class SampleNextStepViewSet(ReplicaReadMixin, viewsets.ModelViewSet, TemplateActionsMixin, TemplatePrefillsLabWorkMixin, AutomationsMixin):
+    replica_read_actions = ["list", "retrieve", "labwork_info"]
+    replica_read_post_actions = ["list_post", "labwork_step_info", "labwork_step_group_locators"]
     queryset = SampleNextStep.objects.all().distinct()
 
     queryset = queryset.annotate(
@@ -84,11 +92,7 @@ class SampleNextStepViewSet(viewsets.ModelViewSet, TemplateActionsMixin, Templat
     )
 
     queryset = queryset.annotate(
-        is_pooled=Case(
-            When(Q(sample__derived_by_samples__volume_ratio__lt=1), then=True),
-            default=False,
-            output_field=BooleanField()
-        )
+        is_pooled=F('sample__is_pooled')
     )
 
     serializer_class = SampleNextStepSerializer
@@ -115,97 +119,97 @@ class SampleNextStepViewSet(viewsets.ModelViewSet, TemplateActionsMixin, Templat
             "name": "Prepare Axiom Samples",
             "description": "Upload the provided template with Axiom preparation information.",
             "template": [AXIOM_PREPARATION_TEMPLATE["identity"]],
-            "importer": AxiomPreparationImporter,
+            "importer": LazyImporter("AxiomPreparationImporter"),
         },
         {
             "name": "DNA or RNA Extractions",
             "description": "Upload the provided template with extraction information.",
             "template": [SAMPLE_EXTRACTION_TEMPLATE["identity"]],
-            "importer": ExtractionImporter,
+            "importer": LazyImporter("ExtractionImporter"),
         },
         {
             "name": "Sample Quality Control",
             "description": "Upload the provided template with samples that underwent a quality control.",
             "template": [SAMPLE_QC_TEMPLATE["identity"]],
-            "importer": SampleQCImporter,
+            "importer": LazyImporter("SampleQCImporter"),
         },
         {
             "name": "Sample Identity Quality Control",
             "description": "Upload the provided template with samples that underwent an identity quality control.",
             "template": [SAMPLE_IDENTITY_QC_TEMPLATE["identity"]],
-            "importer": SampleIdentityQCImporter,
+            "importer": LazyImporter("SampleIdentityQCImporter"),
         },
         {
             "name": "Quality Control - Integration",
             "description": "Upload the result file with samples that underwent a quality control.",
             "template": [QUALITY_CONTROL_INTEGRATION_SPARK_TEMPLATE["identity"]],
-            "importer": QCIntegrationSparkImporter,
+            "importer": LazyImporter("QCIntegrationSparkImporter"),
         },
         {
             "name": "Perform Normalization Planning",
             "description": "Upload the provided template with normalization information to populate normalization template and the robot file.",
             "template": [NORMALIZATION_PLANNING_TEMPLATE["identity"]],
-            "importer": NormalizationPlanningImporter,
+            "importer": LazyImporter("NormalizationPlanningImporter"),
         },
         {
             "name": "Normalize Samples or Libraries",
             "description": "Upload the provided template with information to normalize samples or libraries.",
             "template": [NORMALIZATION_TEMPLATE["identity"]],
-            "importer": NormalizationImporter,
+            "importer": LazyImporter("NormalizationImporter"),
         },
         {
             "name": "Prepare Libraries",
             "description": "Upload the provided template with information to prepare libraries with the possibility to group them by batch.",
             "template": [LIBRARY_PREPARATION_TEMPLATE["identity"]],
-            "importer": LibraryPreparationImporter,
+            "importer": LazyImporter("LibraryPreparationImporter"),
         },
         {
             "name": "Prepare Libraries with Selection",
             "description": "Upload the provided template with information to prepare libraries with the possibility to group them by batch.",
             "template": [LIBRARY_PREPARATION_WITH_SELECTION_TEMPLATE["identity"]],
-            "importer": LibraryPreparationWithSelectionImporter,
+            "importer": LazyImporter("LibraryPreparationWithSelectionImporter"),
         },
         {
             "name": "Transfer",
             "description": "Upload the provided template with libraries to be transfered.",
             "template": [SAMPLE_TRANSFER_TEMPLATE["identity"]],
-            "importer": TransferImporter,
+            "importer": LazyImporter("TransferImporter"),
         },
         {
             "name": "Library Quality Control",
             "description": "Upload the provided template with libraries that underwent a quality control.",
             "template": [LIBRARY_QC_TEMPLATE["identity"]],
-            "importer": LibraryQCImporter,
+            "importer": LazyImporter("LibraryQCImporter"),
         },
         {
             "name": "Perform Pooling Planning",
             "description": "Upload the provided template with pooling information to populate pooling template and the robot file.",
             "template": [SAMPLE_POOLING_PLANNING_TEMPLATE["identity"]],
-            "importer": SamplePoolingPlanningImporter,
+            "importer": LazyImporter("SamplePoolingPlanningImporter"),
         },
         {
             "name": "Pool Samples or Libraries",
             "description": "Upload the provided template with information to pool samples or libraries.",
             "template": [SAMPLE_POOLING_TEMPLATE["identity"]],
-            "importer": SamplePoolingImporter,
+            "importer": LazyImporter("SamplePoolingImporter"),
         },
         {
             "name": "Capture Libraries",
             "description": "Upload the provided template with libraries or pooled libraries to capture.",
             "template": [LIBRARY_CAPTURE_TEMPLATE["identity"]],
-            "importer": LibraryCaptureImporter,
+            "importer": LazyImporter("LibraryCaptureImporter"),
         },
         {
             "name": "Convert Libraries",
             "description": "Upload the provided template with libraries to convert.",
             "template": [LIBRARY_CONVERSION_TEMPLATE["identity"]],
-            "importer": LibraryConversionImporter,
+            "importer": LazyImporter("LibraryConversionImporter"),
         },
         {
             "name": "Add Experiments",
             "description": "Upload the provided template with experiment run information.",
             "template": [EXPERIMENT_ILLUMINA_TEMPLATE['identity'], EXPERIMENT_MGI_TEMPLATE['identity'], EXPERIMENT_INFINIUM_TEMPLATE["identity"], EXPERIMENT_AXIOM_TEMPLATE["identity"], EXPERIMENT_PACBIO_TEMPLATE["identity"], EXPERIMENT_ULTIMA_TEMPLATE["identity"]],
-            "importer": ExperimentRunImporter,
+            "importer": LazyImporter("ExperimentRunImporter"),
         },
     ]
 
@@ -370,6 +374,16 @@ class SampleNextStepViewSet(viewsets.ModelViewSet, TemplateActionsMixin, Templat
 
         return Response({"results": sample_next_step_summary})
 
+    def _get_grouped_step_samples(self, params):
+        step_id = params.get('step__id__in')
+        grouping_column = params.get('group_by')
+
+        if step_id is None or grouping_column is None:
+            return None, "Step ID and a grouping column must be provided."
+        if grouping_column not in LABWORK_STEP_GROUPING_COLUMNS:
+            return None, f"Invalid grouping column {grouping_column}. Valid grouping columns are: {', '.join(LABWORK_STEP_GROUPING_COLUMNS)}."
+        return self.filter_queryset(self.get_queryset()).filter(step__id__exact=step_id), None
+
     @action(detail=False, methods=["post"])
     def labwork_step_info(self, request: HttpRequest, *args, **kwargs):
         """
@@ -383,6 +397,9 @@ class SampleNextStepViewSet(viewsets.ModelViewSet, TemplateActionsMixin, Templat
                                                   - sample__creation_date
                                                   - sample__created_by__username
                                                   - qc_flag
+                       The optional query argument 'with_locators' set to false returns only the names and counts of
+                       the groups, computed by the database. The locators of a group are then fetched page by page
+                       with labwork_step_group_locators.
             `*args`: Arguments to set on the view.
             `**kwargs`: Additional properties to set on the view.
                     
@@ -399,12 +416,12 @@ class SampleNextStepViewSet(viewsets.ModelViewSet, TemplateActionsMixin, Templat
                   {
                     name = grouping_value_1
                     count
-                    sample_locators: []
+                    sample_locators: [] (omitted when with_locators is false)
                   },
                   {
                     name = grouping_value_2
                     count
-                    sample_locators: []
+                    sample_locators: [] (omitted when with_locators is false)
                   },
                   ...
                 ],                
@@ -413,17 +430,27 @@ class SampleNextStepViewSet(viewsets.ModelViewSet, TemplateActionsMixin, Templat
           }
         """
         params = QueryDict(request.META.get('QUERY_STRING'))
+        grouped_step_samples, error = self._get_grouped_step_samples(params)
+        if error:
+            return HttpResponseBadRequest(error)
         step_id = params.get('step__id__in')
         grouping_column = params.get('group_by')
+        with_locators = params.get('with_locators', 'true').lower() != 'false'
 
-        if step_id is None or grouping_column is None:
-            return HttpResponseBadRequest(f"Step ID and a grouping column must be provided.")
         # The objects that is going to be returned
         grouped_step_summary = {"step_id": step_id, "samples": {"grouping_column": grouping_column, "groups": []}}
 
-        grouped_step_samples = self.filter_queryset(self.get_queryset())
+        if not with_locators:
+            # Names and counts only, grouped by the database
+            group_counts = grouped_step_samples.order_by().values(grouping_column) \
+                .annotate(count=Count("sample_id", distinct=True)) \
+                .order_by(grouping_column) \
+                .values_list(grouping_column, "count")
+            grouped_step_summary["samples"]["groups"] = [{"name": grouping, "count": count} for grouping, count in group_counts]
+            return Response({"results": grouped_step_summary})
+
         # Get all samples on the steps with the grouping field
-        grouped_step_samples = grouped_step_samples.filter(step__id__exact=step_id) \
+        grouped_step_samples = grouped_step_samples \
             .annotate(sample_name=F("sample__name")) \
             .annotate(container_name=F("sample__container__name")) \
             .values_list(
@@ -454,3 +481,64 @@ class SampleNextStepViewSet(viewsets.ModelViewSet, TemplateActionsMixin, Templat
             })
 
         return Response({"results": grouped_step_summary})
+
+    @action(detail=False, methods=["post"])
+    def labwork_step_group_locators(self, request: HttpRequest, *args, **kwargs):
+        """
+        API call to retrieve, page by page, the locators of the samples of a group returned by labwork_step_info.
+
+        Args:
+            `request`: The request object received then whe API call was made.
+                       The request must include the query arguments 'step__id__in', 'group_by' (see labwork_step_info)
+                       and 'group' (name of the group, omitted for the group without name).
+                       Optional query arguments : 'limit' (default 100, at most 1000) and 'cursor' (returned with the
+                       previous page).
+            `*args`: Arguments to set on the view.
+            `**kwargs`: Additional properties to set on the view.
+
+        Returns:
+          An object of the form:
+          {
+            results:
+            {
+              name: grouping_value
+              sample_locators: [] (ordered by container barcode and coordinates)
+              next: cursor of the next page (null on the last page)
+            }
+          }
+        """
+        params = QueryDict(request.META.get('QUERY_STRING'))
+        grouped_step_samples, error = self._get_grouped_step_samples(params)
+        if error:
+            return HttpResponseBadRequest(error)
+        grouping_column = params.get('group_by')
+        group = params.get('group', None)
+        try:
+            limit = min(int(params.get('limit', LABWORK_GROUP_LOCATORS_LIMIT)), LABWORK_GROUP_LOCATORS_MAX_LIMIT)
+        except ValueError:
+            return HttpResponseBadRequest("The limit must be a number.")
+        if limit < 1:
+            return HttpResponseBadRequest("The limit must be greater than 0.")
+
+        if group is None:
+            group_samples = grouped_step_samples.filter(**{f"{grouping_column}__isnull": True})
+        elif grouping_column == "qc_flag":
+            group_samples = grouped_step_samples.filter(qc_flag=group.lower() == "true")
+        else:
+            group_samples = grouped_step_samples.filter(**{grouping_column: group})
+
+        group_samples = group_samples \
+            .annotate(sample_name=F("sample__name")) \
+            .annotate(container_name=F("sample__container__name")) \
+            .order_by("ordering_container_barcode", "ordering_container_coordinates") \
+            .values("id", "sample_id", "sample_name", "container_name", "ordering_container_barcode", "ordering_container_coordinates")
+        rows, next_cursor = keyset_paginate(group_samples, params.get(CURSOR_QUERY_PARAM, None), limit)
+
+        sample_locators = [{
+            "sample_id": row["sample_id"],
+            "sample_name": row["sample_name"],
+            "container_name": row["container_name"],
+            "contextual_container_barcode": row["ordering_container_barcode"],
+            "contextual_coordinates": row["ordering_container_coordinates"]
+        } for row in rows]
+        return Response({"results": {"name": group, "sample_locators": sample_locators, "next": next_cursor}})
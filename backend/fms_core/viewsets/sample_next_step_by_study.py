@@ -5,7 +5,7 @@ from rest_framework.decorators import action
 from django.db import transaction, IntegrityError
 from django.core.exceptions import ValidationError
 from django.http import HttpResponseBadRequest, QueryDict
-from django.db.models import Count, F, Case, When, Q, BooleanField
+from django.db.models import F, Case, When, Q, BooleanField
 from fms_core.models.step_order import StepOrder
 from fms_core.filters import SampleNextStepByStudyFilter
 from fms_core.models.workflow import Workflow
@@ -15,9 +15,10 @@ from fms_core._constants import WorkflowAction
 from fms_core.models import SampleNextStepByStudy, Sample, Study, StepHistory
 from fms_core.services.sample_next_step import dequeue_sample_from_specific_step_study_workflow_with_updated_last_step_history
 from fms_core.serializers import SampleNextStepByStudySerializer
-from ._utils import _list_keys
+from ._utils import _list_keys, ReplicaReadMixin, study_step_counts
 
-class SampleNextStepByStudyViewSet(viewsets.ModelViewSet):
+class SampleNextStepByStudyViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
+    replica_read_actions = ["list", "retrieve", "summary_by_study"]
     queryset = SampleNextStepByStudy.objects.select_related("sample_next_step").select_related("step_order").all().distinct()
 
     queryset = queryset.annotate(
@@ -114,7 +115,8 @@ class SampleNextStepByStudyViewSet(viewsets.ModelViewSet):
         For each step, the step order ID, order, step name and count is returned.
 
         The endpoint only returns steps that have at least one sample queued - steps
-        with zero samples are omitted from the results.
+        with zero samples are omitted from the results. The counts are read from the
+        study step counters maintained by the workflow services.
 
         Args:
 
@@ -123,26 +125,4 @@ class SampleNextStepByStudyViewSet(viewsets.ModelViewSet):
         """
        
         study_id = request.GET.get('study__id__in')
-    
-        samples_in_study = SampleNextStepByStudy.objects.all()
-        if study_id is not None:
-            samples_in_study = samples_in_study.filter(study__id=study_id)
-       
-        counted = samples_in_study.values('study__id', 'step_order', 'step_order__order', 'step_order__step__name').annotate(count=Count('step_order')).order_by('study__id', 'step_order__order')
-
-        studies = dict()
-        for group in counted:
-            studyID = group['study__id']
-            if studyID not in studies:
-                studies[studyID] = {
-                    "study_id": studyID,
-                    "steps": []
-                }
-            studies[studyID]['steps'].append({
-                'step_order_id': group['step_order'],
-                'order': group['step_order__order'],
-                'step_name': group['step_order__step__name'],
-                'count': group['count']
-            })
-
-        return Response(studies.values())
+        return Response(study_step_counts("queued_count", study_id))
@@ -1,20 +1,20 @@
-from django.db.models import BooleanField, When, Count, Case, Subquery, OuterRef
+from django.db.models import BooleanField, When, F, Case, Subquery, OuterRef
 from rest_framework import viewsets
 from fms_core.models import DerivedBySample, Sample
 from ._constants import (
     _pooled_sample_filterset_fields,
 )
-from ._utils import _list_keys, TemplateActionsMixin, TemplatePrefillsMixin
+from ._utils import _list_keys, TemplateActionsMixin, TemplatePrefillsMixin, ReplicaReadMixin
 from fms_core.serializers import PooledSampleSerializer, PooledSampleExportSerializer
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
 from fms_core.templates import INDEX_UPDATE_TEMPLATE, SAMPLE_RENAME_TEMPLATE
-from fms_core.template_importer.importers import IndexUpdateImporter, SampleRenameImporter
+from fms_core.template_importer.registry import LazyImporter
 
 from fms_core.filters import PooledSamplesFilter
 
-class PooledSamplesViewSet(viewsets.ModelViewSet, TemplateActionsMixin, TemplatePrefillsMixin):
+class PooledSamplesViewSet(ReplicaReadMixin, viewsets.ModelViewSet, TemplateActionsMixin, TemplatePrefillsMixin):
     '''
         Lists the samples that are contained in a pool. This is a custom endpoint designed
         for the frontend to display pooled samples in a table. It returns the list of derived
@@ -39,13 +39,13 @@ class PooledSamplesViewSet(viewsets.ModelViewSet, TemplateActionsMixin, Template
             "name": "Update Library Index",
             "description": "Upload the provided template with up to 384 index updates.",
             "template": [INDEX_UPDATE_TEMPLATE["identity"]],
-            "importer": IndexUpdateImporter,
+            "importer": LazyImporter("IndexUpdateImporter"),
         },
         {
             "name": "Rename Sample",
             "description": "Rename the selected samples.",
             "template": [SAMPLE_RENAME_TEMPLATE["identity"]],
-            "importer": SampleRenameImporter
+            "importer": LazyImporter("SampleRenameImporter")
         }
     ]
 
@@ -60,7 +60,7 @@ class PooledSamplesViewSet(viewsets.ModelViewSet, TemplateActionsMixin, Template
         self.queryset = DerivedBySample.objects.all()
 
         self.queryset = self.queryset.annotate(
-            count_derived_samples=Count('sample__derived_samples')
+            count_derived_samples=F('sample__derived_sample_count')
         )
 
         self.queryset = self.queryset.annotate(is_pooled=Case(
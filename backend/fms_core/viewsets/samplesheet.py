@@ -4,8 +4,6 @@ from rest_framework.decorators import action
 
 from django.http import HttpResponseServerError, HttpResponseBadRequest, HttpResponse
 
-from fms_core.services.samplesheet import get_samplesheet
-
 import json
 import datetime
 
@@ -31,6 +29,8 @@ class SamplesheetViewSet(viewsets.GenericViewSet):
         Returns:
           response with samplesheet as attachment.
         """
+        from fms_core.services.samplesheet import get_samplesheet # openpyxl is only loaded when a samplesheet is requested
+
         body = json.loads(_request.body)
         samplesheet, errors, _ = get_samplesheet(body["container_kind"], body["placement"])
         if errors:
@@ -7,11 +7,11 @@ from fms_core.models import StepHistory
 from fms_core.serializers import StepHistorySerializer
 from fms_core.filters import StepHistoryFilter
 
-from django.db.models import Count
-
 from ._constants import _stephistory_filterset_fields
+from ._utils import ReplicaReadMixin, study_step_counts
 
-class StepHistoryViewSet(viewsets.ModelViewSet):
+class StepHistoryViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
+    replica_read_actions = ["list", "retrieve", "summary_by_study"]
     queryset = StepHistory.objects.all()
     serializer_class = StepHistorySerializer
     permission_classes = [IsAuthenticated]
@@ -36,7 +36,8 @@ class StepHistoryViewSet(viewsets.ModelViewSet):
         For each study, a data structure is returned containing the study ID and an array
         of steps. For each step we return the StepOrder ID, it's order, the step name, and
         the number of samples that have completed that step. Steps are only returned if there
-        are one or more completed samples, and are omitted otherwise.
+        are one or more completed samples, and are omitted otherwise. The counts are read from
+        the study step counters maintained by the workflow services.
         
         Args:
 
@@ -44,26 +45,4 @@ class StepHistoryViewSet(viewsets.ModelViewSet):
         An array of studies, where each study contains a list of steps with a sample count.
         """
         study_id = request.GET.get('study__id__in')
-
-        history_query = StepHistory.objects.all()
-        if study_id is not None:
-            history_query = history_query.filter(study__id = study_id)
-
-        counted = history_query.values('study__id', 'step_order', 'step_order__order', 'step_order__step__name').annotate(count=Count('step_order')).order_by('study__id', 'step_order__order')
-
-        studies = dict()
-        for group in counted:
-            studyID = group['study__id']
-            if studyID not in studies:
-                studies[studyID] = {
-                    "study_id": studyID,
-                    "steps": []
-                }
-            studies[studyID]['steps'].append({
-                'step_order_id': group['step_order'],
-                'order': group['step_order__order'],
-                'step_name': group['step_order__step__name'],
-                'count': group['count']
-            })
-
-        return Response(studies.values())
\ No newline at end of file
+        return Response(study_step_counts("completed_count", study_id))
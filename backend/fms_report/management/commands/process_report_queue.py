@@ -0,0 +1,64 @@
+from django.core.management.base import BaseCommand
+from os.path import expanduser
+import os
+import time
+import platform
+import logging
+
+from fms_report.services.report_data_preparation import process_production_report_queue, DEFAULT_QUEUE_BATCH_SIZE
+
+# This incremental report preparation module can be called using manage.py :
+# > python manage.py process_report_queue
+# Without --loop, the queue is drained and the command exits (suited for cron). With --loop, the command keeps polling the queue.
+
+# constants
+HOME = expanduser("~")
+REPORTS_PATH = "/reports/"
+LOG_PATH = "log/"
+LOG_NAME = "report_queue"
+SERVER_PLATFORM = "Linux"  # Platform for the server
+SERVER_TZ = "America/Montreal"  # Local timezone
+DEFAULT_POLL_INTERVAL = 30 # seconds
+
+class Command(BaseCommand):
+    help = 'Prepare report data for the readsets queued by validation status changes'
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_QUEUE_BATCH_SIZE, help="Number of readsets prepared per transaction.")
+        parser.add_argument("--loop", action="store_true", help="Keep polling the queue instead of exiting once it is empty.")
+        parser.add_argument("--interval", type=int, default=DEFAULT_POLL_INTERVAL, help="Seconds to wait between polls when looping.")
+
+    def init_logging(self, log_name):
+        path = HOME + REPORTS_PATH + LOG_PATH
+        if not os.path.exists(path):
+            os.makedirs(path)
+        filename = path + log_name + ".log"
+        formatter = logging.Formatter("%(asctime)s || %(levelname)s || %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
+        handler = logging.FileHandler(filename, "a+")
+        handler.setFormatter(formatter)
+        log = logging.getLogger(log_name)
+        log.setLevel(logging.DEBUG)
+        log.addHandler(handler)
+        return log
+
+    def handle(self, *args, **options):
+        if platform.system() == SERVER_PLATFORM:
+            os.environ["TZ"] = SERVER_TZ
+            time.tzset()
+        log = self.init_logging(LOG_NAME)
+
+        while True:
+            try:
+                processed_count = process_production_report_queue(log, batch_size=options["batch_size"])
+                if processed_count:
+                    self.stdout.write(self.style.SUCCESS(f"Prepared report data for {processed_count} queued readsets."))
+                    log.info(f"Prepared report data for {processed_count} queued readsets.")
+            except Exception as err:
+                # Failed batch is rolled back and stays in the queue for the next attempt.
+                self.stdout.write(self.style.ERROR(f"Report queue processing interrupted. Transaction rolled back. {err}"))
+                log.error(f"Report queue processing interrupted. Transaction rolled back. {err}")
+                if not options["loop"]:
+                    raise err
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
@@ -0,0 +1,24 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fms_core', '0080_v5_8_0'),
+        ('fms_report', '0002_v5_0_0'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductionQueue',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('queued_at', models.DateTimeField(auto_now_add=True, help_text='Timestamp the readset was queued for preparation.')),
+                ('readset', models.OneToOneField(help_text='Readset waiting for its report data to be prepared.', on_delete=django.db.models.deletion.CASCADE, related_name='production_queue', to='fms_core.readset')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['queued_at'], name='prodqueue_queuedat_idx')],
+            },
+        ),
+    ]
@@ -2,10 +2,12 @@ from .report import Report
 from .metric_field import MetricField
 from .production_data import ProductionData
 from .production_tracking import ProductionTracking
+from .production_queue import ProductionQueue
 
 __all__ = [
     "Report",
     "MetricField",
     "ProductionData",
     "ProductionTracking",
+    "ProductionQueue",
 ]
\ No newline at end of file
@@ -0,0 +1,15 @@
+from django.db import models
+
+from fms_core.models.readset import Readset
+
+__all__ = ["ProductionQueue"]
+
+
+class ProductionQueue(models.Model):
+    readset = models.OneToOneField(Readset, on_delete=models.CASCADE, related_name="production_queue", help_text="Readset waiting for its report data to be prepared.")
+    queued_at = models.DateTimeField(auto_now_add=True, help_text="Timestamp the readset was queued for preparation.")
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['queued_at'], name='prodqueue_queuedat_idx'),
+        ]
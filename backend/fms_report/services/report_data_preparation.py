@@ -1,20 +1,66 @@
 from fms_report.models.production_data import ProductionData
 from fms_report.models.production_tracking import ProductionTracking
+from fms_report.models.production_queue import ProductionQueue
 
 from fms_core.models._constants import ValidationStatus
 from fms_core.models.readset import Readset
 from fms_core.models.sample import Sample
 from fms_core.models.process import Process
 
+from django.db import transaction
 from django.db.models import Q, F, When, Case, OuterRef, Sum, Value, BigIntegerField, BooleanField, DateField, functions
 
-def prepare_production_report_data(log):
+DEFAULT_QUEUE_BATCH_SIZE = 500
+
+def queue_readsets_for_report_preparation(readset_ids):
+    """
+    Queue readsets for an incremental preparation of their report data. Readsets already waiting in the queue are left as is.
+
+    Args:
+        `readset_ids`: Ids of the readsets that need their report data to be prepared again (validation status changed).
+
+    Returns:
+        Tuple with the number of readsets queued, the errors and the warnings.
+    """
+    errors = []
+    warnings = []
+
+    queued = ProductionQueue.objects.bulk_create([ProductionQueue(readset_id=readset_id) for readset_id in set(readset_ids)], ignore_conflicts=True)
+    return len(queued), errors, warnings
+
+def process_production_report_queue(log, batch_size=DEFAULT_QUEUE_BATCH_SIZE):
+    """
+    Prepares the report data of the queued readsets, one batch at a time, until the queue is empty. Each batch is prepared
+    in its own transaction and removed from the queue when it succeeds. Queue rows locked by another worker are skipped.
+
+    Args:
+        `log`: active logger to keep informed on preparation
+        `batch_size`: maximum number of readsets prepared in a single transaction
+
+    Returns:
+        Number of readsets processed.
+    """
+    processed_count = 0
+    while True:
+        with transaction.atomic():
+            queued_ids = list(ProductionQueue.objects.select_for_update(skip_locked=True).order_by("queued_at").values_list("id", "readset_id")[:batch_size])
+            if not queued_ids:
+                break
+            readset_ids = [readset_id for _, readset_id in queued_ids]
+            log.info(f"Preparing report data for {len(readset_ids)} queued readsets.")
+            prepare_production_report_data(log, readset_ids=readset_ids)
+            ProductionQueue.objects.filter(id__in=[queue_id for queue_id, _ in queued_ids]).delete()
+        processed_count += len(readset_ids)
+    return processed_count
+
+def prepare_production_report_data(log, readset_ids=None):
     """
     Prepares the data for production report. Based on readsets that passed validation. 
     If the readset validation timestamp does not match the stored value in the production tracking table, existing report data (if any) is removed and preparation is done.
 
     Args:
         `log`: active logger to keep informed on preparation
+        `readset_ids`: Optional list of readset ids to restrict the preparation to. Defaults to None (all readsets).
 
     Raises:
         `removal_err`: An error happened while removing existing data from deprecated readsets.
@@ -25,13 +71,18 @@ def prepare_production_report_data(log):
     # Remove updated readsets from the data table
     try:
         log.info("Removing deprecated data.")
-        deleted_rows, _ = ProductionData.objects.filter(readset_id__in=Readset.objects.exclude(production_tracking__validation_timestamp=F("validation_status_timestamp")).values_list("id", flat=True)).delete()
+        deprecated_readsets = Readset.objects.exclude(production_tracking__validation_timestamp=F("validation_status_timestamp"))
+        if readset_ids is not None:
+            deprecated_readsets = deprecated_readsets.filter(id__in=readset_ids)
+        deleted_rows, _ = ProductionData.objects.filter(readset_id__in=deprecated_readsets.values_list("id", flat=True)).delete()
         log.info(f"Deleted {deleted_rows} rows from ProductionData table. Readset validation timestamp no longer match the prepared validation timestamp.")
     except Exception as removal_err:
         log.error(f"ProductionData removal failure: {removal_err}.")
         raise removal_err
     
     queryset = Readset.objects.filter(validation_status=ValidationStatus.PASSED)
+    if readset_ids is not None:
+        queryset = queryset.filter(id__in=readset_ids)
     queryset = queryset.exclude(production_tracking__validation_timestamp=F("validation_status_timestamp"))
 
     queryset = queryset.annotate(reads = Sum(functions.Cast("metrics__value_numeric", output_field=BigIntegerField()), filter= Q(metrics__name="nb_reads")))
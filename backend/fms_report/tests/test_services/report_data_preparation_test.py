@@ -0,0 +1,102 @@
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.utils import timezone
+
+import io
+import logging
+import tempfile
+from unittest import mock
+
+from fms_core.models import Readset, Dataset, Container, Platform, Instrument, InstrumentType, Protocol, Process, RunType, ExperimentRun, SampleKind, Project, Metric
+from fms_core.models._constants import INDEX_READ_FORWARD, INDEX_READ_REVERSE, DOUBLE_STRANDED, ValidationStatus
+from fms_core.services.index import get_or_create_index_set, create_index
+from fms_core.services.library import get_library_type, create_library
+from fms_core.services.platform import get_platform
+from fms_report.models import ProductionData, ProductionQueue, ProductionTracking
+from fms_report.services.report_data_preparation import queue_readsets_for_report_preparation, process_production_report_queue
+
+from fms_core.tests.constants import create_container, create_fullsample
+
+
+class ReportDataPreparationTest(TestCase):
+    def setUp(self):
+        self.log = logging.getLogger(__name__)
+        run_type, _ = RunType.objects.get_or_create(name="Illumina")
+        sample_kind_DNA, _ = SampleKind.objects.get_or_create(name="DNA", is_extracted=True)
+        container, _ = Container.objects.get_or_create(**create_container(name="FlowcellQueueTest", barcode="FlowcellQueueTestBC", kind="illumina-novaseq-x-25b flowcell"))
+
+        library_type, _, _ = get_library_type("RNASeq")
+        platform_illumina, _, _ = get_platform("ILLUMINA")
+        index_set, _, _, _ = get_or_create_index_set("QUEUE_INDEX_SET")
+        index, _, _ = create_index("QUEUE_INDEX_1", "Nextera", index_set)
+        library, _, _ = create_library(library_type=library_type, index=index, platform=platform_illumina, strandedness=DOUBLE_STRANDED)
+
+        platform, _ = Platform.objects.get_or_create(name="PlatformTest")
+        instrument_type, _ = InstrumentType.objects.get_or_create(type="InstrumentTypeTest",
+                                                                  platform=platform,
+                                                                  index_read_5_prime=INDEX_READ_FORWARD,
+                                                                  index_read_3_prime=INDEX_READ_REVERSE)
+        instrument, _ = Instrument.objects.get_or_create(name="Instrument1", type=instrument_type, serial_id="Test101")
+        protocol, _ = Protocol.objects.get_or_create(name="MyProtocolTest")
+        process = Process.objects.create(protocol=protocol, comment="Process test for ExperimentRun")
+        project = Project.objects.create(name="REPORT_QUEUE_PROJECT", external_id="P031554")
+        self.experiment_run = ExperimentRun.objects.create(name="RunNovaseqQueue",
+                                                           run_type=run_type,
+                                                           container=container,
+                                                           instrument=instrument,
+                                                           process=process,
+                                                           start_date="2025-04-07")
+        dataset = Dataset.objects.create(project=project, experiment_run=self.experiment_run, lane=1)
+        validator = User.objects.create(username="validator")
+
+        self.readsets = []
+        for i, coordinates in enumerate(["A01", "B01"]):
+            sample = create_fullsample(name=f"QueueSample{i}",
+                                       alias=f"QueueSample{i}",
+                                       volume=100,
+                                       individual=None,
+                                       sample_kind=sample_kind_DNA,
+                                       container=container,
+                                       coordinates=coordinates)
+            derived_sample = sample.derived_samples.first()
+            derived_sample.library = library
+            derived_sample.save()
+            readset = Readset.objects.create(name=f"Queue_Readset{i}",
+                                             sample_name=f"QueueSample{i}",
+                                             dataset=dataset,
+                                             derived_sample=derived_sample,
+                                             validation_status=ValidationStatus.PASSED,
+                                             validation_status_timestamp=timezone.now(),
+                                             validated_by=validator)
+            Metric.objects.create(name="nb_reads", readset=readset, metric_group="qc", value_numeric=1000)
+            Metric.objects.create(name="yield", readset=readset, metric_group="qc", value_numeric=150000)
+            self.readsets.append(readset)
+
+    def assert_readsets_prepared(self):
+        self.assertFalse(ProductionQueue.objects.exists())
+        self.assertEqual(sorted(ProductionData.objects.values_list("readset_id", "reads", "bases")),
+                         sorted((readset.id, 1000, 150000) for readset in self.readsets))
+        self.assertEqual(ProductionTracking.objects.filter(extracted_readset__in=self.readsets).count(), 2)
+
+    def test_process_production_report_queue(self):
+        queued_count, errors, warnings = queue_readsets_for_report_preparation([readset.id for readset in self.readsets])
+        self.assertEqual(queued_count, 2)
+        self.assertEqual(errors, [])
+        self.assertEqual(warnings, [])
+
+        processed_count = process_production_report_queue(self.log, batch_size=1)
+        self.assertEqual(processed_count, 2)
+        self.assert_readsets_prepared()
+
+        # Queueing the readsets again does not duplicate their report data
+        queue_readsets_for_report_preparation([readset.id for readset in self.readsets])
+        process_production_report_queue(self.log)
+        self.assert_readsets_prepared()
+
+    def test_process_report_queue_command(self):
+        queue_readsets_for_report_preparation([readset.id for readset in self.readsets])
+        with tempfile.TemporaryDirectory() as home:
+            with mock.patch("fms_report.management.commands.process_report_queue.HOME", home):
+                call_command("process_report_queue", stdout=io.StringIO())
+        self.assert_readsets_prepared()
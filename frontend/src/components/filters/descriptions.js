@@ -37,9 +37,9 @@ export const SAMPLE_FILTERS = {
     recursive: true,
     batch: true,
   },
-  derived_by_samples__project__name: {
+  first_project__name: {
     type: FILTER_TYPE.INPUT,
-    key: "derived_by_samples__project__name",
+    key: "first_project__name",
     label: "Project",
     batch: true,
   },
@@ -477,9 +477,9 @@ export const LIBRARY_FILTERS = {
     key: "derived_samples__library__platform__name",
     label: "Platform",
   },
-  derived_by_samples__project__name: {
+  first_project__name: {
     type: FILTER_TYPE.INPUT,
-    key: "derived_by_samples__project__name",
+    key: "first_project__name",
     label: "Project",
     batch: true,
   },
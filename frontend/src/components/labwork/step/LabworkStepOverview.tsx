@@ -2,7 +2,7 @@ import { Collapse, Typography, Button, Space, Tag, notification } from 'antd'
 import React, { useState, useEffect, useCallback, useMemo, ComponentProps } from 'react'
 import { useAppDispatch, useAppSelector } from '../../../hooks'
 import { FILTER_TYPE } from '../../../constants'
-import { getLabworkStepSummary, setSelectedSamples, setSelectedSamplesInGroups, unselectSamples } from '../../../modules/labworkSteps/actions'
+import { getLabworkStepGroupLocators, getLabworkStepSummary, setSelectedSamples, setSelectedSamplesInGroups, unselectSamples } from '../../../modules/labworkSteps/actions'
 import GroupingButton from '../../GroupingButton'
 import LabworkStepOverviewPanel from './LabworkStepOverviewPanel'
 import { selectLabworkStepSummaryState } from '../../../selectors'
@@ -72,7 +72,22 @@ const LabworkStepOverview = ({step, refreshing, stepSamples, columns, filterDefi
     })
   }, [clearFilters, dispatch, step.id, stepSamples.selectedSamples.items])
 
-  const handleSelectGroup = useCallback(async (groupSampleIds: FMSId[]) => {
+  // The summary only has the group counts : the samples of a group are fetched when it is opened or selected
+  const loadGroupSamples = useCallback(async (groupIndex: number) => {
+    const groupSampleIds = await dispatch(getLabworkStepGroupLocators(step.id, activeGrouping.key, groupIndex))
+    dispatch(setSelectedSamplesInGroups(stepSamples.selectedSamples.items))
+    return groupSampleIds
+  }, [activeGrouping.key, dispatch, step.id, stepSamples.selectedSamples.items])
+
+  const handleOpenGroup = useCallback((keys: string | string[]) => {
+    const key = Array.isArray(keys) ? keys[0] : keys
+    if (key !== undefined) {
+      loadGroupSamples(Number(key))
+    }
+  }, [loadGroupSamples])
+
+  const handleSelectGroup = useCallback(async (groupIndex: number) => {
+    const groupSampleIds = await loadGroupSamples(groupIndex)
     const mergedSelection = mergeArraysIntoSet(stepSamples.selectedSamples.items, groupSampleIds)
     if (mergedSelection.length > MAX_STEP_SAMPLE_SELECTION) {
       const TOO_MANY_SELECTED_NOTIFICATION_KEY = `LabworkStep.too-many-sample-selected-${step.id}`
@@ -85,11 +100,12 @@ const LabworkStepOverview = ({step, refreshing, stepSamples, columns, filterDefi
     else {
       dispatch(setSelectedSamples(step.id, mergedSelection))
     }
-  }, [stepSamples.selectedSamples.items, step.id, dispatch])
+  }, [loadGroupSamples, stepSamples.selectedSamples.items, step.id, dispatch])
 
-  const handleClearGroup = useCallback((groupSampleIds: FMSId[]) => {
+  const handleClearGroup = useCallback(async (groupIndex: number) => {
+    const groupSampleIds = await loadGroupSamples(groupIndex)
     dispatch(unselectSamples(step.id, groupSampleIds))
-  }, [dispatch, step.id])
+  }, [dispatch, loadGroupSamples, step.id])
 
   const finalColumns = useMemo(() => {
     let finalColumns = [...columns]
@@ -101,19 +117,20 @@ const LabworkStepOverview = ({step, refreshing, stepSamples, columns, filterDefi
     return finalColumns
   }, [activeGrouping, columns])
 
-  const collapsePanels = useMemo<NonNullable<ComponentProps<typeof Collapse>['items']>>(() => (labworkStepSummary && labworkStepSummary.groups?.map((group: LabworkStepSamplesGroup) => {
-          const sample_ids = Object.keys(group.sample_locators).map((id) => Number(id))
+  const collapsePanels = useMemo<NonNullable<ComponentProps<typeof Collapse>['items']>>(() => (labworkStepSummary && labworkStepSummary.groups?.map((group: LabworkStepSamplesGroup, index: number) => {
           const selectedCount = Object.keys(group.selected_samples).length
+          const groupLoading = loading || group.is_fetching_locators
+          // The selected count is only known once the samples of the group are fetched
           const ButtonsSelectAndClear = (
             <Space orientation="horizontal" style={{width: '100%', justifyContent: 'center'}}>
-              <Tag variant="outlined"><Title style={{ margin: 0 }} level={4}>{`${selectedCount}/${group.count}`}</Title></Tag>
-              <Button disabled={loading || group.count === 0 || selectedCount === group.count} title='Select group samples' onClick={() => handleSelectGroup(sample_ids)}>Select All</Button>
-              <Button disabled={loading || selectedCount === 0} title='Deselect group samples' onClick={() => handleClearGroup(sample_ids)}>Clear Selection</Button>
+              <Tag variant="outlined"><Title style={{ margin: 0 }} level={4}>{`${group.locators_loaded ? selectedCount : '-'}/${group.count}`}</Title></Tag>
+              <Button disabled={groupLoading || group.count === 0 || (group.locators_loaded && selectedCount === group.count)} title='Select group samples' onClick={() => handleSelectGroup(index)}>Select All</Button>
+              <Button disabled={groupLoading || (group.locators_loaded && selectedCount === 0)} title='Deselect group samples' onClick={() => handleClearGroup(index)}>Clear Selection</Button>
             </Space>
           )
 
 					return {
-              key: group.name,
+              key: `${index}`,
               label: group.name,
               extra: ButtonsSelectAndClear,
               children: <LabworkStepOverviewPanel
@@ -146,7 +163,7 @@ const LabworkStepOverview = ({step, refreshing, stepSamples, columns, filterDefi
         <GroupingButton grouping={GROUPING_CREATED_BY} selected={activeGrouping===GROUPING_CREATED_BY} refreshing={labworkStepSummary.isFetching} onClick={handleChangeActiveGrouping}/>
       </div>
       <div style={{ display: 'flex', marginBottom: '1em' }}></div>
-			<Collapse accordion destroyOnHidden={true} collapsible={labworkStepSummary.isFetching ? 'disabled' : 'icon'} items={collapsePanels} />
+			<Collapse accordion destroyOnHidden={true} collapsible={labworkStepSummary.isFetching ? 'disabled' : 'icon'} items={collapsePanels} onChange={handleOpenGroup} />
 		</>
 	)
 }
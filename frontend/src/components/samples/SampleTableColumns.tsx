@@ -503,7 +503,7 @@ export const SAMPLE_FILTER_KEYS: { [key in SampleColumnID]: string } = {
 	[SampleColumnID.CREATION_DATE]: 'creation_date',
 	[SampleColumnID.DEPLETED]: 'depleted',
 	[SampleColumnID.QC_FLAG]: 'qc_flag',
-	[SampleColumnID.PROJECT]: 'derived_by_samples__project__name',
+	[SampleColumnID.PROJECT]: 'first_project__name',
 	[SampleColumnID.COHORT]: 'derived_samples__biosample__individual__cohort',
 	[SampleColumnID.QUEUED_STEPS]: 'sample_next_steps__step__name',
 	[SampleColumnID.SAMPLE_COUNT]: '',
@@ -524,7 +524,7 @@ export const SAMPLE_NEXT_STEP_FILTER_KEYS: { [key in SampleColumnID]: string } =
 	[SampleColumnID.CREATION_DATE]: 'sample__creation_date',
 	[SampleColumnID.DEPLETED]: 'sample__depleted',
 	[SampleColumnID.QC_FLAG]: 'qc_flag',
-	[SampleColumnID.PROJECT]: 'sample__derived_by_samples__project__name',
+	[SampleColumnID.PROJECT]: 'sample__first_project__name',
 	[SampleColumnID.COHORT]: 'sample__derived_samples__biosample__individual__cohort',
 	[SampleColumnID.QUEUED_STEPS]: 'step__name',
 	[SampleColumnID.SAMPLE_COUNT]: '',
@@ -550,7 +550,7 @@ export const SAMPLE_NEXT_STEP_BY_STUDY_FILTER_KEYS: { [key in SampleColumnID]: s
 	[SampleColumnID.CREATION_DATE]: 'sample_next_step__sample__creation_date',
 	[SampleColumnID.DEPLETED]: 'sample_next_step__sample__depleted',
 	[SampleColumnID.QC_FLAG]: 'qc_flag',
-	[SampleColumnID.PROJECT]: 'sample_next_step__sample__derived_by_samples__project__name',
+	[SampleColumnID.PROJECT]: 'sample_next_step__sample__first_project__name',
 	[SampleColumnID.COHORT]: 'sample_next_step__sample__derived_samples__biosample__individual__cohort',
 	[SampleColumnID.QUEUED_STEPS]: 'sample_next_step__step__name',
 	[SampleColumnID.SAMPLE_COUNT]: '',
@@ -15,6 +15,11 @@ export const TemplatePreview = ({checkResult}) => {
           {baseError.error}
         </p>)
     }
+    { checkResult?.base_warnings?.length > 0 && checkResult.base_warnings.map(baseWarning =>
+        <p>
+          <WarningOutlined /> {baseWarning.warning}
+        </p>)
+    }
     <Tabs size="large" type="card">
       {checkResult.result_previews?.map((preview, index) =>
          <TabPane tab={preview.name} key={index}>
@@ -616,12 +616,20 @@ export interface LabworkStepInfo {
             groups: {
                 name: string
                 count: number
-                sample_locators: SampleLocator[]
+                sample_locators?: SampleLocator[] // Omitted when requested without locators
             }[]
         }
     }
 }
 
+export interface LabworkStepGroupLocators {
+    results: {
+        name: string | null
+        sample_locators: SampleLocator[]
+        next: string | null // Cursor of the next page
+    }
+}
+
 /**
  * ReportInformation
  * Returned by the /api/report/[name]/ endpoint
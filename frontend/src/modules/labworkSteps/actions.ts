@@ -1,6 +1,6 @@
 import { notification } from "antd"
 import serializeFilterParamsWithDescriptions, { serializeSortByParams } from "../../components/pagedItemsTable/serializeFilterParamsTS"
-import { FMSContainer, FMSId, LabworkStepInfo } from "../../models/fms_api_models"
+import { FMSContainer, FMSId, LabworkStepInfo, SampleLocator } from "../../models/fms_api_models"
 import { Step } from "../../models/frontend_models"
 import { FilterDescription, FilterOptions, FilterValue, SortBy } from "../../models/paged_items"
 import { selectAuthTokenAccess, selectLabworkStepsState, selectPageSize, selectProtocolsByID, selectSampleNextStepTemplateActions, selectStepsByID, selectLabworkStepSummaryState, selectContainerKindsByID } from "../../selectors"
@@ -9,7 +9,7 @@ import { networkAction } from "../../utils/actions"
 import api from "../../utils/api"
 import { flushContainers as flushPlacementContainers, loadContainer as loadPlacementContainer } from "../placement/reducers"
 import { CoordinateSortDirection, LabworkPrefilledTemplateDescriptor } from "./models"
-import { CLEAR_FILTERS, FLUSH_SAMPLES_AT_STEP, INIT_SAMPLES_AT_STEP, LIST, LIST_TEMPLATE_ACTIONS, SET_FILTER, SET_FILTER_OPTION, SET_SELECTED_SAMPLES, SET_SELECTED_SAMPLES_SORT_DIRECTION, SET_SORT_BY, SHOW_SELECTION_CHANGED_MESSAGE, GET_LABWORK_STEP_SUMMARY, SELECT_SAMPLES_IN_GROUPS, REFRESH_SELECTED_SAMPLES, loadSourceContainer, flushContainers as flushLabworkStepPlacementContainers, LabworkStepPlacementParentContainer } from "./reducers"
+import { CLEAR_FILTERS, FLUSH_SAMPLES_AT_STEP, INIT_SAMPLES_AT_STEP, LIST, LIST_TEMPLATE_ACTIONS, SET_FILTER, SET_FILTER_OPTION, SET_SELECTED_SAMPLES, SET_SELECTED_SAMPLES_SORT_DIRECTION, SET_SORT_BY, SHOW_SELECTION_CHANGED_MESSAGE, GET_LABWORK_STEP_SUMMARY, GET_LABWORK_STEP_GROUP_LOCATORS, SELECT_SAMPLES_IN_GROUPS, REFRESH_SELECTED_SAMPLES, loadSourceContainer, flushContainers as flushLabworkStepPlacementContainers, LabworkStepPlacementParentContainer } from "./reducers"
 import { getCoordinateOrderingParams, refreshSelectedSamplesAtStep } from "./services"
 import { downloadFromFile } from "../../utils/download"
 import { fetchSamples } from "../cache/cache"
@@ -375,7 +375,8 @@ export const getLabworkStepSummary = (stepID: FMSId, groupBy: string, options, s
 	dispatch({ type: GET_LABWORK_STEP_SUMMARY.REQUEST })
 
 	try {
-		const response = await dispatch(api.sampleNextStep.labworkStepSummary(stepID, groupBy, options, sampleIDs))
+		// Group names and counts only, the locators of a group are fetched when it is opened (see getLabworkStepGroupLocators)
+		const response = await dispatch(api.sampleNextStep.labworkStepSummary(stepID, groupBy, options, sampleIDs, false))
 		const summary = response.data.results.samples.groups
 		dispatch({
 			type: GET_LABWORK_STEP_SUMMARY.RECEIVE,
@@ -389,6 +390,43 @@ export const getLabworkStepSummary = (stepID: FMSId, groupBy: string, options, s
 	}
 }
 
+const LABWORK_STEP_GROUP_LOCATORS_PAGE_SIZE = 1000
+
+/**
+ * Fetches, page by page, the sample locators of a group of the labwork step summary.
+ * @param stepID
+ * @param groupBy Grouping column of the summary
+ * @param groupIndex Index of the group in the summary
+ * @returns The ids of the samples of the group
+ */
+export const getLabworkStepGroupLocators = (stepID: FMSId, groupBy: string, groupIndex: number) => async (dispatch: AppDispatch, getState: () => RootState): Promise<FMSId[]> => {
+	const group = selectLabworkStepSummaryState(getState()).groups?.[groupIndex]
+	if (!group || group.is_fetching_locators) {
+		return []
+	}
+	if (group.locators_loaded) {
+		return Object.keys(group.sample_locators).map((id) => Number(id))
+	}
+
+	const groupName = group.name
+	dispatch({ type: GET_LABWORK_STEP_GROUP_LOCATORS.REQUEST, groupIndex, groupName })
+
+	try {
+		const sampleLocators: SampleLocator[] = []
+		let cursor: string | null = null
+		do {
+			const response = await dispatch(api.sampleNextStep.labworkStepGroupLocators(stepID, groupBy, groupName, { limit: LABWORK_STEP_GROUP_LOCATORS_PAGE_SIZE, ...(cursor ? { cursor } : {}) }))
+			sampleLocators.push(...response.data.results.sample_locators)
+			cursor = response.data.results.next
+		} while (cursor)
+		dispatch({ type: GET_LABWORK_STEP_GROUP_LOCATORS.RECEIVE, groupIndex, groupName, sampleLocators })
+		return sampleLocators.map((locator) => locator.sample_id)
+	} catch (err) {
+		dispatch({ type: GET_LABWORK_STEP_GROUP_LOCATORS.ERROR, groupIndex, groupName, error: err })
+		return []
+	}
+}
+
 export function setSelectedSamplesInGroups(sampleIDs: FMSId[]) {
 	return {
 		type: SELECT_SAMPLES_IN_GROUPS[1],
@@ -428,7 +466,7 @@ export function fetchAndLoadSourceContainers(stepID: FMSId, sampleIDs: FMSId[])
 				dispatch(loadPlacementContainer({
 					parentContainerName: parentContainerDetail.name,
 					spec,
-					cells: containerGroup.sample_locators.map((locator) => {
+					cells: (containerGroup.sample_locators ?? []).map((locator) => {
 						return {
 							sample: locator.sample_id,
 							name: locator.sample_name,
@@ -447,7 +485,7 @@ export function fetchAndLoadSourceContainers(stepID: FMSId, sampleIDs: FMSId[])
 			} else {
 				dispatch(loadPlacementContainer({
 					parentContainerName: null,
-					cells: containerGroup.sample_locators.map((locator) => {
+					cells: (containerGroup.sample_locators ?? []).map((locator) => {
 						return {
 							sample: locator.sample_id,
 							name: locator.sample_name,
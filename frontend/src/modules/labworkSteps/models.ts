@@ -49,4 +49,6 @@ export interface LabworkStepSamplesGroup extends Pick<LabworkStepInfoGroup, 'nam
   containers: any
   sample_locators: Record<FMSId, SampleLocator | undefined>
   selected_samples: Record<FMSId, SampleLocator | undefined>
+  locators_loaded: boolean		// The summary only has the group counts, locators are fetched when the group is opened
+  is_fetching_locators: boolean
 }
@@ -21,6 +21,7 @@ export const LIST_TEMPLATE_ACTIONS = createNetworkActionTypes("SAMPLES_AT_STEP.L
 export const SHOW_SELECTION_CHANGED_MESSAGE = 'SAMPLES_AT_STEP:SHOW_SELECTION_CHANGED_MESSAGE'
 export const SET_SELECTED_SAMPLES_SORT_DIRECTION = 'SAMPLES_AT_STEP:SET_SELECTED_SAMPLES_SORT_DIRECTION'
 export const GET_LABWORK_STEP_SUMMARY = createNetworkActionTypes('SAMPLES_AT_STEP.GET_LABWORK_STEP_SUMMARY')
+export const GET_LABWORK_STEP_GROUP_LOCATORS = createNetworkActionTypes('SAMPLES_AT_STEP.GET_LABWORK_STEP_GROUP_LOCATORS')
 export const SELECT_SAMPLES_IN_GROUPS = [SET_SELECTED_SAMPLES, 'SAMPLES_AT_STEP:SET_SELECTED_SAMPLES_IN_GROUPS'] as const
 
 
@@ -349,16 +350,51 @@ export const labworkStepSummary = (state: LabworkStepSummaryState = {isFetching:
 				groups: data.map((group) => ({
 					name: group.name,
 					count: group.count,
-					sample_locators: group.sample_locators.reduce((prev, curr) => {
+					sample_locators: (group.sample_locators ?? []).reduce((prev, curr) => {
 						prev[curr.sample_id] = curr
 						return prev
 					}, {}),
 					selected_samples: {},
-					containers: undefined
+					containers: undefined,
+					locators_loaded: group.sample_locators !== undefined,
+					is_fetching_locators: false
 				} as LabworkStepSamplesGroup))
 			}
 		}
 
+		case GET_LABWORK_STEP_GROUP_LOCATORS.REQUEST:
+		case GET_LABWORK_STEP_GROUP_LOCATORS.RECEIVE:
+		case GET_LABWORK_STEP_GROUP_LOCATORS.ERROR: {
+			const { groupIndex, groupName } = action as unknown as { groupIndex: number, groupName: LabworkStepSamplesGroup['name'] }
+			return {
+				...state,
+				groups: state.groups?.map((group, index) => {
+					// Ignore the answer if the summary was fetched again in the meantime
+					if (index !== groupIndex || group.name !== groupName) {
+						return group
+					}
+					switch (action.type) {
+						case GET_LABWORK_STEP_GROUP_LOCATORS.REQUEST:
+							return { ...group, is_fetching_locators: true }
+						case GET_LABWORK_STEP_GROUP_LOCATORS.RECEIVE: {
+							const sampleLocators = action.sampleLocators as SampleLocator[]
+							return {
+								...group,
+								is_fetching_locators: false,
+								locators_loaded: true,
+								sample_locators: sampleLocators.reduce((prev, curr) => {
+									prev[curr.sample_id] = curr
+									return prev
+								}, {} as LabworkStepSamplesGroup['sample_locators'])
+							}
+						}
+						default:
+							return { ...group, is_fetching_locators: false }
+					}
+				})
+			}
+		}
+
 		case GET_LABWORK_STEP_SUMMARY.ERROR: {
 			return {
 				...state,
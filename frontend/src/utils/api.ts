@@ -1,6 +1,6 @@
 import {stringify as qs} from "querystring";
 import {API_BASE_PATH} from "../config";
-import { FMSDataset, FMSId, FMSPagedResultsReponse, FMSProject, FMSProtocol, FMSReadset, FMSSample, FMSSampleNextStep, FMSSampleNextStepByStudy, FMSStep, FMSStepHistory, FMSStudy, FMSWorkflow, LabworkStepInfo, ReleaseStatus, FMSReportInformation, WorkflowStepOrder, FMSReportData, FMSPooledSample, FMSSampleIdentity, FMSSampleIdentityMatch, FMSBiosample, FMSUser, FMSProfile, FMSSampleLineageGraph, FMSTemplateAction, FMSTemplatePrefillOption, FMSVersion, FMSExperimentRun } from "../models/fms_api_models";
+import { FMSDataset, FMSId, FMSPagedResultsReponse, FMSProject, FMSProtocol, FMSReadset, FMSSample, FMSSampleNextStep, FMSSampleNextStepByStudy, FMSStep, FMSStepHistory, FMSStudy, FMSWorkflow, LabworkStepInfo, LabworkStepGroupLocators, ReleaseStatus, FMSReportInformation, WorkflowStepOrder, FMSReportData, FMSPooledSample, FMSSampleIdentity, FMSSampleIdentityMatch, FMSBiosample, FMSUser, FMSProfile, FMSSampleLineageGraph, FMSTemplateAction, FMSTemplatePrefillOption, FMSVersion, FMSExperimentRun } from "../models/fms_api_models";
 import { AnyAction, Dispatch } from "redux";
 import { RootState } from "../store";
 import { notifyError } from "../modules/notification/actions";
@@ -31,6 +31,8 @@ const api = {
     listParents: id => get(`/containers/${id}/list_parents/`),
     listChildren: id => get(`/containers/${id}/list_children/`),
     listChildrenRecursively: id => get(`/containers/${id}/list_children_recursively/`),
+    placement: (container_ids: number[], options: { sample_count?: number, occupied_coordinates?: Record<number, string[]>, axis?: 'row' | 'column' } = {}) =>
+      post("/containers/placement/", { container_ids, ...options }),
     template: {
       actions: () => get(`/containers/template_actions/`),
       check:  (action, template) => post(`/containers/template_check/`, form({ action, template })),
@@ -271,7 +273,8 @@ const api = {
     getStudySamples: (studyId) => get('/sample-next-step/', {studies__id__in : studyId}),
     executeAutomation: (stepId, additionalData, options) => filteredpost(`/sample-next-step/execute_automation/`, {...options}, form({step_id: stepId, additional_data: additionalData, ...options}),),
     labworkSummary: () => get('/sample-next-step/labwork_info/'),
-    labworkStepSummary: (stepId: FMSId, groupBy: string, options?: QueryParams, sample__id__in?: FMSId[]) => filteredpost<JsonResponse<LabworkStepInfo>>('/sample-next-step/labwork_step_info/', {...options, step__id__in: stepId, group_by: groupBy}, { sample__id__in }),
+    labworkStepSummary: (stepId: FMSId, groupBy: string, options?: QueryParams, sample__id__in?: FMSId[], withLocators = true) => filteredpost<JsonResponse<LabworkStepInfo>>('/sample-next-step/labwork_step_info/', {...options, step__id__in: stepId, group_by: groupBy, ...(withLocators ? {} : { with_locators: 'false' })}, { sample__id__in }),
+    labworkStepGroupLocators: (stepId: FMSId, groupBy: string, group: string | null, options?: QueryParams) => filteredpost<JsonResponse<LabworkStepGroupLocators>>('/sample-next-step/labwork_step_group_locators/', {...options, step__id__in: stepId, group_by: groupBy, ...(group !== null ? { group } : {})}, {}),
     listSamplesAtStep: (stepId: FMSId, options?: QueryParams, sample__id__in?: FMSId[]) => filteredpost<JsonResponse<FMSPagedResultsReponse<FMSSampleNextStep>>>('/sample-next-step/list_post/', {limit: 100000, ...options, step__id__in: stepId}, { sample__id__in }),
     prefill: {
       templates: (protocolId) => get('/sample-next-step/list_prefills/', {protocol: protocolId}),